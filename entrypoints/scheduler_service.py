@@ -17,7 +17,7 @@ sys.path.insert(0, str(root_dir))
 
 from dotenv import load_dotenv
 from src.utils.logger import setup_logger
-from src.services.calendario_service import CalendarioService
+from src.services.container import get_container
 from src.config.settings import settings
 
 # Cargar variables de entorno
@@ -43,7 +43,7 @@ def main():
     logger.info("")
     
     try:
-        service = CalendarioService()
+        service = get_container().calendario_service
         
         logger.info("🚀 Scheduler iniciado")
         logger.info("📅 Ejecutando cada 24 horas")
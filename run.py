@@ -109,11 +109,11 @@ def run_scheduler():
     logger.info("⏰ Iniciando scheduler...")
     
     try:
-        from src.services.calendario_service import CalendarioService
+        from src.services.container import get_container
         import time
         from datetime import datetime
         
-        service = CalendarioService()
+        service = get_container().calendario_service
         
         logger.info("📅 Ejecutando cada 24 horas")
         logger.info("⏸️ Presiona Ctrl+C para detener")
@@ -0,0 +1,207 @@
+# src/ai/answer_cache.py
+"""
+💬 Caché semántica de respuestas del chatbot
+Reutiliza respuestas de Gemini para preguntas equivalentes del mismo día
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, FrozenSet, Optional, Tuple
+from src.utils.logger import setup_logger
+from src.utils.query_parser import QueryParser
+from src.utils.validators import normalizar_texto
+
+
+@dataclass(frozen=True)
+class ClaveRespuesta:
+    """
+    Clave de una pregunta en la caché.
+    
+    Attributes:
+        grupo: (día, versión del snapshot, canal, intención parseada);
+            sólo se comparan preguntas del mismo grupo
+        texto: Pregunta normalizada (coincidencia exacta)
+        tokens: Palabras clave normalizadas (coincidencia aproximada)
+    """
+    grupo: Tuple
+    texto: str
+    tokens: FrozenSet[str]
+
+
+def similitud_jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """
+    Similitud de Jaccard entre dos conjuntos de tokens.
+    
+    Args:
+        a: Primer conjunto
+        b: Segundo conjunto
+    
+    Returns:
+        Valor entre 0 y 1 (0 si alguno está vacío)
+    """
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class AnswerCache:
+    """
+    Caché LRU de respuestas del chatbot.
+    
+    - Coincidencia exacta por pregunta normalizada
+    - Coincidencia aproximada por similitud de palabras clave dentro
+      de la misma intención (mes, año, tipo de evento, referencia temporal)
+    - Las entradas vencen al cambiar el día o la versión del calendario
+    """
+    
+    def __init__(self, max_entradas: int = 512, umbral_similitud: float = 0.75):
+        """
+        Inicializa la caché.
+        
+        Args:
+            max_entradas: Cantidad máxima de respuestas guardadas (0 = deshabilitada)
+            umbral_similitud: Jaccard mínimo para considerar dos preguntas equivalentes
+        """
+        self.logger = setup_logger("AnswerCache")
+        self.parser = QueryParser()
+        self.max_entradas = max_entradas
+        self.umbral_similitud = umbral_similitud
+        
+        self._entradas: "OrderedDict[ClaveRespuesta, str]" = OrderedDict()
+        self._dia = date.today()
+        self._lock = threading.Lock()
+        
+        self.hits_exactos = 0
+        self.hits_similares = 0
+        self.misses = 0
+    
+    @property
+    def habilitada(self) -> bool:
+        """Indica si la caché guarda respuestas"""
+        return self.max_entradas > 0
+    
+    def clave(
+        self,
+        pregunta: str,
+        version: str,
+        dia: Optional[date] = None,
+        canal: Optional[str] = None
+    ) -> ClaveRespuesta:
+        """
+        Construye la clave de una pregunta.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            version: Versión del snapshot usado para responder
+            dia: Día de la consulta (default: hoy)
+            canal: Canal de la respuesta (cada canal tiene su formato)
+        
+        Returns:
+            Clave para obtener() y guardar()
+        """
+        intencion = self.parser.parse(pregunta)
+        grupo = (
+            (dia or date.today()).isoformat(),
+            version,
+            canal,
+            intencion["mes"],
+            intencion["año"],
+            intencion["tipo_evento"],
+            intencion["temporal"],
+        )
+        tokens = frozenset(normalizar_texto(k) for k in intencion["keywords"])
+        
+        return ClaveRespuesta(grupo=grupo, texto=normalizar_texto(pregunta), tokens=tokens)
+    
+    def _rotar_dia(self) -> None:
+        """Vacía la caché si cambió el día (TTL hasta medianoche)"""
+        hoy = date.today()
+        if hoy != self._dia:
+            self._entradas.clear()
+            self._dia = hoy
+    
+    def obtener(self, clave: ClaveRespuesta) -> Optional[str]:
+        """
+        Busca una respuesta para la pregunta o una equivalente.
+        
+        Args:
+            clave: Clave construida con clave()
+        
+        Returns:
+            Respuesta cacheada o None
+        """
+        if not self.habilitada:
+            return None
+        
+        with self._lock:
+            self._rotar_dia()
+            
+            respuesta = self._entradas.get(clave)
+            if respuesta is not None:
+                self._entradas.move_to_end(clave)
+                self.hits_exactos += 1
+                return respuesta
+            
+            mejor, mejor_similitud = None, self.umbral_similitud
+            for candidata in self._entradas:
+                if candidata.grupo != clave.grupo:
+                    continue
+                similitud = similitud_jaccard(clave.tokens, candidata.tokens)
+                if similitud >= mejor_similitud:
+                    mejor, mejor_similitud = candidata, similitud
+            
+            if mejor is not None:
+                self._entradas.move_to_end(mejor)
+                self.hits_similares += 1
+                self.logger.debug(f"Pregunta similar en caché ({mejor_similitud:.2f}): {mejor.texto}")
+                return self._entradas[mejor]
+            
+            self.misses += 1
+            return None
+    
+    def guardar(self, clave: ClaveRespuesta, respuesta: str) -> None:
+        """
+        Guarda una respuesta.
+        
+        Args:
+            clave: Clave construida con clave()
+            respuesta: Respuesta generada por el LLM
+        """
+        if not self.habilitada:
+            return
+        
+        with self._lock:
+            self._rotar_dia()
+            self._entradas[clave] = respuesta
+            self._entradas.move_to_end(clave)
+            
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+    
+    def limpiar(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._entradas.clear()
+    
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Retorna estadísticas de uso.
+        
+        Returns:
+            Diccionario con entradas, hits exactos/similares, misses y hit rate
+        """
+        hits = self.hits_exactos + self.hits_similares
+        total = hits + self.misses
+        return {
+            "entradas": len(self._entradas),
+            "max_entradas": self.max_entradas,
+            "hits_exactos": self.hits_exactos,
+            "hits_similares": self.hits_similares,
+            "misses": self.misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
\ No newline at end of file
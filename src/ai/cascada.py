@@ -0,0 +1,178 @@
+# src/ai/cascada.py
+"""
+🪜 Cascada de modelos
+Las preguntas simples van primero al modelo rápido y barato; si su
+respuesta no pasa una validación liviana se escala al modelo completo
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from src.ai.telemetria import TARIFA_RAPIDO, TelemetriaLLM, get_telemetria_llm
+from src.config.constants import MESES_ESPANOL
+from src.config.settings import settings
+from src.models.evento import Evento
+from src.utils.logger import setup_logger
+from src.utils.validators import normalizar_texto
+
+# Preguntas más largas se consideran complejas
+MAX_PALABRAS_SIMPLE = 14
+
+# Pedidos que necesitan razonar, no sólo buscar una fecha (texto normalizado)
+PALABRAS_COMPLEJAS = (
+    "por que", "porque", "como ", "explica", "compara", "diferencia",
+    "conviene", "recomend", "organiz", "planific", "cuantos dias", "cuanto falta",
+)
+
+# finish_reason con los que la respuesta del modelo rápido no sirve
+FINISH_INCOMPLETOS = ("MAX_TOKENS", "SAFETY", "RECITATION")
+
+# Fechas en la respuesta: "15 de diciembre", "1° de mayo", "15/12", "2026-12-15"
+_MESES = "|".join(MESES_ESPANOL)
+PATRON_DIA_MES = re.compile(rf"\b(\d{{1,2}})[°º]?(?:\s+de)?\s+({_MESES})\b")
+PATRON_NUMERICO = re.compile(r"\b(\d{1,2})/(\d{1,2})\b")
+PATRON_ISO = re.compile(r"\b\d{4}-(\d{1,2})-(\d{1,2})\b")
+
+MOTIVO_VACIA = "vacia"
+MOTIVO_SIN_FECHA = "sin_fecha"
+
+
+class RespuestaIncompletaError(ValueError):
+    """El modelo cortó la respuesta (límite de tokens, seguridad o recitación)"""
+    
+    def __init__(self, finish_reason: str):
+        super().__init__(f"Respuesta incompleta del modelo: {finish_reason}")
+        self.finish_reason = finish_reason
+
+
+def fechas_mencionadas(texto: str) -> Set[Tuple[int, int]]:
+    """
+    Extrae las fechas (día, mes) que menciona un texto.
+    
+    Args:
+        texto: Respuesta del modelo
+    
+    Returns:
+        Conjunto de tuplas (día, mes)
+    """
+    texto = texto.lower()
+    fechas = {(int(dia), MESES_ESPANOL[mes]) for dia, mes in PATRON_DIA_MES.findall(texto)}
+    fechas |= {(int(dia), int(mes)) for dia, mes in PATRON_NUMERICO.findall(texto)}
+    fechas |= {(int(dia), int(mes)) for mes, dia in PATRON_ISO.findall(texto)}
+    return fechas
+
+
+class PoliticaCascada:
+    """
+    Decide qué preguntas prueban primero el modelo rápido y valida sus
+    respuestas.
+    
+    - Simple: sin conversación previa, corta, con un filtro concreto
+      (tipo de evento, mes o período) y sin pedidos de razonamiento
+    - Válida: no vacía y menciona al menos una fecha de los eventos
+      del contexto (si no, el modelo rápido no encontró la respuesta)
+    """
+    
+    def __init__(
+        self,
+        habilitada: Optional[bool] = None,
+        max_palabras: int = MAX_PALABRAS_SIMPLE,
+        telemetria: Optional[TelemetriaLLM] = None
+    ):
+        """
+        Inicializa la política.
+        
+        Args:
+            habilitada: Usar la cascada (default: settings.llm_cascada)
+            max_palabras: Palabras máximas de una pregunta simple
+            telemetria: Telemetría con el costo del modelo rápido (default: global)
+        """
+        self.logger = setup_logger("PoliticaCascada")
+        self.habilitada = habilitada if habilitada is not None else settings.llm_cascada
+        self.max_palabras = max_palabras
+        self.telemetria = telemetria or get_telemetria_llm()
+        
+        self._lock = threading.Lock()
+        self.aceptadas = 0
+        self.escaladas: Counter = Counter()
+    
+    def es_simple(self, pregunta: str, info: Dict[str, Any], seguimiento: bool = False) -> bool:
+        """
+        True si la pregunta es una búsqueda simple en el calendario.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            info: Consulta parseada (QueryParser)
+            seguimiento: Si es una repregunta (depende de la conversación)
+        
+        Returns:
+            True si conviene probar primero el modelo rápido
+        """
+        if not self.habilitada or seguimiento:
+            return False
+        
+        texto = normalizar_texto(pregunta)
+        if len(texto.split()) > self.max_palabras:
+            return False
+        
+        if any(palabra in f"{texto} " for palabra in PALABRAS_COMPLEJAS):
+            return False
+        
+        return bool(info.get("tipo_evento") or info.get("mes") or info.get("temporal"))
+    
+    def validar(self, respuesta: Optional[str], eventos: Optional[Iterable[Evento]]) -> Optional[str]:
+        """
+        Valida la respuesta del modelo rápido.
+        
+        Args:
+            respuesta: Texto generado
+            eventos: Eventos del contexto de la pregunta
+        
+        Returns:
+            None si es válida, o el motivo para escalar
+        """
+        if not respuesta or not respuesta.strip():
+            return MOTIVO_VACIA
+        
+        fechas_contexto = {(e.fecha.day, e.fecha.month) for e in eventos or []}
+        if fechas_contexto and not fechas_mencionadas(respuesta) & fechas_contexto:
+            return MOTIVO_SIN_FECHA
+        
+        return None
+    
+    def registrar_aceptada(self) -> None:
+        """Cuenta una respuesta del modelo rápido que se usó"""
+        with self._lock:
+            self.aceptadas += 1
+    
+    def registrar_escalada(self, motivo: str) -> None:
+        """Cuenta una pregunta que pasó al modelo completo"""
+        with self._lock:
+            self.escaladas[motivo] += 1
+        self.logger.info(f"⬆️ Respuesta del modelo rápido descartada ({motivo}), se escala al modelo completo")
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna el uso de la cascada.
+        
+        Returns:
+            Diccionario con respuestas aceptadas, escaladas por motivo,
+            tasa de aceptación y costo del modelo rápido (también el de
+            los intentos escalados)
+        """
+        costo_rapido = self.telemetria.costo_de(TARIFA_RAPIDO)
+        with self._lock:
+            escaladas = sum(self.escaladas.values())
+            total = self.aceptadas + escaladas
+            return {
+                "habilitada": self.habilitada,
+                "aceptadas": self.aceptadas,
+                "escaladas": escaladas,
+                "motivos": dict(self.escaladas),
+                "tasa_aceptacion": round(self.aceptadas / total, 3) if total else 0.0,
+                "costo_modelo_rapido_usd": {
+                    "total": round(costo_rapido, 6),
+                    "por_aceptada": round(costo_rapido / self.aceptadas, 6) if self.aceptadas else 0.0
+                }
+            }
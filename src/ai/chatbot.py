@@ -5,14 +5,100 @@ Usa Gemini para responder preguntas sobre eventos
 Incluye soporte MCP (Model Context Protocol)
 """
 
-from typing import List, Optional
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional
 from datetime import datetime, timedelta
-from src.ai.llm_client import get_llm_client
+from src.ai.answer_cache import AnswerCache, ClaveRespuesta
+from src.ai.cascada import PoliticaCascada
+from src.ai.llm_backends import PrefijoPrompt
+from src.ai.llm_client import LLMClient, get_llm_client
+from src.ai.context_builder import ContextBuilder
+from src.ai.conversation_store import CAMPOS_FILTRO, ConversationStore, combinar_filtros, es_seguimiento
+from src.ai.herramientas import EjecutorHerramientas, declaraciones_gemini
+from src.ai.intent_router import IntentRouter
+from src.ai.resiliencia import CircuitoAbiertoError, es_reintentable
+from src.ai.scheduler import MENSAJE_SATURADO, LLMSaturadoError, PrioridadLLM, estimar_tokens
+from src.config.constants import CANAL_WHATSAPP
+from src.config.settings import settings
 from src.models.evento import Evento
 from src.services.calendario_service import CalendarioService
+from src.services.container import get_container
+from src.services.evento_filter import EventoFilter
+from src.services.evento_repository import CalendarSnapshot, EventoRepository, get_evento_repository
+from src.utils.event_loop import get_background_loop
 from src.utils.logger import setup_logger
 from src.utils.validators import sanitizar_texto, validar_fecha
 
+MENSAJE_SIN_CALENDARIO = (
+    "❌ Lo siento, no pude obtener información del calendario en este momento. "
+    "Por favor, consulta https://www.unvime.edu.ar/calendario/"
+)
+
+MENSAJE_ERROR = (
+    "❌ Lo siento, tuve un problema al procesar tu pregunta. "
+    "Por favor, intenta de nuevo o consulta el calendario en "
+    "https://www.unvime.edu.ar/calendario/"
+)
+
+MENSAJE_DEGRADADO = (
+    "⚠️ El asistente está respondiendo con demoras. Mientras tanto, estos son "
+    "los eventos del calendario relacionados con tu pregunta:"
+)
+
+# Markdown de Gemini que WhatsApp no muestra: **negrita** y títulos
+PATRON_NEGRITA = re.compile(r"\*\*(.+?)\*\*")
+PATRON_TITULO = re.compile(r"^#{1,6}\s+(.+)$", re.MULTILINE)
+
+
+def formatear_para_canal(texto: str, canal: Optional[str]) -> str:
+    """
+    Adapta el markdown de una respuesta al canal.
+    
+    Args:
+        texto: Respuesta del chatbot
+        canal: Canal de destino (None o Discord: sin cambios)
+    
+    Returns:
+        Respuesta con el formato del canal (WhatsApp usa *negrita*)
+    """
+    if canal != CANAL_WHATSAPP:
+        return texto
+    
+    texto = PATRON_NEGRITA.sub(r"*\1*", texto)
+    return PATRON_TITULO.sub(r"*\1*", texto)
+
+
+@dataclass
+class ConsultaPreparada:
+    """
+    Resultado de preparar una pregunta.
+    
+    Attributes:
+        respuesta_directa: Respuesta sin LLM (router, caché o sin eventos)
+        prompt: Prompt con los eventos del calendario
+        clave_cache: Clave para guardar la respuesta en la caché
+        ejecutor: Ejecutor de herramientas MCP (function calling)
+        prompt_herramientas: Prompt sin eventos para usar con las herramientas
+        prefijo: Instrucciones y calendario cacheados en el proveedor (el
+            prompt lleva sólo fecha, conversación y pregunta)
+        prompt_rapido: Prompt con eventos para el modelo rápido (pregunta
+            simple); None = directo al modelo principal
+        filtros: Filtros resueltos para la pregunta (memoria de conversación)
+        eventos: Eventos usados como contexto
+        version: Versión del snapshot consultado
+    """
+    respuesta_directa: Optional[str] = None
+    prompt: Optional[str] = None
+    clave_cache: Optional[ClaveRespuesta] = None
+    ejecutor: Optional[EjecutorHerramientas] = None
+    prompt_herramientas: Optional[str] = None
+    prefijo: Optional[PrefijoPrompt] = None
+    prompt_rapido: Optional[str] = None
+    filtros: Optional[Dict[str, Any]] = None
+    eventos: Optional[List[Evento]] = None
+    version: Optional[str] = None
+
 
 class CalendarioChatbot:
     """
@@ -21,10 +107,47 @@ class CalendarioChatbot:
     Incluye integración con MCP Server para herramientas avanzadas.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        llm: Optional[LLMClient] = None,
+        calendario_service: Optional[CalendarioService] = None,
+        repository: Optional[EventoRepository] = None
+    ):
+        """
+        Inicializa el chatbot.
+        
+        Args:
+            llm: Cliente de Gemini (default: el compartido del proceso)
+            calendario_service: Servicio de calendario (default: el del contenedor)
+            repository: Repositorio de eventos (default: el global)
+        """
         self.logger = setup_logger("CalendarioChatbot")
-        self.llm = get_llm_client()
-        self.calendario_service = CalendarioService()
+        self.llm = llm or get_llm_client()
+        self.calendario_service = calendario_service or get_container().calendario_service
+        self.repository = repository or get_evento_repository()
+        
+        # Respuestas reutilizables para preguntas equivalentes del mismo día
+        self.answer_cache = AnswerCache(
+            max_entradas=settings.answer_cache_size if settings.enable_cache else 0,
+            umbral_similitud=settings.answer_cache_similitud
+        )
+        
+        # Preguntas frecuentes resueltas sin LLM
+        self.intent_router = IntentRouter()
+        
+        # Preguntas simples: primero el modelo rápido, se escala si la respuesta no convence
+        self.cascada = PoliticaCascada(telemetria=self.llm.telemetria)
+        
+        # Eventos del prompt dentro del presupuesto de tokens
+        self.context_builder = ContextBuilder()
+        self.evento_filter = EventoFilter()
+        
+        # Últimos turnos y filtros de cada usuario (repreguntas)
+        self.conversaciones = ConversationStore(
+            max_conversaciones=settings.conversacion_max_usuarios,
+            max_turnos=settings.conversacion_max_turnos,
+            ttl_segundos=settings.conversacion_ttl
+        )
         
         # Integrar MCP Server
         try:
@@ -35,6 +158,11 @@ class CalendarioChatbot:
             self.mcp_server = None
             self.logger.warning("⚠️ MCP Server no disponible (módulo no encontrado)")
         
+        # Herramientas de lectura que Gemini puede pedir (function calling)
+        self.declaraciones_herramientas = []
+        if self.mcp_server is not None and settings.llm_function_calling and self.llm.soporta_herramientas:
+            self.declaraciones_herramientas = declaraciones_gemini(self.mcp_server.list_tools())
+        
         # Contexto base del asistente
         self.system_context = """
 Eres un asistente académico amigable de la Universidad Nacional de Villa Mercedes (UNViMe).
@@ -56,6 +184,9 @@ Categorías de eventos:
 - 🏖️ RECESO: vacaciones, recesos
 - 📌 OTRO: fechas importantes varias
 """
+        
+        # Prefijo cacheable del snapshot vigente (se rearma con cada versión)
+        self._prefijo: Optional[PrefijoPrompt] = None
     
     def obtener_eventos_semana(self) -> List[Evento]:
         """
@@ -67,8 +198,8 @@ Categorías de eventos:
         try:
             self.logger.debug("Obteniendo eventos de la próxima semana...")
             
-            # Obtener todos los eventos del scraper
-            todos_eventos = self.calendario_service.scraper.obtener_eventos()
+            # Obtener todos los eventos del snapshot vigente
+            todos_eventos = self.repository.obtener_snapshot().eventos
             
             # Filtrar solo la próxima semana
             eventos_proximos = self.calendario_service.filtrar_proxima_semana(todos_eventos)
@@ -85,9 +216,9 @@ Categorías de eventos:
         Obtiene todos los eventos del calendario.
         """
         try:
-            # Obtener eventos del scraper directamente
+            # Obtener eventos del snapshot vigente (compartido con las tools MCP)
             self.logger.debug("Obteniendo todos los eventos del calendario...")
-            eventos = self.calendario_service.scraper.obtener_eventos()
+            eventos = self.repository.obtener_snapshot().eventos
             
             self.logger.debug(f"Total eventos obtenidos: {len(eventos)}")
             return eventos
@@ -96,56 +227,77 @@ Categorías de eventos:
             self.logger.error(f"Error obteniendo eventos: {e}", exc_info=True)
             return []
     
-    async def responder(self, pregunta: str, contexto_eventos: Optional[List[Evento]] = None) -> str:
+    async def _obtener_todos_eventos_async(self) -> List[Evento]:
         """
-        Responde una pregunta del usuario sobre el calendario.
+        Obtiene todos los eventos sin bloquear el event loop.
+        """
+        try:
+            self.logger.debug("Obteniendo todos los eventos del calendario (async)...")
+            snapshot = await self.repository.obtener_snapshot_async()
+            eventos = snapshot.eventos
+            
+            self.logger.debug(f"Total eventos obtenidos: {len(eventos)}")
+            return eventos
+            
+        except Exception as e:
+            self.logger.error(f"Error obteniendo eventos: {e}", exc_info=True)
+            return []
+    
+    def _prefijo_calendario(self, snapshot: CalendarSnapshot) -> PrefijoPrompt:
+        """
+        Instrucciones del asistente más el calendario completo del snapshot.
+        
+        Es igual para todas las preguntas de una misma versión, así el
+        proveedor lo cachea una vez por snapshot.
+        """
+        prefijo = self._prefijo
+        if prefijo is not None and prefijo.clave == snapshot.version:
+            return prefijo
+        
+        prefijo = PrefijoPrompt(
+            clave=snapshot.version,
+            texto=(
+                f"{self.system_context}\n"
+                f"CALENDARIO ACADÉMICO COMPLETO:\n"
+                f"{self.context_builder.listar_todos(snapshot.eventos)}\n"
+            )
+        )
+        self._prefijo = prefijo
+        return prefijo
+    
+    def _prompt_con_eventos(
+        self,
+        pregunta: str,
+        eventos: List[Evento],
+        seccion_historial: str = "",
+        info: Optional[dict] = None
+    ) -> str:
+        """
+        Prompt completo con los eventos más relevantes dentro del presupuesto.
         
         Args:
             pregunta: Pregunta del usuario
-            contexto_eventos: Lista de eventos relevantes (opcional)
-            
+            eventos: Eventos filtrados para la pregunta
+            seccion_historial: Conversación reciente ya formateada
+            info: Consulta parseada con los filtros de la conversación (repreguntas)
+        
         Returns:
-            Respuesta del chatbot
+            Prompt con instrucciones, fecha, eventos y pregunta
         """
-        try:
-            # Si no se proporcionaron eventos, obtener y filtrar inteligentemente
-            if contexto_eventos is None:
-                self.logger.debug("Obteniendo y filtrando eventos para el contexto...")
-                
-                # Obtener todos los eventos
-                todos_eventos = self._obtener_todos_eventos()
-                
-                # USAR FILTRO INTELIGENTE
-                from src.services.evento_filter import EventoFilter
-                filtro = EventoFilter()
-                contexto_eventos = filtro.filtrar(pregunta, todos_eventos)
-                
-                self.logger.info(f"Eventos en contexto (filtrados inteligentemente): {len(contexto_eventos)}")
-            
-            if not contexto_eventos:
-                return (
-                    "❌ Lo siento, no pude obtener información del calendario en este momento. "
-                    "Por favor, consulta https://www.unvime.edu.ar/calendario/"
-                )
-            
-            # Construir contexto con eventos reales
-            eventos_texto = self._formatear_eventos_para_llm(contexto_eventos)
-            
-            # Obtener fecha actual
-            fecha_actual = datetime.now().strftime("%d de %B de %Y")
-            dia_semana = datetime.now().strftime("%A")
-            
-            # Construir prompt completo
-            prompt_completo = f"""
+        fecha_actual = datetime.now().strftime("%d de %B de %Y")
+        dia_semana = datetime.now().strftime("%A")
+        
+        # Construir prompt completo (los eventos van en el lugar de {eventos})
+        plantilla = f"""
 {self.system_context}
 
 FECHA Y HORA ACTUAL: {dia_semana}, {fecha_actual}
 
 EVENTOS DEL CALENDARIO ACADÉMICO:
-{eventos_texto}
+{{eventos}}
 
 ---
-
+{seccion_historial}
 PREGUNTA DEL ESTUDIANTE:
 {pregunta}
 
@@ -157,86 +309,497 @@ INSTRUCCIONES:
 - Usa emojis apropiados
 - Siempre menciona las fechas de forma clara
 """
+        
+        # Contexto con eventos reales dentro del presupuesto de tokens
+        contexto = self.context_builder.construir(
+            pregunta,
+            eventos,
+            tokens_reservados=estimar_tokens(plantilla),
+            info=info
+        )
+        prompt = plantilla.replace("{eventos}", contexto.texto, 1)
+        
+        self.logger.debug(
+            f"Procesando pregunta: {pregunta[:50]}... "
+            f"(~{estimar_tokens(prompt)} tokens, {len(contexto.bloques)} bloques de eventos)"
+        )
+        
+        return prompt
+    
+    async def _preparar_consulta(
+        self,
+        pregunta: str,
+        contexto_eventos: Optional[List[Evento]] = None,
+        usuario: Optional[str] = None,
+        canal: Optional[str] = None
+    ) -> ConsultaPreparada:
+        """
+        Arma el prompt para una pregunta o resuelve la respuesta sin LLM.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            contexto_eventos: Lista de eventos relevantes (opcional)
+            usuario: ID del usuario para la memoria de conversación (opcional)
+            canal: Canal de la respuesta (separa las entradas de la caché)
+        
+        Returns:
+            ConsultaPreparada: si hay respuesta directa (router, caché o
+            sin eventos) no hay prompt
+        """
+        clave_cache = None
+        snapshot = None
+        historial = ""
+        
+        info = self.evento_filter.parser.parse(pregunta)
+        filtros = {campo: info[campo] for campo in CAMPOS_FILTRO}
+        
+        # Repregunta ("¿y en diciembre?"): completar con los filtros del turno anterior
+        conversacion = self.conversaciones.obtener(usuario)
+        seguimiento = conversacion is not None and es_seguimiento(pregunta)
+        filtros_nuevos = True
+        
+        if seguimiento:
+            filtros, filtros_nuevos = combinar_filtros(conversacion.filtros, info)
+            info = {**info, **filtros}
+            historial = conversacion.historial()
+            self.logger.debug(f"Repregunta de {usuario}, filtros combinados: {filtros}")
+        
+        # Si no se proporcionaron eventos, obtener y filtrar inteligentemente
+        if contexto_eventos is None:
+            self.logger.debug("Obteniendo y filtrando eventos para el contexto...")
+            
+            # Obtener todos los eventos
+            try:
+                snapshot = await self.repository.obtener_snapshot_async()
+            except Exception as e:
+                self.logger.error(f"Error obteniendo eventos: {e}", exc_info=True)
+                snapshot = None
+            
+            todos_eventos = snapshot.eventos if snapshot is not None else []
+            version = snapshot.version if snapshot is not None else None
             
-            self.logger.debug(f"Procesando pregunta: {pregunta[:50]}...")
+            # Intenciones comunes (hoy, esta semana, próximo feriado...) sin llamar a Gemini
+            if todos_eventos:
+                rapida = self.intent_router.responder(pregunta, todos_eventos)
+                if rapida is not None:
+                    return ConsultaPreparada(respuesta_directa=rapida.texto, filtros=filtros, version=version)
+            
+            # Misma pregunta (o equivalente), mismo calendario y mismo día → misma respuesta.
+            # Las repreguntas dependen de la conversación: no se comparten entre usuarios
+            if snapshot is not None and self.answer_cache.habilitada and not seguimiento:
+                clave_cache = self.answer_cache.clave(pregunta, snapshot.version, canal=canal)
+                respuesta_cacheada = self.answer_cache.obtener(clave_cache)
+                
+                if respuesta_cacheada is not None:
+                    self.logger.info("💬 Respuesta servida desde caché")
+                    return ConsultaPreparada(respuesta_directa=respuesta_cacheada, filtros=filtros, version=version)
             
+            if seguimiento and not filtros_nuevos and conversacion.eventos and conversacion.version == version:
+                # Sin filtros nuevos: los mismos eventos del turno anterior
+                contexto_eventos = conversacion.eventos
+                self.logger.info(f"Eventos en contexto (reutilizados de la conversación): {len(contexto_eventos)}")
+            else:
+                # USAR FILTRO INTELIGENTE
+                busqueda = snapshot.busqueda if snapshot is not None else None
+                contexto_eventos = self.evento_filter.filtrar_por_info(info, todos_eventos, busqueda)
+                self.logger.info(f"Eventos en contexto (filtrados inteligentemente): {len(contexto_eventos)}")
+        
+        if not contexto_eventos:
+            return ConsultaPreparada(respuesta_directa=MENSAJE_SIN_CALENDARIO)
+        
+        # Obtener fecha actual
+        fecha_actual = datetime.now().strftime("%d de %B de %Y")
+        dia_semana = datetime.now().strftime("%A")
+        
+        seccion_historial = f"\nCONVERSACIÓN RECIENTE:\n{historial}\n" if historial else ""
+        
+        # Cascada: las preguntas simples prueban primero el modelo rápido con los eventos filtrados
+        prompt_rapido = None
+        if self.llm.soporta_cascada and self.cascada.es_simple(pregunta, info, seguimiento):
+            prompt_rapido = self._prompt_con_eventos(pregunta, contexto_eventos)
+        
+        # Con el calendario cacheado en el proveedor sólo se envía lo que cambia;
+        # no hacen falta rondas de herramientas porque el modelo ya tiene todo
+        if snapshot is not None and snapshot.eventos and settings.llm_cache_contexto:
+            prefijo = self._prefijo_calendario(snapshot)
+            
+            if await self.llm.preparar_prefijo(prefijo):
+                prompt = f"""
+FECHA Y HORA ACTUAL: {dia_semana}, {fecha_actual}
+{seccion_historial}
+PREGUNTA DEL ESTUDIANTE:
+{pregunta}
+
+INSTRUCCIONES:
+- Usa SOLO la información del calendario académico
+- La fecha actual es {fecha_actual}, úsala para interpretar "esta semana", "hoy", "mañana", etc.
+- Si la pregunta no se puede responder con el calendario, dilo amablemente
+- Sé conciso (máximo 200 palabras)
+- Usa emojis apropiados
+- Siempre menciona las fechas de forma clara
+"""
+                self.logger.debug(
+                    f"Procesando pregunta: {pregunta[:50]}... "
+                    f"(~{estimar_tokens(prompt)} tokens + contexto cacheado {prefijo.clave})"
+                )
+                
+                return ConsultaPreparada(
+                    prompt=prompt,
+                    prefijo=prefijo,
+                    prompt_rapido=prompt_rapido,
+                    clave_cache=clave_cache,
+                    filtros=filtros,
+                    eventos=contexto_eventos,
+                    version=snapshot.version
+                )
+        
+        prompt_completo = prompt_rapido or self._prompt_con_eventos(
+            pregunta, contexto_eventos, seccion_historial, info=info if seguimiento else None
+        )
+        
+        consulta = ConsultaPreparada(
+            prompt=prompt_completo,
+            prompt_rapido=prompt_rapido,
+            clave_cache=clave_cache,
+            filtros=filtros,
+            eventos=contexto_eventos,
+            version=snapshot.version if snapshot is not None else None
+        )
+        
+        # Con function calling Gemini consulta el calendario con las herramientas MCP;
+        # el prompt con eventos queda como respaldo si esa vía falla
+        if snapshot is not None and self.declaraciones_herramientas:
+            consulta.ejecutor = EjecutorHerramientas(self.mcp_server, snapshot)
+            consulta.prompt_herramientas = f"""
+{self.system_context}
+
+FECHA Y HORA ACTUAL: {dia_semana}, {fecha_actual} ({datetime.now().strftime('%Y-%m-%d')})
+{seccion_historial}
+PREGUNTA DEL ESTUDIANTE:
+{pregunta}
+
+INSTRUCCIONES:
+- Consulta el calendario con las herramientas disponibles antes de responder
+- Usa SOLO la información que devuelven las herramientas
+- Las fechas de las herramientas van en formato YYYY-MM-DD
+- Si la pregunta no se puede responder con el calendario, dilo amablemente
+- Sé conciso (máximo 200 palabras)
+- Usa emojis apropiados
+- Siempre menciona las fechas de forma clara
+"""
+        
+        return consulta
+    
+    def _recordar(self, usuario: Optional[str], pregunta: str, respuesta: str, consulta: ConsultaPreparada) -> None:
+        """Guarda el turno en la memoria de conversación (sólo respuestas válidas)"""
+        if consulta.filtros is None:
+            return
+        
+        self.conversaciones.registrar(
+            usuario,
+            pregunta,
+            respuesta,
+            consulta.filtros,
+            eventos=consulta.eventos,
+            version=consulta.version
+        )
+    
+    @staticmethod
+    def _llm_no_disponible(error: Exception) -> bool:
+        """True si el error indica que Gemini está caído o lento (no un error nuestro)"""
+        return isinstance(error, CircuitoAbiertoError) or es_reintentable(error)
+    
+    def _respuesta_degradada(self, pregunta: str, consulta: ConsultaPreparada) -> str:
+        """
+        Respuesta sin LLM con los eventos ya filtrados para la pregunta.
+        
+        Se usa con el circuito abierto o agotados los reintentos: primero
+        las plantillas del router sin umbral de confianza, si no una lista
+        de los eventos relacionados. No se guarda en la caché.
+        """
+        rapida = self.intent_router.responder(pregunta, consulta.eventos, umbral=0.0)
+        if rapida is not None:
+            return rapida.texto
+        
+        return (
+            f"{MENSAJE_DEGRADADO}\n\n{self.intent_router.listar(consulta.eventos)}\n\n"
+            "📅 Calendario completo: https://www.unvime.edu.ar/calendario/"
+        )
+    
+    async def _generar_rapido(self, consulta: ConsultaPreparada, prioridad: int) -> Optional[str]:
+        """
+        Primer escalón de la cascada: el modelo rápido con los eventos filtrados.
+        
+        Cualquier error del modelo rápido escala, también los transitorios
+        (cuota, timeout, circuito propio abierto): el modelo principal
+        tiene otra cuota y otro circuito. Sólo la cola del planificador,
+        compartida por ambos, corta la cascada.
+        
+        Args:
+            consulta: Consulta con prompt_rapido
+            prioridad: PrioridadLLM de la llamada a Gemini
+        
+        Returns:
+            Respuesta validada, o None para pasar al modelo principal
+        """
+        try:
+            respuesta = await self.llm.chat(mensaje=consulta.prompt_rapido, prioridad=prioridad, rapido=True)
+        except LLMSaturadoError:
+            raise
+        except Exception as e:
+            self.cascada.registrar_escalada(getattr(e, "finish_reason", None) or type(e).__name__)
+            return None
+        
+        motivo = self.cascada.validar(respuesta, consulta.eventos)
+        if motivo is not None:
+            self.cascada.registrar_escalada(motivo)
+            return None
+        
+        self.cascada.registrar_aceptada()
+        return respuesta
+    
+    async def _generar(self, consulta: ConsultaPreparada, prioridad: int) -> str:
+        """
+        Genera la respuesta con el LLM (modelo rápido si la pregunta es
+        simple; si no, function calling y, si falla, el prompt con eventos).
+        
+        Args:
+            consulta: Consulta preparada con prompt
+            prioridad: PrioridadLLM de la llamada a Gemini
+        
+        Returns:
+            Respuesta del LLM
+        """
+        if consulta.prompt_rapido is not None:
+            respuesta = await self._generar_rapido(consulta, prioridad)
+            if respuesta is not None:
+                return respuesta
+        
+        respuesta = None
+        
+        if consulta.ejecutor is not None:
+            try:
+                respuesta = await self.llm.chat_con_herramientas(
+                    mensaje=consulta.prompt_herramientas,
+                    declaraciones=self.declaraciones_herramientas,
+                    ejecutar=consulta.ejecutor,
+                    prioridad=prioridad
+                )
+            except LLMSaturadoError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Function calling falló, se usa el prompt con eventos: {e}")
+        
+        if not respuesta:
             # Generar respuesta con LLM
             respuesta = await self.llm.chat(
-                mensaje=prompt_completo,
-                contexto=None  # El contexto ya está en el mensaje
+                mensaje=consulta.prompt,
+                contexto=None,  # El contexto ya está en el mensaje (o en el prefijo)
+                prioridad=prioridad,
+                prefijo=consulta.prefijo
             )
+        
+        return respuesta
+    
+    async def responder(
+        self,
+        pregunta: str,
+        contexto_eventos: Optional[List[Evento]] = None,
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        usuario: Optional[str] = None,
+        canal: Optional[str] = None
+    ) -> str:
+        """
+        Responde una pregunta del usuario sobre el calendario.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            contexto_eventos: Lista de eventos relevantes (opcional)
+            prioridad: PrioridadLLM de la llamada a Gemini
+            usuario: ID del usuario para recordar la conversación (opcional)
+            canal: Canal de la respuesta (CANAL_DISCORD, CANAL_WHATSAPP)
+            
+        Returns:
+            Respuesta del chatbot
+        """
+        consulta = None
+        
+        try:
+            consulta = await self._preparar_consulta(pregunta, contexto_eventos, usuario, canal)
+            
+            if consulta.respuesta_directa is not None:
+                self._recordar(usuario, pregunta, consulta.respuesta_directa, consulta)
+                return consulta.respuesta_directa
+            
+            respuesta = formatear_para_canal(await self._generar(consulta, prioridad), canal)
             
             self.logger.debug(f"Respuesta generada: {len(respuesta)} caracteres")
             
+            if consulta.clave_cache is not None:
+                self.answer_cache.guardar(consulta.clave_cache, respuesta)
+            
+            self._recordar(usuario, pregunta, respuesta, consulta)
+            
             return respuesta
             
+        except LLMSaturadoError:
+            return MENSAJE_SATURADO
+            
         except Exception as e:
+            if consulta is not None and consulta.eventos and self._llm_no_disponible(e):
+                self.logger.warning(f"⚠️ LLM no disponible, se responde sin LLM: {e!r}")
+                return self._respuesta_degradada(pregunta, consulta)
+            
             self.logger.error(f"Error generando respuesta: {e}", exc_info=True)
-            return (
-                "❌ Lo siento, tuve un problema al procesar tu pregunta. "
-                "Por favor, intenta de nuevo o consulta el calendario en "
-                "https://www.unvime.edu.ar/calendario/"
-            )
+            return MENSAJE_ERROR
     
-    def responder_sync(self, pregunta: str, contexto_eventos: Optional[List[Evento]] = None) -> str:
-        """Versión sincrónica de responder()"""
-        import asyncio
+    async def responder_stream(
+        self,
+        pregunta: str,
+        contexto_eventos: Optional[List[Evento]] = None,
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        usuario: Optional[str] = None,
+        canal: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Versión streaming de responder(): entrega la respuesta a medida que llega.
+        
+        Los errores se entregan como un fragmento final con el mensaje
+        correspondiente, igual que en responder(). Si Gemini no está
+        disponible antes del primer fragmento se responde sin LLM.
+        La respuesta del modelo rápido (cascada) llega en un solo fragmento.
+        Los fragmentos salen tal como los genera el LLM; el formato del
+        canal se aplica a la respuesta completa que se guarda en la caché.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            contexto_eventos: Lista de eventos relevantes (opcional)
+            prioridad: PrioridadLLM de la llamada a Gemini
+            usuario: ID del usuario para recordar la conversación (opcional)
+            canal: Canal de la respuesta (CANAL_DISCORD, CANAL_WHATSAPP)
+            
+        Yields:
+            Fragmentos de la respuesta
+        """
+        try:
+            consulta = await self._preparar_consulta(pregunta, contexto_eventos, usuario, canal)
+        except Exception as e:
+            self.logger.error(f"Error generando respuesta: {e}", exc_info=True)
+            yield MENSAJE_ERROR
+            return
+        
+        if consulta.respuesta_directa is not None:
+            self._recordar(usuario, pregunta, consulta.respuesta_directa, consulta)
+            yield consulta.respuesta_directa
+            return
+        
+        fragmentos = []
         
-        # Arreglar problema del event loop cerrado
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_closed():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-        
-        return loop.run_until_complete(self.responder(pregunta, contexto_eventos))
+            # El modelo rápido responde entero: se valida antes de mostrar nada
+            if consulta.prompt_rapido is not None:
+                rapida = await self._generar_rapido(consulta, prioridad)
+                if rapida is not None:
+                    fragmentos.append(rapida)
+                    yield rapida
+            
+            if consulta.ejecutor is not None and not fragmentos:
+                try:
+                    async for fragmento in self.llm.chat_con_herramientas_stream(
+                        mensaje=consulta.prompt_herramientas,
+                        declaraciones=self.declaraciones_herramientas,
+                        ejecutar=consulta.ejecutor,
+                        prioridad=prioridad
+                    ):
+                        fragmentos.append(fragmento)
+                        yield fragmento
+                except LLMSaturadoError:
+                    raise
+                except Exception as e:
+                    # Con parte de la respuesta ya enviada no se puede volver a empezar
+                    if fragmentos:
+                        raise
+                    self.logger.warning(f"Function calling falló, se usa el prompt con eventos: {e}")
+            
+            if not fragmentos:
+                async for fragmento in self.llm.chat_stream(
+                    mensaje=consulta.prompt,
+                    prioridad=prioridad,
+                    prefijo=consulta.prefijo
+                ):
+                    fragmentos.append(fragmento)
+                    yield fragmento
+                
+        except LLMSaturadoError:
+            yield MENSAJE_SATURADO
+            return
+            
+        except Exception as e:
+            if not fragmentos and consulta.eventos and self._llm_no_disponible(e):
+                self.logger.warning(f"⚠️ LLM no disponible, se responde sin LLM: {e!r}")
+                yield self._respuesta_degradada(pregunta, consulta)
+                return
+            
+            self.logger.error(f"Error generando respuesta: {e}", exc_info=True)
+            yield ("\n\n" if fragmentos else "") + MENSAJE_ERROR
+            return
+        
+        respuesta = formatear_para_canal("".join(fragmentos), canal)
+        self.logger.debug(f"Respuesta generada (stream): {len(respuesta)} caracteres")
+        
+        if consulta.clave_cache is not None and respuesta:
+            self.answer_cache.guardar(consulta.clave_cache, respuesta)
+        
+        if respuesta:
+            self._recordar(usuario, pregunta, respuesta, consulta)
+    
+    def responder_sync(
+        self,
+        pregunta: str,
+        contexto_eventos: Optional[List[Evento]] = None,
+        usuario: Optional[str] = None,
+        canal: Optional[str] = None
+    ) -> str:
+        """
+        Versión sincrónica de responder() (Flask, scripts).
+        
+        Corre en el event loop de fondo del proceso, así todos los
+        threads comparten el cliente de Gemini y el planificador.
+        """
+        return get_background_loop().ejecutar(
+            self.responder(pregunta, contexto_eventos, usuario=usuario, canal=canal)
+        )
     
-    def _formatear_eventos_para_llm(self, eventos: List[Evento]) -> str:
+    async def precalentar(self, pregunta: str, canal: Optional[str] = None) -> bool:
         """
-        Formatea eventos para el contexto del LLM.
+        Genera la respuesta de una pregunta frecuente y la deja en la caché.
+        
+        Usa prioridad de fondo (nunca le quita turno a un estudiante) y
+        no toca la memoria de conversación. Las preguntas que ya se
+        responden al instante (router o caché) no llaman al LLM.
         
         Args:
-            eventos: Lista de eventos
-            
+            pregunta: Pregunta frecuente
+            canal: Canal para el que se formatea la respuesta
+        
         Returns:
-            Texto formateado con los eventos
-        """
-        if not eventos:
-            return "No hay eventos disponibles."
-        
-        # Agrupar por mes
-        eventos_por_mes = {}
-        for evento in eventos:
-            mes_nombre = evento.fecha.strftime("%B %Y")
-            if mes_nombre not in eventos_por_mes:
-                eventos_por_mes[mes_nombre] = []
-            eventos_por_mes[mes_nombre].append(evento)
-        
-        # Construir texto
-        lineas = []
-        for mes, eventos_mes in eventos_por_mes.items():
-            lineas.append(f"\n{mes.upper()}:")
-            for evento in eventos_mes:
-                fecha_legible = evento.fecha.strftime("%d/%m/%Y (%A)")
-                categoria_emoji = self._get_emoji_categoria(evento.categoria)
-                lineas.append(f"  {categoria_emoji} {fecha_legible} - {evento.titulo}")
-        
-        return "\n".join(lineas)
-    
-    def _get_emoji_categoria(self, categoria: str) -> str:
-        """Retorna emoji según categoría"""
-        emojis = {
-            "academico": "🎓",
-            "examen": "📝",
-            "feriado": "🎉",
-            "institucional": "🏛️",
-            "receso": "🏖️",
-            "otro": "📌"
-        }
-        return emojis.get(categoria.lower(), "📅")
+            True si se generó y guardó una respuesta nueva
+        
+        Raises:
+            LLMSaturadoError: Si la cola del LLM está llena
+            CircuitoAbiertoError: Si el circuito del LLM está abierto
+        """
+        consulta = await self._preparar_consulta(pregunta, canal=canal)
+        
+        if consulta.respuesta_directa is not None or consulta.clave_cache is None:
+            return False
+        
+        respuesta = formatear_para_canal(await self._generar(consulta, PrioridadLLM.FONDO), canal)
+        if not respuesta:
+            return False
+        
+        self.answer_cache.guardar(consulta.clave_cache, respuesta)
+        return True
     
     async def buscar_eventos(self, query: str, dias_adelante: int = 90) -> List[Evento]:
         """
@@ -251,7 +814,7 @@ INSTRUCCIONES:
         """
         try:
             # Obtener todos los eventos
-            todos_eventos = self._obtener_todos_eventos()
+            todos_eventos = await self._obtener_todos_eventos_async()
             
             if not todos_eventos:
                 return []
@@ -320,16 +883,8 @@ INSTRUCCIONES:
             return {"error": "MCP Server no disponible"}
         
         try:
-            response = await self.mcp_server.call_tool(nombre, argumentos)
-            
-            if response.isError:
-                self.logger.error(f"Error en herramienta MCP: {response.content}")
-                return {"error": response.content[0]["text"]}
-            
-            # Parsear respuesta JSON
-            import json
-            result_text = response.content[0]["text"]
-            return json.loads(result_text)
+            # Llamada en proceso: el resultado llega sin pasar por JSON
+            return await self.mcp_server.invocar_herramienta(nombre, argumentos)
             
         except Exception as e:
             self.logger.error(f"Error ejecutando herramienta MCP: {e}", exc_info=True)
@@ -360,5 +915,6 @@ INSTRUCCIONES:
         return {
             "disponible": True,
             "servidor": self.mcp_server.to_dict(),
-            "herramientas": len(self.listar_herramientas_mcp())
+            "herramientas": len(self.listar_herramientas_mcp()),
+            "salud": self.mcp_server.health()
         }
\ No newline at end of file
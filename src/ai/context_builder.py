@@ -0,0 +1,256 @@
+# src/ai/context_builder.py
+"""
+🧱 Constructor de contexto para prompts del LLM
+Arma la lista de eventos dentro de un presupuesto de tokens
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from src.ai.scheduler import estimar_tokens
+from src.config.constants import DIAS_SEMANA_ESPANOL, EMOJIS_CATEGORIAS, MESES_ESPANOL
+from src.config.settings import settings
+from src.models.evento import Evento
+from src.utils.logger import setup_logger
+from src.utils.query_parser import QueryParser
+from src.utils.validators import normalizar_texto
+
+NOMBRES_MESES = {numero: nombre for nombre, numero in MESES_ESPANOL.items()}
+
+SIN_EVENTOS = "No hay eventos disponibles."
+
+
+@dataclass
+class BloqueEventos:
+    """
+    Días consecutivos de un mismo evento (p. ej. un receso de dos semanas).
+    
+    Attributes:
+        titulo: Título del evento
+        categoria: Categoría del evento
+        inicio: Primer día
+        fin: Último día
+        puntaje: Relevancia para la consulta
+    """
+    titulo: str
+    categoria: str
+    inicio: date
+    fin: date
+    puntaje: float = 0.0
+    
+    @property
+    def dias(self) -> int:
+        """Cantidad de días que abarca"""
+        return (self.fin - self.inicio).days + 1
+    
+    def linea(self) -> str:
+        """Línea del bloque para el prompt"""
+        emoji = EMOJIS_CATEGORIAS.get(self.categoria, "📅")
+        
+        if self.inicio == self.fin:
+            dia_ingles = self.inicio.strftime("%A")
+            dia = DIAS_SEMANA_ESPANOL.get(dia_ingles, dia_ingles)
+            return f"  {emoji} {self.inicio.strftime('%d/%m/%Y')} ({dia}) - {self.titulo}"
+        
+        return f"  {emoji} {self.inicio.strftime('%d/%m/%Y')} al {self.fin.strftime('%d/%m/%Y')} - {self.titulo}"
+
+
+@dataclass
+class ContextoLLM:
+    """
+    Resultado del constructor de contexto.
+    
+    Attributes:
+        texto: Eventos formateados para el prompt
+        tokens_estimados: Tokens aproximados del texto
+        bloques: Bloques incluidos (orden cronológico)
+        eventos_recibidos: Eventos de entrada
+        bloques_descartados: Bloques que no entraron en el presupuesto o no aportaban
+    """
+    texto: str
+    tokens_estimados: int
+    bloques: List[BloqueEventos] = field(default_factory=list)
+    eventos_recibidos: int = 0
+    bloques_descartados: int = 0
+
+
+def agrupar_rangos(eventos: List[Evento]) -> List[BloqueEventos]:
+    """
+    Colapsa días consecutivos con el mismo título y categoría en un solo bloque.
+    
+    Args:
+        eventos: Eventos (un evento por día, como los expande el scraper)
+    
+    Returns:
+        Bloques en orden cronológico
+    """
+    abiertos: Dict[tuple, BloqueEventos] = {}
+    bloques: List[BloqueEventos] = []
+    
+    for evento in sorted(eventos, key=lambda e: e.fecha):
+        clave = (normalizar_texto(evento.titulo), evento.categoria)
+        dia = evento.fecha.date()
+        bloque = abiertos.get(clave)
+        
+        if bloque is not None and bloque.inicio <= dia <= bloque.fin + timedelta(days=1):
+            bloque.fin = max(bloque.fin, dia)
+            continue
+        
+        bloque = BloqueEventos(titulo=evento.titulo, categoria=evento.categoria, inicio=dia, fin=dia)
+        abiertos[clave] = bloque
+        bloques.append(bloque)
+    
+    return bloques
+
+
+class ContextBuilder:
+    """
+    Selecciona y formatea eventos para el prompt respetando un presupuesto.
+    
+    1. Colapsa días consecutivos del mismo evento en rangos
+    2. Puntúa cada bloque según la consulta parseada (tipo, mes,
+       palabras clave, cercanía) y descarta los pasados que no coinciden
+    3. Incluye los más relevantes mientras entren en el presupuesto
+    4. Formatea en orden cronológico agrupado por mes
+    """
+    
+    def __init__(self, presupuesto_tokens: Optional[int] = None):
+        """
+        Inicializa el constructor.
+        
+        Args:
+            presupuesto_tokens: Tokens máximos del prompt completo (default: settings)
+        """
+        self.logger = setup_logger("ContextBuilder")
+        self.parser = QueryParser()
+        self.presupuesto_tokens = (
+            presupuesto_tokens if presupuesto_tokens is not None else settings.llm_prompt_max_tokens
+        )
+    
+    def _puntuar(self, bloque: BloqueEventos, info: dict, hoy: date) -> float:
+        """Relevancia de un bloque para la consulta (negativo = sin valor)"""
+        puntaje = 0.0
+        coincide = False
+        
+        if info["tipo_evento"] and info["tipo_evento"] in bloque.categoria:
+            puntaje += 3
+            coincide = True
+        
+        if info["mes"]:
+            meses = {(bloque.inicio + timedelta(days=d)).month for d in range(0, bloque.dias, 28)}
+            if info["mes"] in meses | {bloque.fin.month}:
+                puntaje += 3
+                coincide = True
+        
+        palabras_titulo = set(normalizar_texto(bloque.titulo).split())
+        palabras_consulta = {normalizar_texto(k) for k in info["keywords"]}
+        comunes = len(palabras_titulo & palabras_consulta)
+        if comunes:
+            puntaje += 2 * comunes
+            coincide = True
+        
+        if bloque.fin < hoy:
+            # Lo pasado sólo aporta si la consulta lo menciona
+            return puntaje if coincide else -1.0
+        
+        # Próximos eventos primero (decae a lo largo de ~un mes)
+        dias_hasta = max(0, (bloque.inicio - hoy).days)
+        return puntaje + 1 / (1 + dias_hasta / 30)
+    
+    @staticmethod
+    def _formatear(bloques: List[BloqueEventos]) -> str:
+        """Formatea bloques agrupados por mes (orden cronológico)"""
+        if not bloques:
+            return SIN_EVENTOS
+        
+        lineas = []
+        mes_actual = None
+        
+        for bloque in sorted(bloques, key=lambda b: (b.inicio, b.titulo)):
+            mes = (bloque.inicio.year, bloque.inicio.month)
+            if mes != mes_actual:
+                lineas.append(f"\n{NOMBRES_MESES[mes[1]].upper()} {mes[0]}:")
+                mes_actual = mes
+            lineas.append(bloque.linea())
+        
+        return "\n".join(lineas)
+    
+    def construir(
+        self,
+        pregunta: str,
+        eventos: List[Evento],
+        tokens_reservados: int = 0,
+        hoy: Optional[date] = None,
+        info: Optional[dict] = None
+    ) -> ContextoLLM:
+        """
+        Arma el contexto de eventos para una pregunta.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            eventos: Eventos candidatos (ya filtrados por EventoFilter)
+            tokens_reservados: Tokens del resto del prompt (instrucciones, pregunta)
+            hoy: Fecha de referencia (default: hoy)
+            info: Consulta ya parseada (p. ej. con filtros de la conversación)
+        
+        Returns:
+            ContextoLLM con el texto y los tokens estimados
+        """
+        hoy = hoy or date.today()
+        info = info or self.parser.parse(pregunta)
+        disponibles = max(0, self.presupuesto_tokens - tokens_reservados)
+        
+        bloques = agrupar_rangos(eventos)
+        for bloque in bloques:
+            bloque.puntaje = self._puntuar(bloque, info, hoy)
+        
+        candidatos = [b for b in bloques if b.puntaje >= 0] or bloques
+        candidatos.sort(key=lambda b: (-b.puntaje, b.inicio))
+        
+        seleccionados: List[BloqueEventos] = []
+        meses_incluidos = set()
+        usados = 0
+        
+        for bloque in candidatos:
+            mes = (bloque.inicio.year, bloque.inicio.month)
+            costo = estimar_tokens(bloque.linea() + "\n")
+            if mes not in meses_incluidos:
+                costo += estimar_tokens(f"\n{NOMBRES_MESES[mes[1]].upper()} {mes[0]}:\n")
+            
+            if usados + costo > disponibles and seleccionados:
+                continue
+            
+            seleccionados.append(bloque)
+            meses_incluidos.add(mes)
+            usados += costo
+        
+        texto = self._formatear(seleccionados)
+        contexto = ContextoLLM(
+            texto=texto,
+            tokens_estimados=estimar_tokens(texto),
+            bloques=sorted(seleccionados, key=lambda b: b.inicio),
+            eventos_recibidos=len(eventos),
+            bloques_descartados=len(bloques) - len(seleccionados)
+        )
+        
+        self.logger.debug(
+            f"Contexto: {len(eventos)} eventos → {len(seleccionados)} bloques "
+            f"(~{contexto.tokens_estimados} tokens, {contexto.bloques_descartados} descartados)"
+        )
+        
+        return contexto
+    
+    def listar_todos(self, eventos: List[Evento]) -> str:
+        """
+        Formatea el calendario completo, sin presupuesto ni puntaje.
+        
+        Es la parte fija del prompt que se cachea en el proveedor: no
+        depende de la pregunta ni del día.
+        
+        Args:
+            eventos: Eventos del snapshot
+        
+        Returns:
+            Texto con todos los eventos agrupados por mes
+        """
+        return self._formatear(agrupar_rangos(eventos))
\ No newline at end of file
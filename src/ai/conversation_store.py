@@ -0,0 +1,261 @@
+# src/ai/conversation_store.py
+"""
+🧵 Memoria de conversación por usuario
+Guarda los últimos turnos y los filtros resueltos para entender repreguntas
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from src.models.evento import Evento
+from src.utils.logger import setup_logger
+from src.utils.validators import normalizar_texto
+
+# Campos de la consulta parseada que definen qué eventos se filtran
+CAMPOS_FILTRO = ("mes", "año", "tipo_evento", "temporal")
+
+# Largo máximo de cada pregunta/respuesta guardada (la memoria es un resumen)
+MAX_CARACTERES_TURNO = 280
+
+# "¿y en diciembre?", "¿también los feriados?", "¿y ese cuándo es?"
+PATRON_SEGUIMIENTO = re.compile(r"^(y|e|tambien|entonces|pero|y que tal|que tal)\b")
+PATRON_REFERENCIA = re.compile(r"\b(ese|esa|eso|esos|esas|mismo|misma|mismos|anterior)\b")
+
+
+def _recortar(texto: str) -> str:
+    """Recorta un texto al largo guardado por turno"""
+    texto = " ".join(texto.split())
+    if len(texto) <= MAX_CARACTERES_TURNO:
+        return texto
+    return texto[:MAX_CARACTERES_TURNO - 1] + "…"
+
+
+def es_seguimiento(pregunta: str) -> bool:
+    """
+    Detecta si una pregunta continúa la anterior.
+    
+    Args:
+        pregunta: Pregunta del usuario
+    
+    Returns:
+        True si empieza como repregunta ("¿y ...?") o se refiere a algo ya dicho
+    """
+    texto = normalizar_texto(pregunta)
+    return bool(PATRON_SEGUIMIENTO.match(texto) or PATRON_REFERENCIA.search(texto))
+
+
+def combinar_filtros(previos: Dict[str, Any], info: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """
+    Completa los filtros de una repregunta con los de la conversación.
+    
+    Args:
+        previos: Filtros resueltos en el turno anterior
+        info: Consulta parseada de la repregunta
+    
+    Returns:
+        (filtros combinados, True si la repregunta agregó algún filtro propio)
+    """
+    propios = {campo: info.get(campo) for campo in CAMPOS_FILTRO}
+    nuevos = any(propios.values())
+    
+    filtros = {campo: propios[campo] or previos.get(campo) for campo in CAMPOS_FILTRO}
+    
+    # Mes y referencia temporal son alternativos: el nuevo reemplaza al anterior
+    if propios["mes"] and not propios["temporal"]:
+        filtros["temporal"] = None
+    elif propios["temporal"] and not propios["mes"]:
+        filtros["mes"] = filtros["año"] = None
+    
+    return filtros, nuevos
+
+
+@dataclass
+class Turno:
+    """
+    Pregunta y respuesta resumidas.
+    
+    Attributes:
+        pregunta: Pregunta del usuario
+        respuesta: Respuesta enviada (recortada)
+    """
+    pregunta: str
+    respuesta: str
+
+
+@dataclass
+class Conversacion:
+    """
+    Estado de la conversación con un usuario.
+    
+    Attributes:
+        usuario: ID del usuario ("discord:<id>", "whatsapp:<número>")
+        turnos: Últimos turnos (el más viejo primero)
+        filtros: Filtros resueltos en el último turno
+        eventos: Eventos usados como contexto en el último turno
+        version: Versión del snapshot de esos eventos
+        ultimo_uso: time.monotonic() del último acceso
+    """
+    usuario: str
+    turnos: Deque[Turno]
+    filtros: Dict[str, Any] = field(default_factory=dict)
+    eventos: List[Evento] = field(default_factory=list)
+    version: Optional[str] = None
+    ultimo_uso: float = 0.0
+    
+    def historial(self) -> str:
+        """Turnos previos para el prompt"""
+        lineas = []
+        for turno in self.turnos:
+            lineas.append(f"- Estudiante: {turno.pregunta}")
+            lineas.append(f"- Asistente: {turno.respuesta}")
+        return "\n".join(lineas)
+
+
+class ConversationStore:
+    """
+    Conversaciones recientes por usuario, con memoria acotada.
+    
+    - Como máximo N conversaciones: al llenarse se descarta la usada
+      hace más tiempo (LRU)
+    - Cada conversación guarda pocos turnos y recortados
+    - Las conversaciones inactivas vencen (TTL)
+    """
+    
+    def __init__(self, max_conversaciones: int = 1000, max_turnos: int = 4, ttl_segundos: float = 1800):
+        """
+        Inicializa el almacén.
+        
+        Args:
+            max_conversaciones: Usuarios recordados a la vez (0 = deshabilitado)
+            max_turnos: Turnos guardados por usuario
+            ttl_segundos: Inactividad tras la cual se olvida la conversación
+        """
+        self.logger = setup_logger("ConversationStore")
+        self.max_conversaciones = max_conversaciones
+        self.max_turnos = max(1, max_turnos)
+        self.ttl_segundos = ttl_segundos
+        
+        self._conversaciones: "OrderedDict[str, Conversacion]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.descartadas = 0
+        self.vencidas = 0
+    
+    @property
+    def habilitado(self) -> bool:
+        """True si el almacén guarda conversaciones"""
+        return self.max_conversaciones > 0
+    
+    def _purgar_vencidas(self, ahora: float) -> None:
+        """Elimina las conversaciones inactivas (las más viejas están al principio)"""
+        while self._conversaciones:
+            usuario, conversacion = next(iter(self._conversaciones.items()))
+            if ahora - conversacion.ultimo_uso < self.ttl_segundos:
+                break
+            del self._conversaciones[usuario]
+            self.vencidas += 1
+    
+    def obtener(self, usuario: Optional[str]) -> Optional[Conversacion]:
+        """
+        Obtiene la conversación vigente de un usuario.
+        
+        Args:
+            usuario: ID del usuario (None = anónimo)
+        
+        Returns:
+            Conversacion o None si no hay una vigente
+        """
+        if not usuario or not self.habilitado:
+            return None
+        
+        ahora = time.monotonic()
+        
+        with self._lock:
+            self._purgar_vencidas(ahora)
+            conversacion = self._conversaciones.get(usuario)
+            
+            if conversacion is not None:
+                self._conversaciones.move_to_end(usuario)
+                conversacion.ultimo_uso = ahora
+            
+            return conversacion
+    
+    def registrar(
+        self,
+        usuario: Optional[str],
+        pregunta: str,
+        respuesta: str,
+        filtros: Dict[str, Any],
+        eventos: Optional[List[Evento]] = None,
+        version: Optional[str] = None
+    ) -> None:
+        """
+        Agrega un turno a la conversación de un usuario.
+        
+        Args:
+            usuario: ID del usuario (None = anónimo, no se guarda)
+            pregunta: Pregunta del usuario
+            respuesta: Respuesta enviada
+            filtros: Filtros resueltos para la pregunta
+            eventos: Eventos usados como contexto
+            version: Versión del snapshot de esos eventos
+        """
+        if not usuario or not self.habilitado:
+            return
+        
+        ahora = time.monotonic()
+        
+        with self._lock:
+            self._purgar_vencidas(ahora)
+            conversacion = self._conversaciones.get(usuario)
+            
+            if conversacion is None:
+                conversacion = Conversacion(usuario=usuario, turnos=deque(maxlen=self.max_turnos))
+                self._conversaciones[usuario] = conversacion
+                
+                while len(self._conversaciones) > self.max_conversaciones:
+                    self._conversaciones.popitem(last=False)
+                    self.descartadas += 1
+            else:
+                self._conversaciones.move_to_end(usuario)
+            
+            conversacion.turnos.append(Turno(pregunta=_recortar(pregunta), respuesta=_recortar(respuesta)))
+            conversacion.filtros = {campo: filtros.get(campo) for campo in CAMPOS_FILTRO}
+            conversacion.eventos = list(eventos or [])
+            conversacion.version = version
+            conversacion.ultimo_uso = ahora
+    
+    def olvidar(self, usuario: str) -> bool:
+        """
+        Borra la conversación de un usuario.
+        
+        Args:
+            usuario: ID del usuario
+        
+        Returns:
+            True si había una conversación
+        """
+        with self._lock:
+            return self._conversaciones.pop(usuario, None) is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._conversaciones)
+    
+    def estadisticas(self) -> Dict[str, int]:
+        """
+        Retorna el estado del almacén.
+        
+        Returns:
+            Diccionario con conversaciones activas, descartadas y vencidas
+        """
+        with self._lock:
+            return {
+                "conversaciones": len(self._conversaciones),
+                "max_conversaciones": self.max_conversaciones,
+                "descartadas": self.descartadas,
+                "vencidas": self.vencidas
+            }
\ No newline at end of file
@@ -0,0 +1,141 @@
+# src/ai/herramientas.py
+"""
+🛠️ Herramientas MCP para function calling de Gemini
+Traduce los schemas MCP y ejecuta las llamadas que pide el modelo
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from src.services.evento_repository import CalendarSnapshot
+from src.utils.logger import setup_logger
+
+# Sólo herramientas de lectura: el modelo no agrega eventos ni envía notificaciones
+HERRAMIENTAS_LLM = (
+    "buscar_eventos",
+    "get_proximos_examenes",
+    "get_eventos_semana",
+    "generar_link_calendar",
+)
+
+# Herramientas paginadas: el modelo recibe filas compactas y pocas por página
+HERRAMIENTAS_LISTADO = ("buscar_eventos", "get_proximos_examenes", "get_eventos_semana")
+LIMITE_RESULTADOS_LLM = 20
+
+# Campos de JSON Schema que entiende Gemini (el resto, como minimum o default, se descarta)
+CAMPOS_SCHEMA_GEMINI = ("type", "format", "description", "nullable", "enum", "items", "properties", "required")
+
+
+def esquema_para_gemini(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce un JSON Schema MCP a lo que acepta una FunctionDeclaration de Gemini.
+    
+    Args:
+        schema: Schema de entrada de la herramienta
+    
+    Returns:
+        Schema compatible con Gemini
+    """
+    resultado = {}
+    
+    for campo in CAMPOS_SCHEMA_GEMINI:
+        if campo not in schema:
+            continue
+        
+        valor = schema[campo]
+        if campo == "properties":
+            valor = {nombre: esquema_para_gemini(prop) for nombre, prop in valor.items()}
+        elif campo == "items":
+            valor = esquema_para_gemini(valor)
+        elif campo == "required" and not valor:
+            continue
+        
+        resultado[campo] = valor
+    
+    return resultado
+
+
+def declaraciones_gemini(
+    tools: List[Dict[str, Any]],
+    permitidas: Tuple[str, ...] = HERRAMIENTAS_LLM
+) -> List[Dict[str, Any]]:
+    """
+    Convierte la lista de herramientas MCP en declaraciones de funciones.
+    
+    Args:
+        tools: Herramientas de MCPServer.list_tools()
+        permitidas: Nombres de las herramientas a exponer
+    
+    Returns:
+        Lista de declaraciones (name, description, parameters)
+    """
+    return [
+        {
+            "name": tool["name"],
+            "description": tool["description"],
+            "parameters": esquema_para_gemini(tool["input_schema"])
+        }
+        for tool in tools
+        if tool["name"] in permitidas
+    ]
+
+
+class EjecutorHerramientas:
+    """
+    Ejecuta las llamadas del modelo contra el servidor MCP en proceso.
+    
+    Todas las llamadas de una consulta usan el mismo snapshot, así las
+    respuestas son consistentes entre sí. Los errores se devuelven al
+    modelo como resultado en vez de cortar la conversación.
+    """
+    
+    def __init__(self, mcp_server, snapshot: Optional[CalendarSnapshot] = None):
+        """
+        Inicializa el ejecutor.
+        
+        Args:
+            mcp_server: Instancia de MCPServer
+            snapshot: Snapshot compartido por todas las llamadas
+        """
+        self.logger = setup_logger("EjecutorHerramientas")
+        self.mcp_server = mcp_server
+        self.snapshot = snapshot
+        self.llamadas: List[Tuple[str, Dict[str, Any]]] = []
+    
+    async def __call__(self, nombre: str, argumentos: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Ejecuta una herramienta pedida por el modelo.
+        
+        Args:
+            nombre: Nombre de la herramienta
+            argumentos: Argumentos generados por el modelo
+        
+        Returns:
+            {"resultado": ...} o {"error": ...}
+        """
+        from src.mcp.server import serializar_resultado
+        
+        # Gemini entrega los números como float (limit=5.0)
+        argumentos = {
+            clave: int(valor) if isinstance(valor, float) and valor.is_integer() else valor
+            for clave, valor in (argumentos or {}).items()
+        }
+        self.llamadas.append((nombre, argumentos))
+        
+        if nombre not in HERRAMIENTAS_LLM:
+            return {"error": f"Herramienta no disponible: {nombre}"}
+        
+        if nombre in HERRAMIENTAS_LISTADO:
+            argumentos.setdefault("formato", "compacto")
+            limite = argumentos.get("limit") or LIMITE_RESULTADOS_LLM
+            argumentos["limit"] = min(int(limite), LIMITE_RESULTADOS_LLM)
+        
+        self.logger.debug(f"Gemini pidió {nombre}({argumentos})")
+        
+        try:
+            resultado = await self.mcp_server.invocar_herramienta(nombre, argumentos, snapshot=self.snapshot)
+        except Exception as e:
+            self.logger.warning(f"Herramienta {nombre} falló: {e}")
+            return {"error": str(e)}
+        
+        # Ida y vuelta por JSON: fechas y objetos quedan como tipos que acepta Gemini
+        return {"resultado": json.loads(serializar_resultado(resultado))}
\ No newline at end of file
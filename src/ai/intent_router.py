@@ -0,0 +1,337 @@
+# src/ai/intent_router.py
+"""
+🧭 Router de intenciones del chatbot
+Responde sin LLM las preguntas que se resuelven con el calendario estructurado
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from src.ai.context_builder import NOMBRES_MESES, BloqueEventos, agrupar_rangos
+from src.config.constants import DIAS_SEMANA_ESPANOL, EMOJIS_CATEGORIAS
+from src.config.settings import settings
+from src.models.evento import Evento
+from src.utils.logger import setup_logger
+from src.utils.query_parser import QueryParser
+from src.utils.validators import normalizar_texto
+
+# Intenciones con respuesta determinística
+INTENCION_HOY = "hoy"
+INTENCION_MANANA = "manana"
+INTENCION_SEMANA = "semana"
+INTENCION_PROXIMO = "proximo"
+INTENCION_INICIO = "inicio_cuatrimestre"
+
+# Preguntas que piden explicación o consejo: siempre van al LLM
+MARCADORES_ABIERTOS = re.compile(
+    r"\b(por que|porque|como|puedo|debo|deberia|explica\w*|diferencia|que pasa si|"
+    r"recomend\w*|conviene|requisit\w*|inscrib\w*|si falto)\b"
+)
+
+# Palabras que no cambian el sentido de una consulta de calendario
+PALABRAS_NEUTRAS = {
+    "evento", "eventos", "fecha", "fechas", "calendario", "academico", "importante",
+    "importantes", "tengo", "tenemos", "algun", "alguno", "alguna", "actividades",
+    "dias", "universidad", "unvime", "decime", "dime", "mostrame", "muestrame",
+    "cual", "cuales", "hola", "porfa", "favor", "sabes", "saber", "quiero", "pasa",
+}
+
+VOCABULARIO: Dict[str, Set[str]] = {
+    INTENCION_HOY: {"hoy"},
+    INTENCION_MANANA: {"manana"},
+    INTENCION_SEMANA: {"semana", "esta", "proxima", "siguiente", "viene"},
+    INTENCION_PROXIMO: {
+        "proximo", "proxima", "proximos", "proximas", "siguiente", "siguientes", "sigue", "viene", "falta", "faltan", "cuanto",
+        "feriado", "feriados", "examen", "examenes", "final", "finales", "mesa", "mesas",
+        "receso", "vacaciones", "evaluacion",
+    },
+    INTENCION_INICIO: {
+        "empieza", "empiezan", "inicia", "inician", "comienza", "comienzan", "arranca",
+        "arrancan", "inicio", "comienzo", "cuatrimestre", "clases", "primer", "primero",
+        "segundo", "semestre",
+    },
+}
+
+PATRON_PROXIMO = re.compile(r"\b(proxim[oa]s?|siguientes?)\b")
+PATRON_PROXIMOS = re.compile(r"\b(proxim[oa]s|siguientes)\b")
+PATRON_SEMANA = re.compile(r"\b(esta semana|proxima semana|semana que viene|siguiente semana)\b")
+PATRON_INICIO = re.compile(r"\b(empieza\w*|inicia\w*|comienza\w*|arranca\w*|inicio|comienzo)\b")
+PATRON_CURSADA = re.compile(r"\b(cuatrimestre|clases|semestre)\b")
+
+# Tipos con "próximo ..." que se resuelven con el índice
+TIPOS_PROXIMO = {"examen", "feriado", "receso", "institucional"}
+
+# Bloques de eventos en una lista sin LLM
+MAX_BLOQUES_LISTA = 10
+
+
+@dataclass
+class RespuestaRapida:
+    """
+    Respuesta resuelta sin LLM.
+    
+    Attributes:
+        intencion: Intención detectada
+        texto: Respuesta lista para enviar
+        confianza: Confianza de la clasificación (0-1)
+    """
+    intencion: str
+    texto: str
+    confianza: float
+
+
+def _fecha_legible(dia: date) -> str:
+    """Fecha en castellano: "lunes 20 de junio" """
+    nombre_dia = DIAS_SEMANA_ESPANOL.get(dia.strftime("%A"), dia.strftime("%A")).lower()
+    return f"{nombre_dia} {dia.day} de {NOMBRES_MESES[dia.month]}"
+
+
+def _rango_legible(bloque: BloqueEventos) -> str:
+    """Fecha o rango de un bloque en castellano"""
+    if bloque.inicio == bloque.fin:
+        return f"el {_fecha_legible(bloque.inicio)}"
+    return f"del {_fecha_legible(bloque.inicio)} al {_fecha_legible(bloque.fin)}"
+
+
+def _linea(bloque: BloqueEventos) -> str:
+    """Línea de lista para un bloque"""
+    emoji = EMOJIS_CATEGORIAS.get(bloque.categoria, "📅")
+    if bloque.inicio == bloque.fin:
+        return f"{emoji} {bloque.inicio.strftime('%d/%m')} - {bloque.titulo}"
+    return f"{emoji} {bloque.inicio.strftime('%d/%m')} al {bloque.fin.strftime('%d/%m')} - {bloque.titulo}"
+
+
+class IntentRouter:
+    """
+    Clasifica la pregunta y, si la confianza supera el umbral, responde
+    con una plantilla a partir de los eventos.
+    
+    Intenciones: hoy, mañana, esta/próxima semana, próximo
+    feriado/examen/receso, inicio de cuatrimestre o clases.
+    Las preguntas abiertas (por qué, cómo, requisitos...) siempre
+    se derivan al LLM.
+    """
+    
+    def __init__(self, umbral_confianza: Optional[float] = None):
+        """
+        Inicializa el router.
+        
+        Args:
+            umbral_confianza: Confianza mínima para responder sin LLM (default: settings)
+        """
+        self.logger = setup_logger("IntentRouter")
+        self.parser = QueryParser()
+        self.umbral_confianza = (
+            umbral_confianza if umbral_confianza is not None else settings.fast_path_umbral
+        )
+        
+        self.atendidas = 0
+        self.derivadas = 0
+    
+    def clasificar(self, pregunta: str) -> Tuple[Optional[str], float, Dict]:
+        """
+        Detecta la intención de una pregunta.
+        
+        Args:
+            pregunta: Pregunta del usuario
+        
+        Returns:
+            (intención o None, confianza, consulta parseada)
+        """
+        info = self.parser.parse(pregunta)
+        texto = normalizar_texto(pregunta)
+        
+        if MARCADORES_ABIERTOS.search(texto):
+            return None, 0.0, info
+        
+        palabras = set(texto.split())
+        
+        if PATRON_SEMANA.search(texto):
+            intencion = INTENCION_SEMANA
+        elif "hoy" in palabras:
+            intencion = INTENCION_HOY
+        elif "manana" in palabras:
+            intencion = INTENCION_MANANA
+        elif PATRON_PROXIMO.search(texto) and info["tipo_evento"] in TIPOS_PROXIMO:
+            intencion = INTENCION_PROXIMO
+        elif PATRON_INICIO.search(texto) and PATRON_CURSADA.search(texto):
+            intencion = INTENCION_INICIO
+        else:
+            return None, 0.0, info
+        
+        # Confianza: qué parte de las palabras clave explica la intención
+        keywords = {normalizar_texto(k) for k in info["keywords"]} - PALABRAS_NEUTRAS
+        if not keywords:
+            return intencion, 1.0, info
+        
+        explicadas = keywords & VOCABULARIO[intencion]
+        confianza = len(explicadas) / len(keywords)
+        
+        return intencion, round(confianza, 2), info
+    
+    def responder(
+        self,
+        pregunta: str,
+        eventos: List[Evento],
+        hoy: Optional[date] = None,
+        umbral: Optional[float] = None
+    ) -> Optional[RespuestaRapida]:
+        """
+        Intenta responder sin LLM.
+        
+        Args:
+            pregunta: Pregunta del usuario
+            eventos: Eventos del calendario
+            hoy: Fecha de referencia (default: hoy)
+            umbral: Confianza mínima para esta pregunta (default: la del router)
+        
+        Returns:
+            RespuestaRapida o None si la pregunta debe ir al LLM
+        """
+        intencion, confianza, info = self.clasificar(pregunta)
+        umbral = umbral if umbral is not None else self.umbral_confianza
+        
+        if intencion is None or confianza < umbral:
+            self.derivadas += 1
+            return None
+        
+        hoy = hoy or date.today()
+        texto_normalizado = normalizar_texto(pregunta)
+        
+        if intencion in (INTENCION_HOY, INTENCION_MANANA):
+            dia = hoy if intencion == INTENCION_HOY else hoy + timedelta(days=1)
+            texto = self._responder_dia(eventos, dia, intencion)
+        elif intencion == INTENCION_SEMANA:
+            proxima = "esta semana" not in texto_normalizado
+            texto = self._responder_semana(eventos, hoy, proxima)
+        elif intencion == INTENCION_PROXIMO:
+            plural = bool(PATRON_PROXIMOS.search(texto_normalizado))
+            texto = self._responder_proximo(eventos, hoy, info["tipo_evento"], plural)
+        else:
+            texto = self._responder_inicio(eventos, hoy, texto_normalizado)
+        
+        if texto is None:
+            self.derivadas += 1
+            return None
+        
+        self.atendidas += 1
+        self.logger.info(f"⚡ Respuesta directa ({intencion}, confianza {confianza:.2f})")
+        
+        return RespuestaRapida(intencion=intencion, texto=texto, confianza=confianza)
+    
+    def listar(self, eventos: List[Evento], hoy: Optional[date] = None, limite: int = MAX_BLOQUES_LISTA) -> str:
+        """
+        Lista de los próximos eventos, sin interpretar la pregunta.
+        
+        Args:
+            eventos: Eventos a listar (p. ej. los filtrados para la pregunta)
+            hoy: Fecha de referencia (default: hoy)
+            limite: Bloques máximos
+        
+        Returns:
+            Líneas con fecha y título (los bloques pasados sólo si no hay próximos)
+        """
+        hoy = hoy or date.today()
+        bloques = agrupar_rangos(eventos)
+        proximos = [b for b in bloques if b.fin >= hoy] or bloques
+        
+        return "\n".join(_linea(b) for b in proximos[:limite])
+    
+    def _responder_dia(self, eventos: List[Evento], dia: date, intencion: str) -> str:
+        """Eventos de hoy o de mañana"""
+        etiqueta = "Hoy" if intencion == INTENCION_HOY else "Mañana"
+        bloques = [
+            b for b in agrupar_rangos(eventos)
+            if b.inicio <= dia <= b.fin
+        ]
+        
+        if not bloques:
+            return f"📅 {etiqueta} ({_fecha_legible(dia)}) no hay eventos en el calendario académico."
+        
+        lineas = [_linea(b) for b in bloques]
+        return f"📅 {etiqueta} ({_fecha_legible(dia)}):\n\n" + "\n".join(lineas)
+    
+    def _responder_semana(self, eventos: List[Evento], hoy: date, proxima: bool) -> str:
+        """Eventos de esta semana o de la próxima (mismas ventanas que EventoFilter)"""
+        desde = hoy + timedelta(days=7) if proxima else hoy
+        hasta = desde + timedelta(days=7)
+        etiqueta = "la próxima semana" if proxima else "esta semana"
+        
+        bloques = [
+            b for b in agrupar_rangos(eventos)
+            if b.inicio <= hasta and b.fin >= desde
+        ]
+        
+        if not bloques:
+            return f"📅 No hay eventos en el calendario académico para {etiqueta}."
+        
+        lineas = [_linea(b) for b in bloques]
+        return f"📅 Eventos de {etiqueta}:\n\n" + "\n".join(lineas)
+    
+    def _responder_proximo(self, eventos: List[Evento], hoy: date, tipo: str, plural: bool = False) -> Optional[str]:
+        """Próximo evento de una categoría (con "próximos", todos los que vienen)"""
+        bloques = [
+            b for b in agrupar_rangos(eventos)
+            if tipo in b.categoria and b.fin >= hoy
+        ]
+        
+        if not bloques:
+            return None
+        
+        if plural:
+            lineas = [_linea(b) for b in bloques[:MAX_BLOQUES_LISTA]]
+            restantes = len(bloques) - len(lineas)
+            if restantes:
+                lineas.append(f"… y {restantes} más")
+            return f"📅 Próximas fechas ({tipo}):\n\n" + "\n".join(lineas)
+        
+        bloque = bloques[0]
+        emoji = EMOJIS_CATEGORIAS.get(bloque.categoria, "📅")
+        
+        if bloque.inicio <= hoy:
+            return f"{emoji} {bloque.titulo}: es hoy ({_rango_legible(bloque)})."
+        
+        faltan = (bloque.inicio - hoy).days
+        plural = "día" if faltan == 1 else "días"
+        return f"{emoji} Próximo {tipo}: {bloque.titulo}, {_rango_legible(bloque)} (faltan {faltan} {plural})."
+    
+    def _responder_inicio(self, eventos: List[Evento], hoy: date, texto: str) -> Optional[str]:
+        """Próximo inicio de cuatrimestre o de clases"""
+        ordinal = None
+        if re.search(r"\b(segundo|2do|2)\b", texto):
+            ordinal = "segundo"
+        elif re.search(r"\b(primer|primero|1er|1)\b", texto):
+            ordinal = "primer"
+        
+        candidatos = []
+        for bloque in agrupar_rangos(eventos):
+            titulo = normalizar_texto(bloque.titulo)
+            if not PATRON_INICIO.search(titulo) or not PATRON_CURSADA.search(titulo):
+                continue
+            if ordinal and ordinal not in titulo:
+                continue
+            candidatos.append(bloque)
+        
+        if not candidatos:
+            return None
+        
+        proximos = [b for b in candidatos if b.inicio >= hoy]
+        bloque = proximos[0] if proximos else candidatos[-1]
+        verbo = "es" if bloque.inicio >= hoy else "fue"
+        
+        return f"🎓 {bloque.titulo}: {verbo} {_rango_legible(bloque)}."
+    
+    def estadisticas(self) -> Dict[str, float]:
+        """
+        Retorna cuántas preguntas se respondieron sin LLM.
+        
+        Returns:
+            Diccionario con atendidas, derivadas y proporción atendida
+        """
+        total = self.atendidas + self.derivadas
+        return {
+            "atendidas": self.atendidas,
+            "derivadas": self.derivadas,
+            "proporcion_atendida": round(self.atendidas / total, 3) if total else 0.0
+        }
\ No newline at end of file
@@ -0,0 +1,738 @@
+# src/ai/llm_backends.py
+"""
+🔌 Backends del cliente LLM
+Gemini para producción, un modelo falso determinista y casetes de
+grabación/reproducción para correr el chatbot sin red (CI, benchmarks).
+El prefijo fijo de los prompts (instrucciones + calendario) se cachea del
+lado de Gemini cuando es posible.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from src.ai.scheduler import estimar_tokens
+from src.ai.telemetria import anotar_contexto_cacheado, anotar_respuesta
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+# Partes del prompt que cambian con el día y no deben cambiar la clave del casete
+PATRONES_VOLATILES = [
+    re.compile(r"^FECHA Y HORA ACTUAL:.*$", re.MULTILINE),
+    re.compile(r"La fecha actual es [^,\n]*"),
+]
+
+# Contextos cacheados en Gemini que se conservan (el vigente y el anterior,
+# para las consultas que todavía usan el snapshot previo)
+MAX_CONTEXTOS_CACHEADOS = 2
+
+# Segundos antes del vencimiento en que un contexto cacheado deja de usarse
+MARGEN_VENCIMIENTO = 60
+
+# Segundos antes de volver a intentar cachear un prefijo que falló
+ESPERA_REINTENTO_CACHE = 300
+
+
+class CassetteIncompletoError(LookupError):
+    """El casete no tiene grabada la respuesta para un prompt"""
+
+
+@dataclass(frozen=True)
+class PrefijoPrompt:
+    """
+    Parte fija del prompt compartida por muchas llamadas.
+    
+    Attributes:
+        clave: Identifica el contenido (la versión del snapshot)
+        texto: Instrucciones del asistente y calendario completo
+    """
+    clave: str
+    texto: str
+    
+    def unir(self, prompt: str) -> str:
+        """Prompt completo para los backends que no cachean el prefijo"""
+        return f"{self.texto}\n\n---\n\n{prompt}"
+
+
+@dataclass
+class ContextoCacheado:
+    """Prefijo cacheado en Gemini y el modelo que lo usa"""
+    cache: Any
+    modelo: Any
+    vence: float
+
+
+class LLMBackend(ABC):
+    """
+    Modelo que genera texto a partir de un prompt.
+    
+    LLMClient agrega encima el planificador, el armado del prompt y el
+    manejo de errores; el backend sólo produce la respuesta.
+    """
+    
+    nombre = "base"
+    
+    # Modelo de Gemini para function calling (None = no soportado)
+    model: Any = None
+    
+    @abstractmethod
+    async def generar(self, prompt: str) -> str:
+        """
+        Genera la respuesta completa.
+        
+        Args:
+            prompt: Prompt completo
+        
+        Returns:
+            Texto de la respuesta
+        """
+    
+    async def generar_stream(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Genera la respuesta en fragmentos (default: un único fragmento).
+        
+        Args:
+            prompt: Prompt completo
+        
+        Yields:
+            Fragmentos de la respuesta
+        """
+        yield await self.generar(prompt)
+    
+    @abstractmethod
+    def generar_sync(self, prompt: str) -> str:
+        """
+        Versión sincrónica de generar().
+        
+        Args:
+            prompt: Prompt completo
+        
+        Returns:
+            Texto de la respuesta
+        """
+    
+    async def preparar_prefijo(self, prefijo: PrefijoPrompt) -> bool:
+        """
+        Deja el prefijo cacheado del lado del proveedor (default: no soportado).
+        
+        Args:
+            prefijo: Parte fija del prompt
+        
+        Returns:
+            True si las llamadas con este prefijo sólo envían el resto del prompt
+        """
+        return False
+    
+    async def generar_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> str:
+        """
+        Genera la respuesta a un prompt que sigue a un prefijo fijo.
+        
+        Args:
+            prefijo: Parte fija del prompt
+            prompt: Parte variable del prompt
+        
+        Returns:
+            Texto de la respuesta
+        """
+        return await self.generar(prefijo.unir(prompt))
+    
+    async def generar_stream_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> AsyncIterator[str]:
+        """
+        Versión streaming de generar_con_prefijo().
+        
+        Args:
+            prefijo: Parte fija del prompt
+            prompt: Parte variable del prompt
+        
+        Yields:
+            Fragmentos de la respuesta
+        """
+        async for fragmento in self.generar_stream(prefijo.unir(prompt)):
+            yield fragmento
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini (requiere GEMINI_API_KEY y red)"""
+    
+    nombre = "gemini"
+    
+    def __init__(self, modelo: Optional[str] = None, max_tokens: Optional[int] = None, configurar: bool = True):
+        """
+        Inicializa el backend.
+        
+        Args:
+            modelo: Modelo de Gemini (default: settings.llm_model_gemini)
+            max_tokens: Tokens máximos de respuesta (default: settings.llm_max_tokens)
+            configurar: Configurar la API key (False si otro backend ya lo hizo)
+        """
+        self.logger = setup_logger("GeminiClient")
+        self.modelo = modelo or settings.llm_model_gemini
+        
+        if not settings.gemini_api_key:
+            raise ValueError(
+                "GEMINI_API_KEY no está configurada en .env\n"
+                "Obtén tu API key gratis en: https://makersuite.google.com/app/apikey"
+            )
+        
+        # Configurar Gemini
+        if configurar:
+            genai.configure(api_key=settings.gemini_api_key)
+        
+        # Configuración de seguridad (más permisiva para evitar bloqueos innecesarios)
+        self.safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        }
+        
+        self.generation_config = {
+            "temperature": settings.llm_temperature,
+            "max_output_tokens": max_tokens or settings.llm_max_tokens,
+        }
+        
+        # Crear modelo
+        self.model = genai.GenerativeModel(
+            model_name=self.modelo,
+            generation_config=self.generation_config,
+            safety_settings=self.safety_settings
+        )
+        
+        # Prefijos cacheados en Gemini (clave → contexto), el más nuevo al final
+        self._contextos: "OrderedDict[str, ContextoCacheado]" = OrderedDict()
+        self._fallidos: Dict[str, float] = {}
+        self._pendientes: Dict[str, Future] = {}
+        self._lock_contextos = threading.Lock()
+    
+    def _extraer_respuesta(self, response) -> str:
+        """
+        Extrae la respuesta del objeto de Gemini de forma robusta.
+        
+        Args:
+            response: Objeto de respuesta de Gemini
+        
+        Returns:
+            Texto de la respuesta
+        
+        Raises:
+            ValueError: Si no se puede extraer respuesta
+        """
+        try:
+            # Intentar acceso directo al texto
+            if hasattr(response, 'text'):
+                return response.text
+        except ValueError as e:
+            # Si falla, verificar por qué
+            self.logger.warning(f"No se pudo acceder a response.text: {e}")
+        
+        # Verificar finish_reason
+        if hasattr(response, 'candidates') and response.candidates:
+            candidate = response.candidates[0]
+            
+            finish_reason = candidate.finish_reason
+            
+            # Mapeo de finish_reasons
+            finish_reasons = {
+                0: "FINISH_REASON_UNSPECIFIED",
+                1: "STOP (completado normalmente)",
+                2: "MAX_TOKENS (límite de tokens alcanzado)",
+                3: "SAFETY (bloqueado por seguridad)",
+                4: "RECITATION (bloqueado por recitación)",
+                5: "OTHER"
+            }
+            
+            reason_text = finish_reasons.get(finish_reason, f"Desconocido ({finish_reason})")
+            
+            self.logger.error(f"Finish reason: {reason_text}")
+            
+            # Si fue bloqueado por seguridad
+            if finish_reason == 3:
+                if hasattr(candidate, 'safety_ratings'):
+                    self.logger.error("Ratings de seguridad:")
+                    for rating in candidate.safety_ratings:
+                        self.logger.error(f"  - {rating.category}: {rating.probability}")
+                
+                raise ValueError(
+                    "Gemini bloqueó la respuesta por filtros de seguridad. "
+                    "Intenta reformular la pregunta o usa un modelo diferente."
+                )
+            
+            # Intentar extraer partes manualmente
+            if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
+                partes = candidate.content.parts
+                if partes:
+                    textos = [parte.text for parte in partes if hasattr(parte, 'text')]
+                    if textos:
+                        return ' '.join(textos)
+        
+        # Si llegamos aquí, no pudimos extraer nada
+        raise ValueError(
+            f"No se pudo extraer respuesta de Gemini. "
+            f"Finish reason: {finish_reason if 'finish_reason' in locals() else 'desconocido'}"
+        )
+    
+    async def generar(self, prompt: str) -> str:
+        response = await self.model.generate_content_async(prompt)
+        anotar_respuesta(response)
+        return self._extraer_respuesta(response)
+    
+    async def generar_stream(self, prompt: str) -> AsyncIterator[str]:
+        response = await self.model.generate_content_async(prompt, stream=True)
+        
+        async for chunk in response:
+            anotar_respuesta(chunk)
+            if hasattr(chunk, 'text') and chunk.text:
+                yield chunk.text
+    
+    def generar_sync(self, prompt: str) -> str:
+        response = self.model.generate_content(prompt)
+        anotar_respuesta(response)
+        return self._extraer_respuesta(response)
+    
+    def _crear_contexto(self, prefijo: PrefijoPrompt) -> Optional[ContextoCacheado]:
+        """
+        Crea (o reutiliza) el contenido cacheado de un prefijo.
+        
+        Llamadas de red sincrónicas: correr fuera del event loop. El lock
+        sólo protege los diccionarios (el event loop también lo toma); una
+        sola creación por clave, los pedidos simultáneos esperan ese
+        resultado. Descarta los contextos más viejos al superar
+        MAX_CONTEXTOS_CACHEADOS.
+        
+        Args:
+            prefijo: Parte fija del prompt
+        
+        Returns:
+            ContextoCacheado o None si Gemini no lo admite (p. ej. prefijo
+            por debajo del mínimo de tokens del modelo)
+        """
+        with self._lock_contextos:
+            ahora = time.monotonic()
+            contexto = self._contextos.get(prefijo.clave)
+            if contexto is not None and contexto.vence > ahora:
+                return contexto
+            
+            if ahora - self._fallidos.get(prefijo.clave, float("-inf")) < ESPERA_REINTENTO_CACHE:
+                return None
+            
+            pendiente = self._pendientes.get(prefijo.clave)
+            if pendiente is None:
+                pendiente = self._pendientes[prefijo.clave] = Future()
+                propio = True
+            else:
+                propio = False
+        
+        if not propio:
+            return pendiente.result()
+        
+        contexto = None
+        viejos = []
+        ttl = settings.llm_cache_contexto_ttl
+        
+        try:
+            cache = genai.caching.CachedContent.create(
+                model=self.modelo,
+                display_name=f"pregon-{prefijo.clave}"[:128],
+                system_instruction=prefijo.texto,
+                ttl=timedelta(seconds=ttl)
+            )
+            modelo = genai.GenerativeModel.from_cached_content(
+                cache,
+                generation_config=self.generation_config,
+                safety_settings=self.safety_settings
+            )
+            contexto = ContextoCacheado(cache=cache, modelo=modelo, vence=ahora + ttl - MARGEN_VENCIMIENTO)
+        except Exception as e:
+            self.logger.warning(f"⚠️ No se pudo cachear el contexto {prefijo.clave}, se envía completo: {e}")
+        finally:
+            with self._lock_contextos:
+                del self._pendientes[prefijo.clave]
+                
+                if contexto is None:
+                    self._fallidos[prefijo.clave] = ahora
+                else:
+                    self._contextos[prefijo.clave] = contexto
+                    self._contextos.move_to_end(prefijo.clave)
+                    self._fallidos.pop(prefijo.clave, None)
+                    
+                    while len(self._contextos) > MAX_CONTEXTOS_CACHEADOS:
+                        viejos.append(self._contextos.popitem(last=False)[1])
+            
+            pendiente.set_result(contexto)
+        
+        for viejo in viejos:
+            try:
+                viejo.cache.delete()
+            except Exception as e:
+                self.logger.debug(f"No se pudo borrar un contexto cacheado viejo: {e}")
+        
+        if contexto is not None:
+            self.logger.info(f"🧊 Contexto cacheado en Gemini: {prefijo.clave} (~{estimar_tokens(prefijo.texto)} tokens, TTL {ttl}s)")
+        return contexto
+    
+    def _contexto_vigente(self, prefijo: PrefijoPrompt) -> Optional[ContextoCacheado]:
+        """Contexto ya cacheado y no vencido de un prefijo (sin llamadas de red)"""
+        with self._lock_contextos:
+            contexto = self._contextos.get(prefijo.clave)
+            if contexto is None or contexto.vence <= time.monotonic():
+                return None
+            return contexto
+    
+    def _invalidar(self, prefijo: PrefijoPrompt) -> None:
+        """Olvida un contexto que Gemini ya no tiene (vencido o borrado)"""
+        with self._lock_contextos:
+            self._contextos.pop(prefijo.clave, None)
+    
+    async def preparar_prefijo(self, prefijo: PrefijoPrompt) -> bool:
+        if not settings.llm_cache_contexto:
+            return False
+        
+        if estimar_tokens(prefijo.texto) < settings.llm_cache_contexto_min_tokens:
+            return False
+        
+        if self._contexto_vigente(prefijo) is not None:
+            return True
+        
+        return await asyncio.to_thread(self._crear_contexto, prefijo) is not None
+    
+    async def generar_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> str:
+        contexto = self._contexto_vigente(prefijo)
+        if contexto is None:
+            anotar_contexto_cacheado(False)
+            return await super().generar_con_prefijo(prefijo, prompt)
+        
+        try:
+            response = await contexto.modelo.generate_content_async(prompt)
+        except (google_exceptions.NotFound, google_exceptions.PermissionDenied) as e:
+            self.logger.warning(f"Contexto cacheado {prefijo.clave} no disponible, se envía completo: {e}")
+            self._invalidar(prefijo)
+            anotar_contexto_cacheado(False)
+            return await super().generar_con_prefijo(prefijo, prompt)
+        
+        anotar_contexto_cacheado(True)
+        anotar_respuesta(response)
+        return self._extraer_respuesta(response)
+    
+    async def generar_stream_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> AsyncIterator[str]:
+        contexto = self._contexto_vigente(prefijo)
+        response = None
+        
+        if contexto is not None:
+            try:
+                response = await contexto.modelo.generate_content_async(prompt, stream=True)
+            except (google_exceptions.NotFound, google_exceptions.PermissionDenied) as e:
+                self.logger.warning(f"Contexto cacheado {prefijo.clave} no disponible, se envía completo: {e}")
+                self._invalidar(prefijo)
+        
+        anotar_contexto_cacheado(response is not None)
+        
+        if response is None:
+            async for fragmento in super().generar_stream_con_prefijo(prefijo, prompt):
+                yield fragmento
+            return
+        
+        async for chunk in response:
+            anotar_respuesta(chunk)
+            if hasattr(chunk, 'text') and chunk.text:
+                yield chunk.text
+
+
+class FakeBackend(LLMBackend):
+    """
+    Modelo falso determinista: el mismo prompt da siempre la misma
+    respuesta, después de una latencia fija configurable.
+    """
+    
+    nombre = "fake"
+    
+    def __init__(self, latencia: float = 0.0, fragmentos: int = 4):
+        """
+        Inicializa el modelo falso.
+        
+        Args:
+            latencia: Segundos que tarda cada respuesta completa
+            fragmentos: Fragmentos en los que se entrega el stream
+        """
+        self.latencia = latencia
+        self.fragmentos = max(1, fragmentos)
+    
+    @staticmethod
+    def responder(prompt: str) -> str:
+        """Respuesta determinista para un prompt"""
+        huella = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+        return f"📅 Respuesta simulada {huella} ({len(prompt)} caracteres de prompt)"
+    
+    def _partir(self, texto: str) -> List[str]:
+        """Divide la respuesta en fragmentos de largo parecido"""
+        paso = max(1, -(-len(texto) // self.fragmentos))
+        return [texto[i:i + paso] for i in range(0, len(texto), paso)]
+    
+    async def generar(self, prompt: str) -> str:
+        await asyncio.sleep(self.latencia)
+        return self.responder(prompt)
+    
+    async def generar_stream(self, prompt: str) -> AsyncIterator[str]:
+        partes = self._partir(self.responder(prompt))
+        for parte in partes:
+            await asyncio.sleep(self.latencia / len(partes))
+            yield parte
+    
+    def generar_sync(self, prompt: str) -> str:
+        time.sleep(self.latencia)
+        return self.responder(prompt)
+
+
+class CassetteBackend(LLMBackend):
+    """
+    Graba las respuestas de otro backend en un archivo JSON y las
+    reproduce después sin red.
+    
+    - modo "record": delega en el backend real y guarda cada respuesta
+      (con su latencia y sus fragmentos de stream)
+    - modo "replay": responde desde el casete; un prompt no grabado va
+      al backend de respaldo o lanza CassetteIncompletoError
+    
+    La clave de cada grabación ignora la fecha actual del prompt, así un
+    casete sirve en días distintos. Las grabaciones se acumulan en memoria
+    y se escriben una vez al cerrar (o al salir del proceso), no en el
+    event loop con cada respuesta.
+    """
+    
+    nombre = "cassette"
+    
+    def __init__(
+        self,
+        ruta: str,
+        modo: str = "replay",
+        backend: Optional[LLMBackend] = None,
+        respaldo: Optional[LLMBackend] = None,
+        reproducir_latencia: bool = False
+    ):
+        """
+        Inicializa el casete.
+        
+        Args:
+            ruta: Archivo JSON del casete
+            modo: "record" o "replay"
+            backend: Backend real a grabar (requerido en "record")
+            respaldo: Backend para prompts no grabados en "replay" (opcional)
+            reproducir_latencia: Esperar la latencia grabada al reproducir
+        """
+        if modo not in ("record", "replay"):
+            raise ValueError(f"Modo de casete inválido: {modo} (usar 'record' o 'replay')")
+        if modo == "record" and backend is None:
+            raise ValueError("El modo 'record' necesita el backend a grabar")
+        
+        self.logger = setup_logger("CassetteBackend")
+        self.ruta = Path(ruta)
+        self.modo = modo
+        self.backend = backend
+        self.respaldo = respaldo
+        self.reproducir_latencia = reproducir_latencia
+        
+        self._lock = threading.Lock()
+        self.grabaciones: Dict[str, Dict[str, Any]] = self._cargar()
+        self._sin_guardar = False
+        
+        self.aciertos = 0
+        self.fallos = 0
+        
+        if modo == "record":
+            atexit.register(self.guardar)
+    
+    @staticmethod
+    def clave(prompt: str) -> str:
+        """
+        Clave estable de un prompt (sin las partes que cambian con el día).
+        
+        Args:
+            prompt: Prompt completo
+        
+        Returns:
+            Hash SHA-256 del prompt normalizado
+        """
+        for patron in PATRONES_VOLATILES:
+            prompt = patron.sub("", prompt)
+        return hashlib.sha256(prompt.strip().encode("utf-8")).hexdigest()
+    
+    def _cargar(self) -> Dict[str, Dict[str, Any]]:
+        """Lee el casete del disco (vacío si no existe)"""
+        if not self.ruta.exists():
+            if self.modo == "replay":
+                self.logger.warning(f"Casete no encontrado: {self.ruta}")
+            return {}
+        
+        datos = json.loads(self.ruta.read_text(encoding="utf-8"))
+        return {g["clave"]: g for g in datos.get("grabaciones", [])}
+    
+    def guardar(self) -> None:
+        """Escribe en disco las grabaciones pendientes (reemplazo atómico)"""
+        with self._lock:
+            if not self._sin_guardar:
+                return
+            datos = {"version": 1, "grabaciones": list(self.grabaciones.values())}
+            self._sin_guardar = False
+        
+        try:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            temporal = self.ruta.with_suffix(self.ruta.suffix + ".tmp")
+            temporal.write_text(json.dumps(datos, ensure_ascii=False, indent=1), encoding="utf-8")
+            temporal.replace(self.ruta)
+        except Exception:
+            with self._lock:
+                self._sin_guardar = True
+            raise
+        
+        self.logger.info(f"📼 Casete guardado: {self.ruta} ({len(datos['grabaciones'])} grabaciones)")
+    
+    def cerrar(self) -> None:
+        """Guarda las grabaciones pendientes (bloqueante: desde async, usar un executor)"""
+        self.guardar()
+        atexit.unregister(self.guardar)
+    
+    def _grabar(self, prompt: str, fragmentos: List[str], latencia: float) -> None:
+        """Acumula una respuesta del backend real (se escribe al cerrar)"""
+        with self._lock:
+            self.grabaciones[self.clave(prompt)] = {
+                "clave": self.clave(prompt),
+                "prompt": prompt[-200:],
+                "respuesta": "".join(fragmentos),
+                "fragmentos": fragmentos,
+                "latencia": round(latencia, 4)
+            }
+            self._sin_guardar = True
+    
+    def _buscar(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Grabación de un prompt (cuenta aciertos y fallos)"""
+        grabacion = self.grabaciones.get(self.clave(prompt))
+        
+        if grabacion is None:
+            self.fallos += 1
+            if self.respaldo is None:
+                raise CassetteIncompletoError(f"Prompt no grabado en {self.ruta}: ...{prompt[-80:]!r}")
+            self.logger.debug("Prompt no grabado, se usa el backend de respaldo")
+        else:
+            self.aciertos += 1
+        
+        return grabacion
+    
+    async def generar(self, prompt: str) -> str:
+        if self.modo == "record":
+            inicio = time.perf_counter()
+            respuesta = await self.backend.generar(prompt)
+            self._grabar(prompt, [respuesta], time.perf_counter() - inicio)
+            return respuesta
+        
+        grabacion = self._buscar(prompt)
+        if grabacion is None:
+            return await self.respaldo.generar(prompt)
+        
+        if self.reproducir_latencia:
+            await asyncio.sleep(grabacion["latencia"])
+        return grabacion["respuesta"]
+    
+    async def generar_stream(self, prompt: str) -> AsyncIterator[str]:
+        if self.modo == "record":
+            inicio = time.perf_counter()
+            fragmentos = []
+            async for fragmento in self.backend.generar_stream(prompt):
+                fragmentos.append(fragmento)
+                yield fragmento
+            self._grabar(prompt, fragmentos, time.perf_counter() - inicio)
+            return
+        
+        grabacion = self._buscar(prompt)
+        if grabacion is None:
+            async for fragmento in self.respaldo.generar_stream(prompt):
+                yield fragmento
+            return
+        
+        fragmentos = grabacion.get("fragmentos") or [grabacion["respuesta"]]
+        for fragmento in fragmentos:
+            if self.reproducir_latencia:
+                await asyncio.sleep(grabacion["latencia"] / len(fragmentos))
+            yield fragmento
+    
+    def generar_sync(self, prompt: str) -> str:
+        if self.modo == "record":
+            inicio = time.perf_counter()
+            respuesta = self.backend.generar_sync(prompt)
+            self._grabar(prompt, [respuesta], time.perf_counter() - inicio)
+            return respuesta
+        
+        grabacion = self._buscar(prompt)
+        if grabacion is None:
+            return self.respaldo.generar_sync(prompt)
+        
+        if self.reproducir_latencia:
+            time.sleep(grabacion["latencia"])
+        return grabacion["respuesta"]
+
+
+def crear_backend(nombre: Optional[str] = None) -> LLMBackend:
+    """
+    Crea el backend configurado.
+    
+    Args:
+        nombre: "gemini", "fake" o "cassette" (default: settings.llm_backend)
+    
+    Returns:
+        Backend listo para usar
+    
+    Raises:
+        ValueError: Si el nombre no es válido o falta la API key de Gemini
+    """
+    nombre = (nombre or settings.llm_backend).lower()
+    
+    if nombre == "gemini":
+        return GeminiBackend()
+    
+    if nombre == "fake":
+        return FakeBackend(latencia=settings.llm_fake_latencia)
+    
+    if nombre == "cassette":
+        modo = settings.llm_cassette_modo
+        return CassetteBackend(
+            settings.llm_cassette_path,
+            modo=modo,
+            backend=GeminiBackend() if modo == "record" else None,
+            respaldo=FakeBackend(latencia=settings.llm_fake_latencia) if modo == "replay" else None
+        )
+    
+    raise ValueError(f"Backend de LLM desconocido: {nombre} (usar gemini, fake o cassette)")
+
+
+def crear_backend_rapido(nombre: Optional[str] = None) -> Optional[LLMBackend]:
+    """
+    Crea el backend del modelo rápido de la cascada.
+    
+    Sólo Gemini tiene un modelo más chico; con los backends locales
+    (o sin modelo rápido distinto del principal) no hay cascada. Se crea
+    después del backend principal, que ya configuró la API key.
+    
+    Args:
+        nombre: Backend configurado (default: settings.llm_backend)
+    
+    Returns:
+        Backend con settings.llm_model_rapido y el presupuesto de tokens
+        de la cascada, o None
+    """
+    nombre = (nombre or settings.llm_backend).lower()
+    
+    if nombre != "gemini" or not settings.llm_model_rapido or settings.llm_model_rapido == settings.llm_model_gemini:
+        return None
+    
+    return GeminiBackend(modelo=settings.llm_model_rapido, max_tokens=settings.llm_cascada_max_tokens, configurar=False)
\ No newline at end of file
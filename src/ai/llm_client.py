@@ -3,125 +3,153 @@
 🤖 Cliente LLM usando Google Gemini
 """
 
-from typing import Optional
+import asyncio
+import functools
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+from src.ai.cascada import FINISH_INCOMPLETOS, RespuestaIncompletaError
+from src.ai.llm_backends import LLMBackend, PrefijoPrompt, crear_backend, crear_backend_rapido
+from src.ai.resiliencia import CircuitoAbiertoError, PoliticaResiliencia, con_deadline, es_reintentable
+from src.ai.scheduler import LLMSaturadoError, PrioridadLLM, estimar_tokens, get_llm_scheduler
+from src.ai.telemetria import (
+    TARIFA_PRINCIPAL, TARIFA_RAPIDO, MedicionLLM, anotar_respuesta, get_telemetria_llm, medir_turno
+)
 from src.config.settings import settings
 from src.utils.logger import setup_logger
 
 
 class LLMClient:
-    """Cliente para Google Gemini con manejo robusto de errores"""
+    """
+    Cliente del LLM con manejo robusto de errores.
+    
+    Las llamadas pasan por la política de resiliencia (deadline, reintentos,
+    circuito) y por el planificador; el texto lo genera el backend
+    configurado (Gemini, modelo falso o casete).
+    """
     
-    def __init__(self):
+    def __init__(self, backend: Optional[LLMBackend] = None, backend_rapido: Optional[LLMBackend] = None):
+        """
+        Inicializa el cliente.
+        
+        Args:
+            backend: Backend a usar (default: settings.llm_backend)
+            backend_rapido: Modelo rápido de la cascada (default: el configurado
+                si no se pasa backend; None = sin cascada)
+        """
         self.logger = setup_logger("GeminiClient")
+        self.backend = backend or crear_backend()
         
-        if not settings.gemini_api_key:
-            raise ValueError(
-                "GEMINI_API_KEY no está configurada en .env\n"
-                "Obtén tu API key gratis en: https://makersuite.google.com/app/apikey"
-            )
+        # Modelo rápido y barato para las preguntas simples (cascada)
+        if backend_rapido is None and backend is None and settings.llm_cascada:
+            backend_rapido = crear_backend_rapido()
+        self.backend_rapido = backend_rapido
         
-        # Configurar Gemini
-        genai.configure(api_key=settings.gemini_api_key)
+        # Modelo de Gemini para function calling (None con otros backends)
+        self.model = self.backend.model
         
-        # Configuración de seguridad (más permisiva para evitar bloqueos innecesarios)
-        self.safety_settings = {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        }
+        # Límites de ritmo y concurrencia compartidos entre clientes
+        self.scheduler = get_llm_scheduler()
         
-        # Crear modelo
-        self.model = genai.GenerativeModel(
-            model_name=settings.llm_model_gemini,
-            generation_config={
-                "temperature": settings.llm_temperature,
-                "max_output_tokens": settings.llm_max_tokens,
-            },
-            safety_settings=self.safety_settings
-        )
-        
-        self.logger.info(f"✅ Gemini inicializado: {settings.llm_model_gemini}")
+        # Deadline, reintentos, cobertura y circuit breaker
+        self.resiliencia = PoliticaResiliencia()
+        
+        # El modelo rápido tiene su propia cuota: circuito aparte y sin
+        # reintentos (ante un error conviene más escalar al principal)
+        self.resiliencia_rapido = PoliticaResiliencia(reintentos=0) if self.backend_rapido is not None else None
+        
+        # Tokens, latencias y costo de cada llamada (compartida entre clientes)
+        self.telemetria = get_telemetria_llm()
+        
+        if self.backend.nombre == "gemini":
+            rapido = f" (rápido: {settings.llm_model_rapido})" if self.backend_rapido is not None else ""
+            self.logger.info(f"✅ Gemini inicializado: {settings.llm_model_gemini}{rapido}")
+        else:
+            self.logger.info(f"✅ LLM inicializado con backend '{self.backend.nombre}'")
+    
+    @property
+    def soporta_herramientas(self) -> bool:
+        """True si el backend admite function calling"""
+        return self.model is not None
+    
+    @property
+    def soporta_cascada(self) -> bool:
+        """True si hay un modelo rápido para probar antes que el principal"""
+        return self.backend_rapido is not None
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna las métricas del cliente.
+        
+        Returns:
+            Diccionario con la telemetría de las llamadas, el planificador
+            y las políticas de resiliencia (principal y modelo rápido)
+        """
+        return {
+            "backend": self.backend.nombre,
+            "telemetria": self.telemetria.estadisticas(),
+            "planificador": self.scheduler.estadisticas(),
+            "resiliencia": self.resiliencia.estadisticas(),
+            "resiliencia_rapido": self.resiliencia_rapido.estadisticas() if self.resiliencia_rapido is not None else None
+        }
+    
+    def _turno(self, prioridad: int, tokens: int):
+        """Turno del planificador que suma la espera en cola a la telemetría"""
+        return medir_turno(self.scheduler.turno(prioridad, tokens))
     
-    def _extraer_respuesta(self, response) -> str:
+    @staticmethod
+    def _estimar_uso(medicion: MedicionLLM, tokens_prompt: int, respuesta: str) -> None:
+        """Completa los tokens si el backend no informó el uso (backends locales)"""
+        if medicion.tokens_estimados:
+            medicion.tokens_prompt = tokens_prompt
+            medicion.tokens_respuesta = estimar_tokens(respuesta)
+    
+    async def preparar_prefijo(self, prefijo: PrefijoPrompt) -> bool:
         """
-        Extrae la respuesta del objeto de Gemini de forma robusta.
+        Cachea del lado del proveedor la parte fija de los prompts.
         
         Args:
-            response: Objeto de respuesta de Gemini
-            
+            prefijo: Instrucciones y calendario de un snapshot
+        
         Returns:
-            Texto de la respuesta
-            
-        Raises:
-            ValueError: Si no se puede extraer respuesta
+            True si conviene mandar el prefijo aparte (ya está cacheado);
+            False si hay que seguir armando el prompt completo
         """
         try:
-            # Intentar acceso directo al texto
-            if hasattr(response, 'text'):
-                return response.text
-        except ValueError as e:
-            # Si falla, verificar por qué
-            self.logger.warning(f"No se pudo acceder a response.text: {e}")
-        
-        # Verificar finish_reason
-        if hasattr(response, 'candidates') and response.candidates:
-            candidate = response.candidates[0]
-            
-            finish_reason = candidate.finish_reason
-            
-            # Mapeo de finish_reasons
-            finish_reasons = {
-                0: "FINISH_REASON_UNSPECIFIED",
-                1: "STOP (completado normalmente)",
-                2: "MAX_TOKENS (límite de tokens alcanzado)",
-                3: "SAFETY (bloqueado por seguridad)",
-                4: "RECITATION (bloqueado por recitación)",
-                5: "OTHER"
-            }
-            
-            reason_text = finish_reasons.get(finish_reason, f"Desconocido ({finish_reason})")
-            
-            self.logger.error(f"Finish reason: {reason_text}")
-            
-            # Si fue bloqueado por seguridad
-            if finish_reason == 3:
-                if hasattr(candidate, 'safety_ratings'):
-                    self.logger.error("Ratings de seguridad:")
-                    for rating in candidate.safety_ratings:
-                        self.logger.error(f"  - {rating.category}: {rating.probability}")
-                
-                raise ValueError(
-                    "Gemini bloqueó la respuesta por filtros de seguridad. "
-                    "Intenta reformular la pregunta o usa un modelo diferente."
-                )
-            
-            # Intentar extraer partes manualmente
-            if hasattr(candidate, 'content') and hasattr(candidate.content, 'parts'):
-                partes = candidate.content.parts
-                if partes:
-                    textos = [parte.text for parte in partes if hasattr(parte, 'text')]
-                    if textos:
-                        return ' '.join(textos)
-        
-        # Si llegamos aquí, no pudimos extraer nada
-        raise ValueError(
-            f"No se pudo extraer respuesta de Gemini. "
-            f"Finish reason: {finish_reason if 'finish_reason' in locals() else 'desconocido'}"
-        )
+            return await self.backend.preparar_prefijo(prefijo)
+        except Exception as e:
+            self.logger.warning(f"No se pudo preparar el contexto cacheado: {e}")
+            return False
     
-    async def chat(self, mensaje: str, contexto: Optional[str] = None) -> str:
+    async def chat(
+        self,
+        mensaje: str,
+        contexto: Optional[str] = None,
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        prefijo: Optional[PrefijoPrompt] = None,
+        rapido: bool = False
+    ) -> str:
         """
         Envía mensaje a Gemini (versión async).
         
+        Cada intento pasa por el planificador (RPM/TPM, concurrencia y
+        prioridad) y tiene deadline; los errores transitorios se reintentan.
+        
         Args:
             mensaje: Mensaje del usuario
             contexto: Contexto adicional (system prompt)
+            prioridad: PrioridadLLM de la llamada
+            prefijo: Parte fija ya cacheada (ver preparar_prefijo)
+            rapido: Usar el modelo rápido de la cascada (si existe)
             
         Returns:
             Respuesta de Gemini
+        
+        Raises:
+            LLMSaturadoError: Si la cola del planificador está llena
+            CircuitoAbiertoError: Si el circuito del LLM está abierto
+            TimeoutError: Si se agotaron los intentos por deadline
+            RespuestaIncompletaError: Si el modelo rápido cortó la respuesta
         """
         try:
             # Construir prompt completo
@@ -132,16 +160,39 @@ class LLMClient:
             
             self.logger.debug(f"Enviando a Gemini: {mensaje[:100]}...")
             
-            # Generar respuesta (async)
-            response = await self.model.generate_content_async(prompt)
+            rapido = rapido and self.backend_rapido is not None
+            backend = self.backend_rapido if rapido else self.backend
+            politica = self.resiliencia_rapido if rapido else self.resiliencia
+            max_tokens = settings.llm_cascada_max_tokens if rapido else settings.llm_max_tokens
             
-            # Extraer respuesta de forma robusta
-            respuesta_texto = self._extraer_respuesta(response)
+            # Generar respuesta (async); el prefijo cacheado cuenta igual para el TPM
+            tokens_prompt = estimar_tokens(prompt)
+            if prefijo is not None:
+                tokens_prompt += estimar_tokens(prefijo.texto)
+                llamada = functools.partial(backend.generar_con_prefijo, prefijo, prompt)
+            else:
+                llamada = functools.partial(backend.generar, prompt)
+            tokens = tokens_prompt + max_tokens
             
-            self.logger.debug(f"Respuesta recibida: {len(respuesta_texto)} caracteres")
+            tarifa = TARIFA_RAPIDO if rapido else TARIFA_PRINCIPAL
+            with self.telemetria.medir("rapido" if rapido else "chat", backend.nombre, prioridad, tarifa) as medicion:
+                respuesta_texto = await politica.ejecutar(
+                    llamada,
+                    turno=lambda: self._turno(prioridad, tokens)
+                )
+                
+                # Sin stream el primer token llega con la respuesta completa
+                medicion.marcar_primer_token()
+                self._estimar_uso(medicion, tokens_prompt, respuesta_texto)
+                
+                # Una respuesta cortada del modelo rápido no sirve: el chatbot escala
+                if rapido and medicion.finish_reason in FINISH_INCOMPLETOS:
+                    raise RespuestaIncompletaError(medicion.finish_reason)
             
             return respuesta_texto
             
+        except (LLMSaturadoError, CircuitoAbiertoError, RespuestaIncompletaError):
+            raise
         except Exception as e:
             self.logger.error(f"Error en Gemini: {e}", exc_info=True)
             raise
@@ -167,29 +218,46 @@ class LLMClient:
             self.logger.debug(f"Enviando a Gemini: {mensaje[:100]}...")
             
             # Generar respuesta (sync)
-            response = self.model.generate_content(prompt)
-            
-            # Extraer respuesta de forma robusta
-            respuesta_texto = self._extraer_respuesta(response)
-            
-            self.logger.debug(f"Respuesta recibida: {len(respuesta_texto)} caracteres")
+            with self.telemetria.medir("sync", self.backend.nombre, PrioridadLLM.INTERACTIVA) as medicion:
+                respuesta_texto = self.resiliencia.ejecutar_sync(lambda: self.backend.generar_sync(prompt))
+                
+                medicion.marcar_primer_token()
+                self._estimar_uso(medicion, estimar_tokens(prompt), respuesta_texto)
             
             return respuesta_texto
             
+        except CircuitoAbiertoError:
+            raise
         except Exception as e:
             self.logger.error(f"Error en Gemini: {e}", exc_info=True)
             raise
     
-    def chat_stream(self, mensaje: str, contexto: Optional[str] = None):
+    async def chat_stream(
+        self,
+        mensaje: str,
+        contexto: Optional[str] = None,
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        prefijo: Optional[PrefijoPrompt] = None
+    ) -> AsyncIterator[str]:
         """
         Versión streaming (para respuestas en tiempo real).
         
+        El lugar en el planificador se mantiene mientras dure el stream.
+        El deadline vale para cada fragmento y sólo se reintenta antes
+        del primero.
+        
         Args:
             mensaje: Mensaje del usuario
             contexto: Contexto adicional
+            prioridad: PrioridadLLM de la llamada
+            prefijo: Parte fija ya cacheada (ver preparar_prefijo)
             
         Yields:
             Fragmentos de la respuesta
+        
+        Raises:
+            LLMSaturadoError: Si la cola del planificador está llena
+            CircuitoAbiertoError: Si el circuito del LLM está abierto
         """
         try:
             if contexto:
@@ -199,24 +267,182 @@ class LLMClient:
             
             self.logger.debug(f"Streaming desde Gemini: {mensaje[:100]}...")
             
-            # Generar respuesta streaming
-            response = self.model.generate_content(prompt, stream=True)
+            tokens_prompt = estimar_tokens(prompt)
+            if prefijo is not None:
+                tokens_prompt += estimar_tokens(prefijo.texto)
+                abrir = functools.partial(self.backend.generar_stream_con_prefijo, prefijo, prompt)
+            else:
+                abrir = functools.partial(self.backend.generar_stream, prompt)
+            tokens = tokens_prompt + settings.llm_max_tokens
             
-            for chunk in response:
-                if hasattr(chunk, 'text') and chunk.text:
-                    yield chunk.text
+            # Generar respuesta streaming (async)
+            with self.telemetria.medir("stream", self.backend.nombre, prioridad) as medicion:
+                fragmentos = []
+                async for fragmento in self.resiliencia.stream(
+                    abrir,
+                    turno=lambda: self._turno(prioridad, tokens)
+                ):
+                    medicion.marcar_primer_token()
+                    fragmentos.append(fragmento)
+                    yield fragmento
+                
+                self._estimar_uso(medicion, tokens_prompt, "".join(fragmentos))
             
+        except (LLMSaturadoError, CircuitoAbiertoError):
+            raise
         except Exception as e:
             self.logger.error(f"Error en Gemini streaming: {e}", exc_info=True)
             raise
+    
+    async def chat_con_herramientas_stream(
+        self,
+        mensaje: str,
+        declaraciones: List[Dict[str, Any]],
+        ejecutar: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        max_rondas: Optional[int] = None
+    ) -> AsyncIterator[str]:
+        """
+        Conversación con function calling: Gemini pide herramientas, se
+        ejecutan y sus resultados vuelven al modelo hasta que responde.
+        
+        Cada ronda es una llamada al modelo y pasa por el planificador.
+        En la última ronda se deshabilitan las herramientas para forzar
+        una respuesta en texto. Las rondas respetan el circuito y el
+        deadline pero no se reintentan (el chatbot cae al prompt con eventos).
+        
+        Args:
+            mensaje: Mensaje del usuario
+            declaraciones: Declaraciones de funciones (name, description, parameters)
+            ejecutar: Corrutina (nombre, argumentos) → resultado dict
+            prioridad: PrioridadLLM de las llamadas
+            max_rondas: Rondas de herramientas permitidas (default: settings)
+            
+        Yields:
+            Fragmentos de la respuesta final
+        
+        Raises:
+            LLMSaturadoError: Si la cola del planificador está llena
+            CircuitoAbiertoError: Si el circuito del LLM está abierto
+            RuntimeError: Si el backend no admite function calling (ver soporta_herramientas)
+        """
+        if not self.soporta_herramientas:
+            raise RuntimeError(
+                f"El backend '{self.backend.nombre}' no admite function calling; consultar soporta_herramientas antes"
+            )
+        
+        rondas = max_rondas if max_rondas is not None else settings.llm_max_rondas_herramientas
+        herramientas = [{"function_declarations": declaraciones}]
+        chat = self.model.start_chat()
+        contenido: Any = mensaje
+        circuito = self.resiliencia.circuito
+        
+        circuito.verificar()
+        
+        with self.telemetria.medir("herramientas", self.backend.nombre, prioridad) as medicion:
+            try:
+                for ronda in range(rondas + 1):
+                    modo = "NONE" if ronda == rondas else "AUTO"
+                    llamadas = []
+                    
+                    tokens = estimar_tokens(str(contenido)) + settings.llm_max_tokens
+                    async with self._turno(prioridad, tokens):
+                        response = await con_deadline(chat.send_message_async(
+                            contenido,
+                            stream=True,
+                            tools=herramientas,
+                            tool_config={"function_calling_config": {"mode": modo}}
+                        ), self.resiliencia.timeout)
+                        
+                        # El deadline vale también para cada fragmento del stream
+                        fragmentos = response.__aiter__()
+                        while True:
+                            try:
+                                chunk = await con_deadline(fragmentos.__anext__(), self.resiliencia.timeout)
+                            except StopAsyncIteration:
+                                break
+                            
+                            anotar_respuesta(chunk, ronda=ronda)
+                            for parte in chunk.parts:
+                                if parte.function_call.name:
+                                    llamadas.append(parte.function_call)
+                                elif parte.text:
+                                    medicion.marcar_primer_token()
+                                    yield parte.text
+                    
+                    circuito.registrar_exito()
+                    
+                    if not llamadas:
+                        return
+                    
+                    self.logger.debug(f"Ronda {ronda + 1}: {[ll.name for ll in llamadas]}")
+                    
+                    resultados = await asyncio.gather(*(
+                        ejecutar(llamada.name, type(llamada).to_dict(llamada).get("args", {}))
+                        for llamada in llamadas
+                    ))
+                    
+                    contenido = [
+                        genai.protos.Part(function_response=genai.protos.FunctionResponse(
+                            name=llamada.name,
+                            response=resultado
+                        ))
+                        for llamada, resultado in zip(llamadas, resultados)
+                    ]
+                
+            except LLMSaturadoError:
+                circuito.descartar()
+                raise
+            except Exception as e:
+                if es_reintentable(e):
+                    circuito.registrar_fallo()
+                else:
+                    circuito.registrar_exito()
+                self.logger.error(f"Error en Gemini con herramientas: {e}", exc_info=True)
+                raise
+            except BaseException:
+                # Stream abandonado o cancelado
+                circuito.descartar()
+                raise
+    
+    async def chat_con_herramientas(
+        self,
+        mensaje: str,
+        declaraciones: List[Dict[str, Any]],
+        ejecutar: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        max_rondas: Optional[int] = None
+    ) -> str:
+        """
+        Versión no streaming de chat_con_herramientas_stream().
+        
+        Returns:
+            Respuesta final de Gemini
+        """
+        fragmentos = []
+        async for fragmento in self.chat_con_herramientas_stream(
+            mensaje, declaraciones, ejecutar, prioridad=prioridad, max_rondas=max_rondas
+        ):
+            fragmentos.append(fragmento)
+        
+        return "".join(fragmentos)
+
+
+# Instancia global: genai.configure y el modelo se crean una vez por proceso
+_client_instance = None
+_client_lock = threading.Lock()
 
 
-# Factory function
 def get_llm_client() -> LLMClient:
     """
-    Retorna una instancia del cliente Gemini.
+    Retorna el cliente Gemini compartido por el proceso.
     
     Returns:
         Instancia de LLMClient (Gemini)
     """
-    return LLMClient()
\ No newline at end of file
+    global _client_instance
+    if _client_instance is None:
+        with _client_lock:
+            if _client_instance is None:
+                _client_instance = LLMClient()
+    return _client_instance
\ No newline at end of file
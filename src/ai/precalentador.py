@@ -0,0 +1,243 @@
+# src/ai/precalentador.py
+"""
+🔥 Precalentado de respuestas frecuentes
+Pregenera en la caché las respuestas que son iguales para todos en el día
+("qué hay esta semana", "próximos exámenes"...), por canal, al publicar
+cada calendario y a medianoche
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set
+from src.ai.resiliencia import CircuitoAbiertoError
+from src.ai.scheduler import LLMSaturadoError
+from src.config.constants import CANALES_CHAT
+from src.services.evento_repository import CalendarSnapshot, EventoRepository
+from src.utils.event_loop import get_background_loop
+from src.utils.logger import setup_logger
+
+# Preguntas con la misma respuesta para todos los estudiantes en un mismo día
+PREGUNTAS_FRECUENTES = (
+    "¿Qué hay esta semana?",
+    "¿Qué hay la próxima semana?",
+    "¿Cuáles son los próximos exámenes?",
+    "¿Qué feriados hay este mes?",
+    "¿Qué eventos hay este mes?",
+    "¿Qué pasa el próximo mes?",
+    "¿Cuándo son las próximas inscripciones?",
+)
+
+# Segundos después de medianoche para que date.today() ya sea el día nuevo
+MARGEN_MEDIANOCHE = 5
+
+
+def segundos_hasta_medianoche(ahora: Optional[datetime] = None) -> float:
+    """
+    Segundos hasta la próxima medianoche (más un margen).
+    
+    Args:
+        ahora: Momento de referencia (default: ahora)
+    
+    Returns:
+        Segundos a esperar
+    """
+    ahora = ahora or datetime.now()
+    medianoche = datetime.combine(ahora.date() + timedelta(days=1), datetime.min.time())
+    return (medianoche - ahora).total_seconds() + MARGEN_MEDIANOCHE
+
+
+class PrecalentadorRespuestas:
+    """
+    Mantiene caliente la caché de respuestas del chatbot.
+    
+    - Corre al iniciar, con cada snapshot nuevo y a medianoche (la caché
+      vence al cambiar el día o la versión del calendario)
+    - Genera cada pregunta frecuente para cada canal, con prioridad de
+      fondo; las que el router ya resuelve al instante no usan el LLM
+    - Una sola corrida a la vez: los pedidos durante una corrida se
+      atienden al terminar
+    - Si el LLM está saturado o con el circuito abierto, abandona la
+      corrida (los estudiantes tienen prioridad)
+    """
+    
+    def __init__(
+        self,
+        chatbot,
+        repository: Optional[EventoRepository] = None,
+        preguntas: Optional[Iterable[str]] = None,
+        canales: Optional[Iterable[str]] = None
+    ):
+        """
+        Inicializa el precalentador.
+        
+        Args:
+            chatbot: CalendarioChatbot cuya caché se precalienta
+            repository: Repositorio de eventos (default: el del chatbot)
+            preguntas: Preguntas a pregenerar (default: PREGUNTAS_FRECUENTES)
+            canales: Canales de destino (default: CANALES_CHAT)
+        """
+        self.logger = setup_logger("PrecalentadorRespuestas")
+        self.chatbot = chatbot
+        self.repository = repository or chatbot.repository
+        self.preguntas = list(preguntas or PREGUNTAS_FRECUENTES)
+        self.canales = tuple(canales or CANALES_CHAT)
+        
+        self._lock = threading.Lock()
+        self._en_curso = False
+        self._pendiente = False
+        self._iniciado = False
+        self._medianoche = None
+        self._tareas: Set[asyncio.Task] = set()
+        
+        self.corridas = 0
+        self.generadas = 0
+        self.ultima_corrida: Optional[datetime] = None
+    
+    async def precalentar(self) -> Optional[Dict[str, Any]]:
+        """
+        Pregenera las respuestas frecuentes del día.
+        
+        Returns:
+            Resumen de la última corrida (generadas, instantáneas, errores,
+            segundos) o None si se sumó a una corrida en curso
+        """
+        with self._lock:
+            if self._en_curso:
+                self._pendiente = True
+                return None
+            self._en_curso = True
+        
+        try:
+            while True:
+                resumen = await self._corrida()
+                
+                with self._lock:
+                    if not self._pendiente:
+                        return resumen
+                    self._pendiente = False
+        finally:
+            with self._lock:
+                self._en_curso = False
+                self._pendiente = False
+    
+    async def _corrida(self) -> Dict[str, Any]:
+        """Una pasada por todas las preguntas y canales"""
+        resumen = {"generadas": 0, "instantaneas": 0, "errores": 0, "segundos": 0.0}
+        
+        if not self.chatbot.answer_cache.habilitada:
+            return resumen
+        
+        try:
+            snapshot = await self.repository.obtener_snapshot_async()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Sin calendario para precalentar respuestas: {e}")
+            return resumen
+        
+        if not snapshot.eventos:
+            return resumen
+        
+        inicio = time.perf_counter()
+        
+        try:
+            for canal in self.canales:
+                for pregunta in self.preguntas:
+                    try:
+                        if await self.chatbot.precalentar(pregunta, canal):
+                            resumen["generadas"] += 1
+                        else:
+                            resumen["instantaneas"] += 1
+                    except (LLMSaturadoError, CircuitoAbiertoError) as e:
+                        self.logger.warning(f"⚠️ Precalentado interrumpido, el LLM no está disponible: {e}")
+                        return resumen
+                    except Exception as e:
+                        resumen["errores"] += 1
+                        self.logger.error(f"Error precalentando '{pregunta}' ({canal}): {e}", exc_info=True)
+        finally:
+            resumen["segundos"] = round(time.perf_counter() - inicio, 2)
+            self.corridas += 1
+            self.generadas += resumen["generadas"]
+            self.ultima_corrida = datetime.now()
+        
+        self.logger.info(
+            f"🔥 Respuestas frecuentes listas (versión {snapshot.version}): "
+            f"{resumen['generadas']} generadas, {resumen['instantaneas']} ya instantáneas, "
+            f"{resumen['errores']} errores en {resumen['segundos']}s"
+        )
+        return resumen
+    
+    def _programar(self, coro):
+        """Corre una corrutina en el loop actual o, desde código sincrónico, en el loop de fondo"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return get_background_loop().submit(coro)
+        
+        tarea = loop.create_task(coro)
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+        return tarea
+    
+    def _al_publicar(self, snapshot: CalendarSnapshot) -> None:
+        """Callback del repositorio: calendario nuevo, respuestas nuevas"""
+        self.logger.debug(f"Snapshot {snapshot.version} publicado, se precalientan las respuestas")
+        self._programar(self.precalentar())
+    
+    async def _ciclo_medianoche(self) -> None:
+        """Precalienta al comenzar cada día"""
+        while True:
+            await asyncio.sleep(segundos_hasta_medianoche())
+            self.logger.info("🌙 Nuevo día: precalentando respuestas frecuentes")
+            
+            try:
+                await self.precalentar()
+            except Exception as e:
+                self.logger.error(f"Error en el precalentado de medianoche: {e}", exc_info=True)
+    
+    def iniciar(self) -> None:
+        """
+        Se suscribe a los snapshots, precalienta ya y programa el ciclo
+        de medianoche (llamadas repetidas no hacen nada).
+        """
+        with self._lock:
+            if self._iniciado:
+                return
+            self._iniciado = True
+        
+        self.repository.suscribir(self._al_publicar)
+        self._programar(self.precalentar())
+        self._medianoche = self._programar(self._ciclo_medianoche())
+        
+        self.logger.info(
+            f"🔥 Precalentado de respuestas activo: {len(self.preguntas)} preguntas × {len(self.canales)} canales"
+        )
+    
+    def detener(self) -> None:
+        """Cancela el ciclo de medianoche y la suscripción"""
+        with self._lock:
+            if not self._iniciado:
+                return
+            self._iniciado = False
+        
+        self.repository.desuscribir(self._al_publicar)
+        
+        if self._medianoche is not None:
+            self._medianoche.cancel()
+            self._medianoche = None
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna el estado del precalentador.
+        
+        Returns:
+            Diccionario con corridas, respuestas generadas y última corrida
+        """
+        return {
+            "activo": self._iniciado,
+            "corridas": self.corridas,
+            "generadas": self.generadas,
+            "ultima_corrida": self.ultima_corrida.isoformat() if self.ultima_corrida else None,
+            "preguntas": len(self.preguntas),
+            "canales": list(self.canales)
+        }
\ No newline at end of file
@@ -0,0 +1,500 @@
+# src/ai/resiliencia.py
+"""
+🛡️ Resiliencia de las llamadas al LLM
+Deadline por intento, reintentos con backoff aleatorio, pedidos de
+cobertura (hedging) y circuit breaker para cuando Gemini está degradado
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, Optional, TypeVar
+from src.ai.scheduler import LLMSaturadoError
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+T = TypeVar("T")
+
+ESTADO_CERRADO = "cerrado"
+ESTADO_ABIERTO = "abierto"
+ESTADO_SEMIABIERTO = "semiabierto"
+
+# Latencias recientes que se guardan para calcular la demora de cobertura
+MAX_MUESTRAS_LATENCIA = 100
+
+# Muestras necesarias antes de lanzar pedidos de cobertura
+MIN_MUESTRAS_COBERTURA = 20
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    
+    ERRORES_GOOGLE_REINTENTABLES = (
+        google_exceptions.TooManyRequests,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.InternalServerError,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.GatewayTimeout,
+        google_exceptions.DeadlineExceeded,
+    )
+except ImportError:
+    ERRORES_GOOGLE_REINTENTABLES = ()
+
+# En Python 3.10 asyncio.TimeoutError todavía no es el TimeoutError integrado
+ERRORES_TIMEOUT = (TimeoutError, asyncio.TimeoutError)
+
+
+class CircuitoAbiertoError(Exception):
+    """El circuito está abierto: el LLM falló seguido y no se lo llama por un tiempo"""
+
+
+def es_reintentable(error: BaseException) -> bool:
+    """
+    Indica si un error es transitorio (vale la pena reintentar).
+    
+    Args:
+        error: Excepción de la llamada
+    
+    Returns:
+        True para timeouts, errores de conexión y 429/500/503/504 de Google
+    """
+    if isinstance(error, LLMSaturadoError):
+        return False
+    return isinstance(error, ERRORES_TIMEOUT + (ConnectionError,) + ERRORES_GOOGLE_REINTENTABLES)
+
+
+async def con_deadline(espera: Awaitable[T], timeout: Optional[float]) -> T:
+    """
+    Espera con deadline, siempre con el TimeoutError integrado.
+    
+    Args:
+        espera: Corrutina o future a esperar
+        timeout: Segundos máximos (None = sin límite)
+    
+    Returns:
+        Resultado de la espera
+    
+    Raises:
+        TimeoutError: Si se superó el deadline
+    """
+    try:
+        return await asyncio.wait_for(espera, timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"El LLM no respondió en {timeout} segundos") from None
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de tres estados.
+    
+    - Cerrado: las llamadas pasan; N fallos transitorios seguidos lo abren
+    - Abierto: las llamadas se rechazan sin llegar al LLM durante el enfriamiento
+    - Semiabierto: pasada el enfriamiento se deja pasar una sola llamada de
+      prueba; si sale bien se cierra, si falla vuelve a abrirse
+    
+    Es seguro entre threads (lo comparten el loop de Discord y el de fondo).
+    """
+    
+    def __init__(self, umbral_fallos: Optional[int] = None, enfriamiento: Optional[float] = None):
+        """
+        Inicializa el circuito cerrado.
+        
+        Args:
+            umbral_fallos: Fallos seguidos que abren el circuito (default: settings)
+            enfriamiento: Segundos abierto antes de probar de nuevo (default: settings)
+        """
+        self.logger = setup_logger("CircuitBreaker")
+        self.umbral_fallos = max(1, umbral_fallos if umbral_fallos is not None else settings.llm_circuito_fallos)
+        self.enfriamiento = enfriamiento if enfriamiento is not None else settings.llm_circuito_enfriamiento
+        
+        self._estado = ESTADO_CERRADO
+        self._fallos = 0
+        self._abierto_desde = 0.0
+        self._prueba_en_curso = False
+        self._lock = threading.Lock()
+        
+        self.aperturas = 0
+        self.rechazadas = 0
+    
+    @property
+    def estado(self) -> str:
+        """Estado actual (un circuito abierto con el enfriamiento cumplido figura semiabierto)"""
+        with self._lock:
+            if self._estado == ESTADO_ABIERTO and self._enfriado():
+                return ESTADO_SEMIABIERTO
+            return self._estado
+    
+    def _enfriado(self) -> bool:
+        return time.monotonic() - self._abierto_desde >= self.enfriamiento
+    
+    def permitir(self) -> bool:
+        """
+        Consulta si una llamada puede ir al LLM.
+        
+        Returns:
+            True si el circuito está cerrado o si esta llamada es la prueba
+        """
+        with self._lock:
+            if self._estado == ESTADO_CERRADO:
+                return True
+            
+            if self._estado == ESTADO_ABIERTO and self._enfriado():
+                self._estado = ESTADO_SEMIABIERTO
+            
+            if self._estado == ESTADO_SEMIABIERTO and not self._prueba_en_curso:
+                self._prueba_en_curso = True
+                return True
+            
+            self.rechazadas += 1
+            return False
+    
+    def verificar(self) -> None:
+        """
+        Como permitir(), pero falla si la llamada no puede pasar.
+        
+        Raises:
+            CircuitoAbiertoError: Si el circuito está abierto
+        """
+        if not self.permitir():
+            raise CircuitoAbiertoError("Circuito del LLM abierto")
+    
+    def registrar_exito(self) -> None:
+        """El LLM respondió: cierra el circuito"""
+        with self._lock:
+            if self._estado != ESTADO_CERRADO:
+                self.logger.info("🟢 Circuito del LLM cerrado")
+            self._estado = ESTADO_CERRADO
+            self._fallos = 0
+            self._prueba_en_curso = False
+    
+    def registrar_fallo(self) -> None:
+        """El LLM falló con un error transitorio: cuenta para abrir el circuito"""
+        with self._lock:
+            self._fallos += 1
+            
+            if self._estado == ESTADO_SEMIABIERTO or self._fallos >= self.umbral_fallos:
+                if self._estado != ESTADO_ABIERTO:
+                    self.aperturas += 1
+                    self.logger.warning(
+                        f"🔴 Circuito del LLM abierto ({self._fallos} fallos), "
+                        f"se reintenta en {self.enfriamiento:.0f}s"
+                    )
+                self._estado = ESTADO_ABIERTO
+                self._abierto_desde = time.monotonic()
+            
+            self._prueba_en_curso = False
+    
+    def descartar(self) -> None:
+        """La llamada terminó sin decir nada del LLM (cancelada o saturada): libera la prueba"""
+        with self._lock:
+            self._prueba_en_curso = False
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna el estado del circuito.
+        
+        Returns:
+            Diccionario con estado, fallos seguidos, aperturas y llamadas rechazadas
+        """
+        estado = self.estado
+        with self._lock:
+            return {
+                "estado": estado,
+                "fallos_seguidos": self._fallos,
+                "aperturas": self.aperturas,
+                "rechazadas": self.rechazadas
+            }
+
+
+class PoliticaResiliencia:
+    """
+    Envuelve las llamadas al LLM.
+    
+    - Deadline por intento: una llamada colgada no retiene al llamador
+    - Reintentos de errores transitorios con backoff exponencial y jitter
+      completo (espera aleatoria entre 0 y base·2^intento)
+    - Cobertura opcional: si un intento tarda más que el percentil
+      configurado de las latencias recientes, se lanza un segundo pedido
+      y gana el primero que responde
+    - Circuit breaker: con el circuito abierto falla enseguida con
+      CircuitoAbiertoError
+    
+    El turno del planificador se toma dentro de cada intento, así la
+    espera en cola no consume el deadline y cada reintento respeta RPM/TPM.
+    """
+    
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        reintentos: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None,
+        percentil_cobertura: Optional[float] = None,
+        circuito: Optional[CircuitBreaker] = None
+    ):
+        """
+        Inicializa la política.
+        
+        Args:
+            timeout: Segundos máximos por intento (default: settings)
+            reintentos: Reintentos tras el primer intento (default: settings)
+            backoff_base: Espera base entre reintentos en segundos (default: settings)
+            backoff_max: Espera máxima entre reintentos (default: settings)
+            percentil_cobertura: Percentil de latencia que dispara el pedido
+                de cobertura; 0 = deshabilitado (default: settings)
+            circuito: Circuit breaker (default: uno nuevo con settings)
+        """
+        self.logger = setup_logger("ResilienciaLLM")
+        self.timeout = timeout if timeout is not None else settings.llm_timeout
+        self.reintentos = max(0, reintentos if reintentos is not None else settings.llm_reintentos)
+        self.backoff_base = backoff_base if backoff_base is not None else settings.llm_backoff_base
+        self.backoff_max = backoff_max if backoff_max is not None else settings.llm_backoff_max
+        self.percentil_cobertura = (
+            percentil_cobertura if percentil_cobertura is not None else settings.llm_percentil_cobertura
+        )
+        self.circuito = circuito or CircuitBreaker()
+        
+        self._latencias: deque = deque(maxlen=MAX_MUESTRAS_LATENCIA)
+        
+        self.reintentadas = 0
+        self.timeouts = 0
+        self.coberturas = 0
+    
+    def espera_reintento(self, intento: int) -> float:
+        """
+        Backoff exponencial con jitter completo.
+        
+        Args:
+            intento: Número de intento fallido (0 = el primero)
+        
+        Returns:
+            Segundos a esperar antes del siguiente intento
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** intento)))
+    
+    def demora_cobertura(self) -> Optional[float]:
+        """
+        Segundos tras los que se lanza el pedido de cobertura.
+        
+        Returns:
+            Percentil de las latencias recientes, o None si la cobertura
+            está deshabilitada o todavía no hay muestras suficientes
+        """
+        if not self.percentil_cobertura or len(self._latencias) < MIN_MUESTRAS_COBERTURA:
+            return None
+        
+        ordenadas = sorted(self._latencias)
+        posicion = min(len(ordenadas) - 1, int(len(ordenadas) * self.percentil_cobertura / 100))
+        return ordenadas[posicion]
+    
+    def _registrar_error(self, error: Exception, intento: int) -> bool:
+        """
+        Actualiza el circuito tras un intento fallido.
+        
+        Returns:
+            True si hay que reintentar
+        """
+        if isinstance(error, LLMSaturadoError):
+            self.circuito.descartar()
+            return False
+        
+        if not es_reintentable(error):
+            # El LLM respondió (contenido bloqueado, pedido inválido...): no está caído
+            self.circuito.registrar_exito()
+            return False
+        
+        if isinstance(error, ERRORES_TIMEOUT):
+            self.timeouts += 1
+        
+        self.circuito.registrar_fallo()
+        
+        if intento >= self.reintentos or self.circuito.estado == ESTADO_ABIERTO:
+            return False
+        
+        self.reintentadas += 1
+        self.logger.warning(f"⚠️ Error transitorio del LLM (intento {intento + 1}), reintentando: {error!r}")
+        return True
+    
+    async def _intento(
+        self,
+        llamada: Callable[[], Awaitable[T]],
+        turno: Optional[Callable[[], AsyncContextManager]]
+    ) -> T:
+        """Un intento con deadline dentro del turno del planificador"""
+        async with (turno() if turno is not None else nullcontext()):
+            inicio = time.monotonic()
+            resultado = await con_deadline(llamada(), self.timeout)
+            self._latencias.append(time.monotonic() - inicio)
+            return resultado
+    
+    async def _con_cobertura(
+        self,
+        llamada: Callable[[], Awaitable[T]],
+        turno: Optional[Callable[[], AsyncContextManager]]
+    ) -> T:
+        """Intento con un segundo pedido si el primero se demora"""
+        demora = self.demora_cobertura()
+        if demora is None:
+            return await self._intento(llamada, turno)
+        
+        pendientes = {asyncio.ensure_future(self._intento(llamada, turno))}
+        
+        try:
+            hechas, pendientes = await asyncio.wait(pendientes, timeout=demora)
+            if not hechas:
+                self.coberturas += 1
+                self.logger.debug(f"Intento más lento que {demora:.2f}s, se lanza un pedido de cobertura")
+                pendientes.add(asyncio.ensure_future(self._intento(llamada, turno)))
+            
+            error = None
+            while True:
+                for tarea in hechas:
+                    if tarea.exception() is None:
+                        return tarea.result()
+                    error = tarea.exception()
+                
+                if not pendientes:
+                    raise error
+                
+                hechas, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for tarea in pendientes:
+                tarea.cancel()
+    
+    async def ejecutar(
+        self,
+        llamada: Callable[[], Awaitable[T]],
+        turno: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> T:
+        """
+        Ejecuta una llamada al LLM con deadline, reintentos, cobertura y circuito.
+        
+        Args:
+            llamada: Función sin argumentos que retorna la corrutina a ejecutar
+            turno: Función que retorna el turno del planificador para cada intento
+        
+        Returns:
+            Resultado de la llamada
+        
+        Raises:
+            CircuitoAbiertoError: Si el circuito está abierto
+            TimeoutError: Si se agotaron los intentos por deadline
+        """
+        for intento in range(self.reintentos + 1):
+            self.circuito.verificar()
+            
+            try:
+                resultado = await self._con_cobertura(llamada, turno)
+            except asyncio.CancelledError:
+                self.circuito.descartar()
+                raise
+            except Exception as e:
+                if not self._registrar_error(e, intento):
+                    raise
+                await asyncio.sleep(self.espera_reintento(intento))
+                continue
+            
+            self.circuito.registrar_exito()
+            return resultado
+    
+    async def stream(
+        self,
+        abrir: Callable[[], AsyncIterator[str]],
+        turno: Optional[Callable[[], AsyncContextManager]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Versión streaming de ejecutar().
+        
+        El deadline vale para cada fragmento. Sólo se reintenta antes del
+        primer fragmento y no hay cobertura (duplicaría la respuesta).
+        
+        Args:
+            abrir: Función que retorna el stream del LLM
+            turno: Función que retorna el turno del planificador para cada intento
+        
+        Yields:
+            Fragmentos de la respuesta
+        
+        Raises:
+            CircuitoAbiertoError: Si el circuito está abierto
+        """
+        for intento in range(self.reintentos + 1):
+            self.circuito.verificar()
+            entregados = 0
+            terminado = False
+            
+            try:
+                async with (turno() if turno is not None else nullcontext()):
+                    fragmentos = abrir()
+                    try:
+                        while True:
+                            try:
+                                fragmento = await con_deadline(fragmentos.__anext__(), self.timeout)
+                            except StopAsyncIteration:
+                                break
+                            entregados += 1
+                            yield fragmento
+                    finally:
+                        if hasattr(fragmentos, "aclose"):
+                            await fragmentos.aclose()
+                
+                terminado = True
+                self.circuito.registrar_exito()
+                return
+            except Exception as e:
+                terminado = True
+                # Con fragmentos ya entregados no se puede volver a empezar
+                if not self._registrar_error(e, self.reintentos if entregados else intento):
+                    raise
+            finally:
+                # Stream abandonado por el consumidor o cancelado
+                if not terminado:
+                    self.circuito.descartar()
+            
+            await asyncio.sleep(self.espera_reintento(intento))
+    
+    def ejecutar_sync(self, llamada: Callable[[], T]) -> T:
+        """
+        Versión sincrónica de ejecutar(): reintentos y circuito, sin deadline
+        ni cobertura (una llamada sincrónica no se puede interrumpir).
+        
+        Args:
+            llamada: Función sin argumentos a ejecutar
+        
+        Returns:
+            Resultado de la llamada
+        
+        Raises:
+            CircuitoAbiertoError: Si el circuito está abierto
+        """
+        for intento in range(self.reintentos + 1):
+            self.circuito.verificar()
+            
+            try:
+                resultado = llamada()
+            except Exception as e:
+                if not self._registrar_error(e, intento):
+                    raise
+                time.sleep(self.espera_reintento(intento))
+                continue
+            
+            self.circuito.registrar_exito()
+            return resultado
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna el estado de la política.
+        
+        Returns:
+            Diccionario con reintentos, timeouts, coberturas, demora de
+            cobertura y el estado del circuito
+        """
+        return {
+            "reintentadas": self.reintentadas,
+            "timeouts": self.timeouts,
+            "coberturas": self.coberturas,
+            "demora_cobertura": self.demora_cobertura(),
+            "circuito": self.circuito.estadisticas()
+        }
\ No newline at end of file
@@ -0,0 +1,297 @@
+# src/ai/scheduler.py
+"""
+🚦 Planificador de llamadas a Gemini
+Limita concurrencia y ritmo (RPM/TPM) y prioriza las consultas interactivas
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+T = TypeVar("T")
+
+MENSAJE_SATURADO = (
+    "⏳ Estoy recibiendo muchas consultas en este momento. "
+    "Por favor, intenta de nuevo en unos segundos o consulta el calendario en "
+    "https://www.unvime.edu.ar/calendario/"
+)
+
+
+class PrioridadLLM:
+    """Prioridades de las llamadas al LLM (menor = antes)"""
+    INTERACTIVA = 0   # Mensajes directos de usuarios (Discord, WhatsApp)
+    FONDO = 10        # Precálculos y tareas programadas
+
+
+class LLMSaturadoError(Exception):
+    """La cola del LLM está llena y la llamada fue descartada"""
+
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Estima los tokens de un texto (~4 caracteres por token).
+    
+    Args:
+        texto: Texto a enviar
+    
+    Returns:
+        Cantidad aproximada de tokens
+    """
+    return max(1, len(texto) // 4)
+
+
+class TokenBucket:
+    """
+    Balde de tokens con recarga continua.
+    
+    reservar() descuenta siempre y devuelve cuánto hay que esperar
+    hasta que el saldo vuelva a ser positivo, así las reservas se
+    atienden en el orden en que se hicieron.
+    """
+    
+    def __init__(self, capacidad: float, por_minuto: float):
+        """
+        Inicializa el balde lleno.
+        
+        Args:
+            capacidad: Máximo acumulable
+            por_minuto: Tokens que se recargan por minuto
+        """
+        self.capacidad = float(capacidad)
+        self.por_segundo = por_minuto / 60.0
+        self._saldo = float(capacidad)
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _recargar(self) -> None:
+        """Suma lo recargado desde la última consulta"""
+        ahora = time.monotonic()
+        self._saldo = min(self.capacidad, self._saldo + (ahora - self._ultimo) * self.por_segundo)
+        self._ultimo = ahora
+    
+    def reservar(self, cantidad: float) -> float:
+        """
+        Reserva tokens.
+        
+        Args:
+            cantidad: Tokens a consumir (se recorta a la capacidad)
+        
+        Returns:
+            Segundos a esperar antes de usar la reserva (0 si hay saldo)
+        """
+        with self._lock:
+            self._recargar()
+            self._saldo -= min(float(cantidad), self.capacidad)
+            
+            if self._saldo >= 0:
+                return 0.0
+            return -self._saldo / self.por_segundo
+    
+    @property
+    def saldo(self) -> float:
+        """Saldo actual (negativo si hay reservas pendientes)"""
+        with self._lock:
+            self._recargar()
+            return self._saldo
+
+
+class LLMScheduler:
+    """
+    Controla el acceso a Gemini.
+    
+    - Semáforo de concurrencia: como máximo N llamadas en curso
+    - Cola con prioridad: las consultas interactivas pasan antes que las de fondo
+    - Baldes de tokens por requests y tokens por minuto (límites del modelo)
+    - Descarte: con la cola llena se expulsa la entrada menos prioritaria
+      o, si no hay ninguna peor, se rechaza la nueva con LLMSaturadoError
+    
+    Es seguro entre threads y event loops distintos (el loop de fondo
+    de los llamadores sincrónicos y el de Discord, por ejemplo).
+    """
+    
+    def __init__(
+        self,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        max_concurrencia: Optional[int] = None,
+        max_cola: Optional[int] = None
+    ):
+        """
+        Inicializa el planificador.
+        
+        Args:
+            rpm: Requests por minuto del modelo (default: settings)
+            tpm: Tokens por minuto del modelo (default: settings)
+            max_concurrencia: Llamadas simultáneas (default: settings)
+            max_cola: Llamadas esperando turno (default: settings)
+        """
+        self.logger = setup_logger("LLMScheduler")
+        self.rpm = rpm if rpm is not None else settings.llm_rpm
+        self.tpm = tpm if tpm is not None else settings.llm_tpm
+        self.max_concurrencia = max(1, max_concurrencia if max_concurrencia is not None else settings.llm_max_concurrencia)
+        self.max_cola = max_cola if max_cola is not None else settings.llm_max_cola
+        
+        self._requests = TokenBucket(self.rpm, self.rpm)
+        self._tokens = TokenBucket(self.tpm, self.tpm)
+        
+        # Entradas: (prioridad, orden, loop, future)
+        self._cola: List[Tuple[int, int, asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._orden = itertools.count()
+        self._en_curso = 0
+        self._lock = threading.Lock()
+        
+        self.completadas = 0
+        self.rechazadas = 0
+    
+    async def ejecutar(
+        self,
+        llamada: Callable[[], Awaitable[T]],
+        prioridad: int = PrioridadLLM.INTERACTIVA,
+        tokens: int = 1
+    ) -> T:
+        """
+        Ejecuta una llamada al LLM respetando los límites.
+        
+        Args:
+            llamada: Función sin argumentos que retorna la corrutina a ejecutar
+            prioridad: PrioridadLLM de la llamada
+            tokens: Tokens estimados (entrada + salida)
+        
+        Returns:
+            Resultado de la llamada
+        
+        Raises:
+            LLMSaturadoError: Si la cola está llena
+        """
+        async with self.turno(prioridad, tokens):
+            return await llamada()
+    
+    @asynccontextmanager
+    async def turno(self, prioridad: int = PrioridadLLM.INTERACTIVA, tokens: int = 1) -> AsyncIterator[None]:
+        """
+        Reserva un lugar para una llamada que dura todo el bloque (p. ej. streaming).
+        
+        Args:
+            prioridad: PrioridadLLM de la llamada
+            tokens: Tokens estimados (entrada + salida)
+        
+        Raises:
+            LLMSaturadoError: Si la cola está llena
+        """
+        await self._adquirir(prioridad)
+        
+        try:
+            espera = max(self._requests.reservar(1), self._tokens.reservar(tokens))
+            if espera > 0:
+                self.logger.debug(f"Límite de Gemini alcanzado, esperando {espera:.1f}s")
+                await asyncio.sleep(espera)
+            
+            yield
+            self.completadas += 1
+        finally:
+            self._liberar()
+    
+    async def _adquirir(self, prioridad: int) -> None:
+        """Espera un lugar de concurrencia según prioridad"""
+        loop = asyncio.get_running_loop()
+        
+        with self._lock:
+            if self._en_curso < self.max_concurrencia and not self._cola:
+                self._en_curso += 1
+                return
+            
+            if len(self._cola) >= self.max_cola:
+                peor = max(self._cola) if self._cola else None
+                
+                if peor is None or peor[0] <= prioridad:
+                    self.rechazadas += 1
+                    self.logger.warning(f"🚦 Cola del LLM llena ({self.max_cola}), llamada descartada")
+                    raise LLMSaturadoError("Cola del LLM llena")
+                
+                # Expulsar la entrada menos prioritaria para hacer lugar
+                self._cola.remove(peor)
+                heapq.heapify(self._cola)
+                self.rechazadas += 1
+                self.logger.warning(f"🚦 Cola del LLM llena, se descarta una llamada de prioridad {peor[0]}")
+                self._notificar(peor[2], peor[3], LLMSaturadoError("Cola del LLM llena"))
+            
+            entrada = (prioridad, next(self._orden), loop, loop.create_future())
+            heapq.heappush(self._cola, entrada)
+        
+        try:
+            await entrada[3]
+        except asyncio.CancelledError:
+            with self._lock:
+                en_cola = entrada in self._cola
+                if en_cola:
+                    self._cola.remove(entrada)
+                    heapq.heapify(self._cola)
+            
+            # Si el turno ya había sido concedido, devolverlo
+            if not en_cola:
+                self._liberar()
+            raise
+    
+    def _liberar(self) -> None:
+        """Cede el lugar a la siguiente entrada de la cola o lo devuelve"""
+        with self._lock:
+            while self._cola:
+                _, _, loop, future = heapq.heappop(self._cola)
+                if self._notificar(loop, future, None):
+                    return
+            
+            self._en_curso -= 1
+    
+    @staticmethod
+    def _notificar(loop: asyncio.AbstractEventLoop, future: asyncio.Future, error: Optional[Exception]) -> bool:
+        """Resuelve el future de una entrada en su propio loop"""
+        def resolver():
+            if not future.done():
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+        
+        try:
+            loop.call_soon_threadsafe(resolver)
+            return True
+        except RuntimeError:
+            # Loop cerrado: la entrada ya no espera
+            return False
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna el estado del planificador.
+        
+        Returns:
+            Diccionario con llamadas en curso, en cola, completadas y rechazadas
+        """
+        with self._lock:
+            return {
+                "en_curso": self._en_curso,
+                "en_cola": len(self._cola),
+                "max_concurrencia": self.max_concurrencia,
+                "max_cola": self.max_cola,
+                "completadas": self.completadas,
+                "rechazadas": self.rechazadas,
+                "rpm": self.rpm,
+                "tpm": self.tpm
+            }
+
+
+# Instancia global compartida por todos los clientes LLM
+_scheduler_instance = None
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Obtiene la instancia global del planificador"""
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = LLMScheduler()
+    return _scheduler_instance
\ No newline at end of file
@@ -0,0 +1,460 @@
+# src/ai/telemetria.py
+"""
+📊 Telemetría de las llamadas al LLM
+Tokens, espera en cola, tiempo al primer token, latencia, finish reason,
+contexto cacheado y costo estimado de cada llamada, agregados en histogramas
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+# Límites de las cubetas (el último tramo es "mayor al último límite")
+LIMITES_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+LIMITES_TOKENS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768)
+
+# finish_reason de Gemini cuando llega como número
+FINISH_REASONS = {0: "FINISH_REASON_UNSPECIFIED", 1: "STOP", 2: "MAX_TOKENS", 3: "SAFETY", 4: "RECITATION", 5: "OTHER"}
+
+SIN_DATO = "sin_dato"
+
+# Tarifas: cada modelo se cobra a su precio (el rápido de la cascada es más barato)
+TARIFA_PRINCIPAL = "principal"
+TARIFA_RAPIDO = "rapido"
+
+# Medición de la llamada en curso (los backends anotan el uso sin cambiar su firma)
+_medicion_actual: ContextVar[Optional["MedicionLLM"]] = ContextVar("medicion_llm", default=None)
+
+
+class Histograma:
+    """
+    Histograma de cubetas fijas: memoria constante sin importar cuántas
+    muestras se registren. Los percentiles son el límite superior de la
+    cubeta donde caen (acotado por el máximo observado).
+    """
+    
+    def __init__(self, limites: Sequence[float]):
+        """
+        Inicializa el histograma.
+        
+        Args:
+            limites: Límites superiores de las cubetas (inclusivos)
+        """
+        self.limites = tuple(sorted(limites))
+        self.cubetas = [0] * (len(self.limites) + 1)
+        self.cantidad = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+    
+    def registrar(self, valor: float) -> None:
+        """Suma una muestra"""
+        self.cubetas[bisect_left(self.limites, valor)] += 1
+        self.cantidad += 1
+        self.suma += valor
+        self.maximo = max(self.maximo, valor)
+    
+    def percentil(self, p: float) -> float:
+        """
+        Percentil aproximado.
+        
+        Args:
+            p: Percentil (0-100)
+        
+        Returns:
+            Valor del percentil (0 sin muestras)
+        """
+        if not self.cantidad:
+            return 0.0
+        
+        objetivo = p / 100 * self.cantidad
+        acumulado = 0
+        for indice, cantidad in enumerate(self.cubetas):
+            acumulado += cantidad
+            if acumulado >= objetivo and cantidad:
+                if indice == len(self.limites):
+                    return self.maximo
+                return min(float(self.limites[indice]), self.maximo)
+        
+        return self.maximo
+    
+    def resumen(self) -> Dict[str, Any]:
+        """
+        Retorna el estado del histograma.
+        
+        Returns:
+            Diccionario con cantidad, promedio, p50/p95/p99, máximo y cubetas
+        """
+        cubetas = {f"<={limite}": n for limite, n in zip(self.limites, self.cubetas)}
+        cubetas["+inf"] = self.cubetas[-1]
+        return {
+            "cantidad": self.cantidad,
+            "promedio": round(self.suma / self.cantidad, 2) if self.cantidad else 0.0,
+            "p50": round(self.percentil(50), 2),
+            "p95": round(self.percentil(95), 2),
+            "p99": round(self.percentil(99), 2),
+            "maximo": round(self.maximo, 2),
+            "cubetas": cubetas
+        }
+
+
+@dataclass
+class MedicionLLM:
+    """
+    Datos de una llamada al LLM (con sus reintentos y rondas de herramientas).
+    
+    Attributes:
+        operacion: chat, stream, sync o herramientas
+        backend: Nombre del backend
+        prioridad: PrioridadLLM de la llamada
+        tokens_prompt: Tokens de entrada (incluye los cacheados)
+        tokens_respuesta: Tokens generados
+        tokens_cacheados: Tokens de entrada servidos desde la caché del proveedor
+        tokens_estimados: True si el backend no informó el uso (se estima por caracteres)
+        espera_cola: Segundos esperando turno en el planificador
+        primer_token: Segundos hasta el primer fragmento
+        latencia: Segundos totales
+        intentos: Turnos tomados (reintentos y rondas incluidos)
+        finish_reason: Motivo de fin informado por el modelo
+        contexto_cacheado: Si el prefijo se usó desde la caché (None = sin prefijo)
+        error: Tipo de error si la llamada falló
+        costo: Costo estimado en USD
+        tarifa: Precios a aplicar (TARIFA_PRINCIPAL o TARIFA_RAPIDO)
+    """
+    operacion: str
+    backend: str
+    prioridad: int
+    tarifa: str = TARIFA_PRINCIPAL
+    tokens_prompt: int = 0
+    tokens_respuesta: int = 0
+    tokens_cacheados: int = 0
+    tokens_estimados: bool = True
+    espera_cola: float = 0.0
+    primer_token: Optional[float] = None
+    latencia: float = 0.0
+    intentos: int = 0
+    finish_reason: Optional[str] = None
+    contexto_cacheado: Optional[bool] = None
+    error: Optional[str] = None
+    costo: float = 0.0
+    inicio: float = field(default_factory=time.perf_counter, repr=False)
+    _uso: Dict[int, Tuple[int, int, int]] = field(default_factory=dict, repr=False)
+    
+    def anotar_uso(self, prompt: int, respuesta: int, cacheados: int = 0, ronda: int = 0) -> None:
+        """
+        Registra el uso informado por el proveedor.
+        
+        Cada ronda guarda su último valor (los fragmentos de un stream
+        traen totales acumulados) y la medición suma las rondas.
+        """
+        self._uso[ronda] = (prompt, respuesta, cacheados)
+        self.tokens_prompt = sum(uso[0] for uso in self._uso.values())
+        self.tokens_respuesta = sum(uso[1] for uso in self._uso.values())
+        self.tokens_cacheados = sum(uso[2] for uso in self._uso.values())
+        self.tokens_estimados = False
+    
+    def marcar_primer_token(self) -> None:
+        """Registra el primer fragmento (llamadas siguientes no hacen nada)"""
+        if self.primer_token is None:
+            self.primer_token = time.perf_counter() - self.inicio
+
+
+def _entero(valor: Any) -> int:
+    """Contador de usage_metadata (0 si falta)"""
+    return valor if isinstance(valor, int) else 0
+
+
+def anotar_respuesta(response: Any, ronda: int = 0) -> None:
+    """
+    Toma usage_metadata y finish_reason de una respuesta (o fragmento) de Gemini.
+    
+    Args:
+        response: Respuesta o fragmento de stream de Gemini
+        ronda: Ronda de herramientas a la que pertenece
+    """
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return
+    
+    uso = getattr(response, "usage_metadata", None)
+    prompt = _entero(getattr(uso, "prompt_token_count", 0))
+    if prompt:
+        medicion.anotar_uso(
+            prompt,
+            _entero(getattr(uso, "candidates_token_count", 0)),
+            _entero(getattr(uso, "cached_content_token_count", 0)),
+            ronda=ronda
+        )
+    
+    try:
+        razon = response.candidates[0].finish_reason
+    except (AttributeError, IndexError, TypeError):
+        return
+    
+    # Enum de proto (con .name) o número
+    nombre = getattr(razon, "name", None)
+    if isinstance(nombre, str) and razon:
+        medicion.finish_reason = nombre
+    elif isinstance(razon, int) and razon:
+        medicion.finish_reason = FINISH_REASONS.get(razon, str(razon))
+
+
+def anotar_contexto_cacheado(usado: bool) -> None:
+    """
+    Registra si el prefijo de la llamada salió de la caché del proveedor.
+    
+    Args:
+        usado: True si se usó el contexto cacheado, False si se envió completo
+    """
+    medicion = _medicion_actual.get()
+    if medicion is not None:
+        medicion.contexto_cacheado = usado
+
+
+@asynccontextmanager
+async def medir_turno(turno: AsyncContextManager) -> AsyncIterator[None]:
+    """
+    Envuelve un turno del planificador y suma la espera en cola a la medición.
+    
+    Args:
+        turno: Turno de LLMScheduler.turno()
+    """
+    medicion = _medicion_actual.get()
+    inicio = time.perf_counter()
+    
+    async with turno:
+        if medicion is not None:
+            medicion.espera_cola += time.perf_counter() - inicio
+            medicion.intentos += 1
+        yield
+
+
+class TelemetriaLLM:
+    """
+    Agrega las mediciones de todas las llamadas al LLM del proceso.
+    
+    - Histogramas de latencia, primer token, espera en cola y tokens de
+      entrada y salida (para dimensionar cuotas y detectar prompts inflados)
+    - Contadores por operación, finish reason, errores y contexto cacheado
+    - Costo estimado con los precios por millón de tokens de settings,
+      según la tarifa del modelo de cada llamada
+    """
+    
+    def __init__(
+        self,
+        precio_entrada: Optional[float] = None,
+        precio_salida: Optional[float] = None,
+        precio_cacheado: Optional[float] = None,
+        precios_rapido: Optional[Tuple[float, float, float]] = None
+    ):
+        """
+        Inicializa la telemetría.
+        
+        Args:
+            precio_entrada: USD por millón de tokens de entrada (default: settings)
+            precio_salida: USD por millón de tokens generados (default: settings)
+            precio_cacheado: USD por millón de tokens cacheados (default: settings)
+            precios_rapido: (entrada, salida, cacheado) del modelo rápido (default: settings)
+        """
+        self.logger = setup_logger("TelemetriaLLM")
+        self.precio_entrada = precio_entrada if precio_entrada is not None else settings.llm_precio_entrada
+        self.precio_salida = precio_salida if precio_salida is not None else settings.llm_precio_salida
+        self.precio_cacheado = precio_cacheado if precio_cacheado is not None else settings.llm_precio_cacheado
+        self.precios: Dict[str, Tuple[float, float, float]] = {
+            TARIFA_PRINCIPAL: (self.precio_entrada, self.precio_salida, self.precio_cacheado),
+            TARIFA_RAPIDO: precios_rapido or (
+                settings.llm_rapido_precio_entrada,
+                settings.llm_rapido_precio_salida,
+                settings.llm_rapido_precio_cacheado
+            ),
+        }
+        
+        self._lock = threading.Lock()
+        self.histogramas = {
+            "latencia_ms": Histograma(LIMITES_MS),
+            "primer_token_ms": Histograma(LIMITES_MS),
+            "espera_cola_ms": Histograma(LIMITES_MS),
+            "tokens_prompt": Histograma(LIMITES_TOKENS),
+            "tokens_respuesta": Histograma(LIMITES_TOKENS),
+        }
+        self.llamadas = 0
+        self.errores = 0
+        self.operaciones: Counter = Counter()
+        self.finish_reasons: Counter = Counter()
+        self.tipos_error: Counter = Counter()
+        self.contexto_aciertos = 0
+        self.contexto_fallos = 0
+        self.tokens_prompt = 0
+        self.tokens_respuesta = 0
+        self.tokens_cacheados = 0
+        self.tokens_estimados = 0
+        self.costo_total = 0.0
+        self.costo_por_tarifa: Counter = Counter()
+    
+    def costo(self, medicion: MedicionLLM) -> float:
+        """
+        Costo estimado de una llamada.
+        
+        Args:
+            medicion: Medición con los tokens
+        
+        Returns:
+            USD con los precios de su tarifa (los tokens cacheados se
+            cobran al precio de caché)
+        """
+        entrada, salida, cacheado = self.precios.get(medicion.tarifa, self.precios[TARIFA_PRINCIPAL])
+        nuevos = max(0, medicion.tokens_prompt - medicion.tokens_cacheados)
+        return (
+            nuevos * entrada
+            + medicion.tokens_cacheados * cacheado
+            + medicion.tokens_respuesta * salida
+        ) / 1_000_000
+    
+    def costo_de(self, tarifa: str) -> float:
+        """
+        Costo acumulado de las llamadas de una tarifa.
+        
+        Args:
+            tarifa: TARIFA_PRINCIPAL o TARIFA_RAPIDO
+        
+        Returns:
+            USD
+        """
+        with self._lock:
+            return self.costo_por_tarifa[tarifa]
+    
+    @contextmanager
+    def medir(
+        self,
+        operacion: str,
+        backend: str,
+        prioridad: int,
+        tarifa: str = TARIFA_PRINCIPAL
+    ) -> Iterator[MedicionLLM]:
+        """
+        Mide una llamada al LLM y la registra al terminar (también si falla).
+        
+        Args:
+            operacion: chat, rapido, stream, sync o herramientas
+            backend: Nombre del backend
+            prioridad: PrioridadLLM de la llamada
+            tarifa: Precios del modelo que atiende la llamada
+        
+        Yields:
+            MedicionLLM a completar durante la llamada
+        """
+        medicion = MedicionLLM(operacion=operacion, backend=backend, prioridad=prioridad, tarifa=tarifa)
+        token = _medicion_actual.set(medicion)
+        
+        try:
+            yield medicion
+        except BaseException as e:
+            medicion.error = type(e).__name__
+            raise
+        finally:
+            try:
+                _medicion_actual.reset(token)
+            except ValueError:
+                # Stream cerrado desde otro contexto (p. ej. al recolectarlo)
+                pass
+            self.registrar(medicion)
+    
+    def registrar(self, medicion: MedicionLLM) -> None:
+        """
+        Agrega una medición terminada.
+        
+        Args:
+            medicion: Medición de la llamada
+        """
+        if not medicion.latencia:
+            medicion.latencia = time.perf_counter() - medicion.inicio
+        medicion.costo = self.costo(medicion)
+        
+        with self._lock:
+            self.llamadas += 1
+            self.operaciones[medicion.operacion] += 1
+            self.histogramas["latencia_ms"].registrar(medicion.latencia * 1000)
+            self.histogramas["espera_cola_ms"].registrar(medicion.espera_cola * 1000)
+            
+            if medicion.error is not None:
+                self.errores += 1
+                self.tipos_error[medicion.error] += 1
+            else:
+                self.finish_reasons[medicion.finish_reason or SIN_DATO] += 1
+                self.histogramas["tokens_prompt"].registrar(medicion.tokens_prompt)
+                self.histogramas["tokens_respuesta"].registrar(medicion.tokens_respuesta)
+                if medicion.primer_token is not None:
+                    self.histogramas["primer_token_ms"].registrar(medicion.primer_token * 1000)
+            
+            if medicion.contexto_cacheado is True:
+                self.contexto_aciertos += 1
+            elif medicion.contexto_cacheado is False:
+                self.contexto_fallos += 1
+            
+            self.tokens_prompt += medicion.tokens_prompt
+            self.tokens_respuesta += medicion.tokens_respuesta
+            self.tokens_cacheados += medicion.tokens_cacheados
+            self.tokens_estimados += medicion.tokens_estimados
+            self.costo_total += medicion.costo
+            self.costo_por_tarifa[medicion.tarifa] += medicion.costo
+        
+        primer_token = f"{medicion.primer_token:.2f}s" if medicion.primer_token is not None else "-"
+        self.logger.debug(
+            f"📊 {medicion.operacion} ({medicion.backend}): "
+            f"{medicion.tokens_prompt}+{medicion.tokens_respuesta} tokens "
+            f"({medicion.tokens_cacheados} cacheados{', estimados' if medicion.tokens_estimados else ''}), "
+            f"cola {medicion.espera_cola:.2f}s, primer token {primer_token}, total {medicion.latencia:.2f}s, "
+            f"{medicion.error or medicion.finish_reason or SIN_DATO}, ${medicion.costo:.6f}"
+        )
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna las métricas agregadas.
+        
+        Returns:
+            Diccionario con contadores, tokens, costo e histogramas
+        """
+        with self._lock:
+            consultas_contexto = self.contexto_aciertos + self.contexto_fallos
+            return {
+                "llamadas": self.llamadas,
+                "errores": self.errores,
+                "operaciones": dict(self.operaciones),
+                "finish_reasons": dict(self.finish_reasons),
+                "tipos_error": dict(self.tipos_error),
+                "contexto_cacheado": {
+                    "aciertos": self.contexto_aciertos,
+                    "fallos": self.contexto_fallos,
+                    "hit_rate": round(self.contexto_aciertos / consultas_contexto, 3) if consultas_contexto else 0.0
+                },
+                "tokens": {
+                    "prompt": self.tokens_prompt,
+                    "respuesta": self.tokens_respuesta,
+                    "cacheados": self.tokens_cacheados,
+                    "llamadas_estimadas": self.tokens_estimados
+                },
+                "costo_usd": {
+                    "total": round(self.costo_total, 6),
+                    "por_llamada": round(self.costo_total / self.llamadas, 6) if self.llamadas else 0.0,
+                    "por_tarifa": {tarifa: round(costo, 6) for tarifa, costo in self.costo_por_tarifa.items()}
+                },
+                "histogramas": {nombre: h.resumen() for nombre, h in self.histogramas.items()}
+            }
+
+
+# Instancia global compartida por todos los clientes LLM
+_telemetria_instance = None
+
+
+def get_telemetria_llm() -> TelemetriaLLM:
+    """Obtiene la instancia global de la telemetría del LLM"""
+    global _telemetria_instance
+    if _telemetria_instance is None:
+        _telemetria_instance = TelemetriaLLM()
+    return _telemetria_instance
@@ -6,6 +6,9 @@ Define valores que NO cambian durante la ejecución
 
 from datetime import timedelta
 
+# Fuentes de eventos (forman parte del ID estable de cada evento)
+FUENTE_UNVIME = "unvime"
+
 # URLs
 UNVIME_CALENDAR_URL = "https://www.unvime.edu.ar/calendario/"
 UNVIME_LOGO_URL = "https://www.unvime.edu.ar/wp-content/uploads/2019/06/Logo-UNViMe-2019-Negro-Oscuro-600x600.png"
@@ -14,6 +17,21 @@ UNVIME_LOGO_URL = "https://www.unvime.edu.ar/wp-content/uploads/2019/06/Logo-UNV
 SCRAPING_TIMEOUT = 10  # segundos
 USER_AGENT = "Pregon-Bot/1.0 (UNViMe Calendar Bot; +https://github.com/markgoddar/Pregon)"
 
+# Ejecución de trabajo bloqueante (timeouts en segundos)
+EXECUTOR_TIMEOUT_DEFAULT = 30
+EXECUTOR_TIMEOUT_SCRAPING = SCRAPING_TIMEOUT + 5
+EXECUTOR_TIMEOUT_PARSING = 30
+EXECUTOR_TIMEOUT_GOOGLE_API = 20
+EXECUTOR_TIMEOUT_NOTIFICACION = 20
+EXECUTOR_TIMEOUT_LINKS = 15
+
+# Event loop de fondo para llamadores sincrónicos (segundos)
+LOOP_TIMEOUT_DEFAULT = 60
+
+# Paginación de herramientas MCP
+MCP_LIMITE_DEFAULT = 50
+MCP_LIMITE_MAXIMO = 200
+
 # Configuración de eventos
 DIAS_ANTICIPACION = 7  # Cuántos días adelante buscar eventos
 TIMEDELTA_SEMANA = timedelta(days=DIAS_ANTICIPACION)
@@ -81,6 +99,12 @@ CSS_SELECTORS = {
 DISCORD_EMBED_COLOR = 3447003  # Azul
 DISCORD_MAX_DESCRIPTION_LENGTH = 2048
 DISCORD_MAX_FIELD_VALUE_LENGTH = 1024
+DISCORD_INTERVALO_EDICION = 1.2  # segundos entre ediciones (límite: 5 cada 5 s por canal)
+
+# Canales de chat (formato de las respuestas y clave de la caché)
+CANAL_DISCORD = 'discord'
+CANAL_WHATSAPP = 'whatsapp'
+CANALES_CHAT = (CANAL_DISCORD, CANAL_WHATSAPP)
 
 # Configuración de logging
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -75,6 +75,130 @@ class Settings(BaseSettings):
         default=1000,
         description="Máximo de tokens en respuestas"
     )
+    llm_rpm: int = Field(
+        default=15,
+        description="Requests por minuto permitidos por el modelo"
+    )
+    llm_tpm: int = Field(
+        default=1_000_000,
+        description="Tokens por minuto permitidos por el modelo"
+    )
+    llm_max_concurrencia: int = Field(
+        default=4,
+        description="Llamadas simultáneas a Gemini"
+    )
+    llm_max_cola: int = Field(
+        default=32,
+        description="Llamadas esperando turno antes de descartar"
+    )
+    llm_prompt_max_tokens: int = Field(
+        default=2000,
+        description="Presupuesto de tokens del prompt (instrucciones + eventos + pregunta)"
+    )
+    fast_path_umbral: float = Field(
+        default=0.75,
+        description="Confianza mínima para responder sin LLM (mayor a 1 = deshabilitar)"
+    )
+    llm_function_calling: bool = Field(
+        default=True,
+        description="Dejar que Gemini consulte el calendario con las herramientas MCP"
+    )
+    llm_max_rondas_herramientas: int = Field(
+        default=3,
+        description="Rondas máximas de llamadas a herramientas por pregunta"
+    )
+    llm_backend: str = Field(
+        default="gemini",
+        description="Backend del LLM: gemini | fake (sin red) | cassette (grabar/reproducir)"
+    )
+    llm_fake_latencia: float = Field(
+        default=0.0,
+        description="Segundos por respuesta del backend fake"
+    )
+    llm_cassette_path: str = Field(
+        default="cache/llm_cassette.json",
+        description="Archivo del casete de respuestas del LLM"
+    )
+    llm_cassette_modo: str = Field(
+        default="replay",
+        description="Modo del casete: record (graba con Gemini) | replay (reproduce sin red)"
+    )
+    llm_timeout: float = Field(
+        default=30.0,
+        description="Segundos máximos por intento de llamada al LLM"
+    )
+    llm_reintentos: int = Field(
+        default=2,
+        description="Reintentos ante errores transitorios del LLM (timeouts, 429, 5xx)"
+    )
+    llm_backoff_base: float = Field(
+        default=0.5,
+        description="Espera base entre reintentos en segundos (exponencial con jitter)"
+    )
+    llm_backoff_max: float = Field(
+        default=8.0,
+        description="Espera máxima entre reintentos en segundos"
+    )
+    llm_percentil_cobertura: float = Field(
+        default=0.0,
+        description="Percentil de latencia tras el que se lanza un pedido de cobertura (0 = deshabilitado)"
+    )
+    llm_circuito_fallos: int = Field(
+        default=5,
+        description="Fallos transitorios seguidos que abren el circuito del LLM"
+    )
+    llm_circuito_enfriamiento: float = Field(
+        default=60.0,
+        description="Segundos con el circuito abierto antes de volver a probar el LLM"
+    )
+    llm_cache_contexto: bool = Field(
+        default=True,
+        description="Cachear en Gemini las instrucciones y el calendario de cada snapshot"
+    )
+    llm_cache_contexto_ttl: int = Field(
+        default=3600,
+        description="Segundos de vida del contexto cacheado en Gemini"
+    )
+    llm_cache_contexto_min_tokens: int = Field(
+        default=1024,
+        description="Tokens mínimos del prefijo para cachearlo (mínimo del modelo)"
+    )
+    llm_cascada: bool = Field(
+        default=True,
+        description="Probar primero el modelo rápido con las preguntas simples"
+    )
+    llm_model_rapido: str = Field(
+        default="gemini-2.5-flash-lite",
+        description="Modelo rápido y barato de la cascada (vacío = sin cascada)"
+    )
+    llm_cascada_max_tokens: int = Field(
+        default=512,
+        description="Tokens máximos de respuesta del modelo rápido"
+    )
+    llm_precio_entrada: float = Field(
+        default=0.30,
+        description="USD por millón de tokens de entrada (costo estimado en la telemetría)"
+    )
+    llm_precio_salida: float = Field(
+        default=2.50,
+        description="USD por millón de tokens generados"
+    )
+    llm_precio_cacheado: float = Field(
+        default=0.075,
+        description="USD por millón de tokens de entrada servidos desde la caché de contexto"
+    )
+    llm_rapido_precio_entrada: float = Field(
+        default=0.10,
+        description="USD por millón de tokens de entrada del modelo rápido"
+    )
+    llm_rapido_precio_salida: float = Field(
+        default=0.40,
+        description="USD por millón de tokens generados por el modelo rápido"
+    )
+    llm_rapido_precio_cacheado: float = Field(
+        default=0.025,
+        description="USD por millón de tokens cacheados del modelo rápido"
+    )
     
     # Google Calendar
     google_credentials_path: str = Field(
@@ -93,6 +217,37 @@ class Settings(BaseSettings):
     # Cache
     enable_cache: bool = Field(default=True, description="Habilitar sistema de caché")
     cache_ttl: int = Field(default=3600, description="Tiempo de vida del caché en segundos")
+    mcp_response_cache_size: int = Field(
+        default=256,
+        description="Respuestas MCP serializadas en caché (0 = deshabilitar)"
+    )
+    answer_cache_size: int = Field(
+        default=512,
+        description="Respuestas del chatbot en caché (0 = deshabilitar)"
+    )
+    answer_cache_similitud: float = Field(
+        default=0.75,
+        description="Similitud mínima (Jaccard) para reutilizar una respuesta"
+    )
+    answer_cache_precalentar: bool = Field(
+        default=True,
+        description="Pregenerar las respuestas a preguntas frecuentes al publicar el calendario y a medianoche"
+    )
+    
+    # Memoria de conversación por usuario
+    conversacion_max_usuarios: int = Field(
+        default=1000,
+        description="Conversaciones recordadas a la vez, LRU (0 = deshabilitar)"
+    )
+    conversacion_max_turnos: int = Field(default=4, description="Turnos recordados por usuario")
+    conversacion_ttl: int = Field(default=1800, description="Segundos de inactividad antes de olvidar")
+    
+    # Ejecución de trabajo bloqueante
+    executor_max_threads: int = Field(default=8, description="Threads para I/O bloqueante (scraping, APIs)")
+    executor_max_procesos: int = Field(
+        default=1,
+        description="Procesos para parsing CPU-intensivo (0 = usar threads)"
+    )
     
     # Configuración de Pydantic
     model_config = SettingsConfigDict(
@@ -134,7 +289,11 @@ class Settings(BaseSettings):
         ])
     
     def is_ai_enabled(self) -> bool:
-        """Verifica si Gemini está configurado"""
+        """Verifica si el LLM está configurado (Gemini o un backend local)"""
+        if self.llm_backend.lower() == "fake":
+            return True
+        if self.llm_backend.lower() == "cassette" and self.llm_cassette_modo == "replay":
+            return True
         return self.gemini_api_key is not None
     
     def is_google_calendar_enabled(self) -> bool:
@@ -17,11 +17,50 @@ class CalendarManager:
     a su Google Calendar de forma individual o grupal.
     """
     
-    def __init__(self):
+    def __init__(self, calendar_service: Optional[GoogleCalendarService] = None):
+        """
+        Inicializa el gestor.
+        
+        Args:
+            calendar_service: Servicio de Google Calendar (default: el del contenedor,
+                autenticado recién en el primer uso)
+        """
         self.logger = setup_logger("CalendarManager")
-        self.calendar_service = GoogleCalendarService()
+        self._calendar_service = calendar_service
         self.link_generator = CalendarLinkGenerator()
     
+    @property
+    def calendar_service(self) -> GoogleCalendarService:
+        """Servicio de Google Calendar (OAuth en el primer acceso, bloqueante)"""
+        if self._calendar_service is None:
+            from src.services.container import get_container
+            self._calendar_service = get_container().google_calendar
+        return self._calendar_service
+    
+    def agregar_evento(self, evento: Evento) -> Optional[Dict]:
+        """
+        Agrega un evento a Google Calendar (bloqueante: usar desde el executor).
+        
+        Args:
+            evento: Evento a agregar
+            
+        Returns:
+            Resultado de GoogleCalendarService.agregar_evento
+        """
+        return self.calendar_service.agregar_evento(evento)
+    
+    def agregar_multiples_eventos(self, eventos: List[Evento]) -> Dict:
+        """
+        Agrega varios eventos a Google Calendar (bloqueante: usar desde el executor).
+        
+        Args:
+            eventos: Eventos a agregar
+            
+        Returns:
+            Resumen de GoogleCalendarService.agregar_multiples_eventos
+        """
+        return self.calendar_service.agregar_multiples_eventos(eventos)
+    
     def generar_opciones_seleccion(self, eventos: List[Evento]) -> Dict:
         """
         Genera opciones de selección para los eventos.
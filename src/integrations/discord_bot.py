@@ -4,15 +4,85 @@
 Permite a estudiantes consultar el calendario mediante comandos
 """
 
+import time
 import discord
 from discord.ext import commands
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
 from datetime import datetime
 from src.ai.chatbot import CalendarioChatbot
 from src.models.evento import Evento
 from src.config.settings import settings
+from src.config.constants import (
+    CANAL_DISCORD,
+    DISCORD_INTERVALO_EDICION,
+    DISCORD_MAX_DESCRIPTION_LENGTH,
+    EXECUTOR_TIMEOUT_SCRAPING,
+    EXECUTOR_TIMEOUT_PARSING,
+    EXECUTOR_TIMEOUT_GOOGLE_API,
+    EXECUTOR_TIMEOUT_LINKS
+)
+from src.services.container import get_container
+from src.utils.executor import get_executor
 from src.utils.logger import setup_logger
 
+# Scraping + parsing corren en el mismo thread cuando se llama a métodos sync
+TIMEOUT_EVENTOS = EXECUTOR_TIMEOUT_SCRAPING + EXECUTOR_TIMEOUT_PARSING
+
+# Indicador de que la respuesta sigue llegando
+CURSOR_STREAM = " ▌"
+
+
+def _calendar_manager():
+    """CalendarManager compartido del contenedor (construirlo puede bloquear: usar desde el executor)"""
+    return get_container().calendar_manager
+
+
+async def transmitir_respuesta(
+    enviar: Callable[..., Awaitable[discord.Message]],
+    fragmentos: AsyncIterator[str],
+    crear_embed: Callable[[str], discord.Embed],
+    intervalo: float = DISCORD_INTERVALO_EDICION
+) -> discord.Message:
+    """
+    Publica una respuesta en streaming editando un único mensaje.
+    
+    El mensaje se envía con el primer fragmento y luego se edita como
+    mucho una vez por intervalo (límite de Discord); la última edición
+    deja el texto completo.
+    
+    Args:
+        enviar: Función para enviar el mensaje (ctx.send)
+        fragmentos: Fragmentos de la respuesta
+        crear_embed: Construye el embed a partir del texto acumulado
+        intervalo: Segundos mínimos entre ediciones
+    
+    Returns:
+        Mensaje publicado
+    """
+    def embed_de(texto: str) -> discord.Embed:
+        return crear_embed(texto[:DISCORD_MAX_DESCRIPTION_LENGTH])
+    
+    mensaje = None
+    texto = ""
+    ultima_edicion = 0.0
+    
+    async for fragmento in fragmentos:
+        texto += fragmento
+        ahora = time.monotonic()
+        
+        if mensaje is None:
+            mensaje = await enviar(embed=embed_de(texto + CURSOR_STREAM))
+            ultima_edicion = ahora
+        elif ahora - ultima_edicion >= intervalo:
+            await mensaje.edit(embed=embed_de(texto + CURSOR_STREAM))
+            ultima_edicion = ahora
+    
+    if mensaje is None:
+        return await enviar(embed=embed_de(texto))
+    
+    await mensaje.edit(embed=embed_de(texto))
+    return mensaje
+
 
 class PregonDiscordBot(commands.Bot):
     """
@@ -20,7 +90,13 @@ class PregonDiscordBot(commands.Bot):
     usando comandos y procesamiento de lenguaje natural con IA.
     """
     
-    def __init__(self):
+    def __init__(self, chatbot: Optional[CalendarioChatbot] = None):
+        """
+        Inicializa el bot.
+        
+        Args:
+            chatbot: Chatbot a usar (default: el compartido del contenedor)
+        """
         # Configurar intents (permisos del bot)
         intents = discord.Intents.default()
         intents.message_content = True
@@ -34,7 +110,7 @@ class PregonDiscordBot(commands.Bot):
         )
         
         self.logger = setup_logger("DiscordBot")
-        self.chatbot = CalendarioChatbot()
+        self.chatbot = chatbot or get_container().chatbot
         
         # Registrar comandos
         self._registrar_comandos()
@@ -53,6 +129,10 @@ class PregonDiscordBot(commands.Bot):
             await self.change_presence(
                 activity=discord.Game(name="!ayuda para comandos")
             )
+            
+            # Respuestas frecuentes listas antes de la primera pregunta
+            if settings.answer_cache_precalentar:
+                get_container().precalentador.iniciar()
         
         @self.event
         async def on_message(message):
@@ -135,23 +215,27 @@ class PregonDiscordBot(commands.Bot):
                 try:
                     self.logger.info(f"Pregunta de {ctx.author}: {consulta}")
                     
-                    # ✅ El chatbot ahora maneja el filtrado inteligente internamente
-                    respuesta = await self.chatbot.responder(consulta)
-                    
-                    # Crear embed bonito
-                    embed = discord.Embed(
-                        title="🤖 Respuesta del Asistente",
-                        description=respuesta,
-                        color=discord.Color.green()
-                    )
+                    def crear_embed(texto: str) -> discord.Embed:
+                        # Crear embed bonito
+                        embed = discord.Embed(
+                            title="🤖 Respuesta del Asistente",
+                            description=texto,
+                            color=discord.Color.green()
+                        )
+                        
+                        embed.set_footer(
+                            text=f"Pregunta de {ctx.author.name}",
+                            icon_url=ctx.author.avatar.url if ctx.author.avatar else None
+                        )
+                        return embed
                     
-                    embed.set_footer(
-                        text=f"Pregunta de {ctx.author.name}",
-                        icon_url=ctx.author.avatar.url if ctx.author.avatar else None
+                    # ✅ La respuesta aparece con los primeros tokens y se completa editando el mensaje
+                    await transmitir_respuesta(
+                        ctx.send,
+                        self.chatbot.responder_stream(consulta, usuario=f"discord:{ctx.author.id}", canal=CANAL_DISCORD),
+                        crear_embed
                     )
                     
-                    await ctx.send(embed=embed)
-                    
                 except Exception as e:
                     self.logger.error(f"Error procesando pregunta: {e}", exc_info=True)
                     await ctx.send(
@@ -166,8 +250,11 @@ class PregonDiscordBot(commands.Bot):
                 try:
                     self.logger.info(f"Comando eventos de {ctx.author}")
                     
-                    # Obtener eventos
-                    eventos = self.chatbot.obtener_eventos_semana()
+                    # Obtener eventos (fuera del event loop)
+                    eventos = await get_executor().ejecutar_io(
+                        self.chatbot.obtener_eventos_semana,
+                        timeout=TIMEOUT_EVENTOS
+                    )
                     
                     if not eventos:
                         await ctx.send("ℹ️ No hay eventos programados para la próxima semana.")
@@ -231,7 +318,6 @@ class PregonDiscordBot(commands.Bot):
                     self.logger.info(f"Búsqueda de {ctx.author}: {termino}")
                     
                     # Buscar eventos
-                    import asyncio
                     eventos = await self.chatbot.buscar_eventos(termino)
                     
                     if not eventos:
@@ -271,7 +357,11 @@ class PregonDiscordBot(commands.Bot):
                     self.logger.info(f"Comando hoy de {ctx.author}")
                     
                     # Obtener eventos de hoy
-                    eventos_hoy = self.chatbot.obtener_eventos_dia(datetime.now())
+                    eventos_hoy = await get_executor().ejecutar_io(
+                        self.chatbot.obtener_eventos_dia,
+                        datetime.now(),
+                        timeout=TIMEOUT_EVENTOS
+                    )
                     
                     if not eventos_hoy:
                         await ctx.send("ℹ️ No hay eventos programados para hoy.")
@@ -311,12 +401,17 @@ class PregonDiscordBot(commands.Bot):
             """
             async with ctx.typing():
                 try:
-                    from src.integrations.calendar_manager import CalendarManager
+                    executor = get_executor()
                     
-                    manager = CalendarManager()
+                    # Gestor compartido: la autenticación OAuth ocurre en el primer
+                    # agregado, dentro del executor
+                    manager = await executor.ejecutar_io(_calendar_manager, timeout=EXECUTOR_TIMEOUT_GOOGLE_API)
                     
                     # Obtener eventos de la semana
-                    eventos = self.chatbot.obtener_eventos_semana()
+                    eventos = await executor.ejecutar_io(
+                        self.chatbot.obtener_eventos_semana,
+                        timeout=TIMEOUT_EVENTOS
+                    )
                     
                     if not eventos:
                         await ctx.send("ℹ️ No hay eventos próximos para agregar.")
@@ -324,7 +419,12 @@ class PregonDiscordBot(commands.Bot):
                     
                     # Caso 1: Mostrar menú
                     if seleccion.lower() == "menu":
-                        embed_data = manager.generar_embed_discord_seleccionable(eventos)
+                        # Genera un link (acortado vía HTTP) por evento
+                        embed_data = await executor.ejecutar_io(
+                            manager.generar_embed_discord_seleccionable,
+                            eventos,
+                            timeout=EXECUTOR_TIMEOUT_LINKS * len(eventos)
+                        )
                         
                         import discord
                         embed = discord.Embed(
@@ -344,7 +444,11 @@ class PregonDiscordBot(commands.Bot):
                     elif seleccion.lower() == "todos" or seleccion.lower() == "all":
                         await ctx.send("📅 Agregando todos los eventos a Google Calendar...")
                         
-                        resultado = manager.calendar_service.agregar_multiples_eventos(eventos)
+                        resultado = await executor.ejecutar_io(
+                            manager.agregar_multiples_eventos,
+                            eventos,
+                            timeout=EXECUTOR_TIMEOUT_GOOGLE_API * len(eventos)
+                        )
                         
                         if resultado['exitosos'] > 0:
                             await ctx.send(
@@ -363,7 +467,11 @@ class PregonDiscordBot(commands.Bot):
                             
                             await ctx.send(f"📅 Agregando: {evento.titulo}...")
                             
-                            resultado = manager.calendar_service.agregar_evento(evento)
+                            resultado = await executor.ejecutar_io(
+                                manager.agregar_evento,
+                                evento,
+                                timeout=EXECUTOR_TIMEOUT_GOOGLE_API
+                            )
                             
                             if resultado:
                                 await ctx.send(
@@ -397,16 +505,25 @@ class PregonDiscordBot(commands.Bot):
             """
             async with ctx.typing():
                 try:
-                    from src.integrations.calendar_manager import CalendarManager
+                    executor = get_executor()
                     
-                    manager = CalendarManager()
-                    eventos = self.chatbot.obtener_eventos_semana()
+                    # Sólo genera links: no necesita autenticarse con Google
+                    manager = await executor.ejecutar_io(_calendar_manager, timeout=EXECUTOR_TIMEOUT_GOOGLE_API)
+                    eventos = await executor.ejecutar_io(
+                        self.chatbot.obtener_eventos_semana,
+                        timeout=TIMEOUT_EVENTOS
+                    )
                     
                     if not eventos:
                         await ctx.send("ℹ️ No hay eventos próximos.")
                         return
                     
-                    opciones = manager.generar_opciones_seleccion(eventos)
+                    # Genera un link (acortado vía HTTP) por evento
+                    opciones = await executor.ejecutar_io(
+                        manager.generar_opciones_seleccion,
+                        eventos,
+                        timeout=EXECUTOR_TIMEOUT_LINKS * len(eventos)
+                    )
                     
                     # ✅ Función helper para emojis
                     def get_emoji(categoria: str) -> str:
@@ -18,6 +18,10 @@ from src.config.settings import settings
 from src.utils.logger import setup_logger
 
 
+class AutorizacionPendienteError(RuntimeError):
+    """No hay un token válido de Google Calendar y el proceso no puede abrir el navegador"""
+
+
 class GoogleCalendarService:
     """
     Servicio para interactuar con Google Calendar API.
@@ -27,10 +31,21 @@ class GoogleCalendarService:
     # Scopes necesarios para Calendar
     SCOPES = ['https://www.googleapis.com/auth/calendar']
     
-    def __init__(self):
+    def __init__(self, interactivo: bool = True):
+        """
+        Inicializa y autentica el servicio.
+        
+        Args:
+            interactivo: Abrir el navegador si no hay token válido. Los bots
+                y el servidor MCP usan False: sin token fallan enseguida
+        
+        Raises:
+            AutorizacionPendienteError: Si falta el token y no es interactivo
+        """
         self.logger = setup_logger("GoogleCalendar")
         self.creds = None
         self.service = None
+        self.interactivo = interactivo
         
         # Rutas de credenciales
         self.credentials_path = settings.google_credentials_path
@@ -62,6 +77,11 @@ class GoogleCalendarService:
             if self.creds and self.creds.expired and self.creds.refresh_token:
                 self.logger.info("Refrescando token de Google Calendar...")
                 self.creds.refresh(Request())
+            elif not self.interactivo:
+                raise AutorizacionPendienteError(
+                    f"Google Calendar sin token válido en {self.token_path}; "
+                    "autorizar una vez con: python -m src.integrations.google_calendar_service"
+                )
             else:
                 self.logger.info("Iniciando autenticación OAuth 2.0...")
                 self.logger.info("Se abrirá un navegador para autorizar la aplicación")
@@ -226,4 +246,9 @@ class GoogleCalendarService:
             
         except HttpError as error:
             self.logger.error(f"Error listando eventos: {error}")
-            return []
\ No newline at end of file
+            return []
+
+
+if __name__ == "__main__":
+    # Autorización inicial: abre el navegador y guarda el token para los bots
+    GoogleCalendarService(interactivo=True)
\ No newline at end of file
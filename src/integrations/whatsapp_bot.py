@@ -7,7 +7,9 @@ Maneja respuestas de usuarios y comandos
 from typing import Dict, Optional
 from src.integrations.calendar_manager import CalendarManager
 from src.ai.chatbot import CalendarioChatbot
+from src.config.constants import CANAL_WHATSAPP
 from src.notifiers.whatsapp_notifier import WhatsAppNotifier
+from src.services.container import get_container
 from src.utils.logger import setup_logger
 
 
@@ -17,11 +19,25 @@ class WhatsAppBot:
     y permite interacción con el calendario.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        chatbot: Optional[CalendarioChatbot] = None,
+        notifier: Optional[WhatsAppNotifier] = None,
+        calendar_manager: Optional[CalendarManager] = None
+    ):
+        """
+        Inicializa el bot (las dependencias por defecto salen del contenedor).
+        
+        Args:
+            chatbot: Chatbot a usar
+            notifier: Notificador de WhatsApp (cliente de Twilio)
+            calendar_manager: Gestor de links de Google Calendar
+        """
         self.logger = setup_logger("WhatsAppBot")
-        self.notifier = WhatsAppNotifier()
-        self.chatbot = CalendarioChatbot()
-        self.calendar_manager = CalendarManager()
+        container = get_container()
+        self.notifier = notifier or container.whatsapp_notifier
+        self.chatbot = chatbot or container.chatbot
+        self.calendar_manager = calendar_manager or container.calendar_manager
         
         # Comandos disponibles
         self.comandos = {
@@ -52,7 +68,7 @@ class WhatsAppBot:
                 return handler(mensaje)
         
         # Si no es comando, usar IA para responder
-        return self._responder_con_ia(mensaje)
+        return self._responder_con_ia(mensaje, numero_remitente)
     
     def _cmd_eventos(self, mensaje: str) -> str:
         """Comando: EVENTOS - Muestra eventos de la semana"""
@@ -62,9 +78,7 @@ class WhatsAppBot:
             return "ℹ️ No hay eventos próximos programados."
         
         # Usar el método del notificador para formatear
-        from src.notifiers.whatsapp_notifier import WhatsAppNotifier
-        notifier = WhatsAppNotifier()
-        return notifier._construir_mensaje_interactivo(eventos)
+        return self.notifier._construir_mensaje_interactivo(eventos)
     
     def _cmd_calendario(self, mensaje: str) -> str:
         """Comando: CALENDARIO - Genera links para agregar eventos"""
@@ -100,10 +114,11 @@ Ejemplos:
 • "Dame todas las fechas importantes"
 """
     
-    def _responder_con_ia(self, pregunta: str) -> str:
-        """Responde usando IA"""
+    def _responder_con_ia(self, pregunta: str, numero_remitente: Optional[str] = None) -> str:
+        """Responde usando IA (con la conversación previa del remitente)"""
         try:
-            respuesta = self.chatbot.responder_sync(pregunta)
+            usuario = f"whatsapp:{numero_remitente}" if numero_remitente else None
+            respuesta = self.chatbot.responder_sync(pregunta, usuario=usuario, canal=CANAL_WHATSAPP)
             return respuesta
         except Exception as e:
             self.logger.error(f"Error usando IA: {e}", exc_info=True)
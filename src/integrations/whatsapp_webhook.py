@@ -4,14 +4,54 @@
 Requiere Flask y ngrok para desarrollo local
 """
 
+import os
+import threading
+from typing import Optional
 from flask import Flask, request
 from twilio.twiml.messaging_response import MessagingResponse
-from src.integrations.whatsapp_bot import WhatsAppBot
+from src.config.settings import settings
+from src.services.container import get_container
 from src.utils.logger import setup_logger
 
 app = Flask(__name__)
 logger = setup_logger("WhatsAppWebhook")
-bot = WhatsAppBot()
+bot = get_container().whatsapp_bot
+
+# PID del proceso que ya inició el precalentador (cada worker de gunicorn es un proceso)
+_precalentador_pid: Optional[int] = None
+_precalentador_lock = threading.Lock()
+
+
+def iniciar_precalentador() -> None:
+    """
+    Inicia el precalentado de respuestas una vez por proceso.
+    
+    Bajo gunicorn no se pasa por run_webhook_server: se inicia con el
+    primer request de cada worker (no en el import, que con --preload
+    corre en el master y sus threads no sobreviven al fork).
+    """
+    global _precalentador_pid
+    
+    if not settings.answer_cache_precalentar or _precalentador_pid == os.getpid():
+        return
+    
+    with _precalentador_lock:
+        if _precalentador_pid == os.getpid():
+            return
+        
+        try:
+            get_container().precalentador.iniciar()
+        except Exception as e:
+            # Sin precalentado las respuestas se generan al pedirlas
+            logger.error(f"No se pudo iniciar el precalentador: {e}", exc_info=True)
+        
+        _precalentador_pid = os.getpid()
+
+
+@app.before_request
+def antes_de_cada_request():
+    """Inicia el precalentador con el primer request de cada proceso"""
+    iniciar_precalentador()
 
 
 @app.route('/webhook', methods=['POST'])
@@ -53,6 +93,18 @@ def health():
     return {'status': 'ok', 'service': 'Pregon WhatsApp Webhook'}
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Métricas del LLM (tokens, latencias, costo) y de las cachés de respuestas"""
+    container = get_container()
+    return {
+        'llm': container.llm_client.estadisticas(),
+        'cascada': container.chatbot.cascada.estadisticas(),
+        'cache_respuestas': container.chatbot.answer_cache.estadisticas(),
+        'precalentador': container.precalentador.estadisticas()
+    }
+
+
 def run_webhook_server(port: int = 5000):
     """
     Inicia el servidor webhook.
@@ -64,4 +116,7 @@ def run_webhook_server(port: int = 5000):
     logger.info("⚠️ IMPORTANTE: Necesitas exponer este servidor con ngrok")
     logger.info("   Ejecuta en otra terminal: ngrok http 5000")
     
+    # Respuestas frecuentes listas antes del primer mensaje
+    iniciar_precalentador()
+    
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
@@ -0,0 +1,149 @@
+# src/mcp/paginacion.py
+"""
+📄 Paginación y proyección para herramientas MCP
+Cursores opacos estables, límite de resultados y selección de campos
+"""
+
+import base64
+import bisect
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from src.config.constants import MCP_LIMITE_DEFAULT, MCP_LIMITE_MAXIMO
+from src.models.evento import Evento
+
+FORMATO_COMPLETO = "completo"
+FORMATO_COMPACTO = "compacto"
+FORMATOS = (FORMATO_COMPLETO, FORMATO_COMPACTO)
+
+
+def _clave_orden(evento: Evento) -> Tuple[datetime, str]:
+    """Orden total de los eventos: fecha y, a igual fecha, ID"""
+    return (evento.fecha, evento.id)
+
+
+def codificar_cursor(evento: Evento) -> str:
+    """
+    Genera un cursor opaco que apunta justo después del evento.
+    
+    Se basa en (fecha, ID) y no en una posición, así que sigue siendo
+    válido aunque el snapshot cambie entre páginas.
+    
+    Args:
+        evento: Último evento de la página
+    
+    Returns:
+        Cursor en base64 url-safe
+    """
+    crudo = f"{evento.fecha.isoformat()}|{evento.id}".encode("utf-8")
+    return base64.urlsafe_b64encode(crudo).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decodifica un cursor generado por codificar_cursor().
+    
+    Args:
+        cursor: Cursor opaco
+    
+    Returns:
+        Tupla (fecha, ID) del último evento entregado
+    
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        fecha, evento_id = base64.urlsafe_b64decode(cursor + relleno).decode("utf-8").split("|", 1)
+        return datetime.fromisoformat(fecha), evento_id
+    except Exception:
+        raise ValueError(f"Cursor inválido: {cursor}")
+
+
+def normalizar_limite(limit: Optional[int]) -> int:
+    """
+    Acota el límite pedido a [1, MCP_LIMITE_MAXIMO].
+    
+    Args:
+        limit: Límite pedido (None: MCP_LIMITE_DEFAULT)
+    
+    Returns:
+        Límite efectivo
+    """
+    if limit is None:
+        return MCP_LIMITE_DEFAULT
+    return max(1, min(int(limit), MCP_LIMITE_MAXIMO))
+
+
+def paginar(
+    eventos: Iterable[Evento],
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[Evento], Optional[str]]:
+    """
+    Ordena los eventos y devuelve la página que sigue al cursor.
+    
+    Args:
+        eventos: Eventos ya filtrados
+        cursor: Cursor de la página anterior (None: desde el principio)
+        limit: Máximo de eventos por página
+    
+    Returns:
+        Tupla (eventos de la página, cursor siguiente o None si no hay más)
+    
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    ordenados = sorted(eventos, key=_clave_orden)
+    limite = normalizar_limite(limit)
+    
+    inicio = 0
+    if cursor:
+        inicio = bisect.bisect_right([_clave_orden(ev) for ev in ordenados], decodificar_cursor(cursor))
+    
+    pagina = ordenados[inicio:inicio + limite]
+    hay_mas = inicio + limite < len(ordenados)
+    
+    return pagina, codificar_cursor(pagina[-1]) if hay_mas and pagina else None
+
+
+def proyectar(
+    items: List[Dict[str, Any]],
+    campos_disponibles: Sequence[str],
+    fields: Optional[Sequence[str]] = None,
+    formato: Optional[str] = None
+) -> Tuple[Any, Optional[List[str]]]:
+    """
+    Aplica la selección de campos y el formato de salida.
+    
+    El campo "id" siempre se incluye para poder encadenar herramientas.
+    
+    Args:
+        items: Eventos ya convertidos a diccionario
+        campos_disponibles: Campos que produce la herramienta (en orden)
+        fields: Campos pedidos (None: todos)
+        formato: "completo" (lista de objetos) o "compacto" (filas)
+    
+    Returns:
+        Tupla (items proyectados, nombres de columna si el formato es compacto)
+    
+    Raises:
+        ValueError: Si se pide un campo o formato desconocido
+    """
+    formato = formato or FORMATO_COMPLETO
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}. Opciones: {', '.join(FORMATOS)}")
+    
+    campos = list(campos_disponibles)
+    if fields:
+        desconocidos = [f for f in fields if f not in campos_disponibles]
+        if desconocidos:
+            raise ValueError(f"Campos inválidos: {', '.join(desconocidos)}. Opciones: {', '.join(campos_disponibles)}")
+        campos = [c for c in campos_disponibles if c == "id" or c in fields]
+    
+    if formato == FORMATO_COMPACTO:
+        return [[item[c] for c in campos] for item in items], campos
+    
+    if fields:
+        return [{c: item[c] for c in campos} for item in items], None
+    
+    return items, None
\ No newline at end of file
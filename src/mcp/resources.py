@@ -0,0 +1,299 @@
+# src/mcp/resources.py
+"""
+📚 Recursos MCP del calendario académico
+Expone el snapshot completo y vistas por mes y por categoría, cada una con ETag
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from src.config.constants import CategoriaEvento, MESES_ESPANOL
+from src.models.evento import Evento
+from src.services.evento_repository import CalendarSnapshot, EventoRepository, huella_eventos
+from src.utils.event_loop import get_background_loop
+from src.utils.logger import setup_logger
+
+URI_CALENDARIO = "pregon://calendario"
+URI_MES = URI_CALENDARIO + "/mes/{mes}"
+URI_CATEGORIA = URI_CALENDARIO + "/categoria/{categoria}"
+
+MIME_JSON = "application/json"
+
+CATEGORIAS = (
+    CategoriaEvento.ACADEMICO,
+    CategoriaEvento.EXAMEN,
+    CategoriaEvento.FERIADO,
+    CategoriaEvento.ADMINISTRATIVO,
+    CategoriaEvento.RECESO,
+    CategoriaEvento.INSTITUCIONAL,
+    CategoriaEvento.OTRO,
+)
+
+NOMBRES_MESES = {numero: nombre for nombre, numero in MESES_ESPANOL.items()}
+
+# Suscriptores reciben la URI del recurso que cambió
+RecursoCallback = Callable[[str], None]
+
+
+def calcular_etag(eventos: List[Evento]) -> str:
+    """
+    Calcula el ETag de una vista: cambia sólo si cambian sus eventos.
+    
+    Args:
+        eventos: Eventos de la vista
+    
+    Returns:
+        Hash corto del contenido
+    """
+    return huella_eventos(eventos)
+
+
+class CalendarioResources:
+    """
+    Recursos MCP de sólo lectura sobre el snapshot del repositorio.
+    
+    - pregon://calendario: calendario completo
+    - pregon://calendario/mes/{1-12}: eventos de un mes
+    - pregon://calendario/categoria/{categoria}: eventos de una categoría
+    
+    Al publicarse un snapshot nuevo, sólo se notifican las URIs
+    suscriptas cuyo ETag cambió. Mientras haya suscriptores, el
+    snapshot se refresca en segundo plano al vencer el TTL (sin
+    esperar a que alguien lea un recurso).
+    """
+    
+    def __init__(self, repository: EventoRepository):
+        """
+        Inicializa los recursos y se suscribe a las publicaciones del repositorio.
+        
+        Args:
+            repository: Repositorio de eventos compartido
+        """
+        self.logger = setup_logger("CalendarioResources")
+        self.repository = repository
+        
+        self._suscripciones: Dict[str, List[RecursoCallback]] = {}
+        self._etags: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._refresco = None
+        
+        self.repository.suscribir(self._al_publicar)
+    
+    def _resolver(self, uri: str) -> Tuple[str, Callable[[Evento], bool]]:
+        """
+        Traduce una URI a (nombre, filtro de eventos).
+        
+        Raises:
+            ValueError: Si la URI no corresponde a ningún recurso
+        """
+        uri = str(uri).rstrip("/")
+        
+        if uri == URI_CALENDARIO:
+            return "Calendario académico completo", lambda ev: True
+        
+        prefijo_mes = URI_CALENDARIO + "/mes/"
+        if uri.startswith(prefijo_mes):
+            valor = uri[len(prefijo_mes):]
+            if valor.isdigit() and 1 <= int(valor) <= 12:
+                mes = int(valor)
+                return f"Eventos de {NOMBRES_MESES[mes]}", lambda ev: ev.fecha.month == mes
+        
+        prefijo_categoria = URI_CALENDARIO + "/categoria/"
+        if uri.startswith(prefijo_categoria):
+            categoria = uri[len(prefijo_categoria):].lower()
+            if categoria in CATEGORIAS:
+                return f"Eventos de categoría {categoria}", lambda ev: ev.categoria == categoria
+        
+        raise ValueError(f"Recurso desconocido: {uri}")
+    
+    def _vista(self, uri: str, snapshot: CalendarSnapshot) -> List[Evento]:
+        """Eventos del snapshot que pertenecen al recurso"""
+        _, filtro = self._resolver(uri)
+        return [ev for ev in snapshot.eventos if filtro(ev)]
+    
+    def listar_recursos(self, snapshot: Optional[CalendarSnapshot] = None) -> List[Dict[str, Any]]:
+        """
+        Lista los recursos disponibles (meses y categorías con eventos).
+        
+        Args:
+            snapshot: Snapshot a describir (default: el último publicado, sin scrapear)
+        
+        Returns:
+            Lista de descriptores MCP (uri, name, description, mimeType)
+        """
+        snapshot = snapshot or self.repository.snapshot_actual
+        uris = [URI_CALENDARIO]
+        
+        if snapshot is not None:
+            meses = sorted({ev.fecha.month for ev in snapshot.eventos})
+            categorias = sorted({ev.categoria for ev in snapshot.eventos})
+            uris += [URI_MES.format(mes=m) for m in meses]
+            uris += [URI_CATEGORIA.format(categoria=c) for c in categorias]
+        
+        recursos = []
+        for uri in uris:
+            nombre, _ = self._resolver(uri)
+            recursos.append({
+                "uri": uri,
+                "name": nombre,
+                "description": f"{nombre} (UNViMe)",
+                "mimeType": MIME_JSON
+            })
+        
+        return recursos
+    
+    def listar_plantillas(self) -> List[Dict[str, Any]]:
+        """
+        Lista las plantillas de URI de los recursos parametrizados.
+        
+        Returns:
+            Lista de plantillas MCP (uriTemplate, name, description, mimeType)
+        """
+        return [
+            {
+                "uriTemplate": URI_MES,
+                "name": "Eventos por mes",
+                "description": "Eventos de un mes (1-12)",
+                "mimeType": MIME_JSON
+            },
+            {
+                "uriTemplate": URI_CATEGORIA,
+                "name": "Eventos por categoría",
+                "description": f"Eventos de una categoría ({', '.join(CATEGORIAS)})",
+                "mimeType": MIME_JSON
+            },
+        ]
+    
+    async def leer_recurso(self, uri: str, snapshot: Optional[CalendarSnapshot] = None) -> Dict[str, Any]:
+        """
+        Lee un recurso.
+        
+        Args:
+            uri: URI del recurso
+            snapshot: Snapshot a leer (default: el vigente)
+        
+        Returns:
+            Contenido con uri, etag, versión del snapshot y eventos
+        
+        Raises:
+            ValueError: Si la URI no corresponde a ningún recurso
+        """
+        self._resolver(uri)
+        
+        if snapshot is None:
+            snapshot = await self.repository.obtener_snapshot_async()
+        
+        eventos = self._vista(uri, snapshot)
+        
+        return {
+            "uri": str(uri).rstrip("/"),
+            "etag": calcular_etag(eventos),
+            "snapshot": snapshot.version,
+            "total": len(eventos),
+            "eventos": [
+                {
+                    "id": ev.id,
+                    "titulo": ev.titulo,
+                    "fecha": ev.fecha.strftime("%Y-%m-%d"),
+                    "categoria": ev.categoria
+                }
+                for ev in eventos
+            ]
+        }
+    
+    def suscribir(self, uri: str, callback: RecursoCallback) -> None:
+        """
+        Registra un callback que se ejecuta cuando cambia el recurso.
+        
+        Args:
+            uri: URI del recurso
+            callback: Función que recibe la URI actualizada
+        
+        Raises:
+            ValueError: Si la URI no corresponde a ningún recurso
+        """
+        self._resolver(uri)
+        uri = str(uri).rstrip("/")
+        
+        with self._lock:
+            callbacks = self._suscripciones.setdefault(uri, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+            
+            if uri not in self._etags:
+                snapshot = self.repository.snapshot_actual
+                self._etags[uri] = calcular_etag(self._vista(uri, snapshot)) if snapshot else None
+            
+            if self._refresco is None:
+                self._refresco = self._programar(self._ciclo_refresco())
+    
+    def desuscribir(self, uri: str, callback: RecursoCallback) -> None:
+        """
+        Elimina un callback registrado.
+        
+        Args:
+            uri: URI del recurso
+            callback: Función registrada previamente
+        """
+        uri = str(uri).rstrip("/")
+        
+        with self._lock:
+            callbacks = self._suscripciones.get(uri, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            
+            if not callbacks:
+                self._suscripciones.pop(uri, None)
+                self._etags.pop(uri, None)
+            
+            if not self._suscripciones and self._refresco is not None:
+                self._refresco.cancel()
+                self._refresco = None
+    
+    @property
+    def refrescando(self) -> bool:
+        """True si el refresco en segundo plano está activo"""
+        return self._refresco is not None
+    
+    def _programar(self, coro):
+        """Corre una corrutina en el loop actual o, desde código sincrónico, en el loop de fondo"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return get_background_loop().submit(coro)
+        
+        return loop.create_task(coro)
+    
+    async def _ciclo_refresco(self) -> None:
+        """Refresca el snapshot cada vez que vence el TTL (las novedades se notifican al publicar)"""
+        espera = self.repository.segundos_hasta_expirar()
+        
+        while True:
+            await asyncio.sleep(espera)
+            
+            try:
+                await self.repository.refrescar_async()
+            except Exception as e:
+                self.logger.error(f"Error refrescando el calendario para los suscriptores: {e}", exc_info=True)
+            
+            # Si el scraping falló el snapshot sigue vencido: se reintenta en el próximo TTL
+            espera = self.repository.segundos_hasta_expirar() or self.repository.ttl.total_seconds()
+    
+    def _al_publicar(self, snapshot: CalendarSnapshot) -> None:
+        """Compara ETags y notifica los recursos suscriptos que cambiaron"""
+        with self._lock:
+            pendientes = []
+            
+            for uri, callbacks in self._suscripciones.items():
+                etag = calcular_etag(self._vista(uri, snapshot))
+                if etag != self._etags.get(uri):
+                    self._etags[uri] = etag
+                    pendientes.append((uri, list(callbacks)))
+        
+        for uri, callbacks in pendientes:
+            self.logger.info(f"🔔 Recurso actualizado: {uri}")
+            for callback in callbacks:
+                try:
+                    callback(uri)
+                except Exception as e:
+                    self.logger.error(f"Error notificando {uri}: {e}", exc_info=True)
\ No newline at end of file
@@ -0,0 +1,133 @@
+# src/mcp/response_cache.py
+"""
+💾 Caché de respuestas MCP versionada por snapshot
+Guarda el payload ya serializado de las herramientas de sólo lectura
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+from src.utils.logger import setup_logger
+
+# Herramientas deterministas dado (snapshot, argumentos, fecha)
+HERRAMIENTAS_CACHEABLES = frozenset({
+    "get_eventos_semana",
+    "buscar_eventos",
+    "get_proximos_examenes",
+    "generar_link_calendar",
+})
+
+ClaveCache = Tuple[str, str, str, str]
+
+
+class MCPResponseCache:
+    """
+    Caché LRU en memoria para respuestas de herramientas MCP.
+    
+    La clave es (herramienta, argumentos canónicos, versión del snapshot,
+    día). Un snapshot nuevo invalida todo el contenido; el cambio de día
+    hace que las respuestas relativas a "hoy" se recalculen.
+    """
+    
+    def __init__(self, max_entradas: int = 256):
+        """
+        Inicializa la caché.
+        
+        Args:
+            max_entradas: Cantidad máxima de respuestas guardadas
+        """
+        self.logger = setup_logger("MCPResponseCache")
+        self.max_entradas = max_entradas
+        self._entradas: "OrderedDict[ClaveCache, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def es_cacheable(self, herramienta: str) -> bool:
+        """Indica si la caché está activa y la herramienta es de sólo lectura"""
+        return self.max_entradas > 0 and herramienta in HERRAMIENTAS_CACHEABLES
+    
+    @staticmethod
+    def clave(herramienta: str, argumentos: Dict[str, Any], version: str, dia: Optional[date] = None) -> ClaveCache:
+        """
+        Construye la clave de caché.
+        
+        Args:
+            herramienta: Nombre de la herramienta
+            argumentos: Argumentos de la llamada
+            version: Versión del snapshot consultado
+            dia: Día de referencia (default: hoy)
+        
+        Returns:
+            Tupla usable como clave
+        """
+        argumentos_canonicos = json.dumps(argumentos or {}, sort_keys=True, separators=(",", ":"), default=str)
+        return (herramienta, argumentos_canonicos, version, (dia or date.today()).isoformat())
+    
+    def get(self, clave: ClaveCache) -> Optional[str]:
+        """
+        Obtiene un payload serializado.
+        
+        Args:
+            clave: Clave construida con clave()
+        
+        Returns:
+            Payload o None si no está
+        """
+        with self._lock:
+            texto = self._entradas.get(clave)
+            if texto is None:
+                self.misses += 1
+                return None
+            
+            self._entradas.move_to_end(clave)
+            self.hits += 1
+            return texto
+    
+    def set(self, clave: ClaveCache, texto: str) -> None:
+        """
+        Guarda un payload serializado.
+        
+        Args:
+            clave: Clave construida con clave()
+            texto: Payload ya serializado
+        """
+        with self._lock:
+            self._entradas[clave] = texto
+            self._entradas.move_to_end(clave)
+            
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+    
+    def invalidar(self, *_: Any) -> None:
+        """
+        Vacía la caché. Se registra como suscriptor del repositorio,
+        por eso acepta (y descarta) el snapshot publicado.
+        """
+        with self._lock:
+            cantidad = len(self._entradas)
+            self._entradas.clear()
+        
+        if cantidad:
+            self.logger.info(f"🧹 Caché de respuestas MCP invalidada ({cantidad} entradas)")
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        """
+        Retorna estadísticas de uso.
+        
+        Returns:
+            Diccionario con entradas, hits, misses y hit rate
+        """
+        total = self.hits + self.misses
+        return {
+            "entradas": len(self._entradas),
+            "max_entradas": self.max_entradas,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
\ No newline at end of file
@@ -6,15 +6,69 @@ Expone herramientas del calendario académico vía MCP Protocol
 
 import asyncio
 import json
+import threading
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, asdict
 
 from src.mcp.tools.eventos import EventosTools
 from src.mcp.tools.calendario import CalendarioTools
 from src.mcp.tools.notificaciones import NotificacionesTools
+from src.mcp.response_cache import MCPResponseCache
+from src.mcp.resources import CATEGORIAS, CalendarioResources, MIME_JSON
+from src.mcp.paginacion import FORMATOS
+from src.config.constants import MCP_LIMITE_DEFAULT, MCP_LIMITE_MAXIMO
+from src.config.settings import settings
+from src.services.evento_repository import CalendarSnapshot, EventoRepository, get_evento_repository
 from src.utils.logger import setup_logger
 
 
+# Parámetros comunes de las herramientas de listado
+PROPIEDADES_PAGINACION = {
+    "cursor": {
+        "type": "string",
+        "description": "Cursor opaco devuelto como next_cursor para pedir la página siguiente"
+    },
+    "limit": {
+        "type": "integer",
+        "description": f"Máximo de resultados por página (default: {MCP_LIMITE_DEFAULT}, máx: {MCP_LIMITE_MAXIMO})",
+        "minimum": 1,
+        "maximum": MCP_LIMITE_MAXIMO
+    },
+    "fields": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Campos a incluir (titulo, fecha, dia_semana, categoria/dias_restantes); el id siempre se incluye"
+    },
+    "formato": {
+        "type": "string",
+        "description": "completo: lista de objetos; compacto: filas con los nombres de columna en 'campos'",
+        "enum": list(FORMATOS)
+    },
+}
+
+# Herramientas que expone cada grupo (para health sin instanciar)
+HERRAMIENTAS_POR_GRUPO = {
+    "eventos": ("get_eventos_semana", "buscar_eventos", "get_proximos_examenes"),
+    "calendario": ("agregar_a_google_calendar", "generar_link_calendar"),
+    "notificaciones": ("enviar_recordatorio",),
+}
+
+
+def serializar_resultado(result: Any) -> str:
+    """
+    Serializa el resultado de una herramienta para el transporte.
+    
+    JSON compacto: el consumidor es un LLM o un cliente MCP, no una persona.
+    
+    Args:
+        result: Resultado nativo de la herramienta
+    
+    Returns:
+        Texto JSON
+    """
+    return json.dumps(result, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
 @dataclass
 class MCPTool:
     """Definición de una herramienta MCP"""
@@ -38,19 +92,94 @@ class PregonMCPServer:
     a los datos del calendario de manera estandarizada.
     """
     
-    def __init__(self):
+    def __init__(self, repository: Optional[EventoRepository] = None):
         self.logger = setup_logger("MCPServer")
         
-        # Inicializar herramientas
-        self.eventos_tools = EventosTools()
-        self.calendario_tools = CalendarioTools()
-        self.notificaciones_tools = NotificacionesTools()
+        # Repositorio compartido por todas las herramientas
+        self.repository = repository or get_evento_repository()
+        
+        # Grupos de herramientas: se construyen en el primer uso
+        self._grupos: Dict[str, Any] = {}
+        self._grupos_error: Dict[str, str] = {}
+        self._grupos_lock = threading.Lock()
+        
+        # Recursos del calendario (snapshot completo, por mes y por categoría)
+        self.resources = CalendarioResources(self.repository)
+        
+        # Caché de respuestas serializadas, se vacía con cada snapshot nuevo
+        self.response_cache = MCPResponseCache(settings.mcp_response_cache_size if settings.enable_cache else 0)
+        self.repository.suscribir(self.response_cache.invalidar)
         
         # Definir herramientas disponibles
         self.tools = self._define_tools()
         
         self.logger.info(f"MCP Server inicializado con {len(self.tools)} herramientas")
     
+    def _grupo(self, nombre: str, clase) -> Any:
+        """
+        Obtiene (creándolo si hace falta) un grupo de herramientas.
+        
+        Args:
+            nombre: Clave del grupo
+            clase: Clase a instanciar con el repositorio compartido
+        
+        Returns:
+            Instancia del grupo
+        """
+        grupo = self._grupos.get(nombre)
+        if grupo is not None:
+            return grupo
+        
+        with self._grupos_lock:
+            if nombre not in self._grupos:
+                try:
+                    self._grupos[nombre] = clase(self.repository)
+                    self._grupos_error.pop(nombre, None)
+                    self.logger.debug(f"Grupo de herramientas '{nombre}' inicializado")
+                except Exception as e:
+                    self._grupos_error[nombre] = str(e)
+                    raise
+            
+            return self._grupos[nombre]
+    
+    @property
+    def eventos_tools(self) -> EventosTools:
+        """Herramientas de consulta de eventos"""
+        return self._grupo("eventos", EventosTools)
+    
+    @property
+    def calendario_tools(self) -> CalendarioTools:
+        """Herramientas de Google Calendar"""
+        return self._grupo("calendario", CalendarioTools)
+    
+    @property
+    def notificaciones_tools(self) -> NotificacionesTools:
+        """Herramientas de notificaciones"""
+        return self._grupo("notificaciones", NotificacionesTools)
+    
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reporta el estado de cada herramienta sin inicializar dependencias.
+        
+        Estados: "listo", "no_inicializado", "degradado" o "error".
+        
+        Returns:
+            Diccionario herramienta → estado
+        """
+        reporte: Dict[str, Dict[str, Any]] = {}
+        
+        for nombre, herramientas in HERRAMIENTAS_POR_GRUPO.items():
+            grupo = self._grupos.get(nombre)
+            
+            if grupo is not None:
+                reporte.update(grupo.health())
+            elif nombre in self._grupos_error:
+                reporte.update({h: {"estado": "error", "detalle": self._grupos_error[nombre]} for h in herramientas})
+            else:
+                reporte.update({h: {"estado": "no_inicializado"} for h in herramientas})
+        
+        return reporte
+    
     def _define_tools(self) -> List[MCPTool]:
         """Define todas las herramientas disponibles"""
         return [
@@ -59,7 +188,7 @@ class PregonMCPServer:
                 description="Obtiene los eventos de la próxima semana del calendario académico UNViMe",
                 input_schema={
                     "type": "object",
-                    "properties": {},
+                    "properties": {**PROPIEDADES_PAGINACION},
                     "required": []
                 }
             ),
@@ -76,7 +205,7 @@ class PregonMCPServer:
                         "categoria": {
                             "type": "string",
                             "description": "Categoría de evento",
-                            "enum": ["examen", "academico", "feriado", "institucional", "receso", "otro"]
+                            "enum": list(CATEGORIAS)
                         },
                         "desde": {
                             "type": "string",
@@ -85,7 +214,8 @@ class PregonMCPServer:
                         "hasta": {
                             "type": "string",
                             "description": "Fecha hasta (YYYY-MM-DD)"
-                        }
+                        },
+                        **PROPIEDADES_PAGINACION
                     }
                 }
             ),
@@ -99,7 +229,8 @@ class PregonMCPServer:
                             "type": "integer",
                             "description": "Número de días a futuro (default: 30)",
                             "default": 30
-                        }
+                        },
+                        **PROPIEDADES_PAGINACION
                     }
                 }
             ),
@@ -110,8 +241,8 @@ class PregonMCPServer:
                     "type": "object",
                     "properties": {
                         "evento_id": {
-                            "type": "integer",
-                            "description": "ID del evento a agregar (del 1 al N)"
+                            "type": "string",
+                            "description": "ID estable del evento a agregar (campo 'id' de get_eventos_semana o buscar_eventos)"
                         }
                     },
                     "required": ["evento_id"]
@@ -124,8 +255,8 @@ class PregonMCPServer:
                     "type": "object",
                     "properties": {
                         "evento_id": {
-                            "type": "integer",
-                            "description": "ID del evento"
+                            "type": "string",
+                            "description": "ID estable del evento (campo 'id' de get_eventos_semana o buscar_eventos)"
                         }
                     },
                     "required": ["evento_id"]
@@ -138,8 +269,8 @@ class PregonMCPServer:
                     "type": "object",
                     "properties": {
                         "evento_id": {
-                            "type": "integer",
-                            "description": "ID del evento"
+                            "type": "string",
+                            "description": "ID estable del evento (campo 'id' de get_eventos_semana o buscar_eventos)"
                         },
                         "canal": {
                             "type": "string",
@@ -161,13 +292,146 @@ class PregonMCPServer:
         """
         return [asdict(tool) for tool in self.tools]
     
-    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> MCPResponse:
+    async def _ejecutar_herramienta(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        snapshot: Optional[CalendarSnapshot] = None
+    ) -> Any:
+        """
+        Despacha una herramienta y retorna su resultado nativo.
+        
+        Args:
+            name: Nombre de la herramienta
+            arguments: Argumentos de la herramienta
+            snapshot: Snapshot compartido (default: cada tool usa el vigente)
+            
+        Returns:
+            Resultado de la herramienta
+            
+        Raises:
+            ValueError: Si la herramienta no existe
+        """
+        paginacion = {
+            "cursor": arguments.get("cursor"),
+            "limit": arguments.get("limit"),
+            "fields": arguments.get("fields"),
+            "formato": arguments.get("formato")
+        }
+        
+        if name == "get_eventos_semana":
+            return await self.eventos_tools.get_eventos_semana(**paginacion, snapshot=snapshot)
+        
+        elif name == "buscar_eventos":
+            return await self.eventos_tools.buscar_eventos(
+                query=arguments.get("query"),
+                categoria=arguments.get("categoria"),
+                desde=arguments.get("desde"),
+                hasta=arguments.get("hasta"),
+                **paginacion,
+                snapshot=snapshot
+            )
+        
+        elif name == "get_proximos_examenes":
+            return await self.eventos_tools.get_proximos_examenes(
+                dias=arguments.get("dias", 30),
+                **paginacion,
+                snapshot=snapshot
+            )
+        
+        elif name == "agregar_a_google_calendar":
+            return await self.calendario_tools.agregar_evento(
+                evento_id=arguments["evento_id"],
+                snapshot=snapshot
+            )
+        
+        elif name == "generar_link_calendar":
+            return await self.calendario_tools.generar_link(
+                evento_id=arguments["evento_id"],
+                snapshot=snapshot
+            )
+        
+        elif name == "enviar_recordatorio":
+            return await self.notificaciones_tools.enviar_recordatorio(
+                evento_id=arguments["evento_id"],
+                canal=arguments["canal"],
+                snapshot=snapshot
+            )
+        
+        raise ValueError(f"Herramienta desconocida: {name}")
+    
+    async def _snapshot_o_none(self) -> Optional[CalendarSnapshot]:
+        """Snapshot vigente, o None si no se pudo obtener (cada tool degrada sola)"""
+        try:
+            return await self.repository.obtener_snapshot_async()
+        except Exception as e:
+            self.logger.warning(f"No se pudo obtener el snapshot: {e}")
+            return None
+    
+    def _respuesta_texto(self, texto: str) -> MCPResponse:
+        """Construye la respuesta MCP a partir del payload serializado"""
+        return MCPResponse(
+            content=[{
+                "type": "text",
+                "text": texto
+            }],
+            isError=False
+        )
+    
+    def _respuesta_error(self, name: str, error: BaseException) -> MCPResponse:
+        """Construye la respuesta MCP para una herramienta que falló"""
+        self.logger.error(f"Error ejecutando {name}: {error}", exc_info=error)
+        return MCPResponse(
+            content=[{
+                "type": "text",
+                "text": f"Error: {str(error)}"
+            }],
+            isError=True
+        )
+    
+    async def invocar_herramienta(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[CalendarSnapshot] = None
+    ) -> Any:
+        """
+        Ejecuta una herramienta dentro del proceso y retorna su resultado nativo.
+        
+        Pensado para llamadores internos (chatbot, bots): no serializa
+        ni envuelve el resultado en un MCPResponse.
+        
+        Args:
+            name: Nombre de la herramienta
+            arguments: Argumentos de la herramienta
+            snapshot: Snapshot a consultar (default: el vigente)
+            
+        Returns:
+            Resultado de la herramienta (dict o lista)
+            
+        Raises:
+            ValueError: Si la herramienta no existe
+            KeyError: Si falta un argumento obligatorio
+        """
+        self.logger.info(f"Invocando herramienta: {name} con args: {arguments}")
+        return await self._ejecutar_herramienta(name, arguments or {}, snapshot)
+    
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[CalendarSnapshot] = None
+    ) -> MCPResponse:
         """
-        Ejecuta una herramienta por su nombre.
+        Ejecuta una herramienta por su nombre y serializa el resultado.
+        
+        Es el punto de entrada del transporte MCP; dentro del proceso
+        conviene usar invocar_herramienta().
         
         Args:
             name: Nombre de la herramienta
             arguments: Argumentos de la herramienta
+            snapshot: Snapshot a consultar (default: el vigente)
             
         Returns:
             Respuesta de la herramienta
@@ -178,60 +442,105 @@ class PregonMCPServer:
         self.logger.info(f"Ejecutando herramienta: {name} con args: {arguments}")
         
         try:
-            # Ejecutar herramienta correspondiente
-            if name == "get_eventos_semana":
-                result = await self.eventos_tools.get_eventos_semana()
+            clave = None
             
-            elif name == "buscar_eventos":
-                result = await self.eventos_tools.buscar_eventos(
-                    query=arguments.get("query"),
-                    categoria=arguments.get("categoria"),
-                    desde=arguments.get("desde"),
-                    hasta=arguments.get("hasta")
-                )
+            if self.response_cache.es_cacheable(name):
+                # Fijar el snapshot antes de ejecutar: su versión forma parte de la clave
+                if snapshot is None:
+                    snapshot = await self._snapshot_o_none()
+                
+                if snapshot is not None:
+                    clave = self.response_cache.clave(name, arguments, snapshot.version)
+                    texto = self.response_cache.get(clave)
+                    
+                    if texto is not None:
+                        self.logger.debug(f"Respuesta de {name} servida desde caché")
+                        return self._respuesta_texto(texto)
             
-            elif name == "get_proximos_examenes":
-                result = await self.eventos_tools.get_proximos_examenes(
-                    dias=arguments.get("dias", 30)
-                )
+            result = await self._ejecutar_herramienta(name, arguments, snapshot)
+            texto = serializar_resultado(result)
             
-            elif name == "agregar_a_google_calendar":
-                result = await self.calendario_tools.agregar_evento(
-                    evento_id=arguments["evento_id"]
-                )
+            # Los errores de negocio ({"error": ...}) no se cachean
+            if clave is not None and not (isinstance(result, dict) and "error" in result):
+                self.response_cache.set(clave, texto)
             
-            elif name == "generar_link_calendar":
-                result = await self.calendario_tools.generar_link(
-                    evento_id=arguments["evento_id"]
-                )
+            return self._respuesta_texto(texto)
             
-            elif name == "enviar_recordatorio":
-                result = await self.notificaciones_tools.enviar_recordatorio(
-                    evento_id=arguments["evento_id"],
-                    canal=arguments["canal"]
-                )
+        except Exception as e:
+            return self._respuesta_error(name, e)
+    
+    async def call_tools_batch(self, llamadas: List[Dict[str, Any]]) -> List[MCPResponse]:
+        """
+        Ejecuta varias herramientas en paralelo sobre un mismo snapshot.
+        
+        Un error en una llamada no afecta a las demás: cada una
+        devuelve su propia respuesta (con isError=True si falló).
+        
+        Args:
+            llamadas: Lista de {"name": str, "arguments": dict}
             
-            else:
-                raise ValueError(f"Herramienta desconocida: {name}")
+        Returns:
+            Respuestas en el mismo orden que las llamadas
+        """
+        self.logger.info(f"Ejecutando lote de {len(llamadas)} herramientas")
+        
+        # Un único snapshot para todo el lote (coherencia + un solo fetch)
+        snapshot = await self._snapshot_o_none()
+        
+        async def ejecutar(llamada: Dict[str, Any]) -> MCPResponse:
+            if not isinstance(llamada, dict) or "name" not in llamada:
+                return self._respuesta_error("?", ValueError(f"Llamada inválida: {llamada}"))
+            return await self.call_tool(llamada["name"], llamada.get("arguments"), snapshot=snapshot)
+        
+        respuestas = await asyncio.gather(
+            *(ejecutar(llamada) for llamada in llamadas),
+            return_exceptions=True
+        )
+        
+        return [
+            r if isinstance(r, MCPResponse) else self._respuesta_error(llamada.get("name", "?"), r)
+            for llamada, r in zip(llamadas, respuestas)
+        ]
+    
+    def list_resources(self) -> List[Dict[str, Any]]:
+        """
+        Lista los recursos del calendario disponibles.
+        
+        Returns:
+            Lista de recursos en formato MCP
+        """
+        return self.resources.listar_recursos()
+    
+    def list_resource_templates(self) -> List[Dict[str, Any]]:
+        """
+        Lista las plantillas de URI de recursos parametrizados.
+        
+        Returns:
+            Lista de plantillas en formato MCP
+        """
+        return self.resources.listar_plantillas()
+    
+    async def read_resource(self, uri: str) -> Dict[str, Any]:
+        """
+        Lee un recurso y lo serializa para el transporte.
+        
+        Args:
+            uri: URI del recurso
             
-            # Formatear respuesta
-            return MCPResponse(
-                content=[{
-                    "type": "text",
-                    "text": json.dumps(result, indent=2, ensure_ascii=False)
-                }],
-                isError=False
-            )
+        Returns:
+            Contenido MCP (uri, mimeType, text) más el ETag
             
-        except Exception as e:
-            self.logger.error(f"Error ejecutando {name}: {e}", exc_info=True)
-            return MCPResponse(
-                content=[{
-                    "type": "text",
-                    "text": f"Error: {str(e)}"
-                }],
-                isError=True
-            )
+        Raises:
+            ValueError: Si la URI no corresponde a ningún recurso
+        """
+        contenido = await self.resources.leer_recurso(uri)
+        
+        return {
+            "uri": contenido["uri"],
+            "mimeType": MIME_JSON,
+            "etag": contenido["etag"],
+            "text": serializar_resultado(contenido)
+        }
     
     def get_capabilities(self) -> Dict[str, Any]:
         """
@@ -242,7 +551,8 @@ class PregonMCPServer:
         """
         return {
             "tools": True,
-            "resources": False,  # Por ahora no implementamos resources
+            "resources": True,
+            "resources_subscribe": True,
             "prompts": False,     # Por ahora no implementamos prompts
             "logging": True
         }
@@ -259,7 +569,8 @@ class PregonMCPServer:
             "version": "1.0.0",
             "description": "MCP Server para calendario académico UNViMe",
             "capabilities": self.get_capabilities(),
-            "tools": self.list_tools()
+            "tools": self.list_tools(),
+            "resources": self.list_resources()
         }
 
 
@@ -277,4 +588,13 @@ def get_mcp_server() -> PregonMCPServer:
     global _server_instance
     if _server_instance is None:
         _server_instance = PregonMCPServer()
-    return _server_instance
\ No newline at end of file
+    return _server_instance
+
+
+async def main() -> None:
+    """Ejecuta el servidor MCP sobre stdio (entry point de run.py)"""
+    from src.mcp.stdio import ejecutar_stdio
+    from src.utils.logger import redirigir_consola_a_stderr
+    
+    redirigir_consola_a_stderr()
+    await ejecutar_stdio(get_mcp_server())
\ No newline at end of file
@@ -0,0 +1,124 @@
+# src/mcp/stdio.py
+"""
+📡 Transporte stdio para el MCP Server de Pregon
+Adapta PregonMCPServer al SDK oficial de MCP
+"""
+
+import asyncio
+
+from typing import Callable, Dict, Tuple
+
+from mcp import types
+from mcp.server.lowlevel import Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
+from mcp.server.stdio import stdio_server
+
+from src.mcp.server import PregonMCPServer, get_mcp_server
+from src.utils.logger import redirigir_consola_a_stderr, setup_logger
+
+logger = setup_logger("MCPStdio")
+
+
+def crear_servidor_sdk(server: PregonMCPServer) -> Server:
+    """
+    Registra herramientas y recursos de Pregon en un servidor del SDK MCP.
+    
+    La serialización a JSON ocurre sólo acá (vía call_tool), en el
+    límite del transporte.
+    
+    Args:
+        server: Servidor de Pregon
+    
+    Returns:
+        Servidor del SDK listo para conectar a un transporte
+    """
+    sdk = Server("pregon-calendario", version="1.0.0")
+    
+    # (id de sesión, uri) → callback registrado en CalendarioResources
+    suscripciones: Dict[Tuple[int, str], Callable[[str], None]] = {}
+    
+    @sdk.list_tools()
+    async def listar() -> list[types.Tool]:
+        return [
+            types.Tool(name=tool.name, description=tool.description, inputSchema=tool.input_schema)
+            for tool in server.tools
+        ]
+    
+    @sdk.call_tool()
+    async def llamar(name: str, arguments: dict) -> types.CallToolResult:
+        respuesta = await server.call_tool(name, arguments)
+        return types.CallToolResult(
+            content=[types.TextContent(type="text", text=bloque["text"]) for bloque in respuesta.content],
+            isError=respuesta.isError
+        )
+    
+    @sdk.list_resources()
+    async def listar_recursos() -> list[types.Resource]:
+        return [types.Resource(**recurso) for recurso in server.list_resources()]
+    
+    @sdk.list_resource_templates()
+    async def listar_plantillas() -> list[types.ResourceTemplate]:
+        return [types.ResourceTemplate(**plantilla) for plantilla in server.list_resource_templates()]
+    
+    @sdk.read_resource()
+    async def leer_recurso(uri) -> list[ReadResourceContents]:
+        contenido = await server.read_resource(str(uri))
+        return [ReadResourceContents(content=contenido["text"], mime_type=contenido["mimeType"])]
+    
+    @sdk.subscribe_resource()
+    async def suscribir(uri) -> None:
+        session = sdk.request_context.session
+        loop = asyncio.get_running_loop()
+        
+        def notificar(uri_actualizada: str) -> None:
+            # El repositorio puede publicar desde un thread del executor
+            loop.call_soon_threadsafe(
+                lambda: loop.create_task(session.send_resource_updated(uri_actualizada))
+            )
+        
+        clave = (id(session), str(uri))
+        if clave not in suscripciones:
+            server.resources.suscribir(str(uri), notificar)
+            suscripciones[clave] = notificar
+    
+    @sdk.unsubscribe_resource()
+    async def desuscribir(uri) -> None:
+        callback = suscripciones.pop((id(sdk.request_context.session), str(uri)), None)
+        if callback is not None:
+            server.resources.desuscribir(str(uri), callback)
+    
+    return sdk
+
+
+def opciones_inicializacion(sdk: Server):
+    """Opciones de inicialización anunciando soporte de suscripciones"""
+    opciones = sdk.create_initialization_options()
+    
+    # El SDK no detecta el handler de subscribe al armar las capacidades
+    if opciones.capabilities.resources is not None:
+        opciones.capabilities.resources.subscribe = True
+    
+    return opciones
+
+
+async def ejecutar_stdio(server: PregonMCPServer) -> None:
+    """
+    Atiende un cliente MCP por stdin/stdout hasta que cierre la conexión.
+    
+    Args:
+        server: Servidor de Pregon
+    """
+    # stdout queda reservado para los mensajes JSON-RPC
+    redirigir_consola_a_stderr()
+    
+    sdk = crear_servidor_sdk(server)
+    logger.info("🔌 MCP Server escuchando en stdio")
+    
+    async with stdio_server() as (lectura, escritura):
+        await sdk.run(lectura, escritura, opciones_inicializacion(sdk))
+
+
+if __name__ == "__main__":
+    # python -m src.mcp.stdio (sin el menú de run.py escribiendo en stdout)
+    redirigir_consola_a_stderr()
+    asyncio.run(ejecutar_stdio(get_mcp_server()))
\ No newline at end of file
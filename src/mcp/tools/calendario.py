@@ -3,54 +3,128 @@
 📆 Herramientas MCP para Google Calendar
 """
 
-from typing import Dict
-from src.integrations.google_calendar_service import GoogleCalendarService
+import threading
+from typing import Any, Dict, Optional
 from src.integrations.calendar_link_generator import CalendarLinkGenerator
-from src.scrapers.unvime_scraper import UNVimeScraper
+from src.integrations.google_calendar_service import AutorizacionPendienteError
+from src.models.evento import Evento
+from src.services.evento_repository import CalendarSnapshot, EventoRepository, get_evento_repository
+from src.config.constants import EXECUTOR_TIMEOUT_GOOGLE_API, EXECUTOR_TIMEOUT_LINKS
+from src.utils.executor import get_executor
 from src.utils.logger import setup_logger
 
 
 class CalendarioTools:
     """
     Herramientas MCP para integración con Google Calendar.
+    
+    GoogleCalendarService (OAuth + discovery) se construye recién en el
+    primer agregar_evento y siempre dentro del executor, nunca en el
+    event loop ni al arrancar el proceso. Sin token válido no abre el
+    navegador: la herramienta falla y health() la muestra sin autorizar.
     """
     
-    def __init__(self):
+    def __init__(self, repository: Optional[EventoRepository] = None):
         self.logger = setup_logger("CalendarioTools")
-        self.google_calendar = GoogleCalendarService()
         self.link_generator = CalendarLinkGenerator()
-        self.scraper = UNVimeScraper()
+        self.repository = repository or get_evento_repository()
+    
+        self._google_calendar = None
+        self._google_calendar_error: Optional[str] = None
+        self._google_calendar_autorizado = True
+        self._google_calendar_lock = threading.Lock()
+    
+    @property
+    def google_calendar(self):
+        """Servicio de Google Calendar (se autentica en el primer acceso, bloqueante)"""
+        if self._google_calendar is None:
+            with self._google_calendar_lock:
+                if self._google_calendar is None:
+                    from src.services.container import get_container
+                    
+                    try:
+                        self._google_calendar = get_container().google_calendar
+                        self._google_calendar_error = None
+                        self._google_calendar_autorizado = True
+                    except AutorizacionPendienteError as e:
+                        self._google_calendar_error = str(e)
+                        self._google_calendar_autorizado = False
+                        raise
+                    except Exception as e:
+                        self._google_calendar_error = str(e)
+                        raise
+        
+        return self._google_calendar
+    
+    def _agregar_en_google(self, evento: Evento) -> Optional[Dict]:
+        """Inicializa el servicio si hace falta y agrega el evento (bloqueante)"""
+        return self.google_calendar.agregar_evento(evento)
+    
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Estado de cada herramienta del grupo, sin inicializar nada.
+        
+        Returns:
+            Diccionario herramienta → estado
+        """
+        if not self._google_calendar_autorizado:
+            google = {"estado": "no_autorizado", "detalle": self._google_calendar_error}
+        elif self._google_calendar_error is not None:
+            google = {"estado": "error", "detalle": self._google_calendar_error}
+        elif self._google_calendar is None:
+            google = {"estado": "no_inicializado", "detalle": "Se autentica en el primer uso"}
+        elif self._google_calendar.service is None:
+            google = {"estado": "degradado", "detalle": "Sin credenciales válidas de Google Calendar"}
+        else:
+            google = {"estado": "listo"}
+        
+        return {
+            "agregar_a_google_calendar": google,
+            "generar_link_calendar": {"estado": "listo"}
+        }
     
     def _obtener_todos_eventos(self):
-        """Obtiene todos los eventos"""
-        contenido_html = self.scraper.descargar_contenido()
-        return self.scraper.extraer_eventos(contenido_html)
+        """Obtiene todos los eventos del snapshot vigente"""
+        try:
+            return self.repository.obtener_snapshot().eventos
+        except Exception as e:
+            self.logger.error(f"Error obteniendo eventos: {e}", exc_info=True)
+            return []
+    
+    async def _buscar_evento(self, evento_id: str, snapshot: Optional[CalendarSnapshot] = None) -> Optional[Evento]:
+        """Resuelve un ID estable contra el snapshot (default: el vigente)"""
+        if snapshot is None:
+            snapshot = await self.repository.obtener_snapshot_async()
+        return snapshot.obtener(evento_id)
     
-    async def agregar_evento(self, evento_id: int) -> Dict:
+    async def agregar_evento(self, evento_id: str, snapshot: Optional[CalendarSnapshot] = None) -> Dict:
         """
         Agrega un evento a Google Calendar.
         
         Args:
-            evento_id: ID del evento a agregar
+            evento_id: ID estable del evento a agregar
+            snapshot: Snapshot donde resolver el ID (default: el vigente)
             
         Returns:
             Resultado de la operación
         """
         try:
-            # Obtener todos los eventos
-            eventos = self._obtener_todos_eventos()
+            evento = await self._buscar_evento(evento_id, snapshot)
             
-            if evento_id < 1 or evento_id > len(eventos):
-                return {"error": f"ID inválido. Debe ser entre 1 y {len(eventos)}"}
+            if evento is None:
+                return {"error": f"Evento no encontrado: {evento_id}"}
             
-            evento = eventos[evento_id - 1]
-            
-            # Agregar a Google Calendar
-            resultado = self.google_calendar.agregar_evento(evento)
+            # Autenticación (primer uso) y .execute() son bloqueantes
+            resultado = await get_executor().ejecutar_io(
+                self._agregar_en_google,
+                evento,
+                timeout=EXECUTOR_TIMEOUT_GOOGLE_API
+            )
             
             if resultado:
                 return {
                     "success": True,
+                    "id": evento.id,
                     "evento": evento.titulo,
                     "fecha": evento.fecha.strftime("%Y-%m-%d"),
                     "link": resultado.get("link")
@@ -62,28 +136,33 @@ class CalendarioTools:
             self.logger.error(f"Error agregando evento: {e}", exc_info=True)
             return {"error": str(e)}
     
-    async def generar_link(self, evento_id: int) -> Dict:
+    async def generar_link(self, evento_id: str, snapshot: Optional[CalendarSnapshot] = None) -> Dict:
         """
         Genera un link público de Google Calendar.
         
         Args:
-            evento_id: ID del evento
+            evento_id: ID estable del evento
+            snapshot: Snapshot donde resolver el ID (default: el vigente)
             
         Returns:
             Link generado
         """
         try:
-            eventos = self._obtener_todos_eventos()
-            
-            if evento_id < 1 or evento_id > len(eventos):
-                return {"error": f"ID inválido. Debe ser entre 1 y {len(eventos)}"}
+            evento = await self._buscar_evento(evento_id, snapshot)
             
-            evento = eventos[evento_id - 1]
+            if evento is None:
+                return {"error": f"Evento no encontrado: {evento_id}"}
             
-            link = self.link_generator.generar_link(evento)
+            # El acortador hace una request HTTP sincrónica
+            link = await get_executor().ejecutar_io(
+                self.link_generator.generar_link,
+                evento,
+                timeout=EXECUTOR_TIMEOUT_LINKS
+            )
             
             return {
                 "success": True,
+                "id": evento.id,
                 "evento": evento.titulo,
                 "fecha": evento.fecha.strftime("%Y-%m-%d"),
                 "link": link
@@ -5,52 +5,131 @@
 
 import json
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
-from src.services.calendario_service import CalendarioService
-from src.scrapers.unvime_scraper import UNVimeScraper
+from typing import Any, Callable, Optional, List, Dict, Sequence
+from src.mcp.paginacion import paginar, proyectar
+from src.models.evento import Evento
+from src.services.evento_repository import CalendarSnapshot, EventoRepository, get_evento_repository
 from src.utils.logger import setup_logger
 from src.utils.validators import validar_fecha, validar_rango_fechas
 
 
+# Campos que devuelven las herramientas (para la proyección con "fields")
+CAMPOS_EVENTO = ("id", "titulo", "fecha", "dia_semana", "categoria")
+CAMPOS_EXAMEN = ("id", "titulo", "fecha", "dia_semana", "dias_restantes")
+
+
+def _evento_a_dict(ev: Evento) -> Dict[str, Any]:
+    """Representación de un evento en las respuestas de las herramientas"""
+    return {
+        "id": ev.id,
+        "titulo": ev.titulo,
+        "fecha": ev.fecha.strftime("%Y-%m-%d"),
+        "dia_semana": ev.fecha.strftime("%A"),
+        "categoria": ev.categoria
+    }
+
+
 class EventosTools:
     """
     Herramientas MCP para consultar y filtrar eventos del calendario.
+    
+    Todas las herramientas devuelven IDs estables (ver Evento.id), válidos
+    para agregar_a_google_calendar, generar_link_calendar y enviar_recordatorio.
     """
     
-    def __init__(self):
+    def __init__(self, repository: Optional[EventoRepository] = None):
         self.logger = setup_logger("EventosTools")
-        self.scraper = UNVimeScraper()
+        self.repository = repository or get_evento_repository()
+    
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Estado de cada herramienta del grupo, sin disparar scraping.
+        
+        Returns:
+            Diccionario herramienta → estado
+        """
+        snapshot = self.repository.snapshot_actual
+        
+        if snapshot is None:
+            estado = {"estado": "no_inicializado", "detalle": "El calendario se descarga en la primera consulta"}
+        else:
+            estado = {"estado": "listo", "version": snapshot.version, "eventos": len(snapshot)}
+        
+        return {
+            "get_eventos_semana": estado,
+            "buscar_eventos": estado,
+            "get_proximos_examenes": estado
+        }
+    
+    def _pagina(
+        self,
+        eventos: List[Evento],
+        a_dict: Callable[[Evento], Dict[str, Any]],
+        campos: Sequence[str],
+        cursor: Optional[str],
+        limit: Optional[int],
+        fields: Optional[Sequence[str]],
+        formato: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Pagina, proyecta y formatea una lista de eventos.
+        
+        Returns:
+            Diccionario con "items", "devueltos", "next_cursor" y,
+            en formato compacto, "campos"
+        """
+        pagina, siguiente = paginar(eventos, cursor, limit)
+        items, columnas = proyectar([a_dict(ev) for ev in pagina], campos, fields, formato)
+        
+        resultado = {"items": items, "devueltos": len(pagina), "next_cursor": siguiente}
+        if columnas is not None:
+            resultado["campos"] = columnas
+        
+        return resultado
     
-    def _obtener_todos_eventos(self) -> List:
+    async def _obtener_todos_eventos(self, snapshot: Optional[CalendarSnapshot] = None) -> List:
         """
-        Obtiene todos los eventos del calendario.
+        Obtiene todos los eventos del snapshot sin bloquear el event loop.
+        
+        Args:
+            snapshot: Snapshot a usar (default: el vigente del repositorio)
         
         Returns:
             Lista de eventos
         """
         try:
-            # Método correcto: descargar_contenido()
-            contenido_html = self.scraper.descargar_contenido()
-            
-            # Luego extraer eventos
-            eventos = self.scraper.extraer_eventos(contenido_html)
-            
-            return eventos
+            if snapshot is None:
+                snapshot = await self.repository.obtener_snapshot_async()
+            return snapshot.eventos
             
         except Exception as e:
             self.logger.error(f"Error obteniendo eventos: {e}", exc_info=True)
             return []
     
-    async def get_eventos_semana(self) -> Dict:
+    async def get_eventos_semana(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        formato: Optional[str] = None,
+        snapshot: Optional[CalendarSnapshot] = None
+    ) -> Dict:
         """
         Obtiene eventos de la próxima semana.
         
+        Args:
+            cursor: Cursor de la página anterior (next_cursor)
+            limit: Máximo de eventos por página
+            fields: Campos a incluir (el id siempre se incluye)
+            formato: "completo" o "compacto"
+            snapshot: Snapshot a consultar (default: el vigente)
+        
         Returns:
             Diccionario con eventos y metadata
         """
         try:
             # Obtener todos los eventos
-            todos_eventos = self._obtener_todos_eventos()
+            todos_eventos = await self._obtener_todos_eventos(snapshot)
             
             # Filtrar próxima semana
             hoy = datetime.now()
@@ -61,23 +140,15 @@ class EventosTools:
                 if hoy <= ev.fecha <= una_semana
             ]
             
-            # Ordenar por fecha
-            eventos_semana.sort(key=lambda x: x.fecha)
+            # Ordenar por fecha y paginar
+            pagina = self._pagina(eventos_semana, _evento_a_dict, CAMPOS_EVENTO, cursor, limit, fields, formato)
             
             resultado = {
                 "total": len(eventos_semana),
                 "desde": hoy.strftime("%Y-%m-%d"),
                 "hasta": una_semana.strftime("%Y-%m-%d"),
-                "eventos": [
-                    {
-                        "id": idx,
-                        "titulo": ev.titulo,
-                        "fecha": ev.fecha.strftime("%Y-%m-%d"),
-                        "dia_semana": ev.fecha.strftime("%A"),
-                        "categoria": ev.categoria
-                    }
-                    for idx, ev in enumerate(eventos_semana, 1)
-                ]
+                "eventos": pagina.pop("items"),
+                **pagina
             }
             
             self.logger.info(f"Obtenidos {len(eventos_semana)} eventos de la semana")
@@ -92,7 +163,12 @@ class EventosTools:
         query: Optional[str] = None,
         categoria: Optional[str] = None,
         desde: Optional[str] = None,
-        hasta: Optional[str] = None
+        hasta: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        formato: Optional[str] = None,
+        snapshot: Optional[CalendarSnapshot] = None
     ) -> Dict:
         """
         Busca eventos con filtros.
@@ -102,6 +178,11 @@ class EventosTools:
             categoria: Categoría de evento
             desde: Fecha desde (YYYY-MM-DD)
             hasta: Fecha hasta (YYYY-MM-DD)
+            cursor: Cursor de la página anterior (next_cursor)
+            limit: Máximo de eventos por página
+            fields: Campos a incluir (el id siempre se incluye)
+            formato: "completo" o "compacto"
+            snapshot: Snapshot a consultar (default: el vigente)
             
         Returns:
             Diccionario con eventos encontrados
@@ -126,10 +207,10 @@ class EventosTools:
                     return {"error": "El rango de fechas es inválido (desde debe ser <= hasta)"}
             
             # Obtener todos los eventos
-            todos_eventos = self._obtener_todos_eventos()
+            todos_eventos = await self._obtener_todos_eventos(snapshot)
             
             # Aplicar filtros
-            eventos_filtrados = todos_eventos
+            eventos_filtrados = list(todos_eventos)
             
             if query:
                 eventos_filtrados = [
@@ -157,8 +238,8 @@ class EventosTools:
                     if ev.fecha <= fecha_hasta
                 ]
             
-            # Ordenar por fecha
-            eventos_filtrados.sort(key=lambda x: x.fecha)
+            # Ordenar por fecha y paginar
+            pagina = self._pagina(eventos_filtrados, _evento_a_dict, CAMPOS_EVENTO, cursor, limit, fields, formato)
             
             resultado = {
                 "total": len(eventos_filtrados),
@@ -168,16 +249,8 @@ class EventosTools:
                     "desde": desde,
                     "hasta": hasta
                 },
-                "eventos": [
-                    {
-                        "id": idx,
-                        "titulo": ev.titulo,
-                        "fecha": ev.fecha.strftime("%Y-%m-%d"),
-                        "dia_semana": ev.fecha.strftime("%A"),
-                        "categoria": ev.categoria
-                    }
-                    for idx, ev in enumerate(eventos_filtrados, 1)
-                ]
+                "eventos": pagina.pop("items"),
+                **pagina
             }
             
             self.logger.info(f"Búsqueda: {len(eventos_filtrados)} eventos encontrados")
@@ -187,12 +260,25 @@ class EventosTools:
             self.logger.error(f"Error buscando eventos: {e}", exc_info=True)
             return {"error": str(e)}
     
-    async def get_proximos_examenes(self, dias: int = 30) -> Dict:
+    async def get_proximos_examenes(
+        self,
+        dias: int = 30,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        formato: Optional[str] = None,
+        snapshot: Optional[CalendarSnapshot] = None
+    ) -> Dict:
         """
         Obtiene los próximos exámenes.
         
         Args:
             dias: Número de días a futuro
+            cursor: Cursor de la página anterior (next_cursor)
+            limit: Máximo de exámenes por página
+            fields: Campos a incluir (el id siempre se incluye)
+            formato: "completo" o "compacto"
+            snapshot: Snapshot a consultar (default: el vigente)
             
         Returns:
             Diccionario con exámenes próximos
@@ -202,7 +288,7 @@ class EventosTools:
             fecha_limite = hoy + timedelta(days=dias)
             
             # Obtener todos los eventos
-            todos_eventos = self._obtener_todos_eventos()
+            todos_eventos = await self._obtener_todos_eventos(snapshot)
             
             # Filtrar exámenes
             examenes = [
@@ -211,24 +297,25 @@ class EventosTools:
                 and hoy <= ev.fecha <= fecha_limite
             ]
             
-            # Ordenar por fecha
-            examenes.sort(key=lambda x: x.fecha)
+            def examen_a_dict(ex: Evento) -> Dict[str, Any]:
+                return {
+                    "id": ex.id,
+                    "titulo": ex.titulo,
+                    "fecha": ex.fecha.strftime("%Y-%m-%d"),
+                    "dia_semana": ex.fecha.strftime("%A"),
+                    "dias_restantes": (ex.fecha - hoy).days
+                }
+            
+            # Ordenar por fecha y paginar
+            pagina = self._pagina(examenes, examen_a_dict, CAMPOS_EXAMEN, cursor, limit, fields, formato)
             
             resultado = {
                 "total": len(examenes),
                 "dias_busqueda": dias,
                 "desde": hoy.strftime("%Y-%m-%d"),
                 "hasta": fecha_limite.strftime("%Y-%m-%d"),
-                "examenes": [
-                    {
-                        "id": idx,
-                        "titulo": ex.titulo,
-                        "fecha": ex.fecha.strftime("%Y-%m-%d"),
-                        "dia_semana": ex.fecha.strftime("%A"),
-                        "dias_restantes": (ex.fecha - hoy).days
-                    }
-                    for idx, ex in enumerate(examenes, 1)
-                ]
+                "examenes": pagina.pop("items"),
+                **pagina
             }
             
             self.logger.info(f"Encontrados {len(examenes)} exámenes en {dias} días")
@@ -3,59 +3,111 @@
 🔔 Herramientas MCP para notificaciones
 """
 
-from typing import Dict
-from src.scrapers.unvime_scraper import UNVimeScraper
-from src.notifiers.manager import NotificationManager
+import threading
+from typing import Any, Dict, Optional
+from src.services.evento_repository import CalendarSnapshot, EventoRepository, get_evento_repository
+from src.config.constants import EXECUTOR_TIMEOUT_NOTIFICACION
+from src.utils.executor import get_executor
 from src.utils.logger import setup_logger
 
 
 class NotificacionesTools:
     """
     Herramientas MCP para enviar notificaciones.
+    
+    Los notificadores (webhook de Discord, cliente de Twilio) se crean
+    recién en el primer envío.
     """
     
-    def __init__(self):
+    def __init__(self, repository: Optional[EventoRepository] = None):
         self.logger = setup_logger("NotificacionesTools")
-        self.scraper = UNVimeScraper()
-        self.notification_manager = NotificationManager()
+        self.repository = repository or get_evento_repository()
+        
+        self._notification_manager = None
+        self._notification_manager_lock = threading.Lock()
+    
+    @property
+    def notification_manager(self):
+        """Manager con todos los notificadores registrados (se crea en el primer acceso)"""
+        if self._notification_manager is None:
+            with self._notification_manager_lock:
+                if self._notification_manager is None:
+                    from src.services.container import get_container
+                    
+                    # Mismos notificadores (y cliente de Twilio) que el resto del proceso
+                    self._notification_manager = get_container().notification_manager
+        
+        return self._notification_manager
+    
+    def _enviar(self, canal: str, evento) -> bool:
+        """Inicializa los notificadores si hace falta y envía (bloqueante)"""
+        return self.notification_manager.enviar_a_canal(canal, [evento])
     
-    def _obtener_todos_eventos(self):
-        """Obtiene todos los eventos"""
-        contenido_html = self.scraper.descargar_contenido()
-        return self.scraper.extraer_eventos(contenido_html)
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Estado de cada herramienta del grupo, sin inicializar nada.
+        
+        Returns:
+            Diccionario herramienta → estado
+        """
+        if self._notification_manager is None:
+            return {"enviar_recordatorio": {"estado": "no_inicializado", "detalle": "Se crea en el primer envío"}}
+        
+        canales = {n.nombre: n.is_configured() for n in self._notification_manager.notificadores}
+        estado = "listo" if any(canales.values()) else "degradado"
+        
+        return {"enviar_recordatorio": {"estado": estado, "canales": canales}}
     
-    async def enviar_recordatorio(self, evento_id: int, canal: str) -> Dict:
+    async def enviar_recordatorio(
+        self,
+        evento_id: str,
+        canal: str,
+        snapshot: Optional[CalendarSnapshot] = None
+    ) -> Dict:
         """
         Envía un recordatorio de un evento.
         
         Args:
-            evento_id: ID del evento
+            evento_id: ID estable del evento
             canal: Canal de notificación (discord, whatsapp, ambos)
+            snapshot: Snapshot donde resolver el ID (default: el vigente)
             
         Returns:
             Resultado del envío
         """
         try:
-            eventos = self._obtener_todos_eventos()
-            
-            if evento_id < 1 or evento_id > len(eventos):
-                return {"error": f"ID inválido. Debe ser entre 1 y {len(eventos)}"}
+            if snapshot is None:
+                snapshot = await self.repository.obtener_snapshot_async()
+            evento = snapshot.obtener(evento_id)
             
-            evento = eventos[evento_id - 1]
+            if evento is None:
+                return {"error": f"Evento no encontrado: {evento_id}"}
             
-            # Enviar según el canal
+            # Enviar según el canal (webhook y Twilio son bloqueantes)
+            executor = get_executor()
             resultados = {}
             
             if canal in ["discord", "ambos"]:
-                discord_result = self.notification_manager.notificar([evento], ["Discord"])
+                discord_result = await executor.ejecutar_io(
+                    self._enviar,
+                    "Discord",
+                    evento,
+                    timeout=EXECUTOR_TIMEOUT_NOTIFICACION
+                )
                 resultados["discord"] = "enviado" if discord_result else "error"
             
             if canal in ["whatsapp", "ambos"]:
-                whatsapp_result = self.notification_manager.notificar([evento], ["WhatsApp"])
+                whatsapp_result = await executor.ejecutar_io(
+                    self._enviar,
+                    "WhatsApp",
+                    evento,
+                    timeout=EXECUTOR_TIMEOUT_NOTIFICACION
+                )
                 resultados["whatsapp"] = "enviado" if whatsapp_result else "error"
             
             return {
                 "success": True,
+                "id": evento.id,
                 "evento": evento.titulo,
                 "fecha": evento.fecha.strftime("%Y-%m-%d"),
                 "canal": canal,
@@ -3,10 +3,32 @@
 📋 Modelo de datos para eventos del calendario académico
 """
 
+import hashlib
 from datetime import datetime
+from functools import cached_property
 from typing import Optional
 from pydantic import BaseModel, Field, validator
-from src.config.constants import CategoriaEvento, DIAS_SEMANA_ESPANOL
+from src.config.constants import CategoriaEvento, DIAS_SEMANA_ESPANOL, FUENTE_UNVIME
+from src.utils.validators import normalizar_texto
+
+
+def generar_evento_id(fecha: datetime, titulo: str, fuente: str = FUENTE_UNVIME) -> str:
+    """
+    Genera un ID estable a partir del contenido del evento.
+    
+    El mismo (fecha, título normalizado, fuente) produce siempre el mismo ID,
+    así que los IDs sobreviven a re-scrapeos y reordenamientos.
+    
+    Args:
+        fecha: Fecha del evento
+        titulo: Título del evento
+        fuente: Origen del evento
+        
+    Returns:
+        ID hexadecimal de 12 caracteres
+    """
+    clave = f"{fecha.strftime('%Y-%m-%d')}|{normalizar_texto(titulo)}|{fuente}"
+    return hashlib.sha1(clave.encode("utf-8")).hexdigest()[:12]
 
 
 class Evento(BaseModel):
@@ -17,8 +39,10 @@ class Evento(BaseModel):
         fecha: Fecha del evento
         titulo: Descripción del evento
         categoria: Categoría del evento (académico, feriado, etc.)
+        fuente: Origen del evento (calendario scrapeado)
         mes: Mes del evento (1-12)
         dia: Día del evento (1-31)
+        id: ID estable derivado de (fecha, título normalizado, fuente)
     """
     
     fecha: datetime = Field(..., description="Fecha del evento")
@@ -27,6 +51,7 @@ class Evento(BaseModel):
         default=CategoriaEvento.OTRO,
         description="Categoría del evento"
     )
+    fuente: str = Field(default=FUENTE_UNVIME, description="Origen del evento")
     
     @validator('titulo')
     def titulo_no_vacio(cls, v):
@@ -51,6 +76,11 @@ class Evento(BaseModel):
             raise ValueError(f'Categoría inválida: {v}')
         return v
     
+    @cached_property
+    def id(self) -> str:
+        """Retorna el ID estable del evento"""
+        return generar_evento_id(self.fecha, self.titulo, self.fuente)
+    
     @property
     def dia(self) -> int:
         """Retorna el día del mes"""
@@ -7,6 +7,8 @@ Implementa el patrón Template Method
 from abc import ABC, abstractmethod
 from typing import List
 from src.models.evento import Evento
+from src.config.constants import EXECUTOR_TIMEOUT_SCRAPING, EXECUTOR_TIMEOUT_PARSING
+from src.utils.executor import get_executor
 from src.utils.logger import setup_logger
 
 
@@ -66,6 +68,34 @@ class BaseScraper(ABC):
             self.logger.info(f"Scraping completado: {len(eventos)} eventos extraídos")
             return eventos
             
+        except Exception as e:
+            self.logger.error(f"Error durante el scraping: {e}", exc_info=True)
+            raise
+    
+    async def obtener_eventos_async(self) -> List[Evento]:
+        """
+        Versión async de obtener_eventos() que no bloquea el event loop.
+        La descarga corre en el pool de threads y el parsing en el de procesos.
+        
+        Returns:
+            Lista de eventos
+        """
+        executor = get_executor()
+        
+        try:
+            contenido = await executor.ejecutar_io(
+                self.descargar_contenido,
+                timeout=EXECUTOR_TIMEOUT_SCRAPING
+            )
+            eventos = await executor.ejecutar_cpu(
+                self.extraer_eventos,
+                contenido,
+                timeout=EXECUTOR_TIMEOUT_PARSING
+            )
+            
+            self.logger.info(f"Scraping completado: {len(eventos)} eventos extraídos")
+            return eventos
+            
         except Exception as e:
             self.logger.error(f"Error durante el scraping: {e}", exc_info=True)
             raise
\ No newline at end of file
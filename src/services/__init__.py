@@ -4,5 +4,10 @@ Servicios del proyecto Pregon
 """
 
 from .calendario_service import CalendarioService
+from .evento_repository import EventoRepository, CalendarSnapshot, get_evento_repository
+from .container import AppContainer, get_container
 
-__all__ = ['CalendarioService']
\ No newline at end of file
+__all__ = [
+    'CalendarioService', 'EventoRepository', 'CalendarSnapshot', 'get_evento_repository',
+    'AppContainer', 'get_container'
+]
\ No newline at end of file
@@ -4,8 +4,9 @@
 """
 
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from src.models.evento import Evento
+from src.scrapers.base import BaseScraper
 from src.scrapers.unvime_scraper import UNVimeScraper
 from src.notifiers.manager import NotificationManager
 from src.config.constants import TIMEDELTA_SEMANA
@@ -20,12 +21,26 @@ class CalendarioService:
     3. Envío de notificaciones
     """
     
-    def __init__(self):
-        """Inicializa el servicio"""
+    def __init__(
+        self,
+        scraper: Optional[BaseScraper] = None,
+        notification_manager: Optional[NotificationManager] = None
+    ):
+        """
+        Inicializa el servicio.
+        
+        Args:
+            scraper: Scraper a usar (default: UNVimeScraper)
+            notification_manager: Manager ya configurado (default: uno con todos los notificadores)
+        """
         self.logger = setup_logger("CalendarioService")
-        self.scraper = UNVimeScraper()
-        self.notification_manager = NotificationManager()
-        self.notification_manager.registrar_todos()
+        self.scraper = scraper or UNVimeScraper()
+        
+        if notification_manager is None:
+            notification_manager = NotificationManager()
+            notification_manager.registrar_todos()
+        
+        self.notification_manager = notification_manager
     
     def ejecutar(self) -> dict:
         """
@@ -0,0 +1,223 @@
+# src/services/container.py
+"""
+🧩 Contenedor de la aplicación
+Construye una sola vez por proceso las dependencias pesadas y las comparte
+"""
+
+import functools
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+from src.utils.logger import setup_logger
+
+
+class AppContainer:
+    """
+    Grafo de servicios compartido por bots, scheduler y servidor MCP.
+    
+    Cada componente se construye en el primer acceso y se reutiliza:
+    un solo cliente de Gemini, un solo cliente de Twilio, un solo
+    NotificationManager y un solo chatbot por proceso. Los componentes
+    que fallan al construirse no quedan guardados (se reintenta en el
+    próximo acceso).
+    
+    Cada componente se construye una sola vez aunque lo pidan varios
+    hilos, y sólo esperan quienes piden ese mismo componente: una
+    construcción lenta (p. ej. Google Calendar) no frena al resto.
+    """
+    
+    def __init__(self):
+        self.logger = setup_logger("AppContainer")
+        self._componentes: Dict[str, Any] = {}
+        # Construcciones en curso: nombre → (future, hilo que construye)
+        self._pendientes: Dict[str, Any] = {}
+        # Sólo protege los diccionarios, nunca se toma mientras corre una fábrica
+        self._lock = threading.Lock()
+    
+    def _obtener(self, nombre: str, fabrica: Callable[[], Any]) -> Any:
+        """
+        Obtiene (creándolo si hace falta) un componente.
+        
+        Args:
+            nombre: Clave del componente
+            fabrica: Función que lo construye (puede pedir otros componentes)
+        
+        Returns:
+            Instancia compartida
+        
+        Raises:
+            RuntimeError: Si la fábrica pide el mismo componente que construye
+        """
+        componente = self._componentes.get(nombre)
+        if componente is not None:
+            return componente
+        
+        with self._lock:
+            if nombre in self._componentes:
+                return self._componentes[nombre]
+            
+            pendiente = self._pendientes.get(nombre)
+            if pendiente is None:
+                futuro = Future()
+                self._pendientes[nombre] = (futuro, threading.get_ident())
+                propio = True
+            else:
+                futuro, hilo = pendiente
+                if hilo == threading.get_ident():
+                    raise RuntimeError(f"Dependencia circular construyendo '{nombre}'")
+                propio = False
+        
+        # Otro hilo lo está construyendo: esperar su resultado (o su error)
+        if not propio:
+            return futuro.result()
+        
+        try:
+            componente = fabrica()
+        except BaseException as e:
+            with self._lock:
+                del self._pendientes[nombre]
+            futuro.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._componentes[nombre] = componente
+            del self._pendientes[nombre]
+        futuro.set_result(componente)
+        
+        self.logger.debug(f"Componente '{nombre}' inicializado")
+        return componente
+    
+    @property
+    def repository(self):
+        """Repositorio de eventos (snapshot compartido)"""
+        from src.services.evento_repository import get_evento_repository
+        return self._obtener("repository", get_evento_repository)
+    
+    @property
+    def llm_client(self):
+        """Cliente de Gemini del proceso"""
+        from src.ai.llm_client import get_llm_client
+        return self._obtener("llm_client", get_llm_client)
+    
+    @property
+    def discord_notifier(self):
+        """Notificador por webhook de Discord"""
+        from src.notifiers.discord_notifier import DiscordNotifier
+        return self._obtener("discord_notifier", DiscordNotifier)
+    
+    @property
+    def whatsapp_notifier(self):
+        """Notificador de WhatsApp (cliente de Twilio)"""
+        from src.notifiers.whatsapp_notifier import WhatsAppNotifier
+        return self._obtener("whatsapp_notifier", WhatsAppNotifier)
+    
+    @property
+    def notification_manager(self):
+        """Manager con los notificadores compartidos registrados"""
+        def crear():
+            from src.notifiers.manager import NotificationManager
+            
+            manager = NotificationManager()
+            manager.registrar(self.discord_notifier)
+            manager.registrar(self.whatsapp_notifier)
+            return manager
+        
+        return self._obtener("notification_manager", crear)
+    
+    @property
+    def calendario_service(self):
+        """Servicio de notificación semanal (usa el scraper del repositorio)"""
+        def crear():
+            from src.services.calendario_service import CalendarioService
+            
+            return CalendarioService(
+                scraper=self.repository.scraper,
+                notification_manager=self.notification_manager
+            )
+        
+        return self._obtener("calendario_service", crear)
+    
+    @property
+    def google_calendar(self):
+        """
+        Servicio de Google Calendar (bloqueante en el primer acceso).
+        
+        Nunca abre el flujo OAuth interactivo: sin token válido falla
+        enseguida con AutorizacionPendienteError.
+        """
+        from src.integrations.google_calendar_service import GoogleCalendarService
+        return self._obtener("google_calendar", functools.partial(GoogleCalendarService, interactivo=False))
+    
+    @property
+    def calendar_manager(self):
+        """Gestor de links y selección de eventos para Google Calendar"""
+        from src.integrations.calendar_manager import CalendarManager
+        return self._obtener("calendar_manager", CalendarManager)
+    
+    @property
+    def mcp_server(self):
+        """Servidor MCP en proceso"""
+        from src.mcp.server import get_mcp_server
+        return self._obtener("mcp_server", get_mcp_server)
+    
+    @property
+    def chatbot(self):
+        """Chatbot compartido por Discord y WhatsApp"""
+        def crear():
+            from src.ai.chatbot import CalendarioChatbot
+            
+            return CalendarioChatbot(
+                llm=self.llm_client,
+                calendario_service=self.calendario_service,
+                repository=self.repository
+            )
+        
+        return self._obtener("chatbot", crear)
+    
+    @property
+    def precalentador(self):
+        """Precalentado de respuestas frecuentes del chatbot compartido"""
+        def crear():
+            from src.ai.precalentador import PrecalentadorRespuestas
+            
+            return PrecalentadorRespuestas(chatbot=self.chatbot, repository=self.repository)
+        
+        return self._obtener("precalentador", crear)
+    
+    @property
+    def whatsapp_bot(self):
+        """Bot interactivo de WhatsApp"""
+        def crear():
+            from src.integrations.whatsapp_bot import WhatsAppBot
+            
+            return WhatsAppBot(
+                chatbot=self.chatbot,
+                notifier=self.whatsapp_notifier,
+                calendar_manager=self.calendar_manager
+            )
+        
+        return self._obtener("whatsapp_bot", crear)
+    
+    def inicializados(self) -> List[str]:
+        """
+        Componentes ya construidos.
+        
+        Returns:
+            Nombres de los componentes en orden de creación
+        """
+        return list(self._componentes)
+
+
+# Instancia global del contenedor
+_container_instance = None
+_container_lock = threading.Lock()
+
+
+def get_container() -> AppContainer:
+    """Obtiene la instancia global del contenedor"""
+    global _container_instance
+    if _container_instance is None:
+        with _container_lock:
+            if _container_instance is None:
+                _container_instance = AppContainer()
+    return _container_instance
\ No newline at end of file
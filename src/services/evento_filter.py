@@ -4,12 +4,19 @@
 Selecciona eventos relevantes según la consulta parseada
 """
 
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
+import numpy as np
 from src.models.evento import Evento
+from src.services.evento_index import UMBRAL_SIMILITUD, EventoIndex
 from src.utils.query_parser import QueryParser
 from src.utils.logger import setup_logger
 
+# Límites de eventos devueltos al contexto
+MAX_EVENTOS_FILTRADOS = 50
+MAX_EVENTOS_SIN_FILTRO = 100
+MAX_EVENTOS_LEXICOS = 20
+
 
 class EventoFilter:
     """
@@ -21,13 +28,19 @@ class EventoFilter:
         self.logger = setup_logger("EventoFilter")
         self.parser = QueryParser()
     
-    def filtrar(self, consulta: str, todos_eventos: List[Evento]) -> List[Evento]:
+    def filtrar(
+        self,
+        consulta: str,
+        todos_eventos: List[Evento],
+        indice: Optional[EventoIndex] = None
+    ) -> List[Evento]:
         """
         Filtra eventos relevantes según la consulta.
         
         Args:
             consulta: Pregunta del usuario
             todos_eventos: Lista completa de eventos
+            indice: Índice léxico de todos_eventos (opcional)
             
         Returns:
             Lista filtrada de eventos relevantes
@@ -35,10 +48,38 @@ class EventoFilter:
         # Parsear consulta
         info = self.parser.parse(consulta)
         
+        return self.filtrar_por_info(info, todos_eventos, indice)
+    
+    def filtrar_por_info(
+        self,
+        info: dict,
+        todos_eventos: List[Evento],
+        indice: Optional[EventoIndex] = None
+    ) -> List[Evento]:
+        """
+        Filtra eventos con una consulta ya parseada (o filtros resueltos).
+        
+        Con el índice del snapshot la selección es vectorial (máscara de
+        fechas y tipo + similitud con las palabras clave); sin él se usan
+        los filtros de listas.
+        
+        Args:
+            info: Diccionario con mes, año, tipo_evento, temporal y keywords
+            todos_eventos: Lista completa de eventos
+            indice: Índice léxico de todos_eventos (opcional)
+            
+        Returns:
+            Lista filtrada de eventos relevantes
+        """
+        if indice is not None and len(indice) == len(todos_eventos):
+            seleccion = self._filtrar_con_indice(info, todos_eventos, indice)
+            if seleccion is not None:
+                return seleccion
+        
         # Si no detectamos ningún filtro específico, devolver todo
         if not any([info['mes'], info['tipo_evento'], info['temporal']]):
             self.logger.info("Sin filtros específicos detectados, usando todos los eventos")
-            return todos_eventos[:100]  # Límite de seguridad
+            return todos_eventos[:MAX_EVENTOS_SIN_FILTRO]  # Límite de seguridad
         
         eventos_filtrados = todos_eventos.copy()
         
@@ -67,7 +108,42 @@ class EventoFilter:
         
         self.logger.info(f"Total eventos filtrados: {len(eventos_filtrados)}")
         
-        return eventos_filtrados[:50]  # Máximo 50 eventos
+        return eventos_filtrados[:MAX_EVENTOS_FILTRADOS]
+    
+    def _filtrar_con_indice(
+        self,
+        info: dict,
+        todos_eventos: List[Evento],
+        indice: EventoIndex
+    ) -> Optional[List[Evento]]:
+        """
+        Selección vectorial con el índice léxico del snapshot.
+        
+        - Con mes, tipo o temporal: los eventos de la máscara; si son
+          demasiados, primero los más parecidos a la consulta
+        - Sin filtros: los eventos cuyo título se parece a la consulta
+        
+        Returns:
+            Eventos en orden cronológico, o None para seguir con los
+            filtros de listas (sin coincidencias)
+        """
+        consulta = " ".join(info.get('keywords') or [])
+        puntajes = indice.similitudes(consulta)
+        
+        if any([info['mes'], info['tipo_evento'], info['temporal']]):
+            candidatos = np.flatnonzero(indice.mascara(info))
+            limite = MAX_EVENTOS_FILTRADOS
+        else:
+            candidatos = np.flatnonzero(puntajes >= UMBRAL_SIMILITUD)
+            limite = MAX_EVENTOS_LEXICOS
+        
+        if len(candidatos) == 0:
+            return None
+        
+        seleccion = EventoIndex.seleccionar(puntajes, candidatos, limite)
+        self.logger.info(f"Seleccionados con el índice léxico: {len(seleccion)} de {len(candidatos)} candidatos")
+        
+        return sorted((todos_eventos[i] for i in seleccion), key=lambda e: e.fecha)
     
     def _filtrar_por_mes(self, eventos: List[Evento], mes: int, año: int = None) -> List[Evento]:
         """Filtra eventos por mes (y opcionalmente año)"""
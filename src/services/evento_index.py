@@ -0,0 +1,230 @@
+# src/services/evento_index.py
+"""
+🧮 Índice léxico de eventos
+Vectores TF-IDF de n-gramas de caracteres sobre los títulos, en arrays de
+NumPy. Se construye al publicar cada snapshot y se consulta sin red.
+"""
+
+import math
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.models.evento import Evento
+from src.utils.validators import normalizar_texto
+
+# Largos de n-gramas: toleran plurales y variantes ("examenes" ~ "examen")
+NGRAMAS = (3, 4)
+
+# Similitud coseno mínima para considerar que un evento coincide con la consulta
+UMBRAL_SIMILITUD = 0.2
+
+
+def ngramas(texto: str) -> Iterable[str]:
+    """
+    N-gramas de caracteres de cada palabra (con bordes marcados).
+    
+    Args:
+        texto: Texto a descomponer
+    
+    Yields:
+        N-gramas del texto normalizado (" ex", "exa", ..., "en ")
+    """
+    for palabra in normalizar_texto(texto).split():
+        palabra = f" {palabra} "
+        for n in NGRAMAS:
+            for i in range(len(palabra) - n + 1):
+                yield palabra[i:i + n]
+
+
+class EventoIndex:
+    """
+    Índice vectorial de los eventos de un snapshot.
+    
+    - Una fila TF-IDF normalizada por título distinto (el scraper expande
+      los rangos en un evento por día con el mismo título)
+    - Fechas, meses, años y categorías en arrays paralelos a los eventos,
+      para resolver las ventanas de fecha con máscaras booleanas
+    - Una consulta es un producto matriz-vector más un top-k
+    """
+    
+    def __init__(self, eventos: List[Evento]):
+        """
+        Construye el índice.
+        
+        Args:
+            eventos: Eventos del snapshot (el orden se conserva)
+        """
+        self.eventos = list(eventos)
+        
+        filas: Dict[str, int] = {}
+        textos: List[Counter] = []
+        posiciones = []
+        
+        for evento in self.eventos:
+            texto = f"{evento.titulo} {evento.categoria}"
+            fila = filas.get(texto)
+            if fila is None:
+                fila = filas[texto] = len(textos)
+                textos.append(Counter(ngramas(texto)))
+            posiciones.append(fila)
+        
+        self.vocabulario: Dict[str, int] = {}
+        for conteo in textos:
+            for ngrama in conteo:
+                self.vocabulario.setdefault(ngrama, len(self.vocabulario))
+        
+        # Frecuencia de documento sobre títulos distintos (IDF suavizado)
+        df = np.zeros(len(self.vocabulario), dtype=np.float32)
+        matriz = np.zeros((len(textos), len(self.vocabulario)), dtype=np.float32)
+        
+        for fila, conteo in enumerate(textos):
+            for ngrama, veces in conteo.items():
+                columna = self.vocabulario[ngrama]
+                matriz[fila, columna] = 1 + math.log(veces)
+                df[columna] += 1
+        
+        self.idf = np.log((1 + len(textos)) / (1 + df)) + 1
+        self.matriz = self._normalizar(matriz * self.idf)
+        self.filas = np.array(posiciones, dtype=np.int32)
+        
+        self.dias = np.array([e.fecha.toordinal() for e in self.eventos], dtype=np.int32)
+        self.meses = np.array([e.fecha.month for e in self.eventos], dtype=np.int8)
+        self.años = np.array([e.fecha.year for e in self.eventos], dtype=np.int16)
+        self.categorias = np.array([e.categoria.lower() for e in self.eventos], dtype=str)
+    
+    @staticmethod
+    def _normalizar(matriz: np.ndarray) -> np.ndarray:
+        """Normaliza cada fila a norma 1 (las filas vacías quedan en cero)"""
+        normas = np.linalg.norm(matriz, axis=-1, keepdims=True)
+        return np.divide(matriz, normas, out=np.zeros_like(matriz), where=normas > 0)
+    
+    def __len__(self) -> int:
+        return len(self.eventos)
+    
+    def vectorizar(self, consulta: str) -> Optional[np.ndarray]:
+        """
+        Vector TF-IDF de una consulta en el espacio del índice.
+        
+        Args:
+            consulta: Texto de la consulta
+        
+        Returns:
+            Vector normalizado o None si no comparte n-gramas con ningún título
+        """
+        conteo = Counter(n for n in ngramas(consulta) if n in self.vocabulario)
+        if not conteo:
+            return None
+        
+        vector = np.zeros(len(self.vocabulario), dtype=np.float32)
+        for ngrama, veces in conteo.items():
+            vector[self.vocabulario[ngrama]] = 1 + math.log(veces)
+        
+        return self._normalizar(vector * self.idf)
+    
+    def similitudes(self, consulta: str) -> np.ndarray:
+        """
+        Similitud coseno de la consulta con cada evento.
+        
+        Args:
+            consulta: Texto de la consulta
+        
+        Returns:
+            Array con un puntaje en [0, 1] por evento
+        """
+        vector = self.vectorizar(consulta)
+        if vector is None:
+            return np.zeros(len(self.eventos), dtype=np.float32)
+        
+        return (self.matriz @ vector)[self.filas]
+    
+    def mascara(self, info: dict, hoy: Optional[date] = None) -> np.ndarray:
+        """
+        Eventos que cumplen mes, tipo y referencia temporal de una consulta.
+        
+        Mismas reglas que los filtros de EventoFilter, resueltas en bloque.
+        
+        Args:
+            info: Consulta parseada (mes, año, tipo_evento, temporal)
+            hoy: Fecha de referencia (default: hoy)
+        
+        Returns:
+            Array booleano por evento (todo True si la consulta no filtra)
+        """
+        hoy = hoy or date.today()
+        mascara = np.ones(len(self.eventos), dtype=bool)
+        
+        if info.get("mes"):
+            mascara &= self.meses == info["mes"]
+            if info.get("año"):
+                mascara &= self.años == info["año"]
+        
+        if info.get("tipo_evento"):
+            mascara &= np.char.find(self.categorias, info["tipo_evento"].lower()) >= 0
+        
+        temporal = info.get("temporal")
+        dia = hoy.toordinal()
+        ventanas = {
+            "today": (dia, dia),
+            "tomorrow": (dia + 1, dia + 1),
+            "this_week": (dia, dia + 7),
+            "next_week": (dia + 7, dia + 14),
+        }
+        
+        if temporal in ventanas:
+            desde, hasta = ventanas[temporal]
+            mascara &= (self.dias >= desde) & (self.dias <= hasta)
+        elif temporal == "this_month":
+            mascara &= (self.meses == hoy.month) & (self.años == hoy.year)
+        elif temporal == "next_month":
+            mascara &= self.meses == (hoy.month % 12) + 1
+        elif temporal == "this_year":
+            mascara &= self.años == hoy.year
+        
+        return mascara
+    
+    def buscar(
+        self,
+        consulta: str,
+        k: int = 20,
+        mascara: Optional[np.ndarray] = None,
+        umbral: float = UMBRAL_SIMILITUD
+    ) -> List[Tuple[Evento, float]]:
+        """
+        Los k eventos más similares a la consulta.
+        
+        Args:
+            consulta: Texto de la consulta
+            k: Cantidad máxima de resultados
+            mascara: Restringe la búsqueda a estos eventos (opcional)
+            umbral: Similitud mínima
+        
+        Returns:
+            Lista (evento, similitud) de mayor a menor similitud; a igual
+            similitud, en orden cronológico
+        """
+        puntajes = self.similitudes(consulta)
+        validos = puntajes >= umbral
+        if mascara is not None:
+            validos &= mascara
+        
+        indices = self.seleccionar(puntajes, np.flatnonzero(validos), k)
+        return [(self.eventos[i], float(puntajes[i])) for i in indices]
+    
+    @staticmethod
+    def seleccionar(puntajes: np.ndarray, candidatos: np.ndarray, k: int) -> np.ndarray:
+        """
+        Top-k de los candidatos por puntaje (desempata por posición).
+        
+        Args:
+            puntajes: Puntaje de cada evento
+            candidatos: Índices de eventos elegibles
+            k: Cantidad máxima a devolver
+        
+        Returns:
+            Índices ordenados de mayor a menor puntaje
+        """
+        orden = np.lexsort((candidatos, -puntajes[candidatos]))
+        return candidatos[orden[:k]]
\ No newline at end of file
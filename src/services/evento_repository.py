@@ -0,0 +1,298 @@
+# src/services/evento_repository.py
+"""
+🗂️ Repositorio de eventos con snapshots versionados
+Mantiene en memoria el último calendario scrapeado, indexado por ID estable
+"""
+
+import asyncio
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+from src.models.evento import Evento
+from src.scrapers.base import BaseScraper
+from src.services.evento_index import EventoIndex
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+
+def huella_eventos(eventos: Iterable[Evento]) -> str:
+    """
+    Hash corto del contenido completo de los eventos (no sólo de sus IDs:
+    un cambio de categoría o de redacción del título también cuenta).
+    
+    Args:
+        eventos: Eventos a resumir
+    
+    Returns:
+        Hash que no depende del orden de los eventos
+    """
+    serializados = sorted(evento.model_dump_json() for evento in eventos)
+    return hashlib.sha1("\n".join(serializados).encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass(frozen=True)
+class CalendarSnapshot:
+    """
+    Foto inmutable del calendario en un momento dado.
+    
+    Attributes:
+        version: Hash del contenido (cambia si cambia cualquier campo de un evento)
+        eventos: Eventos ordenados por fecha
+        indice: Mapa ID estable → evento
+        creado: Momento en que se obtuvo el contenido
+        busqueda: Índice léxico de los eventos (selección de contexto)
+    """
+    version: str
+    eventos: List[Evento]
+    indice: Dict[str, Evento] = field(repr=False)
+    creado: datetime
+    busqueda: Optional[EventoIndex] = field(default=None, repr=False, compare=False)
+    
+    def obtener(self, evento_id) -> Optional[Evento]:
+        """
+        Busca un evento por su ID estable.
+        
+        Args:
+            evento_id: ID del evento
+        
+        Returns:
+            Evento o None si no existe en este snapshot
+        """
+        return self.indice.get(str(evento_id))
+    
+    def __len__(self) -> int:
+        return len(self.eventos)
+
+
+# Suscriptores reciben el snapshot recién publicado
+SnapshotCallback = Callable[[CalendarSnapshot], None]
+
+
+class EventoRepository:
+    """
+    Fuente única de eventos para tools MCP, chatbot y bots.
+    
+    - Refresca el calendario cuando el snapshot supera el TTL
+    - Resuelve IDs estables con un acceso a diccionario
+    - Notifica a los suscriptores cuando se publica una versión nueva
+    """
+    
+    def __init__(self, scraper: Optional[BaseScraper] = None, ttl_segundos: Optional[int] = None):
+        """
+        Inicializa el repositorio.
+        
+        Args:
+            scraper: Scraper a usar (default: UNVimeScraper)
+            ttl_segundos: Vida del snapshot antes de refrescar (default: settings.cache_ttl)
+        """
+        self.logger = setup_logger("EventoRepository")
+        
+        if scraper is None:
+            from src.scrapers.unvime_scraper import UNVimeScraper
+            scraper = UNVimeScraper()
+        
+        self.scraper = scraper
+        self.ttl = timedelta(seconds=ttl_segundos if ttl_segundos is not None else settings.cache_ttl)
+        
+        self._snapshot: Optional[CalendarSnapshot] = None
+        self._lock = threading.Lock()
+        self._suscriptores: List[SnapshotCallback] = []
+        self._refresco: Optional[asyncio.Task] = None
+    
+    @property
+    def snapshot_actual(self) -> Optional[CalendarSnapshot]:
+        """Último snapshot publicado (sin refrescar)"""
+        return self._snapshot
+    
+    def _expirado(self, snapshot: CalendarSnapshot) -> bool:
+        """Verifica si el snapshot superó el TTL"""
+        return datetime.now() - snapshot.creado > self.ttl
+    
+    def segundos_hasta_expirar(self) -> float:
+        """
+        Tiempo que le queda al snapshot vigente antes de superar el TTL.
+        
+        Returns:
+            Segundos (0 si no hay snapshot o ya expiró)
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            return 0.0
+        
+        return max(0.0, (snapshot.creado + self.ttl - datetime.now()).total_seconds())
+    
+    def publicar(self, eventos: List[Evento]) -> CalendarSnapshot:
+        """
+        Publica un nuevo conjunto de eventos como snapshot.
+        
+        Si el contenido no cambió, sólo renueva el timestamp y no notifica.
+        
+        Args:
+            eventos: Eventos extraídos
+        
+        Returns:
+            Snapshot vigente
+        """
+        indice: Dict[str, Evento] = {}
+        for evento in sorted(eventos, key=lambda e: e.fecha):
+            # Eventos idénticos (misma fecha, título y fuente) comparten ID
+            indice.setdefault(evento.id, evento)
+        
+        version = huella_eventos(indice.values())
+        
+        # El índice léxico se arma una vez por versión del contenido
+        eventos_ordenados = list(indice.values())
+        previo = self._snapshot
+        if previo is not None and previo.version == version and previo.busqueda is not None:
+            busqueda = previo.busqueda
+        else:
+            busqueda = EventoIndex(eventos_ordenados)
+        
+        snapshot = CalendarSnapshot(
+            version=version,
+            eventos=eventos_ordenados,
+            indice=indice,
+            creado=datetime.now(),
+            busqueda=busqueda
+        )
+        
+        with self._lock:
+            anterior = self._snapshot
+            self._snapshot = snapshot
+        
+        if anterior is not None and anterior.version == version:
+            self.logger.debug(f"Snapshot sin cambios (versión {version})")
+            return snapshot
+        
+        self.logger.info(f"📸 Nuevo snapshot publicado: versión {version} ({len(snapshot)} eventos)")
+        self._notificar(snapshot)
+        
+        return snapshot
+    
+    def _notificar(self, snapshot: CalendarSnapshot) -> None:
+        """Avisa a los suscriptores de un snapshot nuevo"""
+        for callback in list(self._suscriptores):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                self.logger.error(f"Error notificando snapshot a {callback}: {e}", exc_info=True)
+    
+    def suscribir(self, callback: SnapshotCallback) -> None:
+        """
+        Registra un callback que se ejecuta al publicar una versión nueva.
+        
+        Args:
+            callback: Función que recibe el snapshot publicado
+        """
+        if callback not in self._suscriptores:
+            self._suscriptores.append(callback)
+    
+    def desuscribir(self, callback: SnapshotCallback) -> None:
+        """
+        Elimina un callback registrado.
+        
+        Args:
+            callback: Función registrada previamente
+        """
+        if callback in self._suscriptores:
+            self._suscriptores.remove(callback)
+    
+    def refrescar(self) -> CalendarSnapshot:
+        """
+        Scrapea el calendario y publica el resultado (bloqueante).
+        
+        Returns:
+            Snapshot vigente (el anterior si el scraping falla)
+        
+        Raises:
+            Exception: Si el scraping falla y no hay snapshot previo
+        """
+        try:
+            return self.publicar(self.scraper.obtener_eventos())
+        except Exception as e:
+            return self._snapshot_tras_error(e)
+    
+    async def refrescar_async(self) -> CalendarSnapshot:
+        """
+        Versión async de refrescar(). Las llamadas concurrentes
+        comparten un único scraping en curso.
+        
+        Returns:
+            Snapshot vigente (el anterior si el scraping falla)
+        """
+        loop = asyncio.get_running_loop()
+        tarea = self._refresco
+        
+        if tarea is None or tarea.done() or tarea.get_loop() is not loop:
+            tarea = loop.create_task(self._refrescar_async())
+            self._refresco = tarea
+        
+        return await asyncio.shield(tarea)
+    
+    async def _refrescar_async(self) -> CalendarSnapshot:
+        """Scraping async + publicación"""
+        try:
+            eventos = await self.scraper.obtener_eventos_async()
+            return self.publicar(eventos)
+        except Exception as e:
+            return self._snapshot_tras_error(e)
+    
+    def _snapshot_tras_error(self, error: Exception) -> CalendarSnapshot:
+        """Sirve el snapshot anterior si el refresco falló"""
+        if self._snapshot is None:
+            raise error
+        
+        self.logger.warning(f"⚠️ No se pudo refrescar el calendario, usando versión {self._snapshot.version}: {error}")
+        return self._snapshot
+    
+    def obtener_snapshot(self) -> CalendarSnapshot:
+        """
+        Retorna el snapshot vigente, refrescándolo si expiró (bloqueante).
+        
+        Returns:
+            Snapshot del calendario
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and not self._expirado(snapshot):
+            return snapshot
+        
+        return self.refrescar()
+    
+    async def obtener_snapshot_async(self) -> CalendarSnapshot:
+        """
+        Retorna el snapshot vigente sin bloquear el event loop.
+        
+        Returns:
+            Snapshot del calendario
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and not self._expirado(snapshot):
+            return snapshot
+        
+        return await self.refrescar_async()
+    
+    def buscar(self, evento_id) -> Optional[Evento]:
+        """
+        Busca un evento por ID en el snapshot vigente.
+        
+        Args:
+            evento_id: ID estable del evento
+        
+        Returns:
+            Evento o None si no existe
+        """
+        return self.obtener_snapshot().obtener(evento_id)
+
+
+# Instancia global del repositorio
+_repository_instance = None
+
+
+def get_evento_repository() -> EventoRepository:
+    """Obtiene la instancia global del repositorio de eventos"""
+    global _repository_instance
+    if _repository_instance is None:
+        _repository_instance = EventoRepository()
+    return _repository_instance
@@ -12,7 +12,8 @@ from .validators import (
     validar_url,
     validar_categoria,
     validar_rango_fechas,
-    sanitizar_texto
+    sanitizar_texto,
+    normalizar_texto
 )
 
 __all__ = [
@@ -25,5 +26,6 @@ __all__ = [
     'validar_url',
     'validar_categoria',
     'validar_rango_fechas',
-    'sanitizar_texto'
+    'sanitizar_texto',
+    'normalizar_texto'
 ]
\ No newline at end of file
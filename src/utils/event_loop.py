@@ -0,0 +1,149 @@
+# src/utils/event_loop.py
+"""
+🔁 Event loop de fondo para código sincrónico
+Un único loop por proceso en un thread propio: Flask y los scripts le
+envían corrutinas en vez de crear un loop por request.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+from src.config.constants import LOOP_TIMEOUT_DEFAULT
+from src.utils.logger import setup_logger
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """
+    Event loop de larga vida corriendo en un thread daemon.
+    
+    Los recursos async (cliente de Gemini, semáforos del planificador,
+    cachés, tareas de refresco del repositorio) quedan ligados a un
+    solo loop y se reutilizan entre requests, aunque los llamadores
+    sean threads distintos de un servidor WSGI.
+    """
+    
+    def __init__(self, nombre: str = "pregon-loop"):
+        """
+        Inicializa el loop (el thread arranca en el primer submit).
+        
+        Args:
+            nombre: Nombre del thread
+        """
+        self.logger = setup_logger("BackgroundLoop")
+        self.nombre = nombre
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def activo(self) -> bool:
+        """True si el thread del loop está corriendo"""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def _iniciar(self) -> asyncio.AbstractEventLoop:
+        """Crea el loop y su thread si todavía no existen"""
+        with self._lock:
+            if self.activo:
+                return self._loop
+            
+            loop = asyncio.new_event_loop()
+            listo = threading.Event()
+            
+            def correr():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(listo.set)
+                loop.run_forever()
+            
+            self._thread = threading.Thread(target=correr, name=self.nombre, daemon=True)
+            self._thread.start()
+            listo.wait()
+            
+            self._loop = loop
+            self.logger.debug(f"Event loop de fondo iniciado ({self.nombre})")
+            return loop
+    
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+        """
+        Programa una corrutina en el loop de fondo (seguro entre threads).
+        
+        Args:
+            coro: Corrutina a ejecutar
+        
+        Returns:
+            Future de concurrent.futures con el resultado
+        
+        Raises:
+            RuntimeError: Si se llama desde el propio loop (usar await)
+        """
+        loop = self._iniciar()
+        
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("submit() desde el loop de fondo: usar await directamente")
+        
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+    
+    def ejecutar(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = LOOP_TIMEOUT_DEFAULT) -> T:
+        """
+        Ejecuta una corrutina en el loop de fondo y espera el resultado.
+        
+        Args:
+            coro: Corrutina a ejecutar
+            timeout: Segundos máximos de espera (None = sin límite)
+        
+        Returns:
+            Resultado de la corrutina
+        
+        Raises:
+            TimeoutError: Si se supera el timeout (la corrutina se cancela)
+        """
+        future = self.submit(coro)
+        
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            nombre = getattr(coro, "__qualname__", repr(coro))
+            self.logger.warning(f"⏱️ Timeout ({timeout}s) esperando {nombre}")
+            raise TimeoutError(f"La operación {nombre} superó el límite de {timeout} segundos")
+    
+    def detener(self, timeout: float = 5.0) -> None:
+        """
+        Detiene el loop y espera a que termine su thread.
+        
+        Args:
+            timeout: Segundos máximos de espera
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        
+        if loop is None or thread is None:
+            return
+        
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        
+        if not thread.is_alive():
+            loop.close()
+            self.logger.debug("Event loop de fondo detenido")
+
+
+# Instancia global del loop de fondo
+_loop_instance = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Obtiene la instancia global del loop de fondo"""
+    global _loop_instance
+    if _loop_instance is None:
+        with _loop_lock:
+            if _loop_instance is None:
+                _loop_instance = BackgroundLoop()
+    return _loop_instance
\ No newline at end of file
@@ -0,0 +1,166 @@
+# src/utils/executor.py
+"""
+⚡ Capa de ejecución para trabajo bloqueante
+Saca del event loop las descargas, el parsing y las APIs sincrónicas
+(Google Calendar, Twilio) para que el bot siga respondiendo bajo carga.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from src.config.constants import EXECUTOR_TIMEOUT_DEFAULT
+from src.config.settings import settings
+from src.utils.logger import setup_logger
+
+T = TypeVar("T")
+
+
+class BlockingExecutor:
+    """
+    Ejecuta funciones bloqueantes fuera del event loop.
+    
+    - I/O (requests, Google API, Twilio) → pool de threads acotado
+    - CPU (parsing con BeautifulSoup) → pool de procesos
+    Cada operación tiene un timeout propio; si se cumple se libera
+    al llamador aunque el trabajo siga corriendo en segundo plano.
+    """
+    
+    def __init__(self, max_threads: Optional[int] = None, max_procesos: Optional[int] = None):
+        """
+        Inicializa los pools (se crean recién en el primer uso).
+        
+        Args:
+            max_threads: Tamaño del pool de threads (default: settings)
+            max_procesos: Tamaño del pool de procesos, 0 lo deshabilita (default: settings)
+        """
+        self.logger = setup_logger("BlockingExecutor")
+        self.max_threads = max_threads if max_threads is not None else settings.executor_max_threads
+        self.max_procesos = max_procesos if max_procesos is not None else settings.executor_max_procesos
+        
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        """Crea el pool de threads bajo demanda"""
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.max_threads,
+                thread_name_prefix="pregon-io"
+            )
+            self.logger.debug(f"Pool de threads creado ({self.max_threads} workers)")
+        return self._thread_pool
+    
+    def _get_process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Crea el pool de procesos bajo demanda (None si está deshabilitado)"""
+        if self.max_procesos <= 0:
+            return None
+        
+        if self._process_pool is None:
+            try:
+                # spawn: evita heredar threads/locks de discord.py o grpc vía fork
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.max_procesos,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self.logger.debug(f"Pool de procesos creado ({self.max_procesos} workers)")
+            except (OSError, NotImplementedError) as e:
+                self.logger.warning(f"No se pudo crear el pool de procesos, usando threads: {e}")
+                self.max_procesos = 0
+                return None
+        
+        return self._process_pool
+    
+    async def _ejecutar(self, pool: Executor, func: Callable[..., T], args, kwargs, timeout: Optional[float]) -> T:
+        """Ejecuta func en el pool indicado con timeout"""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+        
+        limite = timeout if timeout is not None else EXECUTOR_TIMEOUT_DEFAULT
+        
+        try:
+            return await asyncio.wait_for(future, timeout=limite)
+        except asyncio.TimeoutError:
+            nombre = getattr(func, "__qualname__", repr(func))
+            self.logger.warning(f"⏱️ Timeout ({limite}s) ejecutando {nombre}")
+            raise TimeoutError(f"La operación {nombre} superó el límite de {limite} segundos")
+    
+    async def ejecutar_io(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """
+        Ejecuta una función de I/O bloqueante en el pool de threads.
+        
+        Args:
+            func: Función a ejecutar
+            *args: Argumentos posicionales
+            timeout: Segundos máximos de espera (default: EXECUTOR_TIMEOUT_DEFAULT)
+            **kwargs: Argumentos nombrados
+        
+        Returns:
+            Resultado de la función
+        
+        Raises:
+            TimeoutError: Si la operación supera el timeout
+        """
+        return await self._ejecutar(self._get_thread_pool(), func, args, kwargs, timeout)
+    
+    async def ejecutar_cpu(self, func: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """
+        Ejecuta una función CPU-intensiva en el pool de procesos.
+        
+        La función y sus argumentos deben ser serializables con pickle.
+        Si el pool de procesos está deshabilitado o se rompe, cae al
+        pool de threads.
+        
+        Args:
+            func: Función a ejecutar
+            *args: Argumentos posicionales
+            timeout: Segundos máximos de espera (default: EXECUTOR_TIMEOUT_DEFAULT)
+            **kwargs: Argumentos nombrados
+        
+        Returns:
+            Resultado de la función
+        
+        Raises:
+            TimeoutError: Si la operación supera el timeout
+        """
+        pool = self._get_process_pool()
+        
+        if pool is None:
+            return await self.ejecutar_io(func, *args, timeout=timeout, **kwargs)
+        
+        try:
+            return await self._ejecutar(pool, func, args, kwargs, timeout)
+        except BrokenProcessPool as e:
+            self.logger.error(f"Pool de procesos roto, reintentando en threads: {e}")
+            self._process_pool = None
+            return await self.ejecutar_io(func, *args, timeout=timeout, **kwargs)
+    
+    def cerrar(self, esperar: bool = False) -> None:
+        """
+        Cierra los pools.
+        
+        Args:
+            esperar: Si True, espera a que terminen las tareas en curso
+        """
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=esperar, cancel_futures=not esperar)
+            self._thread_pool = None
+        
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=esperar, cancel_futures=not esperar)
+            self._process_pool = None
+
+
+# Instancia global del executor
+_executor_instance = None
+
+
+def get_executor() -> BlockingExecutor:
+    """Obtiene la instancia global del executor"""
+    global _executor_instance
+    if _executor_instance is None:
+        _executor_instance = BlockingExecutor()
+    return _executor_instance
@@ -11,6 +11,9 @@ import colorlog
 from src.config.settings import settings, get_logs_dir
 from src.config.constants import LOG_FORMAT, LOG_DATE_FORMAT, LOG_MAX_BYTES, LOG_BACKUP_COUNT
 
+# Stream de consola para loggers nuevos (stderr cuando stdout es un transporte)
+_stream_consola = sys.stdout
+
 
 def setup_logger(
     name: str,
@@ -39,7 +42,7 @@ def setup_logger(
     logger.setLevel(getattr(logging, log_level))
     
     # Handler para consola con colores
-    console_handler = colorlog.StreamHandler(sys.stdout)
+    console_handler = colorlog.StreamHandler(_stream_consola)
     console_handler.setLevel(getattr(logging, log_level))
     
     # Formato con colores para consola
@@ -87,5 +90,20 @@ def setup_logger(
     return logger
 
 
+def redirigir_consola_a_stderr() -> None:
+    """
+    Envía la salida de consola de todos los loggers a stderr.
+    
+    Necesario cuando stdout transporta un protocolo (MCP sobre stdio).
+    """
+    global _stream_consola
+    _stream_consola = sys.stderr
+    
+    for nombre in list(logging.Logger.manager.loggerDict):
+        for handler in logging.getLogger(nombre).handlers:
+            if isinstance(handler, logging.StreamHandler) and getattr(handler, "stream", None) is sys.stdout:
+                handler.setStream(sys.stderr)
+
+
 # Logger por defecto del módulo
 logger = setup_logger(__name__)
\ No newline at end of file
@@ -4,6 +4,7 @@
 """
 
 import re
+import unicodedata
 from datetime import datetime
 from typing import Optional, Tuple
 
@@ -107,4 +108,22 @@ def sanitizar_texto(texto: str) -> str:
     # Eliminar caracteres especiales peligrosos
     texto = re.sub(r'[<>\"\'&]', '', texto)
     
+    return texto.strip()
+
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normaliza un texto para comparaciones y claves estables.
+    Pasa a minúsculas, quita tildes y signos, y colapsa espacios.
+    
+    Args:
+        texto: Texto a normalizar
+        
+    Returns:
+        Texto normalizado (ej: "Día del Estudiante!" → "dia del estudiante")
+    """
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    texto = re.sub(r'[^a-z0-9]+', ' ', texto)
+    
     return texto.strip()
\ No newline at end of file
@@ -6,6 +6,7 @@ Fixtures compartidos para todos los tests
 import pytest
 from datetime import datetime
 from src.models.evento import Evento
+from src.scrapers.base import BaseScraper
 
 
 @pytest.fixture
@@ -67,4 +68,36 @@ def mock_cache(tmp_path):
     """Cache temporal para tests"""
     from src.utils.cache import Cache
     cache = Cache(cache_dir=str(tmp_path / "cache"), ttl_hours=1)
-    return cache
\ No newline at end of file
+    return cache
+
+
+class ScraperFalso(BaseScraper):
+    """Scraper sin red que devuelve eventos fijos"""
+    
+    def __init__(self, eventos):
+        super().__init__()
+        self.eventos = eventos
+        self.llamadas = 0
+    
+    def descargar_contenido(self) -> str:
+        self.llamadas += 1
+        return ""
+    
+    def extraer_eventos(self, contenido):
+        return list(self.eventos)
+    
+    async def obtener_eventos_async(self):
+        return self.obtener_eventos()
+
+
+@pytest.fixture
+def scraper_falso(lista_eventos):
+    """Scraper falso con la lista de eventos de ejemplo"""
+    return ScraperFalso(lista_eventos)
+
+
+@pytest.fixture
+def repositorio_eventos(scraper_falso):
+    """Repositorio de eventos alimentado por el scraper falso"""
+    from src.services.evento_repository import EventoRepository
+    return EventoRepository(scraper=scraper_falso, ttl_segundos=3600)
\ No newline at end of file
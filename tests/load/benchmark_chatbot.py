@@ -0,0 +1,343 @@
+# tests/load/benchmark_chatbot.py
+"""
+⏱️ Benchmark del chatbot sin red
+Corre CalendarioChatbot.responder sobre un corpus de preguntas con un
+backend LLM local (fake o casete) y separa el tiempo propio (filtrado,
+contexto, armado del prompt) del tiempo del modelo.
+
+Uso:
+    python -m tests.load.benchmark_chatbot --backend fake --latencia 0.2
+    python -m tests.load.benchmark_chatbot --backend cassette --cassette cache/llm_cassette.json
+    python -m tests.load.benchmark_chatbot --backend cassette --grabar   # graba con Gemini
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from src.ai.answer_cache import AnswerCache
+from src.ai.chatbot import CalendarioChatbot
+from src.ai.llm_backends import CassetteBackend, FakeBackend, GeminiBackend, LLMBackend, PrefijoPrompt
+from src.ai.llm_client import LLMClient
+from src.ai.scheduler import LLMScheduler, PrioridadLLM, estimar_tokens
+from src.services.calendario_service import CalendarioService
+from src.services.evento_repository import EventoRepository
+from tests.load.harness import (
+    NotificationManagerFalso,
+    ScraperFixture,
+    ServidorHTMLFixture,
+    generar_html_calendario,
+    percentil,
+)
+
+# Preguntas típicas de Discord y WhatsApp (atajos, filtros y búsquedas libres)
+CORPUS_PREGUNTAS = [
+    "¿Qué hay esta semana?",
+    "¿Hay algo hoy?",
+    "¿Cuándo es el próximo feriado?",
+    "¿Cuándo son los exámenes de julio?",
+    "¿Qué mesas de examen hay en diciembre?",
+    "¿Cuándo son las inscripciones?",
+    "¿Cuándo empiezan las clases del segundo cuatrimestre?",
+    "¿Hay feriados en mayo?",
+    "¿Qué pasa el próximo mes?",
+    "¿Cuándo es el aniversario de la universidad?",
+    "¿Hay receso en invierno?",
+    "¿Cuándo rindo Matemática?",
+    "¿Qué eventos institucionales hay este año?",
+    "¿Cuándo termina el cuatrimestre?",
+    "¿Hay clases la próxima semana?",
+    "Necesito saber las fechas de Física",
+]
+
+
+class BackendMedido(LLMBackend):
+    """Envuelve un backend y registra la duración de cada llamada al modelo"""
+    
+    def __init__(self, backend: LLMBackend):
+        self.backend = backend
+        self.nombre = backend.nombre
+        self.duraciones: List[float] = []
+    
+    async def generar(self, prompt: str) -> str:
+        inicio = time.perf_counter()
+        try:
+            return await self.backend.generar(prompt)
+        finally:
+            self.duraciones.append(time.perf_counter() - inicio)
+    
+    async def generar_stream(self, prompt: str) -> AsyncIterator[str]:
+        inicio = time.perf_counter()
+        try:
+            async for fragmento in self.backend.generar_stream(prompt):
+                yield fragmento
+        finally:
+            self.duraciones.append(time.perf_counter() - inicio)
+    
+    def generar_sync(self, prompt: str) -> str:
+        inicio = time.perf_counter()
+        try:
+            return self.backend.generar_sync(prompt)
+        finally:
+            self.duraciones.append(time.perf_counter() - inicio)
+    
+    async def preparar_prefijo(self, prefijo: PrefijoPrompt) -> bool:
+        return await self.backend.preparar_prefijo(prefijo)
+    
+    async def generar_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> str:
+        inicio = time.perf_counter()
+        try:
+            return await self.backend.generar_con_prefijo(prefijo, prompt)
+        finally:
+            self.duraciones.append(time.perf_counter() - inicio)
+    
+    async def generar_stream_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> AsyncIterator[str]:
+        inicio = time.perf_counter()
+        try:
+            async for fragmento in self.backend.generar_stream_con_prefijo(prefijo, prompt):
+                yield fragmento
+        finally:
+            self.duraciones.append(time.perf_counter() - inicio)
+
+
+@dataclass
+class MedicionPregunta:
+    """Una respuesta del chatbot"""
+    pregunta: str
+    total: float
+    modelo: float
+    llamadas_llm: int
+    tokens_prompt: int
+    
+    @property
+    def propio(self) -> float:
+        """Tiempo fuera del modelo: filtrado, contexto, prompt, planificador"""
+        return max(0.0, self.total - self.modelo)
+
+
+@dataclass
+class ResultadoBenchmark:
+    """Resultados de una corrida del benchmark"""
+    backend: str
+    duracion: float = 0.0
+    mediciones: List[MedicionPregunta] = field(default_factory=list)
+    casete: Dict[str, int] = field(default_factory=dict)
+    
+    def resumen(self) -> Dict[str, float]:
+        """
+        Estadísticas de la corrida.
+        
+        Returns:
+            Diccionario con respuestas, respuestas sin LLM, p50/p95 (ms) de
+            tiempo total, propio y del modelo, y tokens de prompt
+        """
+        con_llm = [m for m in self.mediciones if m.llamadas_llm]
+        tokens = [m.tokens_prompt for m in con_llm]
+        
+        reporte = {
+            "respuestas": len(self.mediciones),
+            "sin_llm": len(self.mediciones) - len(con_llm),
+            "tokens_prompt_promedio": sum(tokens) / len(tokens) if tokens else 0.0,
+            "tokens_prompt_max": max(tokens, default=0),
+        }
+        
+        for nombre, valores in (
+            ("total", [m.total for m in self.mediciones]),
+            ("propio", [m.propio for m in self.mediciones]),
+            ("modelo", [m.modelo for m in con_llm]),
+        ):
+            ordenados = sorted(valores)
+            reporte[f"{nombre}_p50_ms"] = percentil(ordenados, 50) * 1000
+            reporte[f"{nombre}_p95_ms"] = percentil(ordenados, 95) * 1000
+        
+        return reporte
+
+
+class PromptsRegistrados(LLMClient):
+    """LLMClient que registra los tokens de cada prompt enviado (sin el prefijo cacheado)"""
+    
+    def __init__(self, backend: LLMBackend):
+        super().__init__(backend=backend)
+        self.tokens_prompts: List[int] = []
+    
+    async def chat(self, mensaje, contexto=None, prioridad=PrioridadLLM.INTERACTIVA, prefijo=None) -> str:
+        self.tokens_prompts.append(estimar_tokens(mensaje))
+        return await super().chat(mensaje, contexto, prioridad, prefijo)
+
+
+def crear_backend_benchmark(
+    backend: str,
+    latencia: float = 0.0,
+    cassette: Optional[str] = None,
+    grabar: bool = False
+) -> LLMBackend:
+    """
+    Backend del modelo para el benchmark.
+    
+    Args:
+        backend: "fake" o "cassette"
+        latencia: Segundos por respuesta del modelo falso
+        cassette: Archivo del casete
+        grabar: Grabar el casete con Gemini (requiere GEMINI_API_KEY)
+    
+    Returns:
+        Backend sin red (salvo al grabar)
+    """
+    if backend == "fake":
+        return FakeBackend(latencia=latencia)
+    
+    if grabar:
+        return CassetteBackend(cassette, modo="record", backend=GeminiBackend())
+    
+    return CassetteBackend(cassette, modo="replay", respaldo=FakeBackend(latencia=latencia), reproducir_latencia=True)
+
+
+def crear_chatbot(repositorio: EventoRepository, backend: LLMBackend, usar_cache: bool = False) -> CalendarioChatbot:
+    """
+    Chatbot con el backend dado y sin límites de ritmo (no se mide la espera por RPM).
+    
+    Args:
+        repositorio: Repositorio con el calendario ya cargado
+        backend: Backend del modelo
+        usar_cache: Mantener la caché de respuestas (False: cada pregunta llega al pipeline)
+    
+    Returns:
+        Chatbot listo para el benchmark
+    """
+    llm = PromptsRegistrados(backend)
+    llm.scheduler = LLMScheduler(rpm=10**6, tpm=10**12, max_concurrencia=8, max_cola=64)
+    
+    servicio = CalendarioService(scraper=repositorio.scraper, notification_manager=NotificationManagerFalso())
+    chatbot = CalendarioChatbot(llm=llm, calendario_service=servicio, repository=repositorio)
+    
+    if not usar_cache:
+        chatbot.answer_cache = AnswerCache(max_entradas=0)
+    
+    return chatbot
+
+
+async def ejecutar(
+    backend: str = "fake",
+    latencia: float = 0.0,
+    cassette: Optional[str] = None,
+    grabar: bool = False,
+    repeticiones: int = 3,
+    eventos_por_mes: int = 10,
+    usar_cache: bool = False,
+    preguntas: Optional[List[str]] = None
+) -> ResultadoBenchmark:
+    """
+    Levanta el calendario local y responde el corpus de preguntas.
+    
+    Las preguntas se responden de a una para atribuir a cada una el
+    tiempo del modelo.
+    
+    Args:
+        backend: "fake" o "cassette"
+        latencia: Segundos por respuesta del modelo falso
+        cassette: Archivo del casete
+        grabar: Grabar el casete con Gemini
+        repeticiones: Pasadas sobre el corpus
+        eventos_por_mes: Tamaño del calendario simulado
+        usar_cache: Mantener la caché de respuestas
+        preguntas: Corpus (default: CORPUS_PREGUNTAS)
+    
+    Returns:
+        Resultados de la corrida
+    """
+    preguntas = preguntas or CORPUS_PREGUNTAS
+    medido = BackendMedido(crear_backend_benchmark(backend, latencia, cassette, grabar))
+    resultado = ResultadoBenchmark(backend=medido.nombre)
+    
+    with ServidorHTMLFixture(generar_html_calendario(eventos_por_mes)) as fixture:
+        repositorio = EventoRepository(scraper=ScraperFixture(fixture.url), ttl_segundos=3600)
+        await repositorio.obtener_snapshot_async()
+        
+        chatbot = crear_chatbot(repositorio, medido, usar_cache)
+        
+        inicio_corrida = time.perf_counter()
+        for _ in range(repeticiones):
+            for pregunta in preguntas:
+                llamadas, prompts = len(medido.duraciones), len(chatbot.llm.tokens_prompts)
+                
+                inicio = time.perf_counter()
+                await chatbot.responder(pregunta)
+                total = time.perf_counter() - inicio
+                
+                resultado.mediciones.append(MedicionPregunta(
+                    pregunta=pregunta,
+                    total=total,
+                    modelo=sum(medido.duraciones[llamadas:]),
+                    llamadas_llm=len(medido.duraciones) - llamadas,
+                    tokens_prompt=sum(chatbot.llm.tokens_prompts[prompts:])
+                ))
+        resultado.duracion = time.perf_counter() - inicio_corrida
+    
+    if isinstance(medido.backend, CassetteBackend):
+        await asyncio.to_thread(medido.backend.cerrar)
+        resultado.casete = {"aciertos": medido.backend.aciertos, "fallos": medido.backend.fallos}
+    
+    return resultado
+
+
+def formatear_reporte(resultado: ResultadoBenchmark) -> str:
+    """
+    Arma el reporte de texto de una corrida.
+    
+    Args:
+        resultado: Resultados del benchmark
+    
+    Returns:
+        Reporte listo para imprimir
+    """
+    r = resultado.resumen()
+    lineas = [
+        f"Backend: {resultado.backend} | respuestas: {r['respuestas']} (sin LLM: {r['sin_llm']}) | "
+        f"duración: {resultado.duracion:.2f}s",
+        f"{'':<10}{'p50 ms':>10}{'p95 ms':>10}",
+    ]
+    for nombre in ("total", "propio", "modelo"):
+        lineas.append(f"{nombre:<10}{r[f'{nombre}_p50_ms']:>10.2f}{r[f'{nombre}_p95_ms']:>10.2f}")
+    
+    lineas.append(
+        f"Prompt: {r['tokens_prompt_promedio']:.0f} tokens promedio, {r['tokens_prompt_max']} máximo"
+    )
+    if resultado.casete:
+        lineas.append(f"Casete: {resultado.casete['aciertos']} aciertos, {resultado.casete['fallos']} sin grabar")
+    
+    return "\n".join(lineas)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmark del chatbot de Pregon sin red")
+    parser.add_argument("--backend", choices=["fake", "cassette"], default="fake")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Segundos por respuesta del modelo falso")
+    parser.add_argument("--cassette", default="cache/llm_cassette.json", help="Archivo del casete")
+    parser.add_argument("--grabar", action="store_true", help="Grabar el casete con Gemini")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Pasadas sobre el corpus")
+    parser.add_argument("--eventos-por-mes", type=int, default=10, help="Tamaño del calendario simulado")
+    parser.add_argument("--cache", action="store_true", help="Usar la caché de respuestas")
+    args = parser.parse_args(argv)
+    
+    # Los logs INFO por pregunta distorsionan las latencias
+    logging.disable(logging.INFO)
+    
+    resultado = asyncio.run(ejecutar(
+        backend=args.backend,
+        latencia=args.latencia,
+        cassette=args.cassette,
+        grabar=args.grabar,
+        repeticiones=args.repeticiones,
+        eventos_por_mes=args.eventos_por_mes,
+        usar_cache=args.cache
+    ))
+    
+    print(formatear_reporte(resultado))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
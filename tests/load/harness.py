@@ -0,0 +1,508 @@
+# tests/load/harness.py
+"""
+🏋️ Harness de carga para el MCP Server de Pregon
+Simula N clientes concurrentes con una mezcla realista de herramientas,
+en proceso (call_tool) o sobre el transporte MCP real (SDK, JSON-RPC).
+
+Uso:
+    python -m tests.load.harness --clientes 50 --llamadas 20 --modo ambos
+"""
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from src.config.constants import MESES_ESPANOL, SCRAPING_TIMEOUT
+from src.mcp.server import PregonMCPServer
+from src.scrapers.unvime_scraper import UNVimeScraper
+from src.services.evento_repository import EventoRepository
+
+# Peso relativo de cada herramienta en el tráfico simulado
+MEZCLA_HERRAMIENTAS = {
+    "get_eventos_semana": 30,
+    "buscar_eventos": 30,
+    "get_proximos_examenes": 20,
+    "generar_link_calendar": 10,
+    "agregar_a_google_calendar": 5,
+    "enviar_recordatorio": 5,
+}
+
+CONSULTAS = ["examen", "inscripción", "receso", "clases", "feriado", "mesa", "cuatrimestre"]
+CATEGORIAS = ["examen", "academico", "feriado", "receso", "institucional", "administrativo"]
+
+
+# ============================================================================
+# BACKENDS FALSOS
+# ============================================================================
+
+def generar_html_calendario(eventos_por_mes: int = 10) -> str:
+    """
+    Genera un calendario con la estructura HTML real de UNViMe.
+    
+    Incluye eventos de un día y rangos (que el scraper expande por día).
+    
+    Args:
+        eventos_por_mes: Eventos por cada mes
+    
+    Returns:
+        HTML del calendario
+    """
+    titulos = [
+        ("examen", "Mesa de examen de {}"),
+        ("academico", "Inicio de clases de {}"),
+        ("administrativo", "Inscripción a {}"),
+        ("feriado", "Feriado nacional {}"),
+        ("institucional", "Aniversario de {}"),
+    ]
+    materias = ["Matemática", "Física", "Química", "Programación", "Estadística", "Biología"]
+    
+    meses = []
+    for nombre, numero in MESES_ESPANOL.items():
+        items = []
+        for i in range(eventos_por_mes):
+            categoria, plantilla = titulos[i % len(titulos)]
+            dia = 1 + (i * 27 // eventos_por_mes)
+            fecha = f"{dia}/{numero} al {dia + 2}/{numero}" if i % 4 == 3 else str(dia)
+            titulo = plantilla.format(materias[(i + numero) % len(materias)])
+            items.append(
+                f'<div class="cal-event-item categoria-{categoria}">'
+                f'<span class="cal-event-date">{fecha}</span>'
+                f'<span class="cal-event-title">. {titulo}</span></div>'
+            )
+        meses.append(
+            f'<div class="cal-month"><h3>{nombre.capitalize()}</h3>'
+            f'<div class="cal-event-list">{"".join(items)}</div></div>'
+        )
+    
+    return f'<html><body><div class="cal-grid">{"".join(meses)}</div></body></html>'
+
+
+class ServidorHTMLFixture:
+    """Servidor HTTP local que sirve un calendario fijo (sin red externa)"""
+    
+    def __init__(self, html: str):
+        contenido = html.encode("utf-8")
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(contenido)))
+                self.end_headers()
+                self.wfile.write(contenido)
+            
+            def log_message(self, *args):
+                pass
+        
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        host, puerto = self._httpd.server_address[:2]
+        return f"http://{host}:{puerto}/calendario/"
+    
+    def __enter__(self) -> "ServidorHTMLFixture":
+        self._thread.start()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class ScraperFixture(UNVimeScraper):
+    """Scraper real de UNViMe que descarga sin pasar por la caché en disco"""
+    
+    def descargar_contenido(self) -> str:
+        response = requests.get(self.url, timeout=SCRAPING_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+
+
+class GoogleCalendarFalso:
+    """Reemplazo de GoogleCalendarService con latencia simulada"""
+    
+    def __init__(self, latencia: float = 0.005):
+        self.latencia = latencia
+        self.service = object()
+    
+    def agregar_evento(self, evento) -> Dict[str, str]:
+        time.sleep(self.latencia)
+        return {"link": f"https://calendar.google.com/event?eid={evento.id}"}
+
+
+class LinkGeneratorFalso:
+    """Reemplazo de CalendarLinkGenerator sin acortador HTTP"""
+    
+    def generar_link(self, evento) -> str:
+        return f"https://calendar.google.com/render?action=TEMPLATE&text={evento.id}"
+
+
+class NotificationManagerFalso:
+    """Reemplazo de NotificationManager con latencia simulada"""
+    
+    def __init__(self, latencia: float = 0.005):
+        self.latencia = latencia
+        self.notificadores = []
+    
+    def enviar_a_canal(self, canal: str, eventos) -> bool:
+        time.sleep(self.latencia)
+        return True
+
+
+def crear_servidor_de_carga(url_calendario: str) -> PregonMCPServer:
+    """
+    Construye un PregonMCPServer con scraping real contra el fixture
+    local y backends falsos para Google Calendar y notificaciones.
+    
+    Args:
+        url_calendario: URL del servidor HTML local
+    
+    Returns:
+        Servidor listo para recibir carga
+    """
+    repositorio = EventoRepository(scraper=ScraperFixture(url_calendario), ttl_segundos=3600)
+    server = PregonMCPServer(repository=repositorio)
+    
+    server.calendario_tools._google_calendar = GoogleCalendarFalso()
+    server.calendario_tools.link_generator = LinkGeneratorFalso()
+    server.notificaciones_tools._notification_manager = NotificationManagerFalso()
+    
+    return server
+
+
+# ============================================================================
+# GENERACIÓN DE CARGA
+# ============================================================================
+
+def generar_llamada(rng: random.Random, ids: List[str]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Elige una herramienta según la mezcla y arma argumentos realistas.
+    
+    Args:
+        rng: Generador aleatorio (semilla fija para reproducibilidad)
+        ids: IDs de eventos válidos
+    
+    Returns:
+        Tupla (herramienta, argumentos)
+    """
+    nombre = rng.choices(list(MEZCLA_HERRAMIENTAS), weights=list(MEZCLA_HERRAMIENTAS.values()))[0]
+    
+    if nombre == "buscar_eventos":
+        argumentos = rng.choice([
+            {"query": rng.choice(CONSULTAS)},
+            {"categoria": rng.choice(CATEGORIAS)},
+            {"desde": f"{datetime.now().year}-{rng.randint(1, 6):02d}-01",
+             "hasta": f"{datetime.now().year}-{rng.randint(7, 12):02d}-28"},
+            {"limit": 20, "formato": "compacto"},
+        ])
+    elif nombre == "get_proximos_examenes":
+        argumentos = {"dias": rng.choice([7, 30, 90])}
+    elif nombre == "enviar_recordatorio":
+        argumentos = {"evento_id": rng.choice(ids), "canal": rng.choice(["discord", "whatsapp", "ambos"])}
+    elif nombre in ("generar_link_calendar", "agregar_a_google_calendar"):
+        argumentos = {"evento_id": rng.choice(ids)}
+    else:
+        argumentos = {}
+    
+    return nombre, argumentos
+
+
+def percentil(valores: List[float], p: float) -> float:
+    """Percentil por rango más cercano (valores ya ordenados)"""
+    if not valores:
+        return 0.0
+    indice = max(0, min(len(valores) - 1, math.ceil(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+
+@dataclass
+class ResultadoCarga:
+    """Resultados de una corrida de carga"""
+    modo: str
+    clientes: int
+    duracion: float
+    latencias: Dict[str, List[float]] = field(default_factory=dict)
+    errores: Dict[str, int] = field(default_factory=dict)
+    bytes_por_llamada: Dict[str, float] = field(default_factory=dict)
+    
+    @property
+    def total_llamadas(self) -> int:
+        return sum(len(v) for v in self.latencias.values())
+    
+    @property
+    def throughput(self) -> float:
+        """Llamadas por segundo"""
+        return self.total_llamadas / self.duracion if self.duracion else 0.0
+    
+    def resumen(self) -> Dict[str, Dict[str, float]]:
+        """
+        Estadísticas por herramienta.
+        
+        Returns:
+            Diccionario herramienta → llamadas, errores, p50/p95/p99 (ms) y KB por llamada
+        """
+        reporte = {}
+        for nombre, valores in sorted(self.latencias.items()):
+            ordenados = sorted(valores)
+            reporte[nombre] = {
+                "llamadas": len(ordenados),
+                "errores": self.errores.get(nombre, 0),
+                "p50_ms": percentil(ordenados, 50) * 1000,
+                "p95_ms": percentil(ordenados, 95) * 1000,
+                "p99_ms": percentil(ordenados, 99) * 1000,
+                "kb_por_llamada": self.bytes_por_llamada.get(nombre, 0.0) / 1024,
+            }
+        return reporte
+
+
+Invocador = Callable[[str, Dict[str, Any]], Any]
+
+
+async def _simular_clientes(
+    invocadores: List[Invocador],
+    llamadas_por_cliente: int,
+    ids: List[str],
+    semilla: int,
+    resultado: ResultadoCarga
+) -> None:
+    """Lanza un cliente por invocador y registra latencias y errores"""
+    
+    async def cliente(numero: int, invocar: Invocador) -> None:
+        rng = random.Random(semilla + numero)
+        for _ in range(llamadas_por_cliente):
+            nombre, argumentos = generar_llamada(rng, ids)
+            inicio = time.perf_counter()
+            es_error = await invocar(nombre, argumentos)
+            resultado.latencias.setdefault(nombre, []).append(time.perf_counter() - inicio)
+            if es_error:
+                resultado.errores[nombre] = resultado.errores.get(nombre, 0) + 1
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(i, invocar) for i, invocar in enumerate(invocadores)))
+    resultado.duracion = time.perf_counter() - inicio
+
+
+async def carga_en_proceso(
+    server: PregonMCPServer,
+    clientes: int,
+    llamadas_por_cliente: int,
+    semilla: int = 42
+) -> ResultadoCarga:
+    """
+    Ejecuta la carga llamando a call_tool dentro del proceso.
+    
+    Args:
+        server: Servidor bajo prueba
+        clientes: Clientes concurrentes
+        llamadas_por_cliente: Llamadas que hace cada cliente
+        semilla: Semilla para la mezcla de herramientas
+    
+    Returns:
+        Resultados de la corrida
+    """
+    snapshot = await server.repository.obtener_snapshot_async()
+    ids = list(snapshot.indice)
+    
+    async def invocar(nombre: str, argumentos: Dict[str, Any]) -> bool:
+        respuesta = await server.call_tool(nombre, argumentos)
+        return respuesta.isError
+    
+    resultado = ResultadoCarga(modo="proceso", clientes=clientes, duracion=0.0)
+    await _simular_clientes([invocar] * clientes, llamadas_por_cliente, ids, semilla, resultado)
+    return resultado
+
+
+async def carga_por_transporte(
+    server: PregonMCPServer,
+    clientes: int,
+    llamadas_por_cliente: int,
+    semilla: int = 42
+) -> ResultadoCarga:
+    """
+    Ejecuta la carga a través del SDK de MCP: cada cliente abre su propia
+    sesión JSON-RPC (streams en memoria) contra el mismo servidor.
+    
+    Args:
+        server: Servidor bajo prueba
+        clientes: Sesiones concurrentes
+        llamadas_por_cliente: Llamadas que hace cada cliente
+        semilla: Semilla para la mezcla de herramientas
+    
+    Returns:
+        Resultados de la corrida
+    """
+    from contextlib import AsyncExitStack
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from src.mcp.stdio import crear_servidor_sdk
+    
+    snapshot = await server.repository.obtener_snapshot_async()
+    ids = list(snapshot.indice)
+    sdk = crear_servidor_sdk(server)
+    
+    resultado = ResultadoCarga(modo="transporte", clientes=clientes, duracion=0.0)
+    
+    async with AsyncExitStack() as stack:
+        sesiones = [
+            await stack.enter_async_context(create_connected_server_and_client_session(sdk))
+            for _ in range(clientes)
+        ]
+        
+        def invocador(sesion) -> Invocador:
+            async def invocar(nombre: str, argumentos: Dict[str, Any]) -> bool:
+                respuesta = await sesion.call_tool(nombre, argumentos)
+                return respuesta.isError
+            return invocar
+        
+        await _simular_clientes([invocador(s) for s in sesiones], llamadas_por_cliente, ids, semilla, resultado)
+    
+    return resultado
+
+
+async def medir_asignaciones(server: PregonMCPServer, muestras: int = 20, semilla: int = 7) -> Dict[str, float]:
+    """
+    Mide con tracemalloc el pico de memoria asignada por llamada y herramienta.
+    
+    Las llamadas se hacen de a una para poder atribuir cada asignación.
+    
+    Args:
+        server: Servidor bajo prueba
+        muestras: Llamadas por herramienta
+        semilla: Semilla para los argumentos
+    
+    Returns:
+        Diccionario herramienta → bytes promedio por llamada
+    """
+    snapshot = await server.repository.obtener_snapshot_async()
+    ids = list(snapshot.indice)
+    rng = random.Random(semilla)
+    
+    por_herramienta: Dict[str, List[int]] = {nombre: [] for nombre in MEZCLA_HERRAMIENTAS}
+    pendientes = {nombre: muestras for nombre in MEZCLA_HERRAMIENTAS}
+    
+    tracemalloc.start()
+    try:
+        while any(pendientes.values()):
+            nombre, argumentos = generar_llamada(rng, ids)
+            if not pendientes[nombre]:
+                continue
+            
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            await server.call_tool(nombre, argumentos)
+            _, pico = tracemalloc.get_traced_memory()
+            
+            por_herramienta[nombre].append(pico - base)
+            pendientes[nombre] -= 1
+    finally:
+        tracemalloc.stop()
+    
+    return {nombre: sum(v) / len(v) for nombre, v in por_herramienta.items() if v}
+
+
+def formatear_reporte(resultado: ResultadoCarga) -> str:
+    """
+    Arma una tabla de texto con los resultados.
+    
+    Args:
+        resultado: Resultados de una corrida
+    
+    Returns:
+        Reporte listo para imprimir
+    """
+    lineas = [
+        f"Modo: {resultado.modo} | clientes: {resultado.clientes} | "
+        f"llamadas: {resultado.total_llamadas} | duración: {resultado.duracion:.2f}s | "
+        f"throughput: {resultado.throughput:.1f} llamadas/s",
+        f"{'herramienta':<28}{'n':>6}{'err':>5}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'KB/llam':>9}",
+    ]
+    for nombre, stats in resultado.resumen().items():
+        lineas.append(
+            f"{nombre:<28}{stats['llamadas']:>6}{stats['errores']:>5}"
+            f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+            f"{stats['kb_por_llamada']:>9.1f}"
+        )
+    return "\n".join(lineas)
+
+
+async def ejecutar(
+    clientes: int,
+    llamadas_por_cliente: int,
+    modo: str = "ambos",
+    eventos_por_mes: int = 10,
+    muestras_memoria: int = 20
+) -> List[ResultadoCarga]:
+    """
+    Levanta el fixture HTML, construye el servidor y corre la carga.
+    
+    Args:
+        clientes: Clientes concurrentes
+        llamadas_por_cliente: Llamadas por cliente
+        modo: "proceso", "transporte" o "ambos"
+        eventos_por_mes: Tamaño del calendario simulado
+        muestras_memoria: Llamadas por herramienta para medir asignaciones (0: no medir)
+    
+    Returns:
+        Resultados de cada modo ejecutado
+    """
+    resultados = []
+    
+    with ServidorHTMLFixture(generar_html_calendario(eventos_por_mes)) as fixture:
+        server = crear_servidor_de_carga(fixture.url)
+        
+        asignaciones: Dict[str, float] = {}
+        if muestras_memoria:
+            asignaciones = await medir_asignaciones(server, muestras_memoria)
+        
+        if modo in ("proceso", "ambos"):
+            resultados.append(await carga_en_proceso(server, clientes, llamadas_por_cliente))
+        
+        if modo in ("transporte", "ambos"):
+            resultados.append(await carga_por_transporte(server, clientes, llamadas_por_cliente))
+    
+    for resultado in resultados:
+        resultado.bytes_por_llamada = asignaciones
+    
+    return resultados
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Punto de entrada por línea de comandos"""
+    parser = argparse.ArgumentParser(description="Harness de carga del MCP Server de Pregon")
+    parser.add_argument("--clientes", type=int, default=20, help="Clientes concurrentes")
+    parser.add_argument("--llamadas", type=int, default=25, help="Llamadas por cliente")
+    parser.add_argument("--modo", choices=["proceso", "transporte", "ambos"], default="ambos")
+    parser.add_argument("--eventos-por-mes", type=int, default=10, help="Tamaño del calendario simulado")
+    parser.add_argument("--muestras-memoria", type=int, default=20, help="Llamadas por herramienta para tracemalloc")
+    args = parser.parse_args(argv)
+    
+    # Los logs INFO por llamada distorsionan las latencias
+    logging.disable(logging.INFO)
+    
+    resultados = asyncio.run(ejecutar(
+        args.clientes,
+        args.llamadas,
+        args.modo,
+        args.eventos_por_mes,
+        args.muestras_memoria
+    ))
+    
+    for resultado in resultados:
+        print(formatear_reporte(resultado))
+        print()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
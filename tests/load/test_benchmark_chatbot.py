@@ -0,0 +1,42 @@
+"""
+Tests del benchmark del chatbot (corrida corta sin red)
+"""
+
+import pytest
+from tests.load.benchmark_chatbot import CORPUS_PREGUNTAS, ejecutar, formatear_reporte
+
+pytestmark = pytest.mark.load
+
+
+class TestBenchmarkChatbot:
+    """Corridas pequeñas del benchmark con backends locales"""
+    
+    @pytest.mark.asyncio
+    async def test_separa_tiempo_propio_y_del_modelo(self):
+        """Con latencia simulada, el tiempo del modelo debe aparecer aparte"""
+        resultado = await ejecutar(backend="fake", latencia=0.02, repeticiones=1)
+        resumen = resultado.resumen()
+        
+        assert resumen["respuestas"] == len(CORPUS_PREGUNTAS)
+        assert resumen["sin_llm"] < resumen["respuestas"]
+        assert resumen["modelo_p50_ms"] >= 20
+        assert resumen["propio_p50_ms"] < resumen["total_p95_ms"]
+        assert resumen["tokens_prompt_max"] > 0
+        assert "propio" in formatear_reporte(resultado)
+    
+    @pytest.mark.asyncio
+    async def test_grabar_y_reproducir_casete(self, tmp_path, monkeypatch):
+        """Un casete grabado debe reproducir todas las respuestas"""
+        from tests.load import benchmark_chatbot
+        from src.ai.llm_backends import FakeBackend
+        
+        # Se graba con el modelo falso en lugar de Gemini
+        monkeypatch.setattr(benchmark_chatbot, "GeminiBackend", FakeBackend)
+        ruta = str(tmp_path / "casete.json")
+        preguntas = CORPUS_PREGUNTAS[3:7]
+        
+        await ejecutar(backend="cassette", cassette=ruta, grabar=True, repeticiones=1, preguntas=preguntas)
+        resultado = await ejecutar(backend="cassette", cassette=ruta, repeticiones=1, preguntas=preguntas)
+        
+        assert resultado.casete["fallos"] == 0
+        assert resultado.casete["aciertos"] == len(preguntas) - resultado.resumen()["sin_llm"]
\ No newline at end of file
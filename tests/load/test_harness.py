@@ -0,0 +1,37 @@
+"""
+Tests del harness de carga (corrida corta para validar que funciona)
+"""
+
+import pytest
+from tests.load.harness import ejecutar, formatear_reporte, percentil, MEZCLA_HERRAMIENTAS
+
+pytestmark = pytest.mark.load
+
+
+class TestHarnessCarga:
+    """Corridas pequeñas del harness en ambos modos"""
+    
+    def test_percentil(self):
+        """Debe usar el método de rango más cercano"""
+        valores = [float(i) for i in range(1, 101)]
+        
+        assert percentil(valores, 50) == 50.0
+        assert percentil(valores, 99) == 99.0
+        assert percentil([], 95) == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_carga_en_proceso_y_transporte(self):
+        """Ambos modos deben completar todas las llamadas sin errores"""
+        resultados = await ejecutar(clientes=4, llamadas_por_cliente=10, modo="ambos", muestras_memoria=2)
+        
+        assert [r.modo for r in resultados] == ["proceso", "transporte"]
+        
+        for resultado in resultados:
+            resumen = resultado.resumen()
+            
+            assert resultado.total_llamadas == 40
+            assert resultado.throughput > 0
+            assert all(stats["errores"] == 0 for stats in resumen.values())
+            assert all(stats["p50_ms"] <= stats["p99_ms"] for stats in resumen.values())
+            assert set(resultado.bytes_por_llamada) == set(MEZCLA_HERRAMIENTAS)
+            assert "throughput" in formatear_reporte(resultado)
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Tests para la caché semántica de respuestas del chatbot
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.ai.answer_cache import AnswerCache, similitud_jaccard
+from src.models.evento import Evento
+
+
+class TestAnswerCache:
+    """Tests de la caché de respuestas"""
+    
+    def test_hit_exacto_ignora_mayusculas_y_tildes(self):
+        """La misma pregunta escrita distinto debe coincidir exactamente"""
+        cache = AnswerCache()
+        cache.guardar(cache.clave("¿Cuándo son los exámenes finales de diciembre?", "v1"), "respuesta")
+        
+        clave = cache.clave("cuando son los EXAMENES finales de diciembre", "v1")
+        
+        assert cache.obtener(clave) == "respuesta"
+        assert cache.estadisticas()["hits_exactos"] == 1
+    
+    def test_hit_por_similitud(self):
+        """Una pregunta equivalente debe reutilizar la respuesta"""
+        cache = AnswerCache(umbral_similitud=0.6)
+        cache.guardar(cache.clave("¿Cuándo son los exámenes finales de diciembre?", "v1"), "respuesta")
+        
+        clave = cache.clave("¿Qué exámenes finales hay en diciembre?", "v1")
+        
+        assert cache.obtener(clave) == "respuesta"
+        assert cache.estadisticas()["hits_similares"] == 1
+    
+    def test_intencion_distinta_no_coincide(self):
+        """Otro tipo de evento u otro mes no deben reutilizar la respuesta"""
+        cache = AnswerCache(umbral_similitud=0.1)
+        cache.guardar(cache.clave("¿Cuándo son los exámenes de diciembre?", "v1"), "examenes")
+        
+        assert cache.obtener(cache.clave("¿Cuándo son los feriados de diciembre?", "v1")) is None
+        assert cache.obtener(cache.clave("¿Cuándo son los exámenes de marzo?", "v1")) is None
+    
+    def test_version_o_dia_distintos_no_coinciden(self):
+        """Un snapshot nuevo o un día distinto invalidan la respuesta"""
+        cache = AnswerCache()
+        pregunta = "¿Cuándo empiezan las clases?"
+        cache.guardar(cache.clave(pregunta, "v1", date(2025, 3, 1)), "respuesta")
+        
+        assert cache.obtener(cache.clave(pregunta, "v2", date(2025, 3, 1))) is None
+        assert cache.obtener(cache.clave(pregunta, "v1", date(2025, 3, 2))) is None
+    
+    def test_vacia_al_cambiar_el_dia(self):
+        """Al pasar la medianoche deben descartarse las entradas"""
+        cache = AnswerCache()
+        cache.guardar(cache.clave("¿Cuándo empiezan las clases?", "v1"), "respuesta")
+        cache._dia = date(2000, 1, 1)
+        
+        assert cache.obtener(cache.clave("otra pregunta", "v1")) is None
+        assert len(cache) == 0
+    
+    def test_lru_acotada(self):
+        """No debe superar el máximo de entradas"""
+        cache = AnswerCache(max_entradas=2)
+        for mes in ("marzo", "abril", "mayo"):
+            cache.guardar(cache.clave(f"¿Qué feriados hay en {mes}?", "v1"), mes)
+        
+        assert len(cache) == 2
+        assert cache.obtener(cache.clave("¿Qué feriados hay en marzo?", "v1")) is None
+        assert cache.obtener(cache.clave("¿Qué feriados hay en mayo?", "v1")) == "mayo"
+    
+    def test_deshabilitada(self):
+        """Con tamaño 0 no guarda nada"""
+        cache = AnswerCache(max_entradas=0)
+        clave = cache.clave("¿Cuándo empiezan las clases?", "v1")
+        cache.guardar(clave, "respuesta")
+        
+        assert cache.habilitada is False
+        assert cache.obtener(clave) is None
+    
+    def test_estadisticas_hit_rate(self):
+        """El hit rate debe contar exactos y similares"""
+        cache = AnswerCache()
+        clave = cache.clave("¿Cuándo empiezan las clases?", "v1")
+        
+        cache.obtener(clave)
+        cache.guardar(clave, "respuesta")
+        cache.obtener(clave)
+        
+        stats = cache.estadisticas()
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+    
+    def test_similitud_jaccard(self):
+        """Jaccard entre conjuntos de tokens"""
+        assert similitud_jaccard(frozenset({"a", "b"}), frozenset({"a", "b"})) == 1.0
+        assert similitud_jaccard(frozenset({"a", "b"}), frozenset({"b", "c"})) == pytest.approx(1 / 3)
+        assert similitud_jaccard(frozenset(), frozenset({"a"})) == 0.0
+
+
+class TestChatbotAnswerCache:
+    """Tests de la integración de la caché en CalendarioChatbot.responder"""
+    
+    @pytest.fixture
+    def chatbot(self):
+        """Chatbot con LLM y repositorio simulados"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        with patch("src.ai.chatbot.get_llm_client") as mock_llm:
+            mock_llm.return_value.chat = AsyncMock(return_value="🎓 Respuesta")
+            mock_llm.return_value.preparar_prefijo = AsyncMock(return_value=False)
+            mock_llm.return_value.soporta_cascada = False
+            bot = CalendarioChatbot()
+        
+        eventos = [
+            Evento(
+                fecha=datetime.now() + timedelta(days=3),
+                titulo="Inicio de clases",
+                categoria="academico"
+            )
+        ]
+        snapshot = MagicMock(version="v1", eventos=eventos)
+        bot.repository = MagicMock()
+        bot.repository.obtener_snapshot_async = AsyncMock(return_value=snapshot)
+        bot.answer_cache = AnswerCache(max_entradas=8)
+        return bot
+    
+    @pytest.mark.asyncio
+    async def test_segunda_pregunta_no_llama_al_llm(self, chatbot):
+        """La misma pregunta debe responderse desde la caché"""
+        primera = await chatbot.responder("¿Qué tengo que tener en cuenta sobre las clases?")
+        segunda = await chatbot.responder("que tengo que tener en cuenta sobre las clases")
+        
+        assert primera == segunda == "🎓 Respuesta"
+        assert chatbot.llm.chat.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_no_cachea_errores(self, chatbot):
+        """Un error del LLM no debe quedar en la caché"""
+        chatbot.llm.chat = AsyncMock(side_effect=RuntimeError("cuota"))
+        
+        await chatbot.responder("¿Cuándo empiezan las clases?")
+        
+        assert len(chatbot.answer_cache) == 0
\ No newline at end of file
@@ -0,0 +1,245 @@
+"""
+Tests para la cascada de modelos (rápido primero, completo si no convence)
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from google.api_core import exceptions as google_exceptions
+from src.ai.answer_cache import AnswerCache
+from src.ai.cascada import (
+    MOTIVO_SIN_FECHA, MOTIVO_VACIA, PoliticaCascada, RespuestaIncompletaError, fechas_mencionadas
+)
+from src.ai.llm_backends import LLMBackend
+from src.ai.resiliencia import CircuitBreaker, PoliticaResiliencia
+from src.ai.scheduler import LLMScheduler
+from src.ai.telemetria import TARIFA_PRINCIPAL, TARIFA_RAPIDO, TelemetriaLLM, anotar_respuesta
+from src.config.settings import settings
+from src.models.evento import Evento
+
+FERIADO = datetime.now() + timedelta(days=3)
+
+
+class BackendFijo(LLMBackend):
+    """Backend local con una respuesta fija que registra los prompts"""
+    
+    def __init__(self, nombre: str, respuesta: str, finish_reason: str = None, error: Exception = None):
+        self.nombre = nombre
+        self.respuesta = respuesta
+        self.finish_reason = finish_reason
+        self.error = error
+        self.prompts = []
+    
+    async def generar(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        if self.error is not None:
+            raise self.error
+        if self.finish_reason:
+            anotar_respuesta(SimpleNamespace(candidates=[SimpleNamespace(finish_reason=SimpleNamespace(name=self.finish_reason))]))
+        return self.respuesta
+    
+    def generar_sync(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+def crear_llm(rapido: LLMBackend, completo: LLMBackend):
+    """LLMClient sin red con los dos escalones de la cascada"""
+    from src.ai.llm_client import LLMClient
+    
+    llm = LLMClient(backend=completo, backend_rapido=rapido)
+    llm.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=2, max_cola=8)
+    llm.resiliencia = PoliticaResiliencia(reintentos=0, circuito=CircuitBreaker(umbral_fallos=5, enfriamiento=60))
+    llm.resiliencia_rapido = PoliticaResiliencia(reintentos=0, circuito=CircuitBreaker(umbral_fallos=1, enfriamiento=60))
+    return llm
+
+
+@pytest.fixture
+def repositorio(repositorio_eventos):
+    """Repositorio con un feriado y un examen próximos"""
+    hoy = datetime.now()
+    repositorio_eventos.publicar([
+        Evento(fecha=hoy + timedelta(days=2), titulo="Mesa de examen final", categoria="examen"),
+        Evento(fecha=FERIADO, titulo="Feriado nacional", categoria="feriado"),
+    ])
+    return repositorio_eventos
+
+
+@pytest.fixture
+def crear_chatbot(repositorio, monkeypatch):
+    """Fábrica de chatbots sin red ni caché de respuestas"""
+    from src.ai.chatbot import CalendarioChatbot
+    
+    monkeypatch.setattr(settings, "gemini_api_key", None)
+    
+    def crear(respuesta_rapida: str, finish_reason: str = None, error: Exception = None):
+        rapido = BackendFijo("rapido", respuesta_rapida, finish_reason, error)
+        completo = BackendFijo("completo", "🎉 Respuesta del modelo completo")
+        bot = CalendarioChatbot(llm=crear_llm(rapido, completo), calendario_service=MagicMock(), repository=repositorio)
+        bot.answer_cache = AnswerCache(max_entradas=0)
+        bot.cascada = PoliticaCascada(habilitada=True)
+        return bot, rapido, completo
+    
+    return crear
+
+
+class TestPoliticaCascada:
+    """Tests de PoliticaCascada"""
+    
+    def test_pregunta_simple(self):
+        """Una búsqueda corta con filtro concreto prueba el modelo rápido"""
+        politica = PoliticaCascada(habilitada=True)
+        
+        assert politica.es_simple("¿Cuándo es el próximo feriado?", {"tipo_evento": "feriado"})
+        assert not politica.es_simple("Hola, ¿cómo estás?", {})
+    
+    def test_pregunta_compleja(self):
+        """Los pedidos de razonamiento, las repreguntas y las preguntas largas van al modelo completo"""
+        politica = PoliticaCascada(habilitada=True, max_palabras=8)
+        info = {"tipo_evento": "examen"}
+        
+        assert not politica.es_simple("¿Cómo me conviene organizar los exámenes?", info)
+        assert not politica.es_simple("¿Y el examen de física?", info, seguimiento=True)
+        assert not politica.es_simple("¿Cuáles son todos los exámenes finales de las materias del segundo cuatrimestre?", info)
+    
+    def test_deshabilitada(self):
+        """Sin cascada ninguna pregunta es simple"""
+        assert not PoliticaCascada(habilitada=False).es_simple("¿Próximo feriado?", {"tipo_evento": "feriado"})
+    
+    def test_fechas_mencionadas(self):
+        """Reconoce fechas escritas, numéricas e ISO"""
+        texto = "El 1° de Mayo es feriado, el examen es el 15/12 y la inscripción el 2026-03-02"
+        
+        assert fechas_mencionadas(texto) == {(1, 5), (15, 12), (2, 3)}
+    
+    def test_validar(self):
+        """Escala si la respuesta está vacía o no menciona fechas del contexto"""
+        politica = PoliticaCascada(habilitada=True)
+        eventos = [Evento(fecha=datetime(2026, 5, 1), titulo="Día del Trabajador", categoria="feriado")]
+        
+        assert politica.validar("🎉 El feriado es el 1 de mayo", eventos) is None
+        assert politica.validar("   ", eventos) == MOTIVO_VACIA
+        assert politica.validar("No encontré feriados próximos", eventos) == MOTIVO_SIN_FECHA
+    
+    def test_estadisticas(self):
+        """Cuenta aceptadas y escaladas por motivo"""
+        politica = PoliticaCascada(habilitada=True)
+        politica.registrar_aceptada()
+        politica.registrar_escalada(MOTIVO_SIN_FECHA)
+        
+        stats = politica.estadisticas()
+        
+        assert stats["aceptadas"] == 1
+        assert stats["motivos"] == {MOTIVO_SIN_FECHA: 1}
+        assert stats["tasa_aceptacion"] == 0.5
+    
+    def test_costo_del_modelo_rapido(self):
+        """Las estadísticas incluyen solo el costo de las llamadas al modelo rápido"""
+        telemetria = TelemetriaLLM(precio_entrada=1.0, precio_salida=10.0, precio_cacheado=0.25, precios_rapido=(0.1, 1.0, 0.025))
+        politica = PoliticaCascada(habilitada=True, telemetria=telemetria)
+        for tarifa in (TARIFA_RAPIDO, TARIFA_RAPIDO, TARIFA_PRINCIPAL):
+            with telemetria.medir("rapido", "gemini", 0, tarifa) as medicion:
+                medicion.anotar_uso(1_000_000, 0)
+        politica.registrar_aceptada()
+        politica.registrar_aceptada()
+        
+        costo = politica.estadisticas()["costo_modelo_rapido_usd"]
+        
+        assert costo == {"total": 0.2, "por_aceptada": 0.1}
+
+
+class TestLLMClientRapido:
+    """Tests del modelo rápido en LLMClient"""
+    
+    @pytest.mark.asyncio
+    async def test_usa_backend_rapido(self, monkeypatch):
+        """rapido=True usa el backend rápido y queda en la telemetría"""
+        monkeypatch.setattr(settings, "gemini_api_key", None)
+        rapido, completo = BackendFijo("rapido", "rápida"), BackendFijo("completo", "completa")
+        llm = crear_llm(rapido, completo)
+        
+        assert await llm.chat("hola", rapido=True) == "rápida"
+        assert await llm.chat("hola") == "completa"
+        assert llm.soporta_cascada
+        assert "rapido" in llm.telemetria.estadisticas()["operaciones"]
+    
+    @pytest.mark.asyncio
+    async def test_respuesta_cortada(self, monkeypatch):
+        """Si el modelo rápido llega al límite de tokens la respuesta no sirve"""
+        monkeypatch.setattr(settings, "gemini_api_key", None)
+        llm = crear_llm(BackendFijo("rapido", "El feriado es el", "MAX_TOKENS"), BackendFijo("completo", "completa"))
+        
+        with pytest.raises(RespuestaIncompletaError) as error:
+            await llm.chat("hola", rapido=True)
+        
+        assert error.value.finish_reason == "MAX_TOKENS"
+
+
+class TestChatbotCascada:
+    """Tests de la cascada en el chatbot"""
+    
+    @pytest.mark.asyncio
+    async def test_respuesta_rapida_valida(self, crear_chatbot):
+        """Si el modelo rápido responde con la fecha, el completo no se usa"""
+        bot, rapido, completo = crear_chatbot(f"🎉 El próximo feriado es el {FERIADO.day}/{FERIADO.month}")
+        
+        respuesta = await bot.responder("¿Cuándo cae el feriado nacional?")
+        
+        assert "próximo feriado" in respuesta
+        assert len(rapido.prompts) == 1 and completo.prompts == []
+        assert bot.cascada.aceptadas == 1
+    
+    @pytest.mark.asyncio
+    async def test_escala_sin_fecha(self, crear_chatbot):
+        """Una respuesta rápida sin fechas del calendario escala al modelo completo"""
+        bot, rapido, completo = crear_chatbot("No encontré feriados")
+        
+        respuesta = await bot.responder("¿Cuándo cae el feriado nacional?")
+        
+        assert "modelo completo" in respuesta
+        assert len(rapido.prompts) == 1 and len(completo.prompts) == 1
+        assert bot.cascada.escaladas[MOTIVO_SIN_FECHA] == 1
+    
+    @pytest.mark.asyncio
+    async def test_escala_respuesta_cortada(self, crear_chatbot):
+        """Una respuesta cortada por MAX_TOKENS escala al modelo completo"""
+        bot, _, completo = crear_chatbot(f"El feriado es el {FERIADO.day}/{FERIADO.month} y", "MAX_TOKENS")
+        
+        respuesta = await bot.responder("¿Cuándo cae el feriado nacional?")
+        
+        assert "modelo completo" in respuesta
+        assert bot.cascada.escaladas["MAX_TOKENS"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_cuota_del_modelo_rapido_escala(self, crear_chatbot):
+        """Un 429 del modelo rápido escala y no abre el circuito del principal"""
+        bot, rapido, completo = crear_chatbot("", error=google_exceptions.ResourceExhausted("cuota agotada"))
+        
+        primera = await bot.responder("¿Cuándo cae el feriado nacional?")
+        segunda = await bot.responder("¿Cuándo cae el feriado nacional?")
+        
+        assert "modelo completo" in primera and "modelo completo" in segunda
+        assert len(rapido.prompts) == 1  # el segundo intento lo frena el circuito del modelo rápido
+        assert len(completo.prompts) == 2
+        assert bot.cascada.escaladas["ResourceExhausted"] == 1
+        assert bot.cascada.escaladas["CircuitoAbiertoError"] == 1
+        assert bot.llm.resiliencia.circuito.estadisticas()["fallos_seguidos"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_pregunta_compleja_directo_al_completo(self, crear_chatbot):
+        """Las preguntas que piden razonar no pasan por el modelo rápido"""
+        bot, rapido, completo = crear_chatbot("rápida")
+        
+        await bot.responder("¿Cómo me conviene organizarme para los exámenes?")
+        
+        assert rapido.prompts == [] and len(completo.prompts) == 1
+    
+    @pytest.mark.asyncio
+    async def test_stream(self, crear_chatbot):
+        """En streaming la respuesta rápida válida llega en un solo fragmento"""
+        bot, _, completo = crear_chatbot(f"🎉 El próximo feriado es el {FERIADO.day}/{FERIADO.month}")
+        
+        fragmentos = [f async for f in bot.responder_stream("¿Cuándo cae el feriado nacional?")]
+        
+        assert len(fragmentos) == 1 and "próximo feriado" in fragmentos[0]
+        assert completo.prompts == []
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Tests para el contenedor de la aplicación
+"""
+
+import threading
+import pytest
+from unittest.mock import MagicMock, patch
+from src.config.settings import settings
+from src.services.container import AppContainer, get_container
+
+
+@pytest.fixture
+def container(repositorio_eventos):
+    """Contenedor nuevo con el repositorio de prueba"""
+    container = AppContainer()
+    container._componentes["repository"] = repositorio_eventos
+    return container
+
+
+class TestAppContainer:
+    """Tests del grafo de servicios compartido"""
+    
+    def test_componente_se_construye_una_vez(self, container):
+        """Accesos repetidos deben devolver la misma instancia"""
+        with patch("src.notifiers.whatsapp_notifier.WhatsAppNotifier") as clase:
+            primero = container.whatsapp_notifier
+            segundo = container.whatsapp_notifier
+        
+        assert primero is segundo
+        clase.assert_called_once()
+    
+    def test_manager_usa_notificadores_compartidos(self, container):
+        """El NotificationManager debe registrar los mismos notificadores del contenedor"""
+        manager = container.notification_manager
+        
+        assert container.whatsapp_notifier in manager.notificadores
+        assert container.discord_notifier in manager.notificadores
+        assert len(manager.notificadores) == 2
+    
+    def test_servicio_comparte_scraper_y_manager(self, container, repositorio_eventos):
+        """CalendarioService no debe crear su propio scraper ni sus notificadores"""
+        servicio = container.calendario_service
+        
+        assert servicio.scraper is repositorio_eventos.scraper
+        assert servicio.notification_manager is container.notification_manager
+    
+    def test_error_no_queda_guardado(self, container):
+        """Si la construcción falla, el próximo acceso debe reintentar"""
+        servicio = MagicMock()
+        
+        with patch(
+            "src.integrations.google_calendar_service.GoogleCalendarService",
+            side_effect=[FileNotFoundError("credentials.json"), servicio]
+        ):
+            with pytest.raises(FileNotFoundError):
+                container.google_calendar
+            
+            assert "google_calendar" not in container.inicializados()
+            assert container.google_calendar is servicio
+    
+    def test_construccion_lenta_no_bloquea_otros_componentes(self, container):
+        """Mientras Google Calendar se construye, los demás componentes siguen disponibles"""
+        empezo, liberar = threading.Event(), threading.Event()
+        servicio = MagicMock()
+        construcciones = []
+        
+        def construir(**kwargs):
+            construcciones.append(1)
+            empezo.set()
+            liberar.wait(5)
+            return servicio
+        
+        with patch("src.integrations.google_calendar_service.GoogleCalendarService", side_effect=construir):
+            hilos = [threading.Thread(target=lambda: container.google_calendar) for _ in range(2)]
+            for hilo in hilos:
+                hilo.start()
+            
+            try:
+                assert empezo.wait(5)
+                with patch("src.notifiers.discord_notifier.DiscordNotifier") as notificador:
+                    assert container.discord_notifier is notificador.return_value
+                assert "google_calendar" not in container.inicializados()
+            finally:
+                liberar.set()
+                for hilo in hilos:
+                    hilo.join(5)
+        
+        assert container.google_calendar is servicio
+        assert len(construcciones) == 1
+    
+    def test_dependencia_circular(self, container):
+        """Una fábrica que se pide a sí misma falla en lugar de colgarse"""
+        with pytest.raises(RuntimeError, match="circular"):
+            container._obtener("ciclo", lambda: container._obtener("ciclo", object))
+        
+        assert "ciclo" not in container.inicializados()
+    
+    def test_chatbot_y_bot_de_whatsapp_comparten_dependencias(self, container):
+        """El bot de WhatsApp debe usar el chatbot y el notificador del contenedor"""
+        with patch("src.ai.llm_client.get_llm_client") as get_llm:
+            bot = container.whatsapp_bot
+        
+        assert bot.chatbot is container.chatbot
+        assert bot.notifier is container.whatsapp_notifier
+        assert bot.chatbot.llm is get_llm.return_value
+        assert bot.chatbot.calendario_service is container.calendario_service
+        assert bot.chatbot.repository is container.repository
+    
+    def test_calendar_manager_no_autentica_al_crearse(self, container):
+        """Google Calendar se autentica recién al agregar un evento"""
+        with patch("src.integrations.google_calendar_service.GoogleCalendarService") as clase:
+            manager = container.calendar_manager
+            clase.assert_not_called()
+            
+            container._componentes["google_calendar"] = MagicMock()
+            with patch("src.services.container.get_container", return_value=container):
+                manager.agregar_evento(MagicMock())
+        
+        container.google_calendar.agregar_evento.assert_called_once()
+    
+    def test_contenedor_global(self):
+        """get_container debe devolver siempre la misma instancia"""
+        assert get_container() is get_container()
+
+
+class TestLLMClientCompartido:
+    """Tests del cliente de Gemini compartido"""
+    
+    def test_una_instancia_por_proceso(self, monkeypatch):
+        """get_llm_client no debe reconfigurar Gemini en cada llamada"""
+        from src.ai import llm_client
+        
+        monkeypatch.setattr(settings, "gemini_api_key", "clave-de-prueba")
+        monkeypatch.setattr(llm_client, "_client_instance", None)
+        
+        with patch.object(llm_client.genai, "configure") as configure:
+            primero = llm_client.get_llm_client()
+            segundo = llm_client.get_llm_client()
+        
+        assert primero is segundo
+        configure.assert_called_once()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Tests para el constructor de contexto de prompts
+"""
+
+from datetime import date, datetime, timedelta
+from src.ai.context_builder import ContextBuilder, agrupar_rangos
+from src.models.evento import Evento
+
+
+def _receso(inicio: datetime, dias: int):
+    """Receso expandido por día, como lo entrega el scraper"""
+    return [
+        Evento(fecha=inicio + timedelta(days=i), titulo="Receso invernal", categoria="receso")
+        for i in range(dias)
+    ]
+
+
+class TestAgruparRangos:
+    """Tests del colapso de días consecutivos"""
+    
+    def test_colapsa_dias_consecutivos(self):
+        """Un receso de 14 días debe quedar en un solo bloque"""
+        bloques = agrupar_rangos(_receso(datetime(2025, 7, 14), 14))
+        
+        assert len(bloques) == 1
+        assert bloques[0].inicio == date(2025, 7, 14)
+        assert bloques[0].fin == date(2025, 7, 27)
+        assert "14/07/2025 al 27/07/2025" in bloques[0].linea()
+    
+    def test_no_une_dias_separados_ni_titulos_distintos(self):
+        """Días no consecutivos o títulos distintos son bloques separados"""
+        eventos = [
+            Evento(fecha=datetime(2025, 7, 1), titulo="Mesa de examen", categoria="examen"),
+            Evento(fecha=datetime(2025, 7, 3), titulo="Mesa de examen", categoria="examen"),
+            Evento(fecha=datetime(2025, 7, 2), titulo="Feriado", categoria="feriado"),
+        ]
+        
+        assert len(agrupar_rangos(eventos)) == 3
+
+
+class TestContextBuilder:
+    """Tests del presupuesto y la relevancia"""
+    
+    HOY = date(2025, 6, 1)
+    
+    def _eventos(self):
+        """Receso de dos semanas más eventos sueltos"""
+        return _receso(datetime(2025, 7, 14), 14) + [
+            Evento(fecha=datetime(2025, 6, 10), titulo="Mesa de examen final", categoria="examen"),
+            Evento(fecha=datetime(2025, 6, 20), titulo="Paso a la Inmortalidad de Güemes", categoria="feriado"),
+            Evento(fecha=datetime(2025, 3, 10), titulo="Inicio de clases", categoria="academico"),
+        ]
+    
+    def test_reporta_tokens_y_colapsa(self):
+        """El texto debe mostrar el receso en una sola línea y estimar tokens"""
+        contexto = ContextBuilder(presupuesto_tokens=2000).construir(
+            "¿Qué hay en julio?", self._eventos(), hoy=self.HOY
+        )
+        
+        assert contexto.texto.count("Receso invernal") == 1
+        assert "JULIO 2025" in contexto.texto
+        assert contexto.tokens_estimados > 0
+        assert contexto.eventos_recibidos == 17
+    
+    def test_descarta_pasados_sin_relacion(self):
+        """Los eventos pasados que no coinciden con la consulta no aportan"""
+        contexto = ContextBuilder(presupuesto_tokens=2000).construir(
+            "¿Qué feriados hay?", self._eventos(), hoy=self.HOY
+        )
+        
+        assert "Inicio de clases" not in contexto.texto
+        assert contexto.bloques_descartados == 1
+    
+    def test_pasados_mencionados_se_incluyen(self):
+        """Un evento pasado que la consulta menciona sí se incluye"""
+        contexto = ContextBuilder(presupuesto_tokens=2000).construir(
+            "¿Cuándo fue el inicio de clases?", self._eventos(), hoy=self.HOY
+        )
+        
+        assert "Inicio de clases" in contexto.texto
+    
+    def test_respeta_presupuesto_priorizando_relevancia(self):
+        """Con poco presupuesto debe quedarse con lo más relevante"""
+        contexto = ContextBuilder(presupuesto_tokens=40).construir(
+            "¿Cuándo son los exámenes?", self._eventos(), hoy=self.HOY
+        )
+        
+        assert "Mesa de examen final" in contexto.texto
+        assert "Receso invernal" not in contexto.texto
+        assert contexto.tokens_estimados <= 40
+    
+    def test_tokens_reservados_reducen_el_presupuesto(self):
+        """Los tokens del resto del prompt se descuentan del presupuesto"""
+        builder = ContextBuilder(presupuesto_tokens=2000)
+        completo = builder.construir("¿Qué hay?", self._eventos(), hoy=self.HOY)
+        reducido = builder.construir("¿Qué hay?", self._eventos(), tokens_reservados=1970, hoy=self.HOY)
+        
+        assert len(reducido.bloques) < len(completo.bloques)
+        assert len(reducido.bloques) >= 1
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Tests para el contexto cacheado (instrucciones + calendario por snapshot)
+"""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from google.api_core import exceptions as google_exceptions
+from src.ai.llm_backends import MAX_CONTEXTOS_CACHEADOS, FakeBackend, GeminiBackend, LLMBackend, PrefijoPrompt
+from src.ai.scheduler import LLMScheduler
+from src.config.settings import settings
+from src.models.evento import Evento
+
+PREFIJO = PrefijoPrompt(clave="v1", texto="Sos un asistente académico.\n" + "📝 Final de Física\n" * 600)
+
+
+class BackendConCache(LLMBackend):
+    """Backend local que simula la caché de contexto del proveedor"""
+    
+    nombre = "con-cache"
+    
+    def __init__(self, admite: bool = True):
+        self.admite = admite
+        self.preparados = []
+        self.llamadas = []
+    
+    async def preparar_prefijo(self, prefijo: PrefijoPrompt) -> bool:
+        self.preparados.append(prefijo.clave)
+        return self.admite
+    
+    async def generar(self, prompt: str) -> str:
+        self.llamadas.append((None, prompt))
+        return "📅 Respuesta completa"
+    
+    async def generar_con_prefijo(self, prefijo: PrefijoPrompt, prompt: str) -> str:
+        self.llamadas.append((prefijo, prompt))
+        return "📅 Respuesta con contexto cacheado"
+    
+    def generar_sync(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """GeminiBackend sin red: la creación de cachés y modelos es simulada"""
+    import google.generativeai as genai
+    
+    monkeypatch.setattr(settings, "gemini_api_key", "clave-de-prueba")
+    monkeypatch.setattr(settings, "llm_cache_contexto", True)
+    monkeypatch.setattr(settings, "llm_cache_contexto_min_tokens", 1024)
+    
+    crear = MagicMock(side_effect=lambda **kwargs: MagicMock(name=kwargs["display_name"]))
+    modelo_cacheado = MagicMock()
+    modelo_cacheado.generate_content_async = AsyncMock(return_value=SimpleNamespace(text="desde la caché"))
+    monkeypatch.setattr(genai.caching.CachedContent, "create", crear)
+    monkeypatch.setattr(genai.GenerativeModel, "from_cached_content", MagicMock(return_value=modelo_cacheado))
+    
+    backend = GeminiBackend()
+    backend.model = MagicMock()
+    backend.model.generate_content_async = AsyncMock(return_value=SimpleNamespace(text="prompt completo"))
+    backend.crear = crear
+    backend.modelo_cacheado = modelo_cacheado
+    return backend
+
+
+class TestPrefijoEnBackends:
+    """Tests del prefijo en los backends locales"""
+    
+    @pytest.mark.asyncio
+    async def test_backend_local_concatena(self):
+        """Sin caché del proveedor el prefijo viaja dentro del prompt"""
+        backend = FakeBackend()
+        
+        assert not await backend.preparar_prefijo(PREFIJO)
+        assert await backend.generar_con_prefijo(PREFIJO, "¿Cuándo hay finales?") == (
+            await backend.generar(PREFIJO.unir("¿Cuándo hay finales?"))
+        )
+
+
+class TestGeminiContextoCacheado:
+    """Tests de la caché de contexto de GeminiBackend"""
+    
+    @pytest.mark.asyncio
+    async def test_crea_una_vez_por_version(self, gemini):
+        """El mismo snapshot reutiliza el contenido cacheado"""
+        assert await gemini.preparar_prefijo(PREFIJO)
+        assert await gemini.preparar_prefijo(PREFIJO)
+        
+        assert gemini.crear.call_count == 1
+        assert gemini.crear.call_args.kwargs["system_instruction"] == PREFIJO.texto
+    
+    @pytest.mark.asyncio
+    async def test_solo_envia_la_parte_variable(self, gemini):
+        """Con el contexto cacheado se manda sólo el resto del prompt"""
+        await gemini.preparar_prefijo(PREFIJO)
+        
+        respuesta = await gemini.generar_con_prefijo(PREFIJO, "¿Cuándo hay finales?")
+        
+        assert respuesta == "desde la caché"
+        gemini.modelo_cacheado.generate_content_async.assert_awaited_once_with("¿Cuándo hay finales?")
+        gemini.model.generate_content_async.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_prefijo_chico_no_se_cachea(self, gemini):
+        """Por debajo del mínimo del modelo se sigue mandando el prompt completo"""
+        chico = PrefijoPrompt(clave="v1", texto="Sos un asistente.")
+        
+        assert not await gemini.preparar_prefijo(chico)
+        assert await gemini.generar_con_prefijo(chico, "hola") == "prompt completo"
+        gemini.crear.assert_not_called()
+        gemini.model.generate_content_async.assert_awaited_once_with(chico.unir("hola"))
+    
+    @pytest.mark.asyncio
+    async def test_fallo_al_crear_no_se_reintenta_enseguida(self, gemini):
+        """Si Gemini rechaza la caché no se insiste en cada pregunta"""
+        gemini.crear.side_effect = google_exceptions.InvalidArgument("modelo sin caché")
+        
+        assert not await gemini.preparar_prefijo(PREFIJO)
+        assert not await gemini.preparar_prefijo(PREFIJO)
+        assert gemini.crear.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_nuevo_reemplaza_el_contexto(self, gemini):
+        """Se conservan los últimos contextos y se borran los anteriores"""
+        versiones = [PrefijoPrompt(clave=f"v{i}", texto=PREFIJO.texto) for i in range(MAX_CONTEXTOS_CACHEADOS + 1)]
+        for prefijo in versiones:
+            await gemini.preparar_prefijo(prefijo)
+        
+        assert list(gemini._contextos) == [p.clave for p in versiones[1:]]
+        assert gemini._contexto_vigente(versiones[0]) is None
+    
+    @pytest.mark.asyncio
+    async def test_creacion_sin_bloquear_el_event_loop(self, gemini):
+        """La llamada de red no toma el lock que usa el event loop y se hace una sola vez"""
+        def crear_lento(**kwargs):
+            time.sleep(0.3)
+            return MagicMock(name=kwargs["display_name"])
+        
+        gemini.crear.side_effect = crear_lento
+        pausas = []
+        
+        async def medir_pausas():
+            for _ in range(15):
+                inicio = time.monotonic()
+                await asyncio.sleep(0.02)
+                gemini._contexto_vigente(PREFIJO)
+                pausas.append(time.monotonic() - inicio)
+        
+        resultados = await asyncio.gather(
+            medir_pausas(), gemini.preparar_prefijo(PREFIJO), gemini.preparar_prefijo(PREFIJO)
+        )
+        
+        assert resultados[1:] == [True, True]
+        assert gemini.crear.call_count == 1
+        assert max(pausas) < 0.15
+    
+    @pytest.mark.asyncio
+    async def test_contexto_vencido_en_gemini(self, gemini):
+        """Si Gemini ya no tiene el contexto se responde con el prompt completo"""
+        await gemini.preparar_prefijo(PREFIJO)
+        gemini.modelo_cacheado.generate_content_async.side_effect = google_exceptions.NotFound("no existe")
+        
+        assert await gemini.generar_con_prefijo(PREFIJO, "hola") == "prompt completo"
+        assert gemini._contexto_vigente(PREFIJO) is None
+    
+    @pytest.mark.asyncio
+    async def test_deshabilitado(self, gemini, monkeypatch):
+        """LLM_CACHE_CONTEXTO=false no crea cachés"""
+        monkeypatch.setattr(settings, "llm_cache_contexto", False)
+        
+        assert not await gemini.preparar_prefijo(PREFIJO)
+        gemini.crear.assert_not_called()
+
+
+class TestChatbotConContextoCacheado:
+    """Tests del prompt del chatbot con el calendario cacheado"""
+    
+    @pytest.fixture
+    def repositorio(self, repositorio_eventos):
+        """Repositorio con eventos futuros"""
+        hoy = datetime.now()
+        repositorio_eventos.publicar([
+            Evento(fecha=hoy + timedelta(days=20), titulo="Mesa de examen final", categoria="examen"),
+            Evento(fecha=hoy + timedelta(days=40), titulo="Inscripciones a materias", categoria="administrativo"),
+        ])
+        return repositorio_eventos
+    
+    def _chatbot(self, repositorio, backend, monkeypatch):
+        """Chatbot sin red sobre un backend local"""
+        from src.ai.chatbot import CalendarioChatbot
+        from src.ai.llm_client import LLMClient
+        
+        monkeypatch.setattr(settings, "gemini_api_key", None)
+        monkeypatch.setattr(settings, "enable_cache", False)
+        llm = LLMClient(backend=backend)
+        llm.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=2, max_cola=4)
+        return CalendarioChatbot(llm=llm, calendario_service=MagicMock(), repository=repositorio)
+    
+    @pytest.mark.asyncio
+    async def test_prompt_sin_instrucciones_ni_eventos(self, repositorio, monkeypatch):
+        """Instrucciones y calendario van en el prefijo cacheado, no en cada prompt"""
+        backend = BackendConCache()
+        bot = self._chatbot(repositorio, backend, monkeypatch)
+        
+        respuesta = await bot.responder("¿Cuándo es la mesa de examen final?")
+        
+        prefijo, prompt = backend.llamadas[0]
+        assert respuesta == "📅 Respuesta con contexto cacheado"
+        assert prefijo.clave == repositorio.snapshot_actual.version
+        assert bot.system_context in prefijo.texto
+        assert "Mesa de examen final" in prefijo.texto and "Inscripciones a materias" in prefijo.texto
+        assert bot.system_context not in prompt and "Mesa de examen final" not in prompt
+        assert "¿Cuándo es la mesa de examen final?" in prompt
+    
+    @pytest.mark.asyncio
+    async def test_prefijo_por_version(self, repositorio, monkeypatch):
+        """El prefijo se rearma sólo cuando cambia el snapshot"""
+        backend = BackendConCache()
+        bot = self._chatbot(repositorio, backend, monkeypatch)
+        
+        await bot.responder("¿Cuándo es la mesa de examen final?")
+        await bot.responder("¿Cuándo son las inscripciones a materias?")
+        assert backend.llamadas[0][0] is backend.llamadas[1][0]
+        
+        repositorio.publicar(repositorio.snapshot_actual.eventos[:1])
+        await bot.responder("¿Cuándo es la mesa de examen final?")
+        
+        assert backend.llamadas[2][0].clave == repositorio.snapshot_actual.version
+        assert "Inscripciones a materias" not in backend.llamadas[2][0].texto
+    
+    @pytest.mark.asyncio
+    async def test_sin_cache_del_proveedor(self, repositorio, monkeypatch):
+        """Si el backend no cachea se arma el prompt completo de siempre"""
+        backend = BackendConCache(admite=False)
+        bot = self._chatbot(repositorio, backend, monkeypatch)
+        
+        assert await bot.responder("¿Cuándo es la mesa de examen final?") == "📅 Respuesta completa"
+        
+        prefijo, prompt = backend.llamadas[0]
+        assert prefijo is None
+        assert bot.system_context in prompt and "Mesa de examen final" in prompt
@@ -0,0 +1,187 @@
+"""
+Tests para la memoria de conversación por usuario
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from src.ai import conversation_store
+from src.ai.conversation_store import (
+    MAX_CARACTERES_TURNO,
+    ConversationStore,
+    combinar_filtros,
+    es_seguimiento,
+)
+from src.models.evento import Evento
+
+FILTROS_EXAMEN = {"mes": None, "año": None, "tipo_evento": "examen", "temporal": None}
+
+
+class TestRepreguntas:
+    """Tests de detección y combinación de filtros"""
+    
+    @pytest.mark.parametrize("pregunta", [
+        "¿y en diciembre?",
+        "Y los feriados?",
+        "¿También en julio?",
+        "¿a qué hora es ese examen?",
+    ])
+    def test_detecta_repreguntas(self, pregunta):
+        """Preguntas que continúan la anterior"""
+        assert es_seguimiento(pregunta)
+    
+    @pytest.mark.parametrize("pregunta", [
+        "¿Cuándo son los exámenes finales?",
+        "¿Hay feriados en julio?",
+        "¿Cuándo empieza el primer cuatrimestre?",
+    ])
+    def test_preguntas_nuevas(self, pregunta):
+        """Preguntas completas no se tratan como repregunta"""
+        assert not es_seguimiento(pregunta)
+    
+    def test_hereda_tipo_y_cambia_mes(self):
+        """'¿y en diciembre?' después de exámenes → exámenes de diciembre"""
+        info = {"mes": 12, "año": None, "tipo_evento": None, "temporal": None}
+        
+        filtros, nuevos = combinar_filtros(FILTROS_EXAMEN, info)
+        
+        assert filtros == {"mes": 12, "año": None, "tipo_evento": "examen", "temporal": None}
+        assert nuevos
+    
+    def test_mes_reemplaza_referencia_temporal(self):
+        """Un mes nuevo reemplaza 'esta semana' del turno anterior"""
+        previos = {**FILTROS_EXAMEN, "temporal": "this_week"}
+        info = {"mes": 7, "año": None, "tipo_evento": None, "temporal": None}
+        
+        filtros, _ = combinar_filtros(previos, info)
+        
+        assert filtros["temporal"] is None
+        assert filtros["mes"] == 7
+    
+    def test_sin_filtros_nuevos(self):
+        """Una repregunta sin filtros propios conserva los anteriores"""
+        info = {"mes": None, "año": None, "tipo_evento": None, "temporal": None}
+        
+        filtros, nuevos = combinar_filtros(FILTROS_EXAMEN, info)
+        
+        assert filtros == FILTROS_EXAMEN
+        assert not nuevos
+
+
+class TestConversationStore:
+    """Tests del almacén de conversaciones"""
+    
+    def test_guarda_turnos_acotados(self):
+        """Debe guardar sólo los últimos turnos, recortados"""
+        store = ConversationStore(max_turnos=2)
+        
+        for i in range(3):
+            store.registrar("discord:1", f"pregunta {i}", "x" * 1000, FILTROS_EXAMEN)
+        
+        conversacion = store.obtener("discord:1")
+        assert [t.pregunta for t in conversacion.turnos] == ["pregunta 1", "pregunta 2"]
+        assert len(conversacion.turnos[-1].respuesta) == MAX_CARACTERES_TURNO
+        assert conversacion.filtros == FILTROS_EXAMEN
+    
+    def test_descarta_la_menos_usada(self):
+        """Al superar el máximo se descarta la conversación usada hace más tiempo"""
+        store = ConversationStore(max_conversaciones=2)
+        store.registrar("a", "p", "r", FILTROS_EXAMEN)
+        store.registrar("b", "p", "r", FILTROS_EXAMEN)
+        
+        store.obtener("a")
+        store.registrar("c", "p", "r", FILTROS_EXAMEN)
+        
+        assert store.obtener("b") is None
+        assert store.obtener("a") is not None
+        assert store.estadisticas()["descartadas"] == 1
+    
+    def test_vence_por_inactividad(self, monkeypatch):
+        """Una conversación inactiva más que el TTL se olvida"""
+        ahora = [1000.0]
+        monkeypatch.setattr(conversation_store.time, "monotonic", lambda: ahora[0])
+        store = ConversationStore(ttl_segundos=60)
+        store.registrar("a", "p", "r", FILTROS_EXAMEN)
+        
+        ahora[0] += 61
+        
+        assert store.obtener("a") is None
+        assert store.estadisticas()["vencidas"] == 1
+    
+    def test_anonimos_y_deshabilitado(self):
+        """Sin usuario o con tamaño 0 no se guarda nada"""
+        store = ConversationStore()
+        store.registrar(None, "p", "r", FILTROS_EXAMEN)
+        assert len(store) == 0
+        
+        deshabilitado = ConversationStore(max_conversaciones=0)
+        deshabilitado.registrar("a", "p", "r", FILTROS_EXAMEN)
+        assert deshabilitado.obtener("a") is None
+
+
+class TestChatbotConversacion:
+    """Tests de las repreguntas en CalendarioChatbot"""
+    
+    @pytest.fixture
+    def chatbot(self, repositorio_eventos):
+        """Chatbot con LLM simulado y exámenes en julio y diciembre"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        anio = datetime.now().year + 1
+        repositorio_eventos.publicar([
+            Evento(fecha=datetime(anio, 7, 10), titulo="Examen final de julio", categoria="examen"),
+            Evento(fecha=datetime(anio, 12, 12), titulo="Examen final de diciembre", categoria="examen"),
+            Evento(fecha=datetime(anio, 12, 8), titulo="Feriado Inmaculada Concepción", categoria="feriado"),
+        ])
+        
+        with patch("src.ai.chatbot.get_llm_client") as mock_llm:
+            mock_llm.return_value.chat = AsyncMock(return_value="📝 Respuesta")
+            mock_llm.return_value.preparar_prefijo = AsyncMock(return_value=False)
+            mock_llm.return_value.soporta_cascada = False
+            bot = CalendarioChatbot(repository=repositorio_eventos)
+        
+        bot.declaraciones_herramientas = []
+        bot.answer_cache.limpiar()
+        return bot
+    
+    @pytest.mark.asyncio
+    async def test_repregunta_hereda_filtros(self, chatbot):
+        """'¿y en diciembre?' debe traer los exámenes de diciembre y la conversación"""
+        await chatbot.responder("¿Cuándo son los exámenes finales?", usuario="discord:1")
+        await chatbot.responder("¿y en diciembre?", usuario="discord:1")
+        
+        prompt = chatbot.llm.chat.await_args.kwargs["mensaje"]
+        assert "Examen final de diciembre" in prompt
+        assert "Examen final de julio" not in prompt
+        assert "Feriado" not in prompt
+        assert "CONVERSACIÓN RECIENTE" in prompt
+        assert "¿Cuándo son los exámenes finales?" in prompt
+    
+    @pytest.mark.asyncio
+    async def test_repregunta_reutiliza_eventos(self, chatbot):
+        """Sin filtros nuevos se reutilizan los eventos del turno anterior"""
+        await chatbot.responder("¿Cuándo son los exámenes finales?", usuario="discord:1")
+        
+        with patch.object(chatbot.evento_filter, "filtrar_por_info") as filtrar:
+            await chatbot.responder("¿y esos dónde se rinden?", usuario="discord:1")
+        
+        filtrar.assert_not_called()
+        assert "Examen final de julio" in chatbot.llm.chat.await_args.kwargs["mensaje"]
+    
+    @pytest.mark.asyncio
+    async def test_usuarios_independientes(self, chatbot):
+        """La conversación de un usuario no afecta a otro"""
+        await chatbot.responder("¿Cuándo son los exámenes finales?", usuario="discord:1")
+        await chatbot.responder("¿y en diciembre?", usuario="whatsapp:+54")
+        
+        prompt = chatbot.llm.chat.await_args.kwargs["mensaje"]
+        assert "CONVERSACIÓN RECIENTE" not in prompt
+        assert "Feriado" in prompt
+    
+    @pytest.mark.asyncio
+    async def test_repregunta_no_usa_cache(self, chatbot):
+        """Las repreguntas dependen del usuario: no se guardan en la caché compartida"""
+        await chatbot.responder("¿Cuándo son los exámenes finales?", usuario="discord:1")
+        await chatbot.responder("¿y en diciembre?", usuario="discord:1")
+        
+        assert len(chatbot.answer_cache) == 1
\ No newline at end of file
@@ -0,0 +1,120 @@
+"""
+Tests para el event loop de fondo
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from src.utils.event_loop import BackgroundLoop, get_background_loop
+
+
+@pytest.fixture
+def loop_fondo():
+    """Loop de fondo que se detiene al terminar el test"""
+    loop = BackgroundLoop(nombre="pregon-loop-test")
+    yield loop
+    loop.detener()
+
+
+async def _loop_actual():
+    """Devuelve el loop en el que corre"""
+    return asyncio.get_running_loop()
+
+
+class TestBackgroundLoop:
+    """Tests de BackgroundLoop"""
+    
+    def test_ejecutar_devuelve_resultado(self, loop_fondo):
+        """Debe correr la corrutina y devolver su resultado"""
+        async def sumar(a, b):
+            await asyncio.sleep(0)
+            return a + b
+        
+        assert loop_fondo.ejecutar(sumar(2, 3)) == 5
+        assert loop_fondo.activo
+    
+    def test_un_solo_loop_para_todos_los_threads(self, loop_fondo):
+        """Llamadores de threads distintos deben compartir el mismo loop"""
+        loops = []
+        
+        def llamar():
+            loops.append(loop_fondo.ejecutar(_loop_actual()))
+        
+        threads = [threading.Thread(target=llamar) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(loops) == 5
+        assert len({id(loop) for loop in loops}) == 1
+    
+    def test_submit_devuelve_future(self, loop_fondo):
+        """submit() debe devolver un future de concurrent.futures"""
+        future = loop_fondo.submit(_loop_actual())
+        
+        assert isinstance(future.result(timeout=5), asyncio.AbstractEventLoop)
+    
+    def test_timeout_cancela_la_corrutina(self, loop_fondo):
+        """Al vencer el timeout se debe lanzar TimeoutError y cancelar la tarea"""
+        cancelada = threading.Event()
+        
+        async def lenta():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelada.set()
+                raise
+        
+        with pytest.raises(TimeoutError):
+            loop_fondo.ejecutar(lenta(), timeout=0.05)
+        
+        assert cancelada.wait(timeout=2)
+    
+    def test_submit_desde_el_loop_falla(self, loop_fondo):
+        """Llamar submit() desde el propio loop bloquearía: debe fallar"""
+        async def anidada():
+            return loop_fondo.submit(_loop_actual())
+        
+        with pytest.raises(RuntimeError):
+            loop_fondo.ejecutar(anidada())
+    
+    def test_detener_y_reiniciar(self, loop_fondo):
+        """Después de detener, un nuevo submit debe arrancar otro loop"""
+        primero = loop_fondo.ejecutar(_loop_actual())
+        loop_fondo.detener()
+        
+        assert not loop_fondo.activo
+        assert primero.is_closed()
+        assert loop_fondo.ejecutar(_loop_actual()) is not primero
+    
+    def test_instancia_global(self):
+        """get_background_loop debe devolver siempre la misma instancia"""
+        assert get_background_loop() is get_background_loop()
+
+
+class TestResponderSync:
+    """Tests de CalendarioChatbot.responder_sync"""
+    
+    def test_corre_en_el_loop_de_fondo(self, loop_fondo):
+        """responder_sync debe ejecutar responder() en el loop compartido"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        with patch("src.ai.chatbot.get_llm_client"):
+            bot = CalendarioChatbot()
+        
+        threads = []
+        
+        async def responder(pregunta, contexto_eventos=None, usuario=None, canal=None):
+            threads.append(threading.current_thread().name)
+            return f"respuesta: {pregunta}"
+        
+        bot.responder = responder
+        
+        with patch("src.ai.chatbot.get_background_loop", return_value=loop_fondo):
+            primera = bot.responder_sync("hola")
+            segunda = bot.responder_sync("chau")
+        
+        assert (primera, segunda) == ("respuesta: hola", "respuesta: chau")
+        assert threads == ["pregon-loop-test", "pregon-loop-test"]
\ No newline at end of file
@@ -93,4 +93,14 @@ class TestEvento:
         
         str_repr = str(evento)
         assert "Examen Final" in str_repr
-        assert "examen" in str_repr.lower()
\ No newline at end of file
+        assert "examen" in str_repr.lower()
+    
+    def test_id_estable(self):
+        """El ID debe depender sólo de fecha, título normalizado y fuente"""
+        a = Evento(fecha=datetime(2025, 12, 15, 9, 0), titulo="Examen  Final", categoria="examen")
+        b = Evento(fecha=datetime(2025, 12, 15), titulo="examen final", categoria="examen")
+        c = Evento(fecha=datetime(2025, 12, 16), titulo="Examen Final", categoria="examen")
+        
+        assert a.id == b.id
+        assert a.id != c.id
+        assert len(a.id) == 12
\ No newline at end of file
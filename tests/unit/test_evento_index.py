@@ -0,0 +1,159 @@
+"""
+Tests para el índice léxico de eventos
+"""
+
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from src.models.evento import Evento
+from src.services.evento_filter import EventoFilter
+from src.services.evento_index import EventoIndex, ngramas
+
+INICIO = datetime(2026, 3, 2)
+
+
+@pytest.fixture
+def eventos():
+    """Eventos de un calendario típico, ordenados por fecha"""
+    datos = [
+        (datetime(2026, 3, 2), "Inscripción a materias del primer cuatrimestre", "academico"),
+        (datetime(2026, 3, 16), "Inicio de clases primer cuatrimestre", "academico"),
+        (datetime(2026, 7, 6), "Mesa de examen final turno julio", "examen"),
+        (datetime(2026, 7, 13), "Receso invernal", "receso"),
+        (datetime(2026, 7, 20), "Feriado Día de la Independencia", "feriado"),
+        (datetime(2026, 9, 21), "Día del Estudiante", "institucional"),
+        (datetime(2026, 10, 5), "Inscripción a materias del segundo cuatrimestre", "academico"),
+        (datetime(2026, 12, 14), "Mesa de examen final turno diciembre", "examen"),
+    ]
+    return [Evento(fecha=fecha, titulo=titulo, categoria=categoria) for fecha, titulo, categoria in datos]
+
+
+@pytest.fixture
+def indice(eventos):
+    """Índice de los eventos de muestra"""
+    return EventoIndex(eventos)
+
+
+class TestEventoIndex:
+    """Tests de EventoIndex"""
+    
+    def test_ngramas_normalizados(self):
+        """Los n-gramas ignoran tildes y mayúsculas y marcan los bordes"""
+        assert list(ngramas("Día")) == [" di", "dia", "ia ", " dia", "dia "]
+    
+    def test_una_fila_por_titulo(self):
+        """Los días de un mismo rango comparten fila en la matriz"""
+        receso = [
+            Evento(fecha=INICIO + timedelta(days=d), titulo="Receso invernal", categoria="receso")
+            for d in range(10)
+        ]
+        
+        indice = EventoIndex(receso)
+        
+        assert indice.matriz.shape[0] == 1
+        assert len(indice) == 10
+        assert np.allclose(indice.similitudes("receso"), indice.similitudes("receso")[0])
+    
+    @pytest.mark.parametrize("consulta,esperado", [
+        ("dia del estudiante", "Día del Estudiante"),
+        ("receso de invierno", "Receso invernal"),
+        ("independencia", "Feriado Día de la Independencia"),
+    ])
+    def test_buscar_el_mas_similar(self, indice, consulta, esperado):
+        """El primer resultado debe ser el evento nombrado en la consulta"""
+        resultados = indice.buscar(consulta, k=3)
+        
+        assert resultados[0][0].titulo == esperado
+        assert resultados[0][1] > 0.5
+    
+    def test_buscar_tolera_plurales(self, indice):
+        """'inscripciones' encuentra las dos inscripciones"""
+        titulos = {e.titulo for e, _ in indice.buscar("inscripciones", k=5)}
+        
+        assert titulos == {
+            "Inscripción a materias del primer cuatrimestre",
+            "Inscripción a materias del segundo cuatrimestre",
+        }
+    
+    def test_sin_coincidencias(self, indice):
+        """Una consulta sin n-gramas del índice no devuelve nada"""
+        assert indice.vectorizar("zzz") is None
+        assert indice.buscar("zzz") == []
+        assert not indice.similitudes("zzz").any()
+    
+    def test_mascara_de_mes_y_tipo(self, indice):
+        """La máscara combina mes y tipo como EventoFilter"""
+        info = {"mes": 7, "año": None, "tipo_evento": "examen", "temporal": None}
+        
+        seleccion = [indice.eventos[i].titulo for i in np.flatnonzero(indice.mascara(info))]
+        
+        assert seleccion == ["Mesa de examen final turno julio"]
+    
+    def test_mascara_temporal(self, indice, eventos):
+        """'this_week' limita a los próximos 7 días"""
+        info = {"mes": None, "año": None, "tipo_evento": None, "temporal": "this_week"}
+        
+        mascara = indice.mascara(info, hoy=eventos[3].fecha.date() - timedelta(days=2))
+        
+        assert [indice.eventos[i] for i in np.flatnonzero(mascara)] == [eventos[3]]
+    
+    def test_buscar_dentro_de_la_mascara(self, indice):
+        """La búsqueda respeta la ventana de fechas"""
+        info = {"mes": 12, "año": None, "tipo_evento": None, "temporal": None}
+        
+        resultados = indice.buscar("examen", mascara=indice.mascara(info))
+        
+        assert [e.titulo for e, _ in resultados] == ["Mesa de examen final turno diciembre"]
+
+
+class TestEventoFilterConIndice:
+    """Tests de la selección vectorial en EventoFilter"""
+    
+    def test_sin_filtros_usa_similitud(self, eventos, indice):
+        """Sin mes ni tipo se eligen los eventos parecidos a la pregunta"""
+        resultado = EventoFilter().filtrar("¿Cuándo es el día del estudiante?", eventos, indice)
+        
+        assert [e.titulo for e in resultado] == ["Día del Estudiante"]
+    
+    def test_con_filtros_usa_la_mascara(self, eventos, indice):
+        """Con tipo detectado devuelve los eventos de ese tipo en orden cronológico"""
+        resultado = EventoFilter().filtrar("¿Cuándo son los exámenes finales?", eventos, indice)
+        
+        assert [e.titulo for e in resultado] == [
+            "Mesa de examen final turno julio",
+            "Mesa de examen final turno diciembre",
+        ]
+        assert resultado == sorted(resultado, key=lambda e: e.fecha)
+    
+    def test_sin_coincidencias_usa_los_filtros_de_listas(self, eventos, indice):
+        """Si el índice no encuentra nada se conserva el comportamiento anterior"""
+        filtro = EventoFilter()
+        
+        assert filtro.filtrar("¿qué hay?", eventos, indice) == filtro.filtrar("¿qué hay?", eventos)
+    
+    def test_indice_de_otra_lista_se_ignora(self, eventos, indice):
+        """Un índice que no corresponde a los eventos no se usa"""
+        resultado = EventoFilter().filtrar("día del estudiante", eventos[:3], indice)
+        
+        assert len(resultado) == 3
+
+
+class TestSnapshotConIndice:
+    """Tests del índice construido al publicar"""
+    
+    def test_publicar_construye_el_indice(self, repositorio_eventos, eventos):
+        """Cada snapshot publicado trae su índice"""
+        snapshot = repositorio_eventos.publicar(eventos)
+        
+        assert snapshot.busqueda is not None
+        assert len(snapshot.busqueda) == len(snapshot)
+    
+    def test_misma_version_reutiliza_el_indice(self, repositorio_eventos, eventos):
+        """Republicar el mismo contenido no reconstruye el índice"""
+        primero = repositorio_eventos.publicar(eventos)
+        segundo = repositorio_eventos.publicar(list(eventos))
+        
+        assert segundo.busqueda is primero.busqueda
+        
+        tercero = repositorio_eventos.publicar(eventos[:-1])
+        assert tercero.busqueda is not primero.busqueda
\ No newline at end of file
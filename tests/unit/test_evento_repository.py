@@ -0,0 +1,104 @@
+"""
+Tests para EventoRepository
+"""
+
+import pytest
+from datetime import datetime
+from src.models.evento import Evento
+from src.services.evento_repository import EventoRepository
+
+
+class TestEventoRepository:
+    """Tests del repositorio de snapshots de eventos"""
+    
+    def test_obtener_snapshot_indexa_por_id(self, repositorio_eventos, lista_eventos):
+        """Cada evento debe poder resolverse por su ID estable"""
+        snapshot = repositorio_eventos.obtener_snapshot()
+        
+        assert len(snapshot) == len(lista_eventos)
+        for evento in lista_eventos:
+            assert snapshot.obtener(evento.id).titulo == evento.titulo
+    
+    def test_eventos_ordenados_por_fecha(self, repositorio_eventos):
+        """El snapshot debe quedar ordenado por fecha"""
+        snapshot = repositorio_eventos.obtener_snapshot()
+        fechas = [e.fecha for e in snapshot.eventos]
+        assert fechas == sorted(fechas)
+    
+    def test_snapshot_se_reutiliza_dentro_del_ttl(self, repositorio_eventos, scraper_falso):
+        """No debe volver a scrapear mientras el snapshot esté vigente"""
+        repositorio_eventos.obtener_snapshot()
+        repositorio_eventos.obtener_snapshot()
+        
+        assert scraper_falso.llamadas == 1
+    
+    def test_id_inexistente(self, repositorio_eventos):
+        """IDs desconocidos deben retornar None"""
+        assert repositorio_eventos.buscar("no-existe") is None
+        assert repositorio_eventos.buscar(1) is None
+    
+    def test_ids_sobreviven_a_refrescos(self, repositorio_eventos, lista_eventos):
+        """Un ID obtenido antes de refrescar debe seguir resolviendo"""
+        evento_id = repositorio_eventos.obtener_snapshot().eventos[0].id
+        
+        # Mismo contenido en otro orden + un evento nuevo
+        nuevos = list(reversed(lista_eventos)) + [
+            Evento(fecha=datetime(2025, 12, 1), titulo="Inicio de inscripciones", categoria="administrativo")
+        ]
+        repositorio_eventos.publicar(nuevos)
+        
+        assert repositorio_eventos.buscar(evento_id) is not None
+    
+    def test_version_cambia_solo_con_el_contenido(self, repositorio_eventos, lista_eventos):
+        """La versión depende del contenido, no del orden"""
+        v1 = repositorio_eventos.publicar(lista_eventos).version
+        v2 = repositorio_eventos.publicar(list(reversed(lista_eventos))).version
+        v3 = repositorio_eventos.publicar(lista_eventos[:1]).version
+        
+        assert v1 == v2
+        assert v1 != v3
+    
+    def test_version_cambia_si_cambia_un_evento_con_el_mismo_id(self, repositorio_eventos, lista_eventos):
+        """Un cambio de categoría o de mayúsculas en el título no cambia el ID pero sí la versión"""
+        original = lista_eventos[0]
+        corregido = Evento(fecha=original.fecha, titulo=original.titulo.upper(), categoria="academico")
+        v1 = repositorio_eventos.publicar(lista_eventos).version
+        v2 = repositorio_eventos.publicar([corregido] + lista_eventos[1:]).version
+        
+        assert corregido.id == original.id
+        assert v1 != v2
+    
+    def test_suscriptores_reciben_versiones_nuevas(self, repositorio_eventos, lista_eventos):
+        """Sólo debe notificar cuando cambia la versión"""
+        recibidos = []
+        repositorio_eventos.suscribir(recibidos.append)
+        
+        repositorio_eventos.publicar(lista_eventos)
+        repositorio_eventos.publicar(lista_eventos)
+        repositorio_eventos.publicar(lista_eventos[:2])
+        
+        assert len(recibidos) == 2
+    
+    def test_error_sin_snapshot_previo(self):
+        """Si el primer scraping falla, debe propagar el error"""
+        class ScraperRoto:
+            def obtener_eventos(self):
+                raise ConnectionError("sin red")
+        
+        repo = EventoRepository(scraper=ScraperRoto())
+        
+        with pytest.raises(ConnectionError):
+            repo.obtener_snapshot()
+    
+    @pytest.mark.asyncio
+    async def test_refresco_async_con_error_usa_snapshot_anterior(self, repositorio_eventos, scraper_falso):
+        """Si el refresco falla debe servir la última versión conocida"""
+        version = (await repositorio_eventos.obtener_snapshot_async()).version
+        
+        async def fallar():
+            raise ConnectionError("sin red")
+        
+        scraper_falso.obtener_eventos_async = fallar
+        snapshot = await repositorio_eventos.refrescar_async()
+        
+        assert snapshot.version == version
@@ -0,0 +1,83 @@
+"""
+Tests para la capa de ejecución de trabajo bloqueante
+"""
+
+import asyncio
+import time
+import pytest
+from src.utils.executor import BlockingExecutor
+
+
+def _cuadrado(x):
+    """Función a nivel de módulo (serializable para el pool de procesos)"""
+    return x * x
+
+
+class TestBlockingExecutor:
+    """Tests del executor de trabajo bloqueante"""
+    
+    @pytest.fixture
+    def executor(self):
+        """Executor sin pool de procesos (rápido para tests)"""
+        executor = BlockingExecutor(max_threads=2, max_procesos=0)
+        yield executor
+        executor.cerrar()
+    
+    @pytest.mark.asyncio
+    async def test_ejecutar_io_retorna_resultado(self, executor):
+        """Debe retornar el resultado de la función"""
+        resultado = await executor.ejecutar_io(_cuadrado, 4)
+        assert resultado == 16
+    
+    @pytest.mark.asyncio
+    async def test_ejecutar_io_con_kwargs(self, executor):
+        """Debe pasar argumentos nombrados"""
+        resultado = await executor.ejecutar_io(sorted, [3, 1, 2], reverse=True)
+        assert resultado == [3, 2, 1]
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_sigue_respondiendo(self, executor):
+        """Una llamada bloqueante no debe congelar el event loop"""
+        ticks = 0
+        
+        async def latido():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.02)
+                ticks += 1
+        
+        await asyncio.gather(
+            executor.ejecutar_io(time.sleep, 0.2),
+            latido()
+        )
+        
+        assert ticks == 5
+    
+    @pytest.mark.asyncio
+    async def test_timeout(self, executor):
+        """Debe lanzar TimeoutError si se supera el límite"""
+        with pytest.raises(TimeoutError):
+            await executor.ejecutar_io(time.sleep, 1, timeout=0.05)
+    
+    @pytest.mark.asyncio
+    async def test_ejecutar_cpu_sin_procesos_usa_threads(self, executor):
+        """Con max_procesos=0 debe ejecutar en el pool de threads"""
+        resultado = await executor.ejecutar_cpu(_cuadrado, 3)
+        
+        assert resultado == 9
+        assert executor._process_pool is None
+    
+    @pytest.mark.asyncio
+    async def test_excepciones_se_propagan(self, executor):
+        """Los errores de la función deben llegar al llamador"""
+        with pytest.raises(ValueError):
+            await executor.ejecutar_io(int, "no-es-numero")
+    
+    def test_cerrar_libera_pools(self):
+        """cerrar() debe descartar los pools creados"""
+        executor = BlockingExecutor(max_threads=1, max_procesos=0)
+        executor._get_thread_pool()
+        
+        executor.cerrar()
+        
+        assert executor._thread_pool is None
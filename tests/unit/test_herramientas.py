@@ -0,0 +1,244 @@
+"""
+Tests para el function calling de Gemini sobre las herramientas MCP
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+import google.generativeai as genai
+from src.ai.herramientas import (
+    HERRAMIENTAS_LLM,
+    LIMITE_RESULTADOS_LLM,
+    EjecutorHerramientas,
+    declaraciones_gemini,
+    esquema_para_gemini,
+)
+from src.ai.scheduler import LLMScheduler
+from src.config.settings import settings
+from src.mcp.server import PregonMCPServer
+from src.models.evento import Evento
+
+
+@pytest.fixture
+def eventos_futuros():
+    """Exámenes en los próximos días"""
+    hoy = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
+    return [
+        Evento(fecha=hoy + timedelta(days=i + 1), titulo=f"Examen final {i}", categoria="examen")
+        for i in range(30)
+    ]
+
+
+@pytest.fixture
+def servidor(repositorio_eventos, eventos_futuros):
+    """Servidor MCP con un snapshot publicado"""
+    repositorio_eventos.publicar(eventos_futuros)
+    return PregonMCPServer(repository=repositorio_eventos)
+
+
+class TestEsquemas:
+    """Tests de la conversión de schemas MCP a declaraciones de Gemini"""
+    
+    def test_descarta_campos_no_soportados(self):
+        """minimum, maximum y default no existen en el Schema de Gemini"""
+        schema = {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "minimum": 1, "maximum": 100, "default": 10},
+                "fields": {"type": "array", "items": {"type": "string", "default": "id"}}
+            },
+            "required": []
+        }
+        
+        resultado = esquema_para_gemini(schema)
+        
+        assert resultado == {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer"},
+                "fields": {"type": "array", "items": {"type": "string"}}
+            }
+        }
+    
+    def test_solo_herramientas_de_lectura(self, servidor):
+        """Las herramientas con efectos (recordatorios, agregar) no se exponen"""
+        nombres = {d["name"] for d in declaraciones_gemini(servidor.list_tools())}
+        
+        assert nombres == set(HERRAMIENTAS_LLM)
+        assert "enviar_recordatorio" not in nombres
+        assert "agregar_a_google_calendar" not in nombres
+    
+    def test_gemini_acepta_las_declaraciones(self, servidor):
+        """Las declaraciones deben convertirse a FunctionDeclaration sin errores"""
+        from google.generativeai.types import content_types
+        
+        declaraciones = declaraciones_gemini(servidor.list_tools())
+        libreria = content_types.to_function_library([{"function_declarations": declaraciones}])
+        
+        assert len(libreria.to_proto()[0].function_declarations) == len(HERRAMIENTAS_LLM)
+
+
+class TestEjecutorHerramientas:
+    """Tests del ejecutor de llamadas pedidas por el modelo"""
+    
+    @pytest.mark.asyncio
+    async def test_formato_compacto_y_limite(self, servidor, repositorio_eventos):
+        """Los listados deben llegar compactos y con el límite del LLM"""
+        ejecutor = EjecutorHerramientas(servidor, repositorio_eventos.snapshot_actual)
+        
+        resultado = await ejecutor("buscar_eventos", {"categoria": "examen", "limit": 100.0})
+        
+        nombre, argumentos = ejecutor.llamadas[0]
+        assert nombre == "buscar_eventos"
+        assert argumentos["formato"] == "compacto"
+        assert argumentos["limit"] == LIMITE_RESULTADOS_LLM
+        assert "resultado" in resultado
+    
+    @pytest.mark.asyncio
+    async def test_rechaza_herramientas_con_efectos(self, servidor):
+        """Una herramienta no expuesta debe devolver error sin ejecutarse"""
+        servidor.invocar_herramienta = AsyncMock()
+        ejecutor = EjecutorHerramientas(servidor)
+        
+        resultado = await ejecutor("enviar_recordatorio", {"evento_id": "x", "canal": "discord"})
+        
+        assert "error" in resultado
+        servidor.invocar_herramienta.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_error_se_devuelve_al_modelo(self, servidor):
+        """Un fallo de la herramienta debe volver como resultado, no como excepción"""
+        servidor.invocar_herramienta = AsyncMock(side_effect=ValueError("fecha inválida"))
+        ejecutor = EjecutorHerramientas(servidor)
+        
+        resultado = await ejecutor("buscar_eventos", {"desde": "ayer"})
+        
+        assert resultado == {"error": "fecha inválida"}
+
+
+async def _stream(*partes):
+    """Simula un stream de Gemini con un chunk por parte"""
+    for parte in partes:
+        yield MagicMock(parts=[parte])
+
+
+class TestLLMClientHerramientas:
+    """Tests del bucle de function calling de LLMClient"""
+    
+    @pytest.fixture
+    def cliente(self, monkeypatch):
+        """Cliente con el modelo de Gemini simulado"""
+        from src.ai.llm_client import LLMClient
+        
+        monkeypatch.setattr(settings, "gemini_api_key", "clave-de-prueba")
+        cliente = LLMClient()
+        cliente.model = MagicMock()
+        cliente.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=2, max_cola=4)
+        return cliente
+    
+    @pytest.mark.asyncio
+    async def test_ejecuta_herramienta_y_devuelve_resultado(self, cliente):
+        """La llamada pedida por Gemini debe ejecutarse y su resultado volver al modelo"""
+        llamada = genai.protos.Part(
+            function_call=genai.protos.FunctionCall(name="buscar_eventos", args={"query": "final", "limit": 5})
+        )
+        chat = cliente.model.start_chat.return_value
+        chat.send_message_async = AsyncMock(side_effect=[
+            _stream(llamada),
+            _stream(genai.protos.Part(text="📝 Final "), genai.protos.Part(text="el lunes"))
+        ])
+        ejecutar = AsyncMock(return_value={"resultado": {"total": 1}})
+        
+        respuesta = await cliente.chat_con_herramientas("¿Cuándo es el final?", [], ejecutar)
+        
+        assert respuesta == "📝 Final el lunes"
+        ejecutar.assert_awaited_once_with("buscar_eventos", {"query": "final", "limit": 5})
+        
+        devuelto = chat.send_message_async.await_args_list[1].args[0]
+        assert devuelto[0].function_response.name == "buscar_eventos"
+        assert cliente.scheduler.completadas == 2
+    
+    @pytest.mark.asyncio
+    async def test_ultima_ronda_sin_herramientas(self, cliente):
+        """Agotadas las rondas, Gemini debe responder sin poder pedir herramientas"""
+        llamada = genai.protos.Part(function_call=genai.protos.FunctionCall(name="get_eventos_semana"))
+        chat = cliente.model.start_chat.return_value
+        chat.send_message_async = AsyncMock(side_effect=[
+            _stream(llamada),
+            _stream(genai.protos.Part(text="Sin datos"))
+        ])
+        
+        await cliente.chat_con_herramientas("¿Qué hay?", [], AsyncMock(return_value={}), max_rondas=1)
+        
+        modos = [
+            c.kwargs["tool_config"]["function_calling_config"]["mode"]
+            for c in chat.send_message_async.await_args_list
+        ]
+        assert modos == ["AUTO", "NONE"]
+    
+    @pytest.mark.asyncio
+    async def test_deadline_por_fragmento(self, cliente):
+        """Un stream que deja de mandar fragmentos se corta al vencer el deadline"""
+        async def colgado():
+            yield MagicMock(parts=[genai.protos.Part(text="📝 Final ")])
+            await asyncio.sleep(10)
+        
+        chat = cliente.model.start_chat.return_value
+        chat.send_message_async = AsyncMock(return_value=colgado())
+        cliente.resiliencia.timeout = 0.05
+        
+        with pytest.raises(TimeoutError):
+            await cliente.chat_con_herramientas("¿Cuándo es el final?", [], AsyncMock(return_value={}))
+        
+        assert cliente.resiliencia.circuito.estadisticas()["fallos_seguidos"] == 1
+
+
+class TestChatbotFunctionCalling:
+    """Tests de la vía de function calling en CalendarioChatbot"""
+    
+    @pytest.fixture
+    def chatbot(self, servidor, repositorio_eventos):
+        """Chatbot con LLM simulado y servidor MCP real"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        with patch("src.ai.chatbot.get_llm_client") as mock_llm:
+            mock_llm.return_value.chat = AsyncMock(return_value="📝 Respuesta con eventos")
+            mock_llm.return_value.preparar_prefijo = AsyncMock(return_value=False)
+            mock_llm.return_value.soporta_cascada = False
+            mock_llm.return_value.chat_con_herramientas = AsyncMock(return_value="📝 Respuesta con herramientas")
+            bot = CalendarioChatbot()
+        
+        bot.mcp_server = servidor
+        bot.repository = repositorio_eventos
+        bot.answer_cache.limpiar()
+        return bot
+    
+    @pytest.mark.asyncio
+    async def test_usa_herramientas(self, chatbot):
+        """Sin contexto explícito, Gemini debe recibir las herramientas y no los eventos"""
+        respuesta = await chatbot.responder("¿Qué tengo que tener en cuenta para los finales?")
+        
+        assert respuesta == "📝 Respuesta con herramientas"
+        kwargs = chatbot.llm.chat_con_herramientas.await_args.kwargs
+        assert "Examen final" not in kwargs["mensaje"]
+        assert {d["name"] for d in kwargs["declaraciones"]} == set(HERRAMIENTAS_LLM)
+        chatbot.llm.chat.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_respaldo_con_eventos(self, chatbot):
+        """Si el function calling falla debe responder con el prompt de eventos"""
+        chatbot.llm.chat_con_herramientas = AsyncMock(side_effect=RuntimeError("tool_config"))
+        
+        respuesta = await chatbot.responder("¿Qué tengo que tener en cuenta para los finales?")
+        
+        assert respuesta == "📝 Respuesta con eventos"
+        assert "Examen final" in chatbot.llm.chat.await_args.kwargs["mensaje"]
+    
+    @pytest.mark.asyncio
+    async def test_contexto_explicito_no_usa_herramientas(self, chatbot, eventos_futuros):
+        """Con eventos ya elegidos por quien llama no se usan herramientas"""
+        await chatbot.responder("¿Qué tengo que tener en cuenta para los finales?", eventos_futuros[:3])
+        
+        chatbot.llm.chat_con_herramientas.assert_not_awaited()
+        chatbot.llm.chat.assert_awaited_once()
\ No newline at end of file
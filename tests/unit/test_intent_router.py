@@ -0,0 +1,151 @@
+"""
+Tests para el router de intenciones (respuestas sin LLM)
+"""
+
+import pytest
+from datetime import date, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.ai.intent_router import (
+    INTENCION_HOY,
+    INTENCION_INICIO,
+    INTENCION_PROXIMO,
+    INTENCION_SEMANA,
+    IntentRouter
+)
+from src.models.evento import Evento
+
+HOY = date(2025, 6, 16)  # Lunes
+
+
+@pytest.fixture
+def eventos():
+    """Calendario de prueba"""
+    receso = [
+        Evento(fecha=datetime(2025, 7, 14) + timedelta(days=i), titulo="Receso invernal", categoria="receso")
+        for i in range(14)
+    ]
+    return receso + [
+        Evento(fecha=datetime(2025, 3, 10), titulo="Inicio del primer cuatrimestre", categoria="academico"),
+        Evento(fecha=datetime(2025, 6, 16), titulo="Paso a la Inmortalidad de Güemes", categoria="feriado"),
+        Evento(fecha=datetime(2025, 6, 20), titulo="Día de la Bandera", categoria="feriado"),
+        Evento(fecha=datetime(2025, 8, 4), titulo="Inicio del segundo cuatrimestre", categoria="academico"),
+    ]
+
+
+class TestClasificacion:
+    """Tests de la detección de intenciones"""
+    
+    @pytest.mark.parametrize("pregunta,intencion", [
+        ("¿Qué hay hoy?", INTENCION_HOY),
+        ("Hola, ¿qué eventos hay esta semana?", INTENCION_SEMANA),
+        ("¿Cuándo es el próximo feriado?", INTENCION_PROXIMO),
+        ("¿Cuál es el próximo feriado?", INTENCION_PROXIMO),
+        ("¿cuándo son los próximos exámenes?", INTENCION_PROXIMO),
+        ("¿Cuándo empieza el segundo cuatrimestre?", INTENCION_INICIO),
+    ])
+    def test_intenciones_comunes(self, pregunta, intencion):
+        """Las preguntas frecuentes deben clasificarse con confianza alta"""
+        detectada, confianza, _ = IntentRouter(umbral_confianza=0.75).clasificar(pregunta)
+        
+        assert detectada == intencion
+        assert confianza >= 0.75
+    
+    @pytest.mark.parametrize("pregunta", [
+        "¿Por qué no hay clases hoy?",
+        "¿Cómo me inscribo a las mesas de examen?",
+        "¿Qué exámenes hay en diciembre?",
+    ])
+    def test_preguntas_abiertas_van_al_llm(self, pregunta):
+        """Preguntas abiertas o sin plantilla no deben tener intención"""
+        detectada, _, _ = IntentRouter().clasificar(pregunta)
+        
+        assert detectada is None
+    
+    def test_palabras_no_explicadas_bajan_la_confianza(self):
+        """Un detalle que la plantilla no cubre debe derivar al LLM"""
+        router = IntentRouter(umbral_confianza=0.75)
+        _, confianza, _ = router.clasificar("¿Cuándo es el próximo examen de matemática?")
+        
+        assert confianza < 0.75
+
+
+class TestRespuestas:
+    """Tests de las respuestas con plantilla"""
+    
+    def test_hoy(self, eventos):
+        """Debe listar los eventos del día"""
+        respuesta = IntentRouter(0.75).responder("¿Qué hay hoy?", eventos, hoy=HOY)
+        
+        assert "Güemes" in respuesta.texto
+        assert "lunes 16 de junio" in respuesta.texto
+    
+    def test_semana_colapsa_rangos(self, eventos):
+        """La próxima semana de receso debe mostrarse como un rango"""
+        respuesta = IntentRouter(0.75).responder(
+            "¿Qué hay la próxima semana?", eventos, hoy=date(2025, 7, 10)
+        )
+        
+        assert respuesta.texto.count("Receso invernal") == 1
+        assert "14/07 al 27/07" in respuesta.texto
+    
+    def test_proximo_feriado(self, eventos):
+        """Debe responder el próximo feriado y cuántos días faltan"""
+        respuesta = IntentRouter(0.75).responder(
+            "¿Cuándo es el próximo feriado?", eventos, hoy=date(2025, 6, 17)
+        )
+        
+        assert "Día de la Bandera" in respuesta.texto
+        assert "faltan 3 días" in respuesta.texto
+    
+    def test_proximos_lista_todos(self):
+        """En plural debe listar todos los exámenes que vienen, no sólo el primero"""
+        examenes = [
+            Evento(fecha=datetime(2025, 7, 1), titulo="Final de Física", categoria="examen"),
+            Evento(fecha=datetime(2025, 7, 8), titulo="Final de Química", categoria="examen"),
+            Evento(fecha=datetime(2025, 7, 15), titulo="Final de Álgebra", categoria="examen"),
+        ]
+        
+        respuesta = IntentRouter(0.75).responder("¿Cuáles son los próximos exámenes?", examenes, hoy=HOY)
+        
+        for examen in examenes:
+            assert examen.titulo in respuesta.texto
+    
+    def test_inicio_segundo_cuatrimestre(self, eventos):
+        """Debe elegir el cuatrimestre pedido"""
+        respuesta = IntentRouter(0.75).responder(
+            "¿Cuándo empieza el segundo cuatrimestre?", eventos, hoy=HOY
+        )
+        
+        assert "segundo cuatrimestre" in respuesta.texto
+        assert "lunes 4 de agosto" in respuesta.texto
+    
+    def test_sin_dato_deriva(self, eventos):
+        """Si el índice no tiene la respuesta debe derivar al LLM"""
+        router = IntentRouter(0.75)
+        
+        assert router.responder("¿Cuándo es el próximo examen?", eventos, hoy=HOY) is None
+        assert router.estadisticas()["derivadas"] == 1
+
+
+class TestChatbotFastPath:
+    """Tests de la integración en CalendarioChatbot"""
+    
+    @pytest.mark.asyncio
+    async def test_no_llama_al_llm(self, eventos):
+        """Una intención común debe responderse sin Gemini"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        with patch("src.ai.chatbot.get_llm_client") as mock_llm:
+            mock_llm.return_value.chat = AsyncMock(return_value="LLM")
+            bot = CalendarioChatbot()
+        
+        bot.repository = MagicMock()
+        bot.repository.obtener_snapshot_async = AsyncMock(
+            return_value=MagicMock(version="v1", eventos=eventos)
+        )
+        bot.intent_router = IntentRouter(0.75)
+        
+        respuesta = await bot.responder("¿Qué hay esta semana?")
+        
+        assert respuesta.startswith("📅")
+        bot.llm.chat.assert_not_awaited()
\ No newline at end of file
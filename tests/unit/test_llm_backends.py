@@ -0,0 +1,169 @@
+"""
+Tests para los backends del cliente LLM
+"""
+
+import json
+import pytest
+from unittest.mock import patch
+from src.ai.llm_backends import CassetteBackend, CassetteIncompletoError, FakeBackend, crear_backend
+from src.ai.scheduler import LLMScheduler
+from src.config.settings import settings
+
+PROMPT = "FECHA Y HORA ACTUAL: Monday, 02 de March de 2026\n\nPREGUNTA DEL ESTUDIANTE:\n¿Cuándo hay finales?"
+
+
+async def _juntar(stream):
+    """Junta los fragmentos de un stream"""
+    return [fragmento async for fragmento in stream]
+
+
+class TestFakeBackend:
+    """Tests del modelo falso"""
+    
+    @pytest.mark.asyncio
+    async def test_determinista(self):
+        """El mismo prompt debe dar la misma respuesta"""
+        backend = FakeBackend()
+        
+        assert await backend.generar(PROMPT) == await backend.generar(PROMPT)
+        assert await backend.generar(PROMPT) != await backend.generar(PROMPT + "?")
+        assert backend.generar_sync(PROMPT) == await backend.generar(PROMPT)
+    
+    @pytest.mark.asyncio
+    async def test_stream_en_fragmentos(self):
+        """El stream entrega la misma respuesta partida"""
+        backend = FakeBackend(fragmentos=3)
+        
+        fragmentos = await _juntar(backend.generar_stream(PROMPT))
+        
+        assert len(fragmentos) == 3
+        assert "".join(fragmentos) == await backend.generar(PROMPT)
+    
+    @pytest.mark.asyncio
+    async def test_latencia_configurable(self):
+        """Debe esperar la latencia configurada"""
+        backend = FakeBackend(latencia=0.5)
+        
+        with patch("src.ai.llm_backends.asyncio.sleep") as sleep:
+            await backend.generar(PROMPT)
+        
+        sleep.assert_awaited_once_with(0.5)
+
+
+class TestCassetteBackend:
+    """Tests de grabación y reproducción"""
+    
+    @pytest.mark.asyncio
+    async def test_graba_y_reproduce(self, tmp_path):
+        """Lo grabado debe reproducirse sin el backend real"""
+        ruta = tmp_path / "casete.json"
+        real = FakeBackend()
+        
+        grabador = CassetteBackend(str(ruta), modo="record", backend=real)
+        grabada = await grabador.generar(PROMPT)
+        fragmentos = await _juntar(grabador.generar_stream(PROMPT + " (stream)"))
+        grabador.cerrar()
+        
+        reproductor = CassetteBackend(str(ruta), modo="replay")
+        
+        assert await reproductor.generar(PROMPT) == grabada
+        assert await _juntar(reproductor.generar_stream(PROMPT + " (stream)")) == fragmentos
+        assert reproductor.aciertos == 2
+        assert len(json.loads(ruta.read_text(encoding="utf-8"))["grabaciones"]) == 2
+    
+    @pytest.mark.asyncio
+    async def test_clave_ignora_la_fecha_actual(self, tmp_path):
+        """Un casete grabado otro día debe seguir sirviendo"""
+        ruta = str(tmp_path / "casete.json")
+        grabador = CassetteBackend(ruta, modo="record", backend=FakeBackend())
+        await grabador.generar(PROMPT)
+        grabador.cerrar()
+        
+        otro_dia = PROMPT.replace("Monday, 02 de March", "Friday, 19 de June")
+        
+        assert CassetteBackend.clave(otro_dia) == CassetteBackend.clave(PROMPT)
+        assert await CassetteBackend(ruta, modo="replay").generar(otro_dia)
+    
+    @pytest.mark.asyncio
+    async def test_escribe_una_vez_al_cerrar(self, tmp_path):
+        """Grabar no toca el disco; cerrar escribe todo junto"""
+        ruta = tmp_path / "casete.json"
+        grabador = CassetteBackend(str(ruta), modo="record", backend=FakeBackend())
+        
+        for i in range(3):
+            await grabador.generar(f"{PROMPT} {i}")
+        
+        assert not ruta.exists()
+        
+        grabador.cerrar()
+        
+        assert len(json.loads(ruta.read_text(encoding="utf-8"))["grabaciones"]) == 3
+        assert not ruta.with_suffix(".json.tmp").exists()
+    
+    @pytest.mark.asyncio
+    async def test_prompt_no_grabado(self, tmp_path):
+        """Sin respaldo falla; con respaldo responde el backend de respaldo"""
+        ruta = str(tmp_path / "vacio.json")
+        
+        with pytest.raises(CassetteIncompletoError):
+            await CassetteBackend(ruta, modo="replay").generar(PROMPT)
+        
+        respaldo = FakeBackend()
+        casete = CassetteBackend(ruta, modo="replay", respaldo=respaldo)
+        
+        assert await casete.generar(PROMPT) == await respaldo.generar(PROMPT)
+        assert casete.fallos == 1
+    
+    def test_modo_invalido(self, tmp_path):
+        """'record' sin backend o un modo desconocido deben fallar"""
+        with pytest.raises(ValueError):
+            CassetteBackend(str(tmp_path / "c.json"), modo="record")
+        with pytest.raises(ValueError):
+            CassetteBackend(str(tmp_path / "c.json"), modo="rebobinar")
+
+
+class TestLLMClientConBackend:
+    """Tests de LLMClient sobre backends locales"""
+    
+    @pytest.fixture
+    def cliente(self, monkeypatch):
+        """Cliente con el modelo falso y sin API key"""
+        from src.ai.llm_client import LLMClient
+        
+        monkeypatch.setattr(settings, "gemini_api_key", None)
+        cliente = LLMClient(backend=FakeBackend())
+        cliente.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=2, max_cola=4)
+        return cliente
+    
+    @pytest.mark.asyncio
+    async def test_chat_sin_api_key(self, cliente):
+        """Con un backend local no hace falta GEMINI_API_KEY"""
+        respuesta = await cliente.chat("¿Cuándo hay finales?", contexto="Sos un asistente")
+        fragmentos = await _juntar(cliente.chat_stream("¿Cuándo hay finales?", contexto="Sos un asistente"))
+        
+        assert respuesta == "".join(fragmentos)
+        assert cliente.chat_sync("¿Cuándo hay finales?", contexto="Sos un asistente") == respuesta
+    
+    @pytest.mark.asyncio
+    async def test_sin_function_calling(self, cliente):
+        """Los backends locales no declaran herramientas"""
+        assert not cliente.soporta_herramientas
+        
+        with pytest.raises(RuntimeError, match="no admite function calling"):
+            await cliente.chat_con_herramientas("hola", [], None)
+    
+    def test_chatbot_no_usa_herramientas(self, cliente):
+        """El chatbot no debe declarar herramientas si el backend no las admite"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        bot = CalendarioChatbot(llm=cliente)
+        
+        assert bot.declaraciones_herramientas == []
+    
+    def test_crear_backend(self, monkeypatch):
+        """crear_backend debe respetar la configuración"""
+        monkeypatch.setattr(settings, "llm_fake_latencia", 0.25)
+        
+        assert crear_backend("fake").latencia == 0.25
+        with pytest.raises(ValueError):
+            crear_backend("gpt")
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Tests para el planificador de llamadas a Gemini
+"""
+
+import asyncio
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from src.ai.scheduler import MENSAJE_SATURADO, LLMSaturadoError, LLMScheduler, PrioridadLLM, TokenBucket
+from src.models.evento import Evento
+
+
+class TestTokenBucket:
+    """Tests del balde de tokens"""
+    
+    def test_sin_espera_con_saldo(self):
+        """Mientras haya saldo no debe esperar"""
+        balde = TokenBucket(capacidad=2, por_minuto=60)
+        
+        assert balde.reservar(1) == 0
+        assert balde.reservar(1) == 0
+    
+    def test_espera_proporcional_a_la_deuda(self):
+        """Sin saldo debe esperar lo que tarda en recargarse"""
+        balde = TokenBucket(capacidad=1, por_minuto=60)
+        balde.reservar(1)
+        
+        assert balde.reservar(1) == pytest.approx(1.0, abs=0.05)
+        assert balde.reservar(1) == pytest.approx(2.0, abs=0.05)
+
+
+class TestLLMScheduler:
+    """Tests de concurrencia, prioridad y descarte"""
+    
+    @staticmethod
+    def _scheduler(**kwargs) -> LLMScheduler:
+        opciones = {"rpm": 10_000, "tpm": 10_000_000, "max_concurrencia": 1, "max_cola": 8}
+        opciones.update(kwargs)
+        return LLMScheduler(**opciones)
+    
+    @pytest.mark.asyncio
+    async def test_respeta_concurrencia(self):
+        """No debe superar el máximo de llamadas simultáneas"""
+        scheduler = self._scheduler(max_concurrencia=2)
+        activas, maximo = 0, 0
+        
+        async def llamada():
+            nonlocal activas, maximo
+            activas += 1
+            maximo = max(maximo, activas)
+            await asyncio.sleep(0.01)
+            activas -= 1
+            return "ok"
+        
+        resultados = await asyncio.gather(*(scheduler.ejecutar(llamada) for _ in range(6)))
+        
+        assert resultados == ["ok"] * 6
+        assert maximo == 2
+        assert scheduler.estadisticas()["en_curso"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_interactivas_antes_que_fondo(self):
+        """Las consultas interactivas en cola deben pasar primero"""
+        scheduler = self._scheduler()
+        liberar = asyncio.Event()
+        orden = []
+        
+        async def bloqueante():
+            await liberar.wait()
+        
+        def registrar(nombre):
+            async def llamada():
+                orden.append(nombre)
+            return llamada
+        
+        primera = asyncio.create_task(scheduler.ejecutar(bloqueante))
+        await asyncio.sleep(0)
+        
+        tareas = [
+            asyncio.create_task(scheduler.ejecutar(registrar("fondo"), PrioridadLLM.FONDO)),
+            asyncio.create_task(scheduler.ejecutar(registrar("interactiva"), PrioridadLLM.INTERACTIVA)),
+        ]
+        await asyncio.sleep(0)
+        liberar.set()
+        await asyncio.gather(primera, *tareas)
+        
+        assert orden == ["interactiva", "fondo"]
+    
+    @pytest.mark.asyncio
+    async def test_cola_llena_descarta(self):
+        """Con la cola llena debe rechazar con LLMSaturadoError"""
+        scheduler = self._scheduler(max_cola=1)
+        liberar = asyncio.Event()
+        
+        async def bloqueante():
+            await liberar.wait()
+        
+        tareas = [asyncio.create_task(scheduler.ejecutar(bloqueante)) for _ in range(2)]
+        await asyncio.sleep(0)
+        
+        with pytest.raises(LLMSaturadoError):
+            await scheduler.ejecutar(bloqueante)
+        
+        liberar.set()
+        await asyncio.gather(*tareas)
+        assert scheduler.estadisticas()["rechazadas"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_interactiva_expulsa_fondo(self):
+        """Una consulta interactiva debe desplazar a una de fondo si la cola está llena"""
+        scheduler = self._scheduler(max_cola=1)
+        liberar = asyncio.Event()
+        
+        async def bloqueante():
+            await liberar.wait()
+            return "ok"
+        
+        primera = asyncio.create_task(scheduler.ejecutar(bloqueante))
+        await asyncio.sleep(0)
+        fondo = asyncio.create_task(scheduler.ejecutar(bloqueante, PrioridadLLM.FONDO))
+        await asyncio.sleep(0)
+        interactiva = asyncio.create_task(scheduler.ejecutar(bloqueante, PrioridadLLM.INTERACTIVA))
+        await asyncio.sleep(0)
+        
+        liberar.set()
+        
+        assert await interactiva == "ok"
+        with pytest.raises(LLMSaturadoError):
+            await fondo
+        await primera
+    
+    @pytest.mark.asyncio
+    async def test_cancelacion_devuelve_el_lugar(self):
+        """Cancelar una llamada en cola no debe perder lugares"""
+        scheduler = self._scheduler()
+        liberar = asyncio.Event()
+        
+        async def bloqueante():
+            await liberar.wait()
+        
+        primera = asyncio.create_task(scheduler.ejecutar(bloqueante))
+        await asyncio.sleep(0)
+        en_cola = asyncio.create_task(scheduler.ejecutar(bloqueante))
+        await asyncio.sleep(0)
+        
+        en_cola.cancel()
+        liberar.set()
+        await primera
+        
+        with pytest.raises(asyncio.CancelledError):
+            await en_cola
+        
+        stats = scheduler.estadisticas()
+        assert stats["en_curso"] == 0
+        assert stats["en_cola"] == 0
+    
+    def test_compartido_entre_threads(self):
+        """Debe limitar llamadas de distintos event loops (WhatsApp)"""
+        scheduler = self._scheduler(max_concurrencia=1)
+        activas, maximo = 0, 0
+        lock = threading.Lock()
+        
+        async def llamada():
+            nonlocal activas, maximo
+            with lock:
+                activas += 1
+                maximo = max(maximo, activas)
+            await asyncio.sleep(0.01)
+            with lock:
+                activas -= 1
+        
+        hilos = [
+            threading.Thread(target=lambda: asyncio.run(scheduler.ejecutar(llamada)))
+            for _ in range(4)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join(timeout=5)
+        
+        assert maximo == 1
+        assert scheduler.estadisticas()["completadas"] == 4
+
+
+class TestChatbotSaturado:
+    """Tests del mensaje de descarte en el chatbot"""
+    
+    @pytest.mark.asyncio
+    async def test_responde_mensaje_amable(self):
+        """Si el LLM está saturado debe responder el mensaje de espera"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        with patch("src.ai.chatbot.get_llm_client") as mock_llm:
+            mock_llm.return_value.chat = AsyncMock(side_effect=LLMSaturadoError("llena"))
+            bot = CalendarioChatbot()
+        
+        eventos = [Evento(fecha=datetime.now(), titulo="Inicio de clases", categoria="academico")]
+        respuesta = await bot.responder("¿Cuándo empiezan las clases?", contexto_eventos=eventos)
+        
+        assert respuesta == MENSAJE_SATURADO
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Tests para la paginación y proyección de herramientas MCP
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from src.models.evento import Evento
+from src.mcp.paginacion import codificar_cursor, decodificar_cursor, paginar, proyectar
+from src.mcp.tools.eventos import CAMPOS_EVENTO, EventosTools
+
+
+@pytest.fixture
+def muchos_eventos():
+    """Treinta eventos en días consecutivos"""
+    inicio = datetime(2025, 3, 1)
+    return [
+        Evento(fecha=inicio + timedelta(days=i), titulo=f"Evento {i}", categoria="academico")
+        for i in range(30)
+    ]
+
+
+@pytest.fixture
+def repositorio_muchos(repositorio_eventos, muchos_eventos):
+    """Repositorio con los treinta eventos ya publicados"""
+    repositorio_eventos.publicar(muchos_eventos)
+    return repositorio_eventos
+
+
+class TestPaginacion:
+    """Tests de cursores y páginas"""
+    
+    def test_cursor_ida_y_vuelta(self, evento_ejemplo):
+        """El cursor debe decodificar a la fecha e ID del evento"""
+        cursor = codificar_cursor(evento_ejemplo)
+        
+        assert decodificar_cursor(cursor) == (evento_ejemplo.fecha, evento_ejemplo.id)
+    
+    def test_cursor_invalido(self):
+        """Un cursor corrupto debe lanzar ValueError"""
+        with pytest.raises(ValueError):
+            decodificar_cursor("no-es-un-cursor")
+    
+    def test_recorrer_todas_las_paginas(self, muchos_eventos):
+        """Recorrer con cursores debe entregar cada evento una sola vez"""
+        vistos, cursor = [], None
+        
+        while True:
+            pagina, cursor = paginar(reversed(muchos_eventos), cursor, limit=7)
+            vistos.extend(pagina)
+            if cursor is None:
+                break
+        
+        assert [ev.id for ev in vistos] == [ev.id for ev in muchos_eventos]
+    
+    def test_proyectar_campos(self):
+        """Debe conservar sólo los campos pedidos más el id"""
+        items = [{"id": "a", "titulo": "T", "fecha": "2025-01-01", "dia_semana": "X", "categoria": "examen"}]
+        
+        proyectados, columnas = proyectar(items, CAMPOS_EVENTO, fields=["fecha"])
+        
+        assert proyectados == [{"id": "a", "fecha": "2025-01-01"}]
+        assert columnas is None
+    
+    def test_proyectar_compacto(self):
+        """El formato compacto debe devolver filas y nombres de columna"""
+        items = [{"id": "a", "titulo": "T", "fecha": "2025-01-01", "dia_semana": "X", "categoria": "examen"}]
+        
+        filas, columnas = proyectar(items, CAMPOS_EVENTO, fields=["titulo"], formato="compacto")
+        
+        assert columnas == ["id", "titulo"]
+        assert filas == [["a", "T"]]
+    
+    def test_campo_desconocido(self):
+        """Un campo inexistente debe lanzar ValueError"""
+        with pytest.raises(ValueError):
+            proyectar([], CAMPOS_EVENTO, fields=["lugar"])
+
+
+class TestBuscarEventosPaginado:
+    """Tests de buscar_eventos con cursor, limit y fields"""
+    
+    @pytest.mark.asyncio
+    async def test_buscar_con_limite_y_cursor(self, repositorio_muchos):
+        """Debe devolver la página pedida y un cursor a la siguiente"""
+        tools = EventosTools(repository=repositorio_muchos)
+        
+        primera = await tools.buscar_eventos(limit=20)
+        segunda = await tools.buscar_eventos(limit=20, cursor=primera["next_cursor"])
+        
+        assert primera["total"] == 30
+        assert primera["devueltos"] == 20
+        assert segunda["devueltos"] == 10
+        assert segunda["next_cursor"] is None
+    
+    @pytest.mark.asyncio
+    async def test_buscar_compacto(self, repositorio_muchos):
+        """El modo compacto debe incluir los nombres de columna"""
+        tools = EventosTools(repository=repositorio_muchos)
+        
+        resultado = await tools.buscar_eventos(fields=["fecha"], formato="compacto", limit=2)
+        
+        assert resultado["campos"] == ["id", "fecha"]
+        assert resultado["eventos"][0][1] == "2025-03-01"
+    
+    @pytest.mark.asyncio
+    async def test_buscar_cursor_invalido(self, repositorio_muchos):
+        """Un cursor inválido debe devolver un error"""
+        tools = EventosTools(repository=repositorio_muchos)
+        
+        resultado = await tools.buscar_eventos(cursor="???")
+        
+        assert "error" in resultado
\ No newline at end of file
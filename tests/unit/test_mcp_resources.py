@@ -0,0 +1,104 @@
+"""
+Tests para los recursos MCP del calendario
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from src.models.evento import Evento
+from src.mcp.resources import CalendarioResources, URI_CALENDARIO
+
+
+class TestCalendarioResources:
+    """Tests de recursos y suscripciones"""
+    
+    @pytest.fixture
+    def recursos(self, repositorio_eventos):
+        """Recursos sobre el repositorio con eventos de prueba"""
+        return CalendarioResources(repositorio_eventos)
+    
+    @pytest.mark.asyncio
+    async def test_leer_calendario_completo(self, recursos, lista_eventos):
+        """Debe devolver todos los eventos con ETag y versión"""
+        contenido = await recursos.leer_recurso(URI_CALENDARIO)
+        
+        assert contenido["total"] == len(lista_eventos)
+        assert contenido["etag"]
+        assert contenido["snapshot"] == recursos.repository.snapshot_actual.version
+    
+    @pytest.mark.asyncio
+    async def test_leer_por_mes_y_categoria(self, recursos):
+        """Las vistas deben filtrar por mes y por categoría"""
+        diciembre = await recursos.leer_recurso("pregon://calendario/mes/12")
+        examenes = await recursos.leer_recurso("pregon://calendario/categoria/examen")
+        
+        assert diciembre["total"] == 2
+        assert [ev["categoria"] for ev in examenes["eventos"]] == ["examen"]
+    
+    @pytest.mark.asyncio
+    async def test_uri_invalida(self, recursos):
+        """Una URI desconocida debe lanzar ValueError"""
+        with pytest.raises(ValueError):
+            await recursos.leer_recurso("pregon://calendario/mes/13")
+    
+    @pytest.mark.asyncio
+    async def test_listar_recursos(self, recursos):
+        """Debe listar el calendario y las vistas con eventos"""
+        await recursos.repository.obtener_snapshot_async()
+        
+        uris = [r["uri"] for r in recursos.listar_recursos()]
+        
+        assert URI_CALENDARIO in uris
+        assert "pregon://calendario/mes/11" in uris
+        assert "pregon://calendario/categoria/receso" in uris
+    
+    @pytest.mark.asyncio
+    async def test_notifica_solo_recursos_que_cambiaron(self, recursos, lista_eventos):
+        """Un snapshot nuevo sólo debe notificar las vistas con otro ETag"""
+        await recursos.repository.obtener_snapshot_async()
+        notificados = []
+        
+        recursos.suscribir("pregon://calendario/categoria/examen", notificados.append)
+        recursos.suscribir("pregon://calendario/categoria/receso", notificados.append)
+        
+        nuevo = Evento(fecha=datetime(2025, 12, 22), titulo="Mesa de Física", categoria="examen")
+        recursos.repository.publicar(lista_eventos + [nuevo])
+        
+        assert notificados == ["pregon://calendario/categoria/examen"]
+    
+    @pytest.mark.asyncio
+    async def test_desuscribir(self, recursos, lista_eventos, evento_ejemplo):
+        """Tras desuscribirse no debe recibir notificaciones"""
+        await recursos.repository.obtener_snapshot_async()
+        notificados = []
+        
+        recursos.suscribir(URI_CALENDARIO, notificados.append)
+        recursos.desuscribir(URI_CALENDARIO, notificados.append)
+        recursos.repository.publicar([evento_ejemplo])
+        
+        assert notificados == []
+    
+    @pytest.mark.asyncio
+    async def test_refresco_en_segundo_plano_con_suscriptores(self, scraper_falso, lista_eventos):
+        """Con suscriptores el snapshot se refresca al vencer el TTL; sin ellos, no"""
+        from src.services.evento_repository import EventoRepository
+        
+        recursos = CalendarioResources(EventoRepository(scraper=scraper_falso, ttl_segundos=0.05))
+        await recursos.repository.obtener_snapshot_async()
+        notificados = []
+        
+        recursos.suscribir("pregon://calendario/categoria/examen", notificados.append)
+        scraper_falso.eventos = lista_eventos + [
+            Evento(fecha=datetime(2025, 12, 22), titulo="Mesa de Física", categoria="examen")
+        ]
+        await asyncio.sleep(0.2)
+        
+        assert notificados == ["pregon://calendario/categoria/examen"]
+        assert recursos.refrescando
+        
+        recursos.desuscribir("pregon://calendario/categoria/examen", notificados.append)
+        llamadas = scraper_falso.llamadas
+        await asyncio.sleep(0.2)
+        
+        assert not recursos.refrescando
+        assert scraper_falso.llamadas == llamadas
\ No newline at end of file
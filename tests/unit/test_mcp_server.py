@@ -3,6 +3,7 @@
 Tests para el MCP Server
 """
 
+import json
 import pytest
 from src.mcp.server import PregonMCPServer
 
@@ -65,4 +66,106 @@ class TestMCPServer:
         server = PregonMCPServer()
         response = await server.call_tool("invalid_tool", {})
         
-        assert response.isError is True
\ No newline at end of file
+        assert response.isError is True
+    
+    @pytest.mark.asyncio
+    async def test_call_tools_batch(self, repositorio_eventos, scraper_falso):
+        """Debe ejecutar el lote sobre un único snapshot y aislar errores"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        respuestas = await server.call_tools_batch([
+            {"name": "buscar_eventos", "arguments": {"categoria": "examen"}},
+            {"name": "invalid_tool", "arguments": {}},
+            {"name": "get_proximos_examenes", "arguments": {"dias": 30}},
+        ])
+        
+        assert len(respuestas) == 3
+        assert respuestas[0].isError is False
+        assert respuestas[1].isError is True
+        assert respuestas[2].isError is False
+        
+        resultado = json.loads(respuestas[0].content[0]["text"])
+        assert resultado["total"] == 1
+        
+        # Todas las herramientas compartieron un único scraping
+        assert scraper_falso.llamadas == 1
+    
+    @pytest.mark.asyncio
+    async def test_call_tools_batch_llamada_malformada(self, repositorio_eventos):
+        """Una llamada sin nombre no debe romper el lote"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        respuestas = await server.call_tools_batch([{"arguments": {}}, {"name": "get_eventos_semana"}])
+        
+        assert respuestas[0].isError is True
+        assert respuestas[1].isError is False
+    
+    @pytest.mark.asyncio
+    async def test_call_tool_usa_cache_de_respuestas(self, repositorio_eventos):
+        """La segunda llamada idéntica debe servirse desde la caché"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        primera = await server.call_tool("buscar_eventos", {"categoria": "examen"})
+        segunda = await server.call_tool("buscar_eventos", {"categoria": "examen"})
+        
+        assert primera.content[0]["text"] == segunda.content[0]["text"]
+        assert server.response_cache.hits == 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_se_invalida_con_snapshot_nuevo(self, repositorio_eventos, evento_ejemplo):
+        """Publicar un snapshot distinto debe vaciar la caché"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        await server.call_tool("get_proximos_examenes", {"dias": 30})
+        assert len(server.response_cache) == 1
+        
+        repositorio_eventos.publicar([evento_ejemplo])
+        
+        assert len(server.response_cache) == 0
+    
+    def test_inicializacion_perezosa(self, repositorio_eventos):
+        """Crear el servidor no debe construir grupos de herramientas"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        assert server._grupos == {}
+        assert server.health()["agregar_a_google_calendar"]["estado"] == "no_inicializado"
+    
+    @pytest.mark.asyncio
+    async def test_health_tras_primer_uso(self, repositorio_eventos):
+        """Tras usar un grupo, su health debe reflejar el snapshot"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        await server.call_tool("get_eventos_semana", {})
+        
+        salud = server.health()
+        
+        assert salud["get_eventos_semana"]["estado"] == "listo"
+        assert salud["enviar_recordatorio"]["estado"] == "no_inicializado"
+        assert "calendario" not in server._grupos
+    
+    @pytest.mark.asyncio
+    async def test_invocar_herramienta_retorna_objetos_nativos(self, repositorio_eventos):
+        """La llamada en proceso no debe pasar por JSON"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        resultado = await server.invocar_herramienta("buscar_eventos", {"categoria": "examen"})
+        
+        assert isinstance(resultado, dict)
+        assert resultado["total"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_invocar_herramienta_invalida_lanza_error(self, repositorio_eventos):
+        """Una herramienta desconocida debe lanzar ValueError"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        with pytest.raises(ValueError):
+            await server.invocar_herramienta("invalid_tool")
+    
+    @pytest.mark.asyncio
+    async def test_call_tool_serializa_compacto(self, repositorio_eventos):
+        """El transporte debe usar JSON compacto"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        
+        response = await server.call_tool("buscar_eventos", {"categoria": "examen"})
+        texto = response.content[0]["text"]
+        
+        assert "\n" not in texto
+        assert json.loads(texto)["total"] == 1
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Tests para el transporte MCP (SDK oficial, sesión en memoria)
+"""
+
+import asyncio
+import json
+import pytest
+from mcp import types
+from mcp.shared.memory import create_connected_server_and_client_session
+from src.mcp.server import PregonMCPServer
+from src.mcp.stdio import crear_servidor_sdk
+
+
+class TestMCPStdio:
+    """Tests del adaptador al SDK de MCP"""
+    
+    @pytest.mark.asyncio
+    async def test_listar_y_llamar_herramientas(self, repositorio_eventos):
+        """Un cliente MCP real debe listar y ejecutar herramientas"""
+        sdk = crear_servidor_sdk(PregonMCPServer(repository=repositorio_eventos))
+        
+        async with create_connected_server_and_client_session(sdk) as cliente:
+            herramientas = await cliente.list_tools()
+            resultado = await cliente.call_tool("buscar_eventos", {"categoria": "examen"})
+        
+        assert len(herramientas.tools) == 6
+        assert resultado.isError is False
+        assert json.loads(resultado.content[0].text)["total"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_herramienta_invalida_es_error(self, repositorio_eventos):
+        """Los errores deben llegar al cliente con isError"""
+        sdk = crear_servidor_sdk(PregonMCPServer(repository=repositorio_eventos))
+        
+        async with create_connected_server_and_client_session(sdk) as cliente:
+            resultado = await cliente.call_tool("invalid_tool", {})
+        
+        assert resultado.isError is True
+    
+    @pytest.mark.asyncio
+    async def test_leer_recurso_y_recibir_actualizacion(self, repositorio_eventos, evento_ejemplo):
+        """Un cliente suscripto debe recibir notifications/resources/updated"""
+        server = PregonMCPServer(repository=repositorio_eventos)
+        sdk = crear_servidor_sdk(server)
+        recibidas = []
+        
+        async def al_recibir(mensaje):
+            if isinstance(mensaje, types.ServerNotification):
+                recibidas.append(mensaje.root)
+        
+        async with create_connected_server_and_client_session(sdk, message_handler=al_recibir) as cliente:
+            contenido = await cliente.read_resource("pregon://calendario")
+            await cliente.subscribe_resource("pregon://calendario")
+            
+            repositorio_eventos.publicar([evento_ejemplo])
+            await asyncio.sleep(0.1)
+        
+        assert json.loads(contenido.contents[0].text)["total"] == 3
+        assert any(isinstance(n, types.ResourceUpdatedNotification) for n in recibidas)
\ No newline at end of file
@@ -4,6 +4,7 @@ Tests para CalendarioTools (MCP)
 """
 
 import pytest
+from unittest.mock import patch
 from src.mcp.tools.calendario import CalendarioTools
 
 
@@ -55,4 +56,45 @@ class TestCalendarioTools:
         eventos = tools._obtener_todos_eventos()
         
         assert eventos is not None
-        assert isinstance(eventos, list)
\ No newline at end of file
+        assert isinstance(eventos, list)
+    
+    @pytest.mark.asyncio
+    async def test_generar_link_con_id_estable(self, repositorio_eventos, lista_eventos, monkeypatch):
+        """Debe resolver el ID estable contra el snapshot"""
+        tools = CalendarioTools(repository=repositorio_eventos)
+        monkeypatch.setattr(tools.link_generator, "generar_link", lambda evento: "https://link")
+        
+        evento = lista_eventos[0]
+        resultado = await tools.generar_link(evento_id=evento.id)
+        
+        assert resultado["success"] is True
+        assert resultado["id"] == evento.id
+        assert resultado["evento"] == evento.titulo
+    
+    def test_google_calendar_perezoso(self, repositorio_eventos):
+        """No debe autenticarse con Google al construir las herramientas"""
+        tools = CalendarioTools(repository=repositorio_eventos)
+        
+        assert tools._google_calendar is None
+        assert tools.health()["agregar_a_google_calendar"]["estado"] == "no_inicializado"
+    
+    def test_sin_token_no_abre_el_navegador(self, repositorio_eventos, tmp_path, monkeypatch):
+        """Sin token válido la herramienta falla enseguida y health() la marca sin autorizar"""
+        from src.config.settings import settings
+        from src.integrations import google_calendar_service
+        from src.services.container import AppContainer
+        
+        credenciales = tmp_path / "google_calendar.json"
+        credenciales.write_text("{}")
+        monkeypatch.setattr(settings, "google_credentials_path", str(credenciales))
+        monkeypatch.setattr(settings, "google_token_path", str(tmp_path / "token.json"))
+        
+        tools = CalendarioTools(repository=repositorio_eventos)
+        
+        with patch.object(google_calendar_service, "InstalledAppFlow") as flujo, \
+                patch("src.services.container.get_container", return_value=AppContainer()):
+            with pytest.raises(google_calendar_service.AutorizacionPendienteError):
+                tools.google_calendar
+        
+        flujo.from_client_secrets_file.assert_not_called()
+        assert tools.health()["agregar_a_google_calendar"]["estado"] == "no_autorizado"
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Tests para el precalentado de respuestas frecuentes
+"""
+
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from src.ai.answer_cache import AnswerCache
+from src.ai.llm_backends import LLMBackend
+from src.ai.precalentador import MARGEN_MEDIANOCHE, PrecalentadorRespuestas, segundos_hasta_medianoche
+from src.ai.resiliencia import CircuitBreaker, PoliticaResiliencia
+from src.ai.scheduler import LLMScheduler, PrioridadLLM
+from src.config.constants import CANAL_DISCORD, CANAL_WHATSAPP
+from src.config.settings import settings
+from src.models.evento import Evento
+
+PREGUNTAS = ["¿Cuáles son los próximos exámenes?", "¿Qué feriados hay este mes?", "¿Qué hay esta semana?"]
+
+
+class BackendContado(LLMBackend):
+    """Backend local que cuenta las llamadas y responde con markdown"""
+    
+    nombre = "contado"
+    
+    def __init__(self):
+        self.prompts = []
+    
+    async def generar(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return f"📝 **Respuesta {len(self.prompts)}**"
+    
+    def generar_sync(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+@pytest.fixture
+def repositorio(repositorio_eventos):
+    """Repositorio con eventos de las próximas semanas"""
+    hoy = datetime.now()
+    repositorio_eventos.publicar([
+        Evento(fecha=hoy + timedelta(days=2), titulo="Mesa de examen final", categoria="examen"),
+        Evento(fecha=hoy + timedelta(days=3), titulo="Feriado nacional", categoria="feriado"),
+        Evento(fecha=hoy + timedelta(days=30), titulo="Inscripciones a materias", categoria="administrativo"),
+    ])
+    return repositorio_eventos
+
+
+@pytest.fixture
+def chatbot(repositorio, monkeypatch):
+    """Chatbot sin red con caché de respuestas"""
+    from src.ai.chatbot import CalendarioChatbot
+    from src.ai.llm_client import LLMClient
+    
+    monkeypatch.setattr(settings, "gemini_api_key", None)
+    llm = LLMClient(backend=BackendContado())
+    llm.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=2, max_cola=8)
+    llm.resiliencia = PoliticaResiliencia(reintentos=0, circuito=CircuitBreaker(umbral_fallos=1, enfriamiento=60))
+    
+    bot = CalendarioChatbot(llm=llm, calendario_service=MagicMock(), repository=repositorio)
+    bot.answer_cache = AnswerCache(max_entradas=64)
+    return bot
+
+
+@pytest.fixture
+def precalentador(chatbot):
+    """Precalentador con un corpus chico"""
+    return PrecalentadorRespuestas(chatbot, preguntas=PREGUNTAS)
+
+
+class TestPrecalentador:
+    """Tests de PrecalentadorRespuestas"""
+    
+    @pytest.mark.asyncio
+    async def test_genera_por_canal(self, precalentador, chatbot):
+        """Cada pregunta que necesita LLM se genera una vez por canal"""
+        resumen = await precalentador.precalentar()
+        
+        # "esta semana" y "próximos exámenes" las resuelve el router: no pasan por el LLM
+        assert resumen["generadas"] == 2
+        assert resumen["instantaneas"] == 4
+        assert len(chatbot.llm.backend.prompts) == 2
+    
+    @pytest.mark.asyncio
+    async def test_el_primer_estudiante_no_espera_al_llm(self, precalentador, chatbot):
+        """Después de precalentar la pregunta frecuente sale de la caché"""
+        await precalentador.precalentar()
+        llamadas = len(chatbot.llm.backend.prompts)
+        
+        discord = await chatbot.responder("¿Qué feriados hay este mes?", canal=CANAL_DISCORD)
+        whatsapp = await chatbot.responder("¿Qué feriados hay este mes?", canal=CANAL_WHATSAPP)
+        
+        assert len(chatbot.llm.backend.prompts) == llamadas
+        assert "**" in discord
+        assert "**" not in whatsapp and "*Respuesta" in whatsapp
+    
+    @pytest.mark.asyncio
+    async def test_segunda_corrida_sin_llm(self, precalentador, chatbot):
+        """Con la caché caliente una nueva corrida no llama al LLM"""
+        await precalentador.precalentar()
+        resumen = await precalentador.precalentar()
+        
+        assert resumen["generadas"] == 0
+        assert len(chatbot.llm.backend.prompts) == 2
+    
+    @pytest.mark.asyncio
+    async def test_prioridad_de_fondo(self, precalentador, chatbot):
+        """El precalentado nunca le quita turno a un estudiante"""
+        prioridades = []
+        turno = chatbot.llm.scheduler.turno
+        
+        def registrar(prioridad=PrioridadLLM.INTERACTIVA, tokens=1):
+            prioridades.append(prioridad)
+            return turno(prioridad, tokens)
+        
+        chatbot.llm.scheduler.turno = registrar
+        await precalentador.precalentar()
+        
+        assert prioridades and set(prioridades) == {PrioridadLLM.FONDO}
+    
+    @pytest.mark.asyncio
+    async def test_circuito_abierto_interrumpe(self, precalentador, chatbot):
+        """Con el LLM caído la corrida se abandona en lugar de insistir"""
+        chatbot.llm.resiliencia.circuito.registrar_fallo()
+        
+        resumen = await precalentador.precalentar()
+        
+        assert resumen["generadas"] == 0
+        assert chatbot.llm.backend.prompts == []
+    
+    @pytest.mark.asyncio
+    async def test_corridas_concurrentes_se_combinan(self, precalentador, chatbot):
+        """Un pedido durante una corrida se atiende al terminar, sin correr en paralelo"""
+        primera, segunda = await asyncio.gather(precalentador.precalentar(), precalentador.precalentar())
+        
+        assert segunda is None
+        assert primera["generadas"] == 0  # resumen de la repetición, con todo ya en caché
+        assert precalentador.corridas == 2
+        assert len(chatbot.llm.backend.prompts) == 2
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_nuevo_dispara_el_precalentado(self, precalentador, repositorio, chatbot):
+        """Al publicar otra versión del calendario se regeneran las respuestas"""
+        precalentador.iniciar()
+        try:
+            await asyncio.sleep(0.05)
+            assert precalentador.corridas == 1
+            
+            repositorio.publicar(repositorio.snapshot_actual.eventos[:-1])
+            await asyncio.sleep(0.05)
+            
+            assert precalentador.corridas == 2
+            assert len(chatbot.llm.backend.prompts) == 4
+        finally:
+            precalentador.detener()
+        
+        assert precalentador._al_publicar not in repositorio._suscriptores
+    
+    @pytest.mark.asyncio
+    async def test_cache_deshabilitada(self, precalentador, chatbot):
+        """Sin caché de respuestas no hay nada que precalentar"""
+        chatbot.answer_cache = AnswerCache(max_entradas=0)
+        
+        resumen = await precalentador.precalentar()
+        
+        assert resumen["generadas"] == 0
+        assert chatbot.llm.backend.prompts == []
+    
+    def test_segundos_hasta_medianoche(self):
+        """La espera termina pasada la medianoche"""
+        ahora = datetime(2026, 3, 2, 23, 59, 0)
+        
+        assert segundos_hasta_medianoche(ahora) == 60 + MARGEN_MEDIANOCHE
+
+
+class TestFormatoPorCanal:
+    """Tests del formato de las respuestas según el canal"""
+    
+    def test_whatsapp_usa_negrita_simple(self):
+        """WhatsApp no muestra **negrita** ni títulos markdown"""
+        from src.ai.chatbot import formatear_para_canal
+        
+        texto = "## Exámenes\n📝 **Final de Física**: lunes"
+        
+        assert formatear_para_canal(texto, CANAL_WHATSAPP) == "*Exámenes*\n📝 *Final de Física*: lunes"
+        assert formatear_para_canal(texto, CANAL_DISCORD) == texto
+    
+    def test_cache_separada_por_canal(self):
+        """La misma pregunta en otro canal es otra entrada"""
+        cache = AnswerCache()
+        cache.guardar(cache.clave("¿Qué feriados hay?", "v1", canal=CANAL_DISCORD), "**discord**")
+        
+        assert cache.obtener(cache.clave("¿Qué feriados hay?", "v1", canal=CANAL_WHATSAPP)) is None
+        assert cache.obtener(cache.clave("¿Qué feriados hay?", "v1", canal=CANAL_DISCORD)) == "**discord**"
\ No newline at end of file
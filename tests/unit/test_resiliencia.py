@@ -0,0 +1,369 @@
+"""
+Tests para la resiliencia de las llamadas al LLM
+"""
+
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from google.api_core import exceptions as google_exceptions
+from src.ai.llm_backends import FakeBackend, LLMBackend
+from src.ai.resiliencia import (
+    ESTADO_ABIERTO,
+    ESTADO_CERRADO,
+    ESTADO_SEMIABIERTO,
+    MIN_MUESTRAS_COBERTURA,
+    CircuitBreaker,
+    CircuitoAbiertoError,
+    PoliticaResiliencia,
+    con_deadline,
+    es_reintentable,
+)
+from src.ai.scheduler import LLMSaturadoError, LLMScheduler
+from src.config.settings import settings
+from src.models.evento import Evento
+
+
+class BackendInestable(LLMBackend):
+    """Backend que falla las primeras llamadas y después responde"""
+    
+    nombre = "inestable"
+    
+    def __init__(self, fallos: int = 0, error: Exception = None, demora: float = 0.0):
+        self.fallos = fallos
+        self.error = error or google_exceptions.ServiceUnavailable("503")
+        self.demora = demora
+        self.llamadas = 0
+    
+    async def generar(self, prompt: str) -> str:
+        self.llamadas += 1
+        if self.demora:
+            await asyncio.sleep(self.demora)
+        if self.llamadas <= self.fallos:
+            raise self.error
+        return f"respuesta {self.llamadas}"
+    
+    async def generar_stream(self, prompt: str):
+        yield await self.generar(prompt)
+        yield " (fin)"
+    
+    def generar_sync(self, prompt: str) -> str:
+        self.llamadas += 1
+        if self.llamadas <= self.fallos:
+            raise self.error
+        return f"respuesta {self.llamadas}"
+
+
+def _politica(**kwargs) -> PoliticaResiliencia:
+    """Política sin esperas entre reintentos"""
+    opciones = dict(timeout=1.0, reintentos=2, backoff_base=0.0, backoff_max=0.0, percentil_cobertura=0)
+    opciones.update(kwargs)
+    opciones.setdefault("circuito", CircuitBreaker(umbral_fallos=3, enfriamiento=60))
+    return PoliticaResiliencia(**opciones)
+
+
+class TestErroresReintentables:
+    """Tests de la clasificación de errores"""
+    
+    @pytest.mark.parametrize("error", [
+        TimeoutError(),
+        ConnectionResetError(),
+        google_exceptions.ServiceUnavailable("503"),
+        google_exceptions.TooManyRequests("429"),
+        google_exceptions.DeadlineExceeded("504"),
+    ])
+    def test_transitorios(self, error):
+        """Timeouts, conexión, 429 y 5xx se reintentan"""
+        assert es_reintentable(error)
+    
+    @pytest.mark.parametrize("error", [
+        ValueError("respuesta bloqueada"),
+        google_exceptions.InvalidArgument("400"),
+        LLMSaturadoError("cola llena"),
+    ])
+    def test_definitivos(self, error):
+        """Errores del pedido y la cola llena no se reintentan"""
+        assert not es_reintentable(error)
+
+
+class TestCircuitBreaker:
+    """Tests de los estados del circuito"""
+    
+    def test_abre_tras_fallos_seguidos(self):
+        """N fallos seguidos abren el circuito; un éxito reinicia la cuenta"""
+        circuito = CircuitBreaker(umbral_fallos=2, enfriamiento=60)
+        
+        circuito.registrar_fallo()
+        circuito.registrar_exito()
+        circuito.registrar_fallo()
+        assert circuito.estado == ESTADO_CERRADO
+        
+        circuito.registrar_fallo()
+        assert circuito.estado == ESTADO_ABIERTO
+        
+        with pytest.raises(CircuitoAbiertoError):
+            circuito.verificar()
+        assert circuito.estadisticas()["rechazadas"] == 1
+    
+    def test_semiabierto_deja_pasar_una_prueba(self):
+        """Pasado el enfriamiento pasa una sola llamada; su resultado decide el estado"""
+        circuito = CircuitBreaker(umbral_fallos=1, enfriamiento=0)
+        circuito.registrar_fallo()
+        
+        assert circuito.estado == ESTADO_SEMIABIERTO
+        assert circuito.permitir()
+        assert not circuito.permitir()
+        
+        circuito.registrar_fallo()
+        assert circuito.permitir()
+        
+        circuito.registrar_exito()
+        assert circuito.estado == ESTADO_CERRADO
+        assert circuito.permitir() and circuito.permitir()
+    
+    def test_descartar_libera_la_prueba(self):
+        """Una prueba cancelada no deja el circuito trabado"""
+        circuito = CircuitBreaker(umbral_fallos=1, enfriamiento=0)
+        circuito.registrar_fallo()
+        
+        assert circuito.permitir()
+        circuito.descartar()
+        
+        assert circuito.permitir()
+
+
+class TestPoliticaResiliencia:
+    """Tests de deadline, reintentos y cobertura"""
+    
+    @pytest.mark.asyncio
+    async def test_reintenta_errores_transitorios(self):
+        """Un 503 pasajero se reintenta con backoff"""
+        backend = BackendInestable(fallos=2)
+        politica = _politica()
+        
+        with patch("src.ai.resiliencia.asyncio.sleep") as sleep:
+            respuesta = await politica.ejecutar(lambda: backend.generar("hola"))
+        
+        assert respuesta == "respuesta 3"
+        assert sleep.await_count == 2
+        assert politica.reintentadas == 2
+        assert politica.circuito.estado == ESTADO_CERRADO
+    
+    @pytest.mark.asyncio
+    async def test_no_reintenta_errores_definitivos(self):
+        """Un error del pedido se propaga enseguida y no cuenta como caída"""
+        backend = BackendInestable(fallos=1, error=ValueError("bloqueada"))
+        politica = _politica()
+        
+        with pytest.raises(ValueError):
+            await politica.ejecutar(lambda: backend.generar("hola"))
+        
+        assert backend.llamadas == 1
+        assert politica.circuito.estadisticas()["fallos_seguidos"] == 0
+    
+    def test_backoff_con_jitter(self):
+        """La espera es aleatoria entre 0 y base·2^intento, con tope"""
+        politica = _politica(backoff_base=0.5, backoff_max=1.5)
+        
+        esperas = [politica.espera_reintento(3) for _ in range(50)]
+        
+        assert all(0 <= e <= 1.5 for e in esperas)
+        assert len(set(esperas)) > 1
+    
+    @pytest.mark.asyncio
+    async def test_deadline_por_intento(self):
+        """Una llamada colgada se corta al vencer el deadline"""
+        backend = BackendInestable(demora=10)
+        politica = _politica(timeout=0.05, reintentos=1)
+        
+        with pytest.raises(TimeoutError):
+            await politica.ejecutar(lambda: backend.generar("hola"))
+        
+        assert backend.llamadas == 2
+        assert politica.timeouts == 2
+    
+    @pytest.mark.asyncio
+    async def test_timeout_de_asyncio_es_transitorio(self):
+        """asyncio.TimeoutError (distinto del integrado en 3.10) también se reintenta"""
+        assert es_reintentable(asyncio.TimeoutError())
+        
+        with pytest.raises(TimeoutError):
+            await con_deadline(asyncio.sleep(10), 0.01)
+    
+    @pytest.mark.asyncio
+    async def test_la_espera_en_cola_no_consume_el_deadline(self):
+        """El deadline empieza con el turno del planificador"""
+        scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=1, max_cola=4)
+        politica = _politica(timeout=0.15, reintentos=0)
+        
+        async def lenta():
+            await asyncio.sleep(0.1)
+            return "ok"
+        
+        turno = lambda: scheduler.turno()
+        resultados = await asyncio.gather(*(politica.ejecutar(lenta, turno=turno) for _ in range(3)))
+        
+        assert resultados == ["ok"] * 3
+    
+    @pytest.mark.asyncio
+    async def test_circuito_abierto_no_llama_al_llm(self):
+        """Con el circuito abierto falla sin llegar al backend"""
+        backend = BackendInestable(fallos=10)
+        politica = _politica(reintentos=5, circuito=CircuitBreaker(umbral_fallos=2, enfriamiento=60))
+        
+        with pytest.raises(google_exceptions.ServiceUnavailable):
+            await politica.ejecutar(lambda: backend.generar("hola"))
+        
+        # Se dejó de reintentar al abrirse el circuito
+        assert backend.llamadas == 2
+        
+        with pytest.raises(CircuitoAbiertoError):
+            await politica.ejecutar(lambda: backend.generar("hola"))
+        assert backend.llamadas == 2
+    
+    @pytest.mark.asyncio
+    async def test_saturado_no_abre_el_circuito(self):
+        """La cola llena es nuestra, no una caída del LLM"""
+        politica = _politica(circuito=CircuitBreaker(umbral_fallos=1, enfriamiento=60))
+        
+        async def saturada():
+            raise LLMSaturadoError("cola llena")
+        
+        with pytest.raises(LLMSaturadoError):
+            await politica.ejecutar(saturada)
+        
+        assert politica.circuito.estado == ESTADO_CERRADO
+    
+    @pytest.mark.asyncio
+    async def test_cobertura_gana_el_mas_rapido(self):
+        """Un intento más lento que el percentil lanza un segundo pedido"""
+        politica = _politica(percentil_cobertura=90)
+        politica._latencias.extend([0.01] * MIN_MUESTRAS_COBERTURA)
+        demoras = iter([10, 0])
+        
+        async def llamada():
+            demora = next(demoras)
+            await asyncio.sleep(demora)
+            return f"tardó {demora}"
+        
+        respuesta = await asyncio.wait_for(politica.ejecutar(llamada), 1)
+        
+        assert respuesta == "tardó 0"
+        assert politica.coberturas == 1
+    
+    def test_cobertura_deshabilitada(self):
+        """Con percentil 0 o pocas muestras no hay cobertura"""
+        assert _politica().demora_cobertura() is None
+        
+        politica = _politica(percentil_cobertura=95)
+        politica._latencias.extend([0.1] * (MIN_MUESTRAS_COBERTURA - 1))
+        assert politica.demora_cobertura() is None
+        
+        politica._latencias.append(2.0)
+        assert politica.demora_cobertura() == 2.0
+    
+    @pytest.mark.asyncio
+    async def test_stream_reintenta_antes_del_primer_fragmento(self):
+        """Un stream que falla al abrir se reintenta"""
+        backend = BackendInestable(fallos=1)
+        politica = _politica()
+        
+        fragmentos = [f async for f in politica.stream(lambda: backend.generar_stream("hola"))]
+        
+        assert fragmentos == ["respuesta 2", " (fin)"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_no_reintenta_con_fragmentos_entregados(self):
+        """Con parte de la respuesta ya entregada el error se propaga"""
+        politica = _politica()
+        aperturas = []
+        
+        async def cortado():
+            aperturas.append(1)
+            yield "Las clases"
+            raise google_exceptions.ServiceUnavailable("503")
+        
+        fragmentos = []
+        with pytest.raises(google_exceptions.ServiceUnavailable):
+            async for fragmento in politica.stream(cortado):
+                fragmentos.append(fragmento)
+        
+        assert fragmentos == ["Las clases"]
+        assert len(aperturas) == 1
+    
+    def test_ejecutar_sync(self):
+        """La versión sincrónica reintenta y usa el circuito"""
+        backend = BackendInestable(fallos=1)
+        politica = _politica()
+        
+        assert politica.ejecutar_sync(lambda: backend.generar_sync("hola")) == "respuesta 2"
+
+
+class TestChatbotDegradado:
+    """Tests de las respuestas sin LLM cuando Gemini no está disponible"""
+    
+    @pytest.fixture
+    def chatbot(self, monkeypatch):
+        """Chatbot con un backend que siempre devuelve 503"""
+        from src.ai.chatbot import CalendarioChatbot
+        from src.ai.llm_client import LLMClient
+        
+        monkeypatch.setattr(settings, "gemini_api_key", None)
+        llm = LLMClient(backend=BackendInestable(fallos=100))
+        llm.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=2, max_cola=4)
+        llm.resiliencia = _politica(reintentos=0, circuito=CircuitBreaker(umbral_fallos=1, enfriamiento=60))
+        return CalendarioChatbot(llm=llm)
+    
+    @pytest.fixture
+    def eventos(self):
+        """Eventos de contexto en el futuro"""
+        año = datetime.now().year + 1
+        return [
+            Evento(fecha=datetime(año, 7, 6), titulo="Mesa de examen final turno julio", categoria="examen"),
+            Evento(fecha=datetime(año, 7, 20), titulo="Receso invernal", categoria="receso"),
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_circuito_abierto_lista_los_eventos(self, chatbot, eventos):
+        """Con Gemini caído se responden los eventos filtrados, no un error"""
+        from src.ai.chatbot import MENSAJE_DEGRADADO
+        
+        respuesta = await chatbot.responder("¿Qué materias conviene rendir?", eventos)
+        
+        assert respuesta.startswith(MENSAJE_DEGRADADO)
+        assert "Mesa de examen final turno julio" in respuesta
+        assert chatbot.llm.resiliencia.circuito.estado == ESTADO_ABIERTO
+        
+        # Con el circuito abierto ni siquiera se llama al backend
+        llamadas = chatbot.llm.backend.llamadas
+        segunda = await chatbot.responder("¿Qué materias conviene rendir?", eventos)
+        assert segunda.startswith(MENSAJE_DEGRADADO)
+        assert chatbot.llm.backend.llamadas == llamadas
+    
+    @pytest.mark.asyncio
+    async def test_usa_las_plantillas_del_router(self, chatbot, eventos):
+        """Si la pregunta tiene una intención conocida se responde con su plantilla"""
+        respuesta = await chatbot.responder("¿Cuándo es el próximo receso de invierno largo?", eventos)
+        
+        assert "Receso invernal" in respuesta
+        assert "⚠️" not in respuesta
+    
+    @pytest.mark.asyncio
+    async def test_stream_degradado(self, chatbot, eventos):
+        """El streaming también responde sin LLM si Gemini no está disponible"""
+        from src.ai.chatbot import MENSAJE_DEGRADADO
+        
+        fragmentos = [f async for f in chatbot.responder_stream("¿Qué materias conviene rendir?", eventos)]
+        
+        assert len(fragmentos) == 1
+        assert fragmentos[0].startswith(MENSAJE_DEGRADADO)
+    
+    @pytest.mark.asyncio
+    async def test_otros_errores_siguen_siendo_error(self, chatbot, eventos):
+        """Un error que no es de disponibilidad mantiene el mensaje de error"""
+        from src.ai.chatbot import MENSAJE_ERROR
+        
+        chatbot.llm.backend = FakeBackend()
+        chatbot.llm.backend.generar = lambda prompt: (_ for _ in ()).throw(RuntimeError("bug"))
+        
+        assert await chatbot.responder("¿Qué materias conviene rendir?", eventos) == MENSAJE_ERROR
\ No newline at end of file
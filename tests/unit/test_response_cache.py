@@ -0,0 +1,67 @@
+"""
+Tests para la caché de respuestas MCP
+"""
+
+from datetime import date
+from src.mcp.response_cache import MCPResponseCache
+
+
+class TestMCPResponseCache:
+    """Tests de la caché versionada de respuestas"""
+    
+    def test_clave_canonica(self):
+        """El orden de los argumentos no debe cambiar la clave"""
+        a = MCPResponseCache.clave("buscar_eventos", {"query": "x", "categoria": "examen"}, "v1")
+        b = MCPResponseCache.clave("buscar_eventos", {"categoria": "examen", "query": "x"}, "v1")
+        
+        assert a == b
+    
+    def test_clave_depende_de_version_y_dia(self):
+        """Versión o día distintos deben generar claves distintas"""
+        base = MCPResponseCache.clave("get_eventos_semana", {}, "v1", date(2025, 12, 1))
+        
+        assert base != MCPResponseCache.clave("get_eventos_semana", {}, "v2", date(2025, 12, 1))
+        assert base != MCPResponseCache.clave("get_eventos_semana", {}, "v1", date(2025, 12, 2))
+    
+    def test_get_set_y_estadisticas(self):
+        """Debe contar hits y misses"""
+        cache = MCPResponseCache(max_entradas=4)
+        clave = cache.clave("get_eventos_semana", {}, "v1")
+        
+        assert cache.get(clave) is None
+        cache.set(clave, "[]")
+        assert cache.get(clave) == "[]"
+        
+        stats = cache.estadisticas()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_lru_descarta_la_menos_usada(self):
+        """Al superar el límite debe descartar la entrada más antigua"""
+        cache = MCPResponseCache(max_entradas=2)
+        claves = [cache.clave("buscar_eventos", {"query": q}, "v1") for q in ("a", "b", "c")]
+        
+        cache.set(claves[0], "a")
+        cache.set(claves[1], "b")
+        cache.get(claves[0])
+        cache.set(claves[2], "c")
+        
+        assert cache.get(claves[1]) is None
+        assert cache.get(claves[0]) == "a"
+    
+    def test_solo_herramientas_de_lectura(self):
+        """Las herramientas con efectos no deben cachearse"""
+        cache = MCPResponseCache()
+        
+        assert cache.es_cacheable("buscar_eventos") is True
+        assert cache.es_cacheable("enviar_recordatorio") is False
+        assert MCPResponseCache(max_entradas=0).es_cacheable("buscar_eventos") is False
+    
+    def test_invalidar(self):
+        """invalidar() debe vaciar la caché aceptando el snapshot como argumento"""
+        cache = MCPResponseCache()
+        cache.set(cache.clave("get_eventos_semana", {}, "v1"), "[]")
+        
+        cache.invalidar(object())
+        
+        assert len(cache) == 0
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Tests para las respuestas en streaming (chatbot y Discord)
+"""
+
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.ai.scheduler import MENSAJE_SATURADO, LLMSaturadoError
+from src.models.evento import Evento
+
+
+async def _generar(*fragmentos, error=None):
+    """Simula un stream del LLM"""
+    for fragmento in fragmentos:
+        yield fragmento
+    if error is not None:
+        raise error
+
+
+class TestResponderStream:
+    """Tests de CalendarioChatbot.responder_stream"""
+    
+    @pytest.fixture
+    def chatbot(self):
+        """Chatbot con LLM simulado"""
+        from src.ai.chatbot import CalendarioChatbot
+        
+        with patch("src.ai.chatbot.get_llm_client"):
+            bot = CalendarioChatbot()
+        
+        bot.llm = MagicMock()
+        bot.llm.preparar_prefijo = AsyncMock(return_value=False)
+        bot.llm.soporta_cascada = False
+        return bot
+    
+    @pytest.fixture
+    def eventos(self):
+        """Eventos de contexto"""
+        return [Evento(fecha=datetime.now(), titulo="Inicio de clases", categoria="academico")]
+    
+    @pytest.mark.asyncio
+    async def test_entrega_fragmentos(self, chatbot, eventos):
+        """Debe entregar los fragmentos en orden"""
+        chatbot.llm.chat_stream = MagicMock(return_value=_generar("Las clases ", "empiezan hoy"))
+        
+        fragmentos = [f async for f in chatbot.responder_stream("¿Cuándo empiezan las clases?", eventos)]
+        
+        assert fragmentos == ["Las clases ", "empiezan hoy"]
+    
+    @pytest.mark.asyncio
+    async def test_error_a_mitad_de_stream(self, chatbot, eventos):
+        """Un error a mitad del stream debe terminar con el mensaje de error"""
+        chatbot.llm.chat_stream = MagicMock(return_value=_generar("Las clases", error=RuntimeError("corte")))
+        
+        fragmentos = [f async for f in chatbot.responder_stream("¿Cuándo empiezan las clases?", eventos)]
+        
+        assert fragmentos[0] == "Las clases"
+        assert "❌" in fragmentos[-1]
+    
+    @pytest.mark.asyncio
+    async def test_saturado(self, chatbot, eventos):
+        """Con el LLM saturado debe entregar el mensaje de espera"""
+        chatbot.llm.chat_stream = MagicMock(return_value=_generar(error=LLMSaturadoError("llena")))
+        
+        fragmentos = [f async for f in chatbot.responder_stream("¿Cuándo empiezan las clases?", eventos)]
+        
+        assert fragmentos == [MENSAJE_SATURADO]
+    
+    @pytest.mark.asyncio
+    async def test_guarda_respuesta_completa_en_cache(self, chatbot, eventos):
+        """La respuesta completa debe quedar en la caché"""
+        snapshot = MagicMock(version="v1", eventos=eventos)
+        chatbot.repository = MagicMock()
+        chatbot.repository.obtener_snapshot_async = AsyncMock(return_value=snapshot)
+        chatbot.llm.chat_stream = MagicMock(return_value=_generar("Hoy ", "empiezan"))
+        
+        pregunta = "¿Qué tengo que tener en cuenta sobre las clases?"
+        _ = [f async for f in chatbot.responder_stream(pregunta)]
+        segunda = [f async for f in chatbot.responder_stream(pregunta)]
+        
+        assert segunda == ["Hoy empiezan"]
+        assert chatbot.llm.chat_stream.call_count == 1
+
+
+class TestTransmitirRespuesta:
+    """Tests de la edición progresiva del mensaje de Discord"""
+    
+    @pytest.mark.asyncio
+    async def test_envia_y_edita(self):
+        """Debe enviar con el primer fragmento y terminar con el texto completo"""
+        from src.integrations.discord_bot import CURSOR_STREAM, transmitir_respuesta
+        
+        mensaje = MagicMock()
+        mensaje.edit = AsyncMock()
+        enviar = AsyncMock(return_value=mensaje)
+        
+        await transmitir_respuesta(enviar, _generar("Hola", " mundo"), lambda texto: texto, intervalo=0)
+        
+        assert enviar.await_args.kwargs["embed"] == "Hola" + CURSOR_STREAM
+        assert mensaje.edit.await_args.kwargs["embed"] == "Hola mundo"
+    
+    @pytest.mark.asyncio
+    async def test_limita_ediciones(self):
+        """No debe editar más de una vez por intervalo"""
+        from src.integrations.discord_bot import transmitir_respuesta
+        
+        mensaje = MagicMock()
+        mensaje.edit = AsyncMock()
+        enviar = AsyncMock(return_value=mensaje)
+        
+        await transmitir_respuesta(enviar, _generar(*"abcdefghij"), lambda texto: texto, intervalo=60)
+        
+        # Sólo la edición final
+        assert enviar.await_count == 1
+        assert mensaje.edit.await_count == 1
+        assert mensaje.edit.await_args.kwargs["embed"] == "abcdefghij"
\ No newline at end of file
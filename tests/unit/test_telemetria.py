@@ -0,0 +1,219 @@
+"""
+Tests para la telemetría de las llamadas al LLM
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from src.ai.llm_backends import FakeBackend, LLMBackend
+from src.ai.resiliencia import CircuitBreaker, PoliticaResiliencia
+from src.ai.scheduler import LLMScheduler, PrioridadLLM
+from src.ai.telemetria import (
+    SIN_DATO,
+    TARIFA_PRINCIPAL,
+    TARIFA_RAPIDO,
+    Histograma,
+    MedicionLLM,
+    TelemetriaLLM,
+    anotar_contexto_cacheado,
+    anotar_respuesta,
+)
+from src.config.settings import settings
+
+
+def respuesta_gemini(prompt: int, salida: int, cacheados: int = 0, razon: int = 1):
+    """Respuesta con la forma de las de Gemini (usage_metadata y candidates)"""
+    return SimpleNamespace(
+        text="📅 Respuesta",
+        usage_metadata=SimpleNamespace(
+            prompt_token_count=prompt,
+            candidates_token_count=salida,
+            cached_content_token_count=cacheados
+        ),
+        candidates=[SimpleNamespace(finish_reason=razon)]
+    )
+
+
+class BackendConUso(LLMBackend):
+    """Backend local que informa el uso como Gemini"""
+    
+    nombre = "con-uso"
+    
+    async def generar(self, prompt: str) -> str:
+        anotar_contexto_cacheado(True)
+        respuesta = respuesta_gemini(prompt=1200, salida=80, cacheados=1000)
+        anotar_respuesta(respuesta)
+        return respuesta.text
+    
+    def generar_sync(self, prompt: str) -> str:
+        raise NotImplementedError
+
+
+class BackendRoto(LLMBackend):
+    """Backend que siempre falla con un error no reintentable"""
+    
+    nombre = "roto"
+    
+    async def generar(self, prompt: str) -> str:
+        raise ValueError("respuesta bloqueada")
+    
+    def generar_sync(self, prompt: str) -> str:
+        raise ValueError("respuesta bloqueada")
+
+
+def crear_cliente(backend: LLMBackend, max_concurrencia: int = 2):
+    """LLMClient sin red con telemetría propia"""
+    from src.ai.llm_client import LLMClient
+    
+    cliente = LLMClient(backend=backend)
+    cliente.scheduler = LLMScheduler(rpm=1000, tpm=10**9, max_concurrencia=max_concurrencia, max_cola=8)
+    cliente.resiliencia = PoliticaResiliencia(reintentos=0, circuito=CircuitBreaker(umbral_fallos=5, enfriamiento=60))
+    cliente.telemetria = TelemetriaLLM(precio_entrada=1.0, precio_salida=10.0, precio_cacheado=0.25)
+    return cliente
+
+
+@pytest.fixture(autouse=True)
+def sin_api_key(monkeypatch):
+    """Los backends locales no necesitan GEMINI_API_KEY"""
+    monkeypatch.setattr(settings, "gemini_api_key", None)
+
+
+class TestHistograma:
+    """Tests de Histograma"""
+    
+    def test_percentiles_por_cubeta(self):
+        """El percentil es el límite de su cubeta, acotado por el máximo"""
+        histograma = Histograma((10, 100, 1000))
+        for valor in [5] * 90 + [50] * 9 + [700]:
+            histograma.registrar(valor)
+        
+        assert histograma.percentil(50) == 10
+        assert histograma.percentil(95) == 100
+        assert histograma.percentil(100) == 700
+        assert histograma.resumen()["cubetas"] == {"<=10": 90, "<=100": 9, "<=1000": 1, "+inf": 0}
+    
+    def test_valores_sobre_el_ultimo_limite(self):
+        """Lo que supera el último límite cae en +inf y reporta el máximo"""
+        histograma = Histograma((10,))
+        histograma.registrar(42)
+        
+        assert histograma.percentil(99) == 42
+        assert histograma.resumen()["cubetas"]["+inf"] == 1
+    
+    def test_vacio(self):
+        """Sin muestras todo vale 0"""
+        assert Histograma((10,)).resumen()["p95"] == 0.0
+
+
+class TestMedicion:
+    """Tests de MedicionLLM y de la lectura de usage_metadata"""
+    
+    def test_rondas_se_suman(self):
+        """Cada ronda de herramientas suma; los fragmentos de una ronda se pisan"""
+        medicion = MedicionLLM(operacion="herramientas", backend="gemini", prioridad=PrioridadLLM.INTERACTIVA)
+        medicion.anotar_uso(100, 5, ronda=0)
+        medicion.anotar_uso(100, 20, ronda=0)
+        medicion.anotar_uso(300, 40, cacheados=50, ronda=1)
+        
+        assert (medicion.tokens_prompt, medicion.tokens_respuesta, medicion.tokens_cacheados) == (400, 60, 50)
+        assert not medicion.tokens_estimados
+    
+    def test_fuera_de_una_llamada(self):
+        """Sin medición en curso anotar no hace nada"""
+        anotar_respuesta(respuesta_gemini(10, 10))
+        anotar_contexto_cacheado(True)
+    
+    def test_costo_con_tokens_cacheados(self):
+        """Los tokens cacheados se cobran al precio de caché"""
+        telemetria = TelemetriaLLM(precio_entrada=1.0, precio_salida=10.0, precio_cacheado=0.25)
+        medicion = MedicionLLM(operacion="chat", backend="gemini", prioridad=PrioridadLLM.INTERACTIVA)
+        medicion.anotar_uso(1_000_000, 100_000, cacheados=800_000)
+        
+        assert telemetria.costo(medicion) == pytest.approx(0.2 + 0.2 + 1.0)
+    
+    def test_costo_con_la_tarifa_del_modelo_rapido(self):
+        """Las llamadas al modelo rápido se cobran a sus propios precios"""
+        telemetria = TelemetriaLLM(precio_entrada=1.0, precio_salida=10.0, precio_cacheado=0.25, precios_rapido=(0.1, 1.0, 0.025))
+        
+        for tarifa in (TARIFA_PRINCIPAL, TARIFA_RAPIDO):
+            with telemetria.medir("chat", "gemini", PrioridadLLM.INTERACTIVA, tarifa) as medicion:
+                medicion.anotar_uso(1_000_000, 100_000)
+        
+        assert telemetria.costo_de(TARIFA_PRINCIPAL) == pytest.approx(1.0 + 1.0)
+        assert telemetria.costo_de(TARIFA_RAPIDO) == pytest.approx(0.1 + 0.1)
+        assert telemetria.estadisticas()["costo_usd"]["por_tarifa"] == {TARIFA_PRINCIPAL: 2.0, TARIFA_RAPIDO: 0.2}
+
+
+class TestLLMClientTelemetria:
+    """Tests de las mediciones de LLMClient"""
+    
+    @pytest.mark.asyncio
+    async def test_chat_con_backend_local(self):
+        """Sin usage_metadata los tokens se estiman y la llamada queda registrada"""
+        cliente = crear_cliente(FakeBackend(latencia=0.02))
+        
+        await cliente.chat("¿Cuándo hay finales?")
+        metricas = cliente.telemetria.estadisticas()
+        
+        assert metricas["llamadas"] == 1 and metricas["operaciones"] == {"chat": 1}
+        assert metricas["tokens"]["prompt"] > 0 and metricas["tokens"]["respuesta"] > 0
+        assert metricas["tokens"]["llamadas_estimadas"] == 1
+        assert metricas["finish_reasons"] == {SIN_DATO: 1}
+        assert metricas["histogramas"]["latencia_ms"]["maximo"] >= 20
+        assert metricas["histogramas"]["primer_token_ms"]["cantidad"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_uso_informado_por_el_proveedor(self):
+        """Tokens, finish reason, contexto cacheado y costo salen de la respuesta"""
+        cliente = crear_cliente(BackendConUso())
+        
+        await cliente.chat("¿Cuándo hay finales?")
+        metricas = cliente.telemetria.estadisticas()
+        
+        assert metricas["tokens"] == {"prompt": 1200, "respuesta": 80, "cacheados": 1000, "llamadas_estimadas": 0}
+        assert metricas["finish_reasons"] == {"STOP": 1}
+        assert metricas["contexto_cacheado"]["aciertos"] == 1
+        assert metricas["costo_usd"]["total"] == pytest.approx((200 * 1.0 + 1000 * 0.25 + 80 * 10.0) / 1e6, abs=1e-6)
+    
+    @pytest.mark.asyncio
+    async def test_stream_mide_el_primer_token(self):
+        """En streaming el primer fragmento llega antes que el final"""
+        cliente = crear_cliente(FakeBackend(latencia=0.08, fragmentos=4))
+        
+        fragmentos = [f async for f in cliente.chat_stream("¿Cuándo hay finales?")]
+        histogramas = cliente.telemetria.estadisticas()["histogramas"]
+        
+        assert len(fragmentos) == 4
+        assert histogramas["primer_token_ms"]["maximo"] < histogramas["latencia_ms"]["maximo"]
+    
+    @pytest.mark.asyncio
+    async def test_espera_en_cola(self):
+        """Con un solo lugar la segunda llamada registra la espera"""
+        cliente = crear_cliente(FakeBackend(latencia=0.05), max_concurrencia=1)
+        
+        await asyncio.gather(cliente.chat("primera"), cliente.chat("segunda"))
+        
+        assert cliente.telemetria.estadisticas()["histogramas"]["espera_cola_ms"]["maximo"] >= 40
+    
+    @pytest.mark.asyncio
+    async def test_errores_por_tipo(self):
+        """Una llamada fallida cuenta como error y no suma tokens"""
+        cliente = crear_cliente(BackendRoto())
+        
+        with pytest.raises(ValueError):
+            await cliente.chat("¿Cuándo hay finales?")
+        metricas = cliente.telemetria.estadisticas()
+        
+        assert metricas["errores"] == 1 and metricas["tipos_error"] == {"ValueError": 1}
+        assert metricas["histogramas"]["tokens_prompt"]["cantidad"] == 0
+    
+    def test_estadisticas_del_cliente(self):
+        """El cliente expone telemetría, planificador y resiliencia juntos"""
+        cliente = crear_cliente(FakeBackend())
+        
+        cliente.chat_sync("¿Cuándo hay finales?")
+        metricas = cliente.estadisticas()
+        
+        assert metricas["backend"] == "fake"
+        assert metricas["telemetria"]["operaciones"] == {"sync": 1}
+        assert {"planificador", "resiliencia"} <= set(metricas)
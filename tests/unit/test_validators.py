@@ -10,6 +10,7 @@ from src.utils.validators import (
     validar_url,
     validar_categoria,
     validar_rango_fechas,
+    normalizar_texto,
     sanitizar_texto
 )
 
@@ -76,4 +77,9 @@ class TestValidadores:
         resultado = sanitizar_texto(texto)
         assert resultado == "Hola Mundo script"
         assert "<" not in resultado
-        assert ">" not in resultado
\ No newline at end of file
+        assert ">" not in resultado
+    
+    def test_normalizar_texto(self):
+        """Debe quitar tildes, signos y espacios extra"""
+        assert normalizar_texto("  Día del   Estudiante! ") == "dia del estudiante"
+        assert normalizar_texto("EXÁMENES") == normalizar_texto("examenes")
\ No newline at end of file